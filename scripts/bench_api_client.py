@@ -0,0 +1,121 @@
+"""
+Measure per-subtask latency of the resident -> API hop.
+
+Compares a fresh ``httpx.Client`` per request (the old behaviour) with the
+pooled keep-alive client from ``vivarium.runtime.api_client``, over TCP and,
+where available, a Unix domain socket. A stub HTTP/1.1 server answers POST
+/cycle immediately, so the numbers isolate connection overhead.
+
+Usage:
+    python scripts/bench_api_client.py [--fanout 3] [--rounds 200]
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from vivarium.runtime.api_client import close_api_client, get_api_client  # noqa: E402
+
+_BODY = json.dumps({"status": "completed", "result": "ok", "budget_used": 0.0}).encode("utf-8")
+
+
+class _CycleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("uds", 0)
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def _run(post, fanout: int, rounds: int) -> list:
+    """Time each fan-out round (``fanout`` parallel POSTs); returns per-subtask ms."""
+    samples = []
+    payload = {"prompt": "x", "task_id": "bench"}
+    with ThreadPoolExecutor(max_workers=fanout) as pool:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            list(pool.map(lambda _i: post(payload), range(fanout)))
+            samples.append((time.perf_counter() - start) * 1000.0 / fanout)
+    return samples
+
+
+def _report(label: str, samples: list) -> float:
+    median = statistics.median(samples)
+    p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} median {median:7.3f} ms/subtask   p95 {p95:7.3f} ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fanout", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    tcp_server = _serve(ThreadingHTTPServer(("127.0.0.1", 0), _CycleHandler))
+    url = f"http://127.0.0.1:{tcp_server.server_address[1]}/cycle"
+
+    def fresh_post(payload):
+        with httpx.Client(timeout=30) as client:
+            return client.post(url, json=payload)
+
+    def pooled_post(payload):
+        return get_api_client(30, uds_path="").post(url, json=payload)
+
+    print(f"fan-out {args.fanout} x {args.rounds} rounds")
+    fresh = _report("fresh client per request", _run(fresh_post, args.fanout, args.rounds))
+    pooled = _report("pooled keep-alive (TCP)", _run(pooled_post, args.fanout, args.rounds))
+    print(f"{'saved per subtask (TCP)':<28} {fresh - pooled:7.3f} ms")
+
+    if hasattr(socket, "AF_UNIX"):
+        sock_path = os.path.join(tempfile.mkdtemp(), "api.sock")
+        uds_server = _serve(_UnixHTTPServer(sock_path, _CycleHandler))
+
+        def uds_post(payload):
+            return get_api_client(30, uds_path=sock_path).post("http://127.0.0.1/cycle", json=payload)
+
+        uds = _report("pooled keep-alive (UDS)", _run(uds_post, args.fanout, args.rounds))
+        print(f"{'saved per subtask (UDS)':<28} {fresh - uds:7.3f} ms")
+        uds_server.shutdown()
+        os.unlink(sock_path)
+
+    close_api_client()
+    tcp_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Show that N parallel POST /cycle calls overlap instead of queueing.
+
+Drives the real FastAPI app in-process (httpx ASGI transport). The LLM path
+uses a stub wrapper whose ``call_llm`` blocks for ``--llm-delay`` seconds the
+way the sync Groq SDK does; the local path runs ``--local-command`` for real.
+With a non-blocking /cycle, wall time stays near one call's latency up to
+VIVARIUM_CYCLE_MAX_CONCURRENCY; a blocking handler would take N times as long.
+
+Usage:
+    python scripts/bench_cycle_concurrency.py [--parallel 8] [--llm-delay 0.5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from vivarium.runtime import swarm_api as swarm  # noqa: E402
+
+
+class _BlockingWrapper:
+    """Stands in for SecureAPIWrapper; sleeps like a blocking SDK call."""
+
+    auditor = None
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def estimate_cost_for_request(self, prompt, model):
+        return 0.0
+
+    def call_llm(self, **kwargs):
+        time.sleep(self.delay)
+        return {"result": "ok", "model": kwargs["model"], "cost": 0.0}
+
+
+async def _burst(payloads: list) -> float:
+    transport = httpx.ASGITransport(app=swarm.app, client=("127.0.0.1", 40000))
+    headers = {"X-Vivarium-Internal-Token": swarm.INTERNAL_EXECUTION_TOKEN}
+    async with httpx.AsyncClient(transport=transport, base_url="http://127.0.0.1", timeout=120) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/cycle", json=p, headers=headers) for p in payloads))
+        elapsed = time.perf_counter() - start
+    failed = [r for r in responses if r.status_code != 200]
+    if failed:
+        raise SystemExit(f"{len(failed)} request(s) failed: {failed[0].status_code} {failed[0].text}")
+    return elapsed
+
+
+def _report(label: str, elapsed: float, single: float, parallel: int) -> None:
+    serial = single * parallel
+    print(
+        f"{label:<8} {parallel} calls: wall {elapsed:6.3f}s   serial estimate {serial:6.3f}s   "
+        f"overlap x{serial / elapsed:4.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--parallel", type=int, default=8)
+    parser.add_argument("--llm-delay", type=float, default=0.5)
+    parser.add_argument("--local-command", default="ls -R vivarium")
+    args = parser.parse_args()
+
+    swarm.SECURE_API_WRAPPER = _BlockingWrapper(args.llm_delay)
+    swarm.validate_config = lambda require_groq_key=False: None
+    swarm._pre_execute_safety_report = lambda text, task_id: {"passed": True, "task_id": task_id}
+
+    print(f"VIVARIUM_CYCLE_MAX_CONCURRENCY={swarm.CYCLE_MAX_CONCURRENCY}")
+    # Distinct prompts: identical in-flight prompts would be coalesced into one call.
+    llm = [{"mode": "llm", "prompt": f"hello {i}", "model": "llama-3.1-8b-instant"} for i in range(args.parallel)]
+    single = asyncio.run(_burst(llm[:1]))
+    _report("llm", asyncio.run(_burst(llm)), single, args.parallel)
+
+    local = {"mode": "local", "task": args.local_command, "timeout": 60}
+    single = asyncio.run(_burst([local]))
+    _report("local", asyncio.run(_burst([local] * args.parallel)), single, args.parallel)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import api_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_api_client():
+    """Tests swap ``httpx.Client``; never hand one test's cached shared client to the next."""
+    api_client.close_api_client()
+    yield
+    api_client.close_api_client()
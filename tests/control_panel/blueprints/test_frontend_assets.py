@@ -0,0 +1,57 @@
+import gzip
+import re
+
+from jinja2 import Template
+
+from vivarium.runtime.control_panel.frontend_assets import INDEX_PAGE, STATIC_ASSETS
+from vivarium.runtime.control_panel.frontend_template import CONTROL_PANEL_HTML
+
+
+def _asset_urls(page: bytes) -> list:
+    return re.findall(r'/assets/panel\.[0-9a-f]+\.(?:css|js)', page.decode("utf-8"))
+
+
+def test_split_page_reassembles_to_the_rendered_template():
+    page = INDEX_PAGE.body.decode("utf-8")
+    for url in _asset_urls(INDEX_PAGE.body):
+        asset = STATIC_ASSETS[url.rsplit("/", 1)[1]]
+        text = asset.body.decode("utf-8")
+        if url.endswith(".css"):
+            page = page.replace(f'<link rel="stylesheet" href="{url}">', f"<style>{text}</style>")
+        else:
+            page = page.replace(f'<script src="{url}"></script>', f"<script>{text}</script>")
+    assert page == Template(CONTROL_PANEL_HTML).render()
+
+
+def test_root_serves_compressed_page_and_immutable_assets(client, localhost_kwargs):
+    response = client.get("/", headers={"Accept-Encoding": "gzip"}, **localhost_kwargs)
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    page = gzip.decompress(response.data)
+    assert page == INDEX_PAGE.body
+
+    urls = _asset_urls(page)
+    assert {url.rsplit(".", 1)[1] for url in urls} == {"css", "js"}
+    for url in urls:
+        asset = client.get(url, **localhost_kwargs)
+        assert asset.status_code == 200
+        assert "Content-Encoding" not in asset.headers
+        assert asset.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert asset.headers["X-Content-Type-Options"] == "nosniff"
+
+    assert client.get("/assets/panel.0000.js", **localhost_kwargs).status_code == 404
+
+
+def test_root_revalidates_with_etag(client, localhost_kwargs):
+    first = client.get("/", headers={"Accept-Encoding": "gzip"}, **localhost_kwargs)
+    again = client.get(
+        "/",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]},
+        **localhost_kwargs,
+    )
+    assert again.status_code == 304
+    assert again.data == b""
+    # API responses keep the no-store default.
+    assert client.get("/api/insights", **localhost_kwargs).headers["Cache-Control"] == "no-store"
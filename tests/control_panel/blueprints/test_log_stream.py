@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+from vivarium.runtime.control_panel.log_stream import LogStream
+
+
+class _Socket:
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, name, payload, to=None, callback=None):
+        self.sent.append(SimpleNamespace(name=name, payload=payload, to=to, ack=callback))
+
+
+def test_entries_published_between_flushes_go_out_as_one_batch_per_client():
+    socket = _Socket()
+    stream = LogStream(socket, buffer_size=10, ack_timeout=60)
+    stream.connect("a")
+    stream.connect("b")
+    stream.publish([("log_entry", {"n": 1}), ("task_output", {"n": 2})])
+    stream.publish([("log_entry", {"n": 3})])
+
+    assert stream.flush() == 2
+    assert sorted(msg.to for msg in socket.sent) == ["a", "b"]
+    for msg in socket.sent:
+        assert msg.name == "log_batch"
+        assert [item["entry"]["n"] for item in msg.payload["items"]] == [1, 2, 3]
+        assert "summary" not in msg.payload
+    assert stream.stats()["emitted"] == 6 and stream.stats()["batches"] == 2
+
+
+def test_unacked_client_is_held_back_and_overflow_becomes_a_summary():
+    socket = _Socket()
+    stream = LogStream(socket, buffer_size=3, ack_timeout=60)
+    stream.connect("slow")
+    stream.publish([("log_entry", {"n": 0})])
+    stream.flush()
+    first = socket.sent.pop()
+
+    stream.publish([("log_entry", {"n": n}) for n in range(1, 5)] + [("task_output", {"n": 5})])
+    assert stream.flush() == 0  # previous batch not acknowledged yet
+    assert stream.has_in_flight()
+
+    first.ack()
+    assert stream.flush() == 1
+    payload = socket.sent.pop().payload
+    assert [item["entry"]["n"] for item in payload["items"]] == [3, 4, 5]
+    assert payload["summary"] == {"dropped": 2, "by_type": {"log_entry": 2}}
+    stats = stream.stats()
+    assert (stats["published"], stats["emitted"], stats["dropped"], stats["summaries"]) == (6, 4, 2, 1)
+
+
+def test_ack_timeout_releases_client_and_disconnect_forgets_it():
+    socket = _Socket()
+    stream = LogStream(socket, buffer_size=5, ack_timeout=0)
+    stream.connect("a")
+    stream.publish([("log_entry", {"n": 1})])
+    stream.flush()
+    stream.publish([("log_entry", {"n": 2})])
+    assert stream.flush() == 1
+
+    stream.disconnect("a")
+    stream.publish([("log_entry", {"n": 3})])
+    assert stream.flush() == 0
+    assert stream.stats()["clients"] == 0
+
+
+def test_stream_stats_endpoint(client, localhost_kwargs):
+    response = client.get("/api/logs/stream_stats", **localhost_kwargs)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["success"] is True
+    assert {"published", "emitted", "dropped", "clients"} <= set(data)
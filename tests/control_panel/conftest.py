@@ -27,11 +27,14 @@ def app(monkeypatch):
     _app.config["EXECUTION_LOG"] = workspace / "execution_log.jsonl"
     _app.config["QUEUE_FILE"] = workspace / "queue.json"
     _app.config["KILL_SWITCH"] = swarm_dir / "kill_switch.json"
+    _app.config["BUDGET_LEDGER"] = swarm_dir / "budget_ledger.sqlite3"
     _app.config["FREE_TIME_BALANCES"] = swarm_dir / "free_time_balances.json"
     _app.config["IDENTITIES_DIR"] = identities_dir
     worker_file = swarm_dir / "worker_process.json"
     _app.config["WORKER_PROCESS_FILE"] = worker_file
     monkeypatch.setattr("vivarium.runtime.control_panel_app.WORKER_PROCESS_FILE", worker_file)
+    monkeypatch.setattr("vivarium.runtime.control_panel_app.INSIGHTS_ROLLUP_FILE", workspace / "insights_rollup.json")
+    monkeypatch.setattr("vivarium.runtime.control_panel_app._INSIGHTS_ROLLUP_STATE", {"rollup": None})
     _app.config["RUNTIME_SPEED_FILE"] = swarm_dir / "runtime_speed.json"
     _app.config["MAILBOX_QUESTS_FILE"] = swarm_dir / "mailbox_quests.json"
     _app.config["CREATIVE_SEED_PATTERN"] = CREATIVE_SEED_PATTERN
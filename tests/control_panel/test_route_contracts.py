@@ -39,6 +39,10 @@ ROUTE_CONTRACTS = {
         'required': ['stopped'],
         'types': {'stopped': bool}
     },
+    '/api/budget': {
+        'required': ['success', 'spent', 'reserved', 'budget_limit', 'remaining'],
+        'types': {'success': bool, 'spent': (int, float), 'budget_limit': (int, float)}
+    },
     '/api/runtime_speed': {
         'required': ['success', 'speed'],
         'types': {'success': bool, 'speed': (int, float)}
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.requests import Request
+
+from vivarium.runtime import api_client
+from vivarium.runtime import swarm_api as swarm
+
+
+def test_api_client_is_shared_until_settings_change():
+    api_client.close_api_client()
+    first = api_client.get_api_client(30.0, uds_path="")
+    assert api_client.get_api_client(30.0, uds_path="") is first
+    assert first.is_closed is False
+
+    second = api_client.get_api_client(45.0, uds_path="")
+    assert second is not first
+    # Other threads may still be using the old client; it is only closed at shutdown.
+    assert first.is_closed is False
+
+    api_client.close_api_client()
+    assert first.is_closed is True
+    assert second.is_closed is True
+
+
+def test_api_client_uses_swapped_httpx_client_after_reset(monkeypatch):
+    api_client.close_api_client()
+    created = []
+
+    class _FakeClient:
+        def __init__(self, *args, **kwargs):
+            created.append(kwargs)
+
+    monkeypatch.setattr(api_client.httpx, "Client", _FakeClient)
+    api_client.close_api_client()
+    client = api_client.get_api_client(10.0, uds_path="")
+    assert isinstance(client, _FakeClient)
+    assert api_client.get_api_client(10.0, uds_path="") is client
+    assert created[0]["limits"].max_keepalive_connections == api_client.API_MAX_KEEPALIVE_CONNECTIONS
+    api_client.close_api_client()
+
+
+def _request(client, server, headers=()):
+    return Request({"type": "http", "client": client, "server": server, "headers": list(headers)})
+
+
+def test_unix_socket_requests_are_local_only_when_uds_configured(monkeypatch):
+    monkeypatch.setattr(swarm, "API_UDS_PATH", "")
+    assert swarm._is_unix_socket_request(_request(None, None)) is False
+
+    monkeypatch.setattr(swarm, "API_UDS_PATH", "/tmp/vivarium-api.sock")
+    assert swarm._is_unix_socket_request(_request(None, None)) is True
+    assert swarm._is_unix_socket_request(_request(("10.0.0.5", 1234), ("0.0.0.0", 8420))) is False
+    assert swarm._is_unix_socket_request(_request(None, None, [(b"x-forwarded-for", b"10.0.0.5")])) is False
@@ -0,0 +1,158 @@
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime.budget_ledger import API_ACCOUNT, SWARM_ACCOUNT, BudgetLedger, daily_account
+from vivarium.runtime.secure_api_wrapper import BudgetEnforcer
+from vivarium.utils.cost_tracker import BudgetExceededError, CostTracker
+
+
+def _reserve_in_child(db_path, results):
+    ledger = BudgetLedger(Path(db_path))
+    reservation = ledger.reserve(SWARM_ACCOUNT, 0.4, limit=1.0)
+    if reservation is not None:
+        ledger.commit(SWARM_ACCOUNT, reservation, 0.4)
+    results.put(reservation is not None)
+
+
+def test_reserve_commit_release(tmp_path):
+    ledger = BudgetLedger(tmp_path / "ledger.sqlite3")
+    first = ledger.reserve(SWARM_ACCOUNT, 0.6, limit=1.0)
+    assert first is not None
+    assert ledger.reserve(SWARM_ACCOUNT, 0.6, limit=1.0) is None  # 0.6 already held
+
+    ledger.commit(SWARM_ACCOUNT, first, 0.25)
+    snapshot = ledger.snapshot()
+    assert snapshot["spent"] == pytest.approx(0.25)
+    assert snapshot["reserved"] == 0.0
+
+    second = ledger.reserve(SWARM_ACCOUNT, 0.5, limit=1.0)
+    ledger.release(second)
+    assert ledger.spent() == pytest.approx(0.25)
+    assert ledger.snapshot()["reserved"] == 0.0
+
+
+def test_reservations_are_atomic_across_processes(tmp_path):
+    db_path = tmp_path / "ledger.sqlite3"
+    results = multiprocessing.Queue()
+    children = [
+        multiprocessing.Process(target=_reserve_in_child, args=(str(db_path), results))
+        for _ in range(4)
+    ]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join(timeout=20)
+    granted = sorted(results.get(timeout=5) for _ in children)
+    assert granted == [False, False, True, True]
+    assert BudgetLedger(db_path).spent() == pytest.approx(0.8)
+
+
+def test_stale_reservations_are_reclaimed(tmp_path):
+    # Reservations of a process that died are dropped at once; live ones after the TTL.
+    ledger = BudgetLedger(tmp_path / "ledger.sqlite3", reservation_ttl_seconds=1.0)
+    assert ledger.reserve(SWARM_ACCOUNT, 0.9, limit=1.0)
+    assert ledger.reserve(SWARM_ACCOUNT, 0.9, limit=1.0) is None
+    time.sleep(1.1)
+    assert ledger.reserve(SWARM_ACCOUNT, 0.9, limit=1.0)
+
+
+def test_new_account_is_seeded_from_execution_log(tmp_path):
+    log = tmp_path / "execution_log.jsonl"
+    log.write_text(
+        "\n".join(json.dumps({"task_id": f"t{i}", "budget_used": 0.1}) for i in range(3)) + "\n",
+        encoding="utf-8",
+    )
+    ledger = BudgetLedger(tmp_path / "ledger.sqlite3", seed_log=log)
+    assert ledger.spent() == pytest.approx(0.3)
+    assert ledger.spent("other") == 0.0
+
+    # The seed only applies once; later log lines are charged by the API, not replayed.
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"task_id": "t3", "budget_used": 5.0}) + "\n")
+    assert BudgetLedger(tmp_path / "ledger.sqlite3", seed_log=log).spent() == pytest.approx(0.3)
+
+
+def test_enforcers_in_different_processes_share_spend(tmp_path):
+    db_path = tmp_path / "ledger.sqlite3"
+    api_worker = BudgetEnforcer(1.0, ledger=BudgetLedger(db_path))
+    restarted = BudgetEnforcer(1.0, ledger=BudgetLedger(db_path))
+
+    reservation = api_worker.reserve(0.5)
+    api_worker.commit(reservation, 0.7)
+    api_worker.record_cache_hit(0.01)
+
+    assert restarted.get_spent() == pytest.approx(0.7)
+    assert restarted.remaining == pytest.approx(0.3)
+    assert restarted.reserve(0.5) is None
+    assert restarted.get_cache_savings() == {"cache_hits": 1, "cache_saved": pytest.approx(0.01)}
+
+
+def test_cost_tracker_uses_ledger(monkeypatch, tmp_path):
+    monkeypatch.setattr(CostTracker, "_instance", None)
+    tracker = CostTracker(budget_usd=1.0, ledger=BudgetLedger(tmp_path / "ledger.sqlite3"))
+    tracker.add_cost(0.75)
+    assert tracker.get_remaining_budget() == pytest.approx(0.25)
+    with pytest.raises(BudgetExceededError):
+        tracker.add_cost(0.5)
+    assert tracker.spent_usd == pytest.approx(0.75)
+    tracker.reset()
+    assert tracker.spent_usd == 0.0
+
+
+def test_cost_tracker_reset_leaves_swarm_spend_alone(monkeypatch, tmp_path):
+    ledger = BudgetLedger(tmp_path / "ledger.sqlite3")
+    ledger.charge(SWARM_ACCOUNT, 0.4)
+    monkeypatch.setattr(CostTracker, "_instance", None)
+    tracker = CostTracker(budget_usd=1.0, ledger=ledger)
+    tracker.add_cost(0.2)
+    tracker.reset()
+
+    assert tracker.account != SWARM_ACCOUNT
+    assert ledger.spent(SWARM_ACCOUNT) == pytest.approx(0.4)
+    with pytest.raises(ValueError):
+        ledger.reset(SWARM_ACCOUNT)
+
+
+def test_cost_tracker_budget_is_per_run_unless_account_is_shared(monkeypatch, tmp_path):
+    ledger = BudgetLedger(tmp_path / "ledger.sqlite3")
+    monkeypatch.setattr(CostTracker, "_instance", None)
+    first_run = CostTracker(budget_usd=1.0, ledger=ledger)
+    first_run.add_cost(0.9)
+
+    # A restarted process gets a fresh budget instead of inheriting a lifetime cap.
+    monkeypatch.setattr(CostTracker, "_instance", None)
+    second_run = CostTracker(budget_usd=1.0, ledger=ledger)
+    assert second_run.account != first_run.account
+    assert second_run.get_remaining_budget() == pytest.approx(1.0)
+
+    # An explicit account is shared across processes and persists.
+    for _ in range(2):
+        monkeypatch.setattr(CostTracker, "_instance", None)
+        shared = CostTracker(budget_usd=1.0, ledger=ledger, account="nightly-report")
+        shared.add_cost(0.3)
+    assert shared.spent_usd == pytest.approx(0.6)
+
+
+def test_daily_api_budget_rolls_up_into_swarm_spend(tmp_path):
+    ledger = BudgetLedger(tmp_path / "ledger.sqlite3")
+    enforcer = BudgetEnforcer(1.0, ledger=ledger, account=API_ACCOUNT, period="day")
+    assert enforcer.current_account == daily_account(API_ACCOUNT)
+
+    enforcer.commit(enforcer.reserve(0.6), 0.6)
+    enforcer.record_cache_hit(0.05)
+    assert enforcer.reserve(0.6) is None
+    assert ledger.spent(SWARM_ACCOUNT) == pytest.approx(0.6)
+    assert ledger.snapshot(SWARM_ACCOUNT)["cache_hits"] == 1
+
+    # A new day (or an explicit reset) starts the API window over; all-time spend stays.
+    enforcer.reset()
+    assert enforcer.remaining == pytest.approx(1.0)
+    assert ledger.spent(SWARM_ACCOUNT) == pytest.approx(0.6)
+    assert daily_account(API_ACCOUNT, now=0) == "api:1970-01-01"
@@ -0,0 +1,99 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import swarm_api as swarm
+from vivarium.runtime.codebase_scan import BlockedPathMatcher, CodebaseScanner
+
+
+def _full_scan(root: Path, ignore_dirs, blocked) -> dict:
+    """The original os.walk scan that read every file on each call."""
+    file_info, test_files, total_lines = [], [], 0
+    for current, dirs, files in os.walk(root):
+        if blocked.reason(Path(current).resolve()):
+            dirs[:] = []
+            continue
+        dirs[:] = [d for d in dirs if d not in ignore_dirs and not d.startswith(".")]
+        for filename in files:
+            if not filename.endswith(".py"):
+                continue
+            path = Path(current) / filename
+            if blocked.reason(path.resolve()):
+                continue
+            content = path.read_text(encoding="utf-8", errors="ignore")
+            rel_path = str(path.relative_to(root))
+            has_tests = "test" in rel_path.lower() or "def test_" in content
+            total_lines += len(content.splitlines())
+            file_info.append({"path": rel_path, "lines": len(content.splitlines()), "has_tests": has_tests})
+            if has_tests:
+                test_files.append(rel_path)
+    return {
+        "total_files": len(file_info),
+        "total_lines": total_lines,
+        "files": file_info,
+        "test_files": test_files,
+        "has_tests": bool(test_files),
+    }
+
+
+def _tree(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "secret").mkdir()
+    (root / "node_modules").mkdir()
+    (root / ".hidden").mkdir()
+    (root / "main.py").write_text("print(1)\nprint(2)\n", encoding="utf-8")
+    (root / "pkg" / "util.py").write_text("def test_util():\n    pass\n", encoding="utf-8")
+    (root / "pkg" / "sub" / "deep.py").write_text("x = 1\n", encoding="utf-8")
+    (root / "pkg" / "notes.md").write_text("not python\n", encoding="utf-8")
+    (root / "secret" / "key.py").write_text("KEY = 1\n", encoding="utf-8")
+    (root / "node_modules" / "vendored.py").write_text("x = 1\n", encoding="utf-8")
+    (root / ".hidden" / "h.py").write_text("x = 1\n", encoding="utf-8")
+    (root / "link.py").symlink_to(root / "secret" / "key.py")
+    return root
+
+
+def test_incremental_scan_matches_full_scan_and_reuses_unchanged_files(tmp_path):
+    root = _tree(tmp_path)
+    blocked = BlockedPathMatcher([((root / "secret").resolve(), "blocked")])
+    cache_file = tmp_path / "cache" / "scan.json"
+    scanner = CodebaseScanner(root, ignore_dirs={"node_modules"}, blocked=blocked, cache_file=cache_file)
+
+    expected = _full_scan(root, {"node_modules"}, blocked)
+    assert scanner.scan() == expected
+    assert {info["path"] for info in expected["files"]} == {"main.py", "pkg/util.py", "pkg/sub/deep.py"}
+    assert scanner.last_scan == {"files": 3, "read": 3, "reused": 0}
+
+    # A new process picks up the persisted cache and reads nothing.
+    reloaded = CodebaseScanner(root, ignore_dirs={"node_modules"}, blocked=blocked, cache_file=cache_file)
+    assert reloaded.scan() == expected
+    assert reloaded.last_scan["read"] == 0
+
+    (root / "pkg" / "sub" / "deep.py").write_text("x = 1\ny = 2\nz = 3\n", encoding="utf-8")
+    (root / "main.py").unlink()
+    result = reloaded.scan()
+    assert result == _full_scan(root, {"node_modules"}, blocked)
+    assert reloaded.last_scan == {"files": 2, "read": 1, "reused": 1}
+
+
+def test_api_scan_matches_full_scan_of_repo():
+    expected = _full_scan(swarm.REPO_ROOT, swarm.IGNORE_DIRS, swarm.READ_BLOCK_MATCHER)
+    scanner = CodebaseScanner(swarm.REPO_ROOT, swarm.IGNORE_DIRS, swarm.READ_BLOCK_MATCHER, cache_file=None)
+    assert scanner.scan() == expected
+
+
+def test_blocked_path_matcher_matches_roots_and_children_only():
+    matcher = BlockedPathMatcher([
+        (Path("/repo/vivarium/physics"), "physics"),
+        (Path("/repo/SECURITY.md"), "security"),
+    ])
+    assert matcher.reason(Path("/repo/vivarium/physics")) == "physics"
+    assert matcher.reason(Path("/repo/vivarium/physics/laws.py")) == "physics"
+    assert matcher.reason(Path("/repo/vivarium/physics_notes.py")) is None
+    assert matcher.reason(Path("/repo/SECURITY.md")) == "security"
+    assert matcher.reason(Path("/repo/SECURITY.md.bak")) is None
+    assert swarm._blocked_read_reason(swarm.REPO_ROOT / "vivarium" / "physics" / "x.py").startswith(
+        "Local command blocked: physics"
+    )
@@ -36,6 +36,8 @@ def _configure_control_panel_paths(monkeypatch, tmp_path):
     monkeypatch.setattr(cp, "BOUNTIES_FILE", swarm_dir / "bounties.json")
     monkeypatch.setattr(cp, "DISCUSSIONS_DIR", swarm_dir / "discussions")
     monkeypatch.setattr(cp, "RUNTIME_SPEED_FILE", swarm_dir / "runtime_speed.json")
+    monkeypatch.setattr(cp, "INSIGHTS_ROLLUP_FILE", tmp_path / "cache" / "insights_rollup.json")
+    monkeypatch.setattr(cp, "_INSIGHTS_ROLLUP_STATE", {"rollup": None})
     cp.runtime_config.set_groq_api_key(None)
 
     # Sync paths to app.config so blueprints (e.g. identities, stop_toggle, groq_key, chatrooms) use test paths
@@ -307,6 +309,11 @@ def test_insights_api_aggregates_runtime_signals(monkeypatch, tmp_path):
     assert payload["health"]["state"] == "watch"
     card_ids = {card.get("id") for card in payload.get("metric_cards", [])}
     assert "spend_queue" in card_ids
+    assert payload["usage"]["days"] == 1
+    assert payload["usage"]["by_identity"]["identity_alpha"]["actions"] == 2
+
+    cp._insights_rollup().flush()
+    assert (tmp_path / "cache" / "insights_rollup.json").exists()
 
 
 def test_runtime_speed_api_round_trip(monkeypatch, tmp_path):
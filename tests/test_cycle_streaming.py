@@ -0,0 +1,340 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import api_client
+from vivarium.runtime import control_panel_app
+from vivarium.runtime import swarm_api as swarm
+from vivarium.runtime import worker_runtime as worker
+from vivarium.runtime.groq_client import GroqInferenceEngine
+
+MODEL = "llama-3.1-8b-instant"
+TOKEN_HEADERS = {"X-Vivarium-Internal-Token": swarm.INTERNAL_EXECUTION_TOKEN}
+
+
+def _parse_sse(body: str):
+    return list(worker._iter_sse_events(body.splitlines()))
+
+
+class _Auditor:
+    def __init__(self):
+        self.events = []
+
+    def log(self, event):
+        self.events.append(event)
+
+
+class _StreamingWrapper:
+    """Stands in for SecureAPIWrapper; replays deltas through stream_callback."""
+
+    def __init__(self, deltas, cost=0.0):
+        self.deltas = deltas
+        self.cost = cost
+        self.auditor = _Auditor()
+        self.calls = []
+
+    def estimate_cost_for_request(self, prompt, model):
+        return 0.0
+
+    def call_llm(self, stream_callback=None, **kwargs):
+        self.calls.append(kwargs)
+        sent = []
+        for delta in self.deltas:
+            sent.append(delta)
+            if stream_callback(delta) is False:
+                break
+        return {
+            "result": "".join(sent),
+            "model": kwargs["model"],
+            "input_tokens": 3,
+            "output_tokens": len(sent),
+            "cost": self.cost,
+        }
+
+
+def _patch_api(monkeypatch, wrapper):
+    monkeypatch.setattr(swarm, "SECURE_API_WRAPPER", wrapper)
+    monkeypatch.setattr(swarm, "validate_config", lambda require_groq_key=False: None)
+    monkeypatch.setattr(
+        swarm,
+        "_pre_execute_safety_report",
+        lambda task_text, task_id: {"passed": True, "checks": {}, "task_id": task_id},
+    )
+
+
+def test_groq_execute_streams_deltas_and_reads_final_usage():
+    usage = SimpleNamespace(prompt_tokens=11, completion_tokens=3)
+
+    def _chunk(text, with_usage=False):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=text))],
+            x_groq=SimpleNamespace(usage=usage) if with_usage else None,
+            usage=None,
+        )
+
+    class _Stream:
+        closed = False
+
+        def __iter__(self):
+            yield _chunk("Hel")
+            yield _chunk("lo")
+            yield _chunk("!")
+            yield _chunk(None, with_usage=True)
+
+        def close(self):
+            _Stream.closed = True
+
+    created = []
+    engine = GroqInferenceEngine.__new__(GroqInferenceEngine)
+    engine.client = SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(create=lambda **kw: created.append(kw) or _Stream())
+        )
+    )
+    engine.total_cost = 0.0
+    engine.total_input_tokens = engine.total_output_tokens = engine.request_count = 0
+    engine.rate_limiter = None
+    engine._rate_limit_wait = lambda model_id, estimated_tokens: True
+
+    seen = []
+    result = engine.execute("Say hello", model=MODEL, stream_callback=seen.append)
+    assert created[0]["stream"] is True
+    assert seen == ["Hel", "lo", "!"]
+    assert result["result"] == "Hello!"
+    assert (result["input_tokens"], result["output_tokens"]) == (11, 3)
+    assert result["stopped_early"] is False
+    assert _Stream.closed
+
+    _Stream.closed = False
+    stopped = engine.execute("Say hello", model=MODEL, stream_callback=lambda text: False)
+    assert stopped["result"] == "Hel"
+    assert stopped["stopped_early"] is True
+    assert stopped["output_tokens"] >= 1  # approximated: usage chunk never arrived
+    assert _Stream.closed
+
+
+def test_groq_rate_limit_mid_stream_does_not_replay_on_fallback_model():
+    def _chunk(text):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], x_groq=None, usage=None
+        )
+
+    def _cut_off_stream():
+        yield _chunk("Hel")
+        raise RuntimeError("rate_limit_exceeded: tokens per minute")
+
+    def _refused_stream():
+        raise RuntimeError("rate_limit_exceeded: tokens per minute")
+        yield  # pragma: no cover
+
+    created = []
+    streams = {"cut": _cut_off_stream, "refused": _refused_stream}
+    mode = {"primary": "cut"}
+
+    def _create(**kw):
+        created.append(kw["model"])
+        if kw["model"] == "openai/gpt-oss-120b":
+            return streams[mode["primary"]]()
+        return iter([_chunk("Hi")])
+
+    engine = GroqInferenceEngine.__new__(GroqInferenceEngine)
+    engine.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    engine.total_cost = 0.0
+    engine.total_input_tokens = engine.total_output_tokens = engine.request_count = 0
+    engine.rate_limiter = None
+    engine._rate_limit_wait = lambda model_id, estimated_tokens: True
+
+    seen = []
+    result = engine.execute("Say hello", model="openai/gpt-oss-120b", stream_callback=seen.append)
+    assert result["returncode"] == 429
+    assert seen == ["Hel"]
+    assert created == ["openai/gpt-oss-120b"]
+
+    # Nothing reached the caller yet, so the 70B fallback is still safe.
+    created.clear()
+    seen.clear()
+    mode["primary"] = "refused"
+    result = engine.execute("Say hello", model="openai/gpt-oss-120b", stream_callback=seen.append)
+    assert result["returncode"] == 0
+    assert seen == ["Hi"]
+    assert created == ["openai/gpt-oss-120b", "llama-3.3-70b-versatile"]
+
+
+def test_cycle_stream_relays_deltas_then_result(monkeypatch):
+    wrapper = _StreamingWrapper(["Hel", "lo", "!"], cost=0.0001)
+    _patch_api(monkeypatch, wrapper)
+
+    client = TestClient(swarm.app)
+    response = client.post(
+        "/cycle/stream",
+        json={"prompt": "Say hello", "model": MODEL, "max_budget": 0.5, "task_id": "t_stream"},
+        headers=TOKEN_HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["delta", "delta", "delta", "result"]
+    assert [data["text"] for _, data in events[:3]] == ["Hel", "lo", "!"]
+    assert events[2][1]["output_tokens"] == 3
+    final = events[-1][1]
+    assert final["status"] == "completed"
+    assert final["result"] == "Hello!"
+    assert final["task_id"] == "t_stream"
+
+
+def test_cycle_stream_cuts_off_when_running_cost_exceeds_budget(monkeypatch):
+    wrapper = _StreamingWrapper(["word "] * 50, cost=0.001)
+    _patch_api(monkeypatch, wrapper)
+
+    client = TestClient(swarm.app)
+    response = client.post(
+        "/cycle/stream",
+        json={"prompt": "Write a lot", "model": MODEL, "max_budget": 1e-9, "task_id": "t_cut"},
+        headers=TOKEN_HEADERS,
+    )
+
+    events = _parse_sse(response.text)
+    deltas = [data for name, data in events if name == "delta"]
+    assert 1 <= len(deltas) < 50
+    name, final = events[-1]
+    assert name == "result"
+    assert final["status"] == "budget_exceeded"
+    assert final["result"] == "word " * len(deltas)
+    assert wrapper.auditor.events[-1]["event"] == "TASK_BUDGET_EXCEEDED_ACTUAL"
+    assert wrapper.auditor.events[-1]["cutoff"] is True
+
+
+def test_cycle_stream_validates_before_opening_stream(monkeypatch):
+    _patch_api(monkeypatch, _StreamingWrapper(["x"]))
+    client = TestClient(swarm.app)
+
+    assert client.post("/cycle/stream", json={"prompt": "hi"}).status_code == 403
+    bad_model = client.post(
+        "/cycle/stream",
+        json={"prompt": "hi", "model": "not-a-model"},
+        headers=TOKEN_HEADERS,
+    )
+    assert bad_model.status_code == 400
+    assert not bad_model.headers["content-type"].startswith("text/event-stream")
+
+
+def test_worker_stream_request_appends_progress_and_returns_result(monkeypatch, tmp_path):
+    body = "".join(
+        [
+            swarm._sse_event("delta", {"text": "Hel", "output_tokens": 1}),
+            swarm._sse_event("delta", {"text": "lo", "output_tokens": 2}),
+            swarm._sse_event("result", {"status": "completed", "result": "Hello", "model": MODEL}),
+        ]
+    )
+    requests = []
+
+    def _handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        worker.httpx,
+        "Client",
+        lambda *args, **kwargs: real_client(transport=httpx.MockTransport(_handler)),
+    )
+    monkeypatch.setattr(worker, "EXECUTION_LOG", tmp_path / "execution_log.jsonl")
+    monkeypatch.setattr(worker, "STREAM_PROGRESS_LOG", tmp_path / "stream_progress.jsonl")
+    monkeypatch.setattr(worker, "STREAM_PROGRESS_INTERVAL_SECONDS", 3600.0)
+    api_client.close_api_client()
+    try:
+        status_code, result, error = worker._stream_cycle_request(
+            "http://127.0.0.1:8420",
+            {"prompt": "Say hello", "model": MODEL, "task_id": "t_worker"},
+            "t_worker",
+        )
+    finally:
+        api_client.close_api_client()
+
+    assert (status_code, error) == (200, "")
+    assert result["result"] == "Hello"
+    assert requests[0].url.path == "/cycle/stream"
+    # Live output goes to the progress sidecar, never to the execution log.
+    assert not (tmp_path / "execution_log.jsonl").exists()
+    progress = [json.loads(line) for line in (tmp_path / "stream_progress.jsonl").read_text().splitlines()]
+    # First delta emits immediately; the rest is flushed once at the end, as a delta.
+    assert [(entry["offset"], entry["delta"]) for entry in progress] == [(0, "Hel"), (3, "lo")]
+    assert progress[-1]["chars"] == 5
+    assert progress[-1]["output_tokens"] == 2
+
+
+def test_worker_stream_request_maps_budget_cutoff_and_missing_endpoint(monkeypatch, tmp_path):
+    responses = {
+        "cut": httpx.Response(
+            200,
+            text=swarm._sse_event("result", {"status": "budget_exceeded", "result": "", "budget_used": 0.2}),
+        ),
+        "missing": httpx.Response(404, json={"detail": "Not Found"}),
+    }
+    current = {"key": "cut"}
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        worker.httpx,
+        "Client",
+        lambda *args, **kwargs: real_client(
+            transport=httpx.MockTransport(lambda request: responses[current["key"]])
+        ),
+    )
+    monkeypatch.setattr(worker, "EXECUTION_LOG", tmp_path / "execution_log.jsonl")
+    monkeypatch.setattr(worker, "STREAM_PROGRESS_LOG", tmp_path / "stream_progress.jsonl")
+    api_client.close_api_client()
+    try:
+        payload = {"prompt": "x", "max_budget": 0.1}
+        status_code, result, error = worker._stream_cycle_request("http://127.0.0.1:8420", payload, "t")
+        assert status_code == 403 and result is None
+        assert "Stream cut off" in error
+
+        current["key"] = "missing"
+        assert worker._stream_cycle_request("http://127.0.0.1:8420", payload, "t") == (None, None, "")
+    finally:
+        api_client.close_api_client()
+
+
+def test_log_watcher_routes_stream_progress_to_task_output(monkeypatch, tmp_path):
+    action_log = tmp_path / "action_log.jsonl"
+    execution_log = tmp_path / "execution_log.jsonl"
+    progress_log = tmp_path / "stream_progress.jsonl"
+    execution_log.write_text(
+        json.dumps({"task_id": "t1", "status": "completed", "worker_id": "w1", "timestamp": "2026-01-01T00:00:01"})
+        + "\n",
+        encoding="utf-8",
+    )
+    progress_log.write_text(
+        json.dumps({"task_id": "t1", "worker_id": "w1", "timestamp": "2026-01-01T00:00:00",
+                    "delta": "Hel", "offset": 0, "chars": 3, "output_tokens": 1})
+        + "\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(control_panel_app, "ACTION_LOG", action_log)
+    monkeypatch.setattr(control_panel_app, "EXECUTION_LOG", execution_log)
+    monkeypatch.setattr(control_panel_app, "STREAM_PROGRESS_LOG", progress_log)
+    monkeypatch.setattr(control_panel_app, "last_log_position", 0)
+    monkeypatch.setattr(control_panel_app, "last_execution_log_position", 0)
+    monkeypatch.setattr(control_panel_app, "last_stream_progress_position", 0)
+
+    emitted = []
+    socket = SimpleNamespace(emit=lambda name, data, **kwargs: emitted.append((name, data, kwargs)))
+    watcher = control_panel_app.LogWatcher(socket)
+    watcher.stream.connect("sid-1")
+    watcher.send_new_entries()
+
+    assert len(emitted) == 1
+    name, payload, kwargs = emitted[0]
+    assert name == "log_batch" and kwargs["to"] == "sid-1"
+    # Live output precedes the completion that clears it in the UI.
+    assert [item["type"] for item in payload["items"]] == ["task_output", "log_entry"]
+    assert payload["items"][0]["entry"]["delta"] == "Hel"
+    assert payload["items"][0]["entry"]["task_id"] == "t1"
+    assert payload["items"][1]["entry"]["action"] == "completed"
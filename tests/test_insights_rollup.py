@@ -0,0 +1,138 @@
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime.insights_rollup import DAY_SECONDS, HOUR_SECONDS, InsightsRollup
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _append(path: Path, *records: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def _rollup(tmp_path: Path, **kwargs) -> InsightsRollup:
+    return InsightsRollup(
+        tmp_path / "execution_log.jsonl",
+        tmp_path / "action_log.jsonl",
+        [tmp_path / "api_audit.log", tmp_path / "legacy" / ".." / "api_audit.log"],
+        tmp_path / "discussions",
+        rollup_path=tmp_path / "cache" / "insights_rollup.json",
+        **kwargs,
+    )
+
+
+def _seed(tmp_path: Path, now: float) -> None:
+    recent, last_week, last_quarter = now - 2 * HOUR_SECONDS, now - 3 * DAY_SECONDS, now - 60 * DAY_SECONDS
+    _append(
+        tmp_path / "execution_log.jsonl",
+        {"timestamp": _iso(last_quarter), "task_id": "t0", "status": "completed", "budget_used": 0.5},
+        {"timestamp": _iso(last_week), "task_id": "t1", "status": "approved", "identity_id": "identity_a", "budget_used": 0.25},
+        {"timestamp": _iso(recent), "task_id": "t2", "status": "completed", "identity_id": "identity_a", "budget_used": 0.125},
+        {"timestamp": _iso(recent), "task_id": "t3", "status": "failed", "identity_id": "identity_b"},
+        {"timestamp": _iso(recent), "task_id": "t4", "status": "pending_review"},
+    )
+    _append(
+        tmp_path / "action_log.jsonl",
+        {"timestamp": _iso(recent), "action_type": "API", "detail": "900 tokens | $0.02", "actor": "identity_a"},
+        {"timestamp": _iso(recent), "action_type": "SAFETY", "action": "BLOCKED_WRITE", "actor": "identity_b"},
+        {"timestamp": _iso(last_week), "action_type": "ERROR", "actor": "SYSTEM"},
+    )
+    _append(
+        tmp_path / "api_audit.log",
+        {"timestamp": _iso(recent), "model": "m-small", "cost": 0.002, "input_tokens": 800, "output_tokens": 200},
+        {"timestamp": _iso(last_week), "model": "m-large", "cost": 0.003, "input_tokens": 1200, "output_tokens": 300},
+    )
+    _append(
+        tmp_path / "discussions" / "watercooler.jsonl",
+        {"timestamp": _iso(recent), "author_id": "identity_a", "content": "hi"},
+    )
+    _append(
+        tmp_path / "discussions" / "dm__identity_a__identity_b.jsonl",
+        {"timestamp": _iso(recent), "author_id": "identity_b", "content": "psst"},
+        {"timestamp": _iso(last_quarter), "author_id": "identity_a", "content": "old"},
+    )
+
+
+def test_rollup_buckets_match_the_logs(tmp_path):
+    now = time.time()
+    _seed(tmp_path, now)
+    rollup = _rollup(tmp_path)
+    assert rollup.poll() == 13  # the audit log path listed twice is tailed once
+
+    day = rollup.totals(now - DAY_SECONDS, now=now)
+    assert day["status:completed"] == 1 and day["status:failed"] == 1 and day["status:pending_review"] == 1
+    assert day["execution_cost"] == pytest.approx(0.125)
+    assert day["api_calls"] == 1 and day["api_cost"] == pytest.approx(0.02)
+    assert day["safety_blocks"] == 1 and "action:ERROR" not in day
+    assert day["messages"] == 2 and day["dm_messages"] == 1
+
+    totals = rollup.running_totals()
+    assert totals["execution"]["cost"] == pytest.approx(0.875)
+    assert totals["execution"]["failure_streak"] == 1
+    assert totals["audit"]["cost"] == pytest.approx(0.005)
+
+    windows = rollup.trend_windows(now)
+    assert windows["week"]["action:ERROR"] == 1
+    assert windows["prev_3m"]["dm_messages"] == 1 and "dm_messages" not in windows["prev_3w"]
+
+    week = rollup.usage(7, now=now)
+    assert week["tasks"] == 2 and week["tokens"] == 2500
+    assert week["by_identity"]["identity_a"] == {"actions": 1, "cost": 0.375, "tasks": 2, "messages": 1}
+    assert week["by_model"]["m-large"] == {"calls": 1, "cost": 0.003, "tokens": 1500}
+    assert rollup.usage(120, now=now)["tasks"] == 3
+
+
+def test_rollup_resumes_from_file_and_rebuilds_only_replaced_logs(tmp_path):
+    now = time.time()
+    _seed(tmp_path, now)
+    rollup = _rollup(tmp_path, save_interval=0)
+    rollup.poll()
+    before = rollup.totals(now - 30 * DAY_SECONDS, now=now)
+
+    resumed = _rollup(tmp_path)
+    assert resumed.loaded_from_rollup is True
+    assert resumed.poll() == 0
+    assert resumed.totals(now - 30 * DAY_SECONDS, now=now) == before
+
+    _append(tmp_path / "action_log.jsonl", {"timestamp": _iso(now), "action_type": "API", "detail": "$0.5"})
+    assert resumed.poll() == 1
+    assert resumed.totals(now - DAY_SECONDS, now=now)["api_calls"] == 2
+
+    # Execution log replaced (e.g. compacted): only that kind is rebuilt.
+    replaced = tmp_path / "execution_log.new"
+    _append(replaced, {"timestamp": _iso(now), "task_id": "t9", "status": "failed", "budget_used": 1.0})
+    replaced.replace(tmp_path / "execution_log.jsonl")
+    resumed.poll()
+    day = resumed.totals(now - DAY_SECONDS, now=now)
+    assert day["status:failed"] == 1 and "status:completed" not in day
+    assert day["api_calls"] == 2
+    assert resumed.running_totals()["execution"] == {
+        "cost": 1.0,
+        "last_event_at": pytest.approx(now),
+        "failure_streak": 1,
+    }
+
+
+def test_compaction_checkpoint_counts_toward_all_time_spend_only(tmp_path):
+    now = time.time()
+    _append(
+        tmp_path / "execution_log.jsonl",
+        {"type": "compaction_checkpoint", "timestamp": _iso(now), "budget_used": 3.0},
+        {"timestamp": _iso(now), "task_id": "t1", "status": "completed", "budget_used": 0.5},
+    )
+    rollup = _rollup(tmp_path)
+    rollup.poll()
+    assert rollup.totals(now - DAY_SECONDS, now=now)["execution_cost"] == pytest.approx(0.5)
+    assert rollup.running_totals()["execution"]["cost"] == pytest.approx(3.5)
@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.utils.jsonl_appender import GroupCommitAppender, get_appender
+
+
+def _lines(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_concurrent_appends_are_group_committed(tmp_path):
+    log = tmp_path / "events.jsonl"
+    appender = GroupCommitAppender(log, flush_interval=0.005)
+
+    def _writer(n: int) -> None:
+        for i in range(25):
+            appender.append({"writer": n, "i": i, "text": "é" * 50})
+
+    threads = [threading.Thread(target=_writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = _lines(log)
+    assert len(records) == 200
+    for n in range(8):
+        assert [r["i"] for r in records if r["writer"] == n] == list(range(25))
+    assert appender.records == 200
+    assert appender.commits < 200
+
+
+def test_append_is_visible_immediately_and_survives_replacement(tmp_path):
+    log = tmp_path / "events.jsonl"
+    appender = GroupCommitAppender(log)
+    appender.append({"n": 1})
+    assert _lines(log) == [{"n": 1}]
+
+    replacement = tmp_path / "replacement.jsonl"
+    replacement.write_text(json.dumps({"n": 0}) + "\n", encoding="utf-8")
+    os.replace(replacement, log)
+    appender.append({"n": 2})
+    assert _lines(log) == [{"n": 0}, {"n": 2}]
+
+    log.unlink()
+    appender.append({"n": 3})
+    assert _lines(log) == [{"n": 3}]
+
+
+def test_size_rotation_keeps_backups(tmp_path):
+    log = tmp_path / "audit.jsonl"
+    appender = GroupCommitAppender(log, max_bytes=60, backup_count=2, fsync="always")
+    for i in range(6):
+        appender.append({"i": i, "pad": "x" * 20})
+    assert log.stat().st_size <= 60
+    assert (tmp_path / "audit.jsonl.1").exists()
+    assert (tmp_path / "audit.jsonl.2").exists()
+    assert not (tmp_path / "audit.jsonl.3").exists()
+    assert _lines(log)[-1]["i"] == 5
+
+
+def test_processes_do_not_interleave(tmp_path):
+    log = tmp_path / "shared.jsonl"
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[3]);"
+        "from vivarium.utils.jsonl_appender import get_appender;"
+        "a = get_appender(sys.argv[1]);"
+        "[a.append({'proc': sys.argv[2], 'i': i, 'pad': 'y' * 3000}) for i in range(100)]"
+    )
+    root = str(Path(__file__).parent.parent)
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script, str(log), str(n), root])
+        for n in range(3)
+    ]
+    for proc in procs:
+        assert proc.wait(timeout=60) == 0
+    records = _lines(log)
+    assert len(records) == 300
+
+
+def test_get_appender_shares_instances_and_validates_fsync(tmp_path):
+    log = tmp_path / "x.jsonl"
+    assert get_appender(log) is get_appender(tmp_path / "." / "x.jsonl")
+    with pytest.raises(ValueError):
+        GroupCommitAppender(log, fsync="sometimes")
+
+
+def test_get_appender_rejects_conflicting_options_for_shared_path(tmp_path):
+    log = tmp_path / "exec.jsonl"
+    appender = get_appender(log, max_bytes=0)
+    assert get_appender(log, max_bytes=0) is appender
+    assert get_appender(log) is appender
+    with pytest.raises(ValueError, match="max_bytes"):
+        get_appender(log, max_bytes=1024)
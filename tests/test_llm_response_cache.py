@@ -0,0 +1,133 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import groq_client
+from vivarium.runtime.llm_response_cache import LLMResponseCache
+from vivarium.runtime.secure_api_wrapper import SecureAPIWrapper, create_admin_context
+
+MODEL = "llama-3.1-8b-instant"
+
+
+def _wrapper(monkeypatch, tmp_path, cache):
+    monkeypatch.setenv("VIVARIUM_API_AUDIT_LOG", str(tmp_path / "audit.log"))
+    monkeypatch.setenv("VIVARIUM_BUDGET_LEDGER", str(tmp_path / "ledger.sqlite3"))
+    calls = []
+
+    def _fake_execute(prompt, model, **kwargs):
+        calls.append(kwargs)
+        return {
+            "result": f"answer:{prompt}",
+            "returncode": 0,
+            "cost": 0.002,
+            "total_cost_usd": 0.002,
+            "input_tokens": 10,
+            "output_tokens": 5,
+            "model": model,
+        }
+
+    monkeypatch.setattr(groq_client, "execute_with_groq", _fake_execute)
+    wrapper = SecureAPIWrapper(create_admin_context(), budget_limit=1.0, response_cache=cache)
+    return wrapper, calls
+
+
+def _audit_events(tmp_path):
+    lines = (tmp_path / "audit.log").read_text().splitlines()
+    return [json.loads(line)["event"] for line in lines]
+
+
+def test_identical_requests_are_served_from_cache_at_zero_cost(monkeypatch, tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache")
+    wrapper, calls = _wrapper(monkeypatch, tmp_path, cache)
+
+    first = wrapper.call_llm("Summarize\r\nthe log", model=MODEL, max_tokens=64, audit_task_id="t1")
+    spent = wrapper.budget.get_spent()
+    second = wrapper.call_llm("Summarize\nthe log  ", model=MODEL, max_tokens=64, audit_task_id="t2")
+
+    assert len(calls) == 1
+    assert second["result"] == first["result"]
+    assert second["cached"] is True
+    assert second["cost"] == 0.0
+    assert second["cached_cost"] == 0.002
+    assert wrapper.budget.get_spent() == spent
+    stats = wrapper.get_stats()
+    assert stats["cache_hits"] == 1
+    assert stats["cache_saved"] == 0.002
+    assert _audit_events(tmp_path) == ["API_CALL_SUCCESS", "API_CALL_CACHE_HIT"]
+
+    # Different sampling settings are different requests.
+    wrapper.call_llm("Summarize\nthe log", model=MODEL, max_tokens=128)
+    assert len(calls) == 2
+
+
+def test_bypass_flag_and_high_temperature_skip_the_cache(monkeypatch, tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache", max_temperature=0.5)
+    wrapper, calls = _wrapper(monkeypatch, tmp_path, cache)
+
+    for _ in range(2):
+        wrapper.call_llm("brainstorm", model=MODEL, temperature=0.9)
+    assert len(calls) == 2
+
+    wrapper.call_llm("brainstorm", model=MODEL, temperature=0.9, seed=7)
+    wrapper.call_llm("brainstorm", model=MODEL, temperature=0.9, seed=7)
+    assert len(calls) == 3
+
+    wrapper.call_llm("brainstorm", model=MODEL, temperature=0.9, seed=7, cache_bypass=True)
+    assert len(calls) == 4
+    assert "cache_bypass" not in calls[-1]
+
+
+def test_cache_expires_entries_and_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path, ttl_seconds=60, max_entries=2)
+    for index, key in enumerate(("a", "b")):
+        cache.put(key, {"result": key})
+        os.utime(tmp_path / f"{key}.json", (1000 + index, 1000 + index))
+
+    assert cache.get("a") == {"result": "a"}  # refreshes "a"
+    cache.put("c", {"result": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+    expired = LLMResponseCache(tmp_path, ttl_seconds=0)
+    entry = json.loads((tmp_path / "a.json").read_text())
+    entry["stored_at"] -= 10
+    (tmp_path / "a.json").write_text(json.dumps(entry))
+    assert expired.get("a") is None
+    assert not (tmp_path / "a.json").exists()
+
+
+def test_cache_hit_is_served_while_the_rate_limit_is_exhausted(monkeypatch, tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache")
+    wrapper, calls = _wrapper(monkeypatch, tmp_path, cache)
+    wrapper.call_llm("status report", model=MODEL)
+
+    monkeypatch.setattr(wrapper.rate_limiter, "wait_time", lambda *_args, **_kwargs: 1e6)
+    cached = wrapper.call_llm("status report", model=MODEL)
+    assert cached["cached"] is True and len(calls) == 1
+    with pytest.raises(PermissionError, match="Rate limit"):
+        wrapper.call_llm("a new question", model=MODEL)
+
+
+def test_puts_under_capacity_do_not_list_the_directory(tmp_path):
+    cache = LLMResponseCache(tmp_path, max_entries=10)
+    scans = []
+    list_entries = cache._list_entries
+    cache._list_entries = lambda: scans.append(1) or list_entries()
+
+    for index in range(10):
+        cache.put(f"k{index}", {"result": index})
+    cache.put("k0", {"result": "again"})  # overwrite: still 10 entries
+    assert len(scans) == 1  # the initial count
+    assert cache.stats()["entries"] == 10
+
+    cache.put("k10", {"result": 10})
+    assert len(scans) == 2
+    assert cache.stats()["entries"] == 9  # evicted to the 90% low-water mark
+    assert cache.stats()["evictions"] == 2
+    assert len(list(tmp_path.glob("*.json"))) == 9
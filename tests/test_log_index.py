@@ -0,0 +1,223 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import worker_runtime as worker
+from vivarium.runtime.budget_ledger import SWARM_ACCOUNT, get_budget_ledger
+from vivarium.runtime.log_index import (
+    ExecutionStatusIndex,
+    JsonlTailer,
+    MtimeJsonCache,
+    SpendAccumulator,
+    compact_execution_log,
+    read_jsonl_tail,
+)
+
+
+def _append(path: Path, *records: dict) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def test_tailer_consumes_only_complete_lines(tmp_path):
+    log = tmp_path / "events.jsonl"
+    _append(log, {"task_id": "a"})
+    with open(log, "a", encoding="utf-8") as f:
+        f.write('{"task_id": "b"')
+
+    tailer = JsonlTailer(log)
+    records, reset = tailer.poll()
+    assert [r["task_id"] for r in records] == ["a"]
+    assert reset is False
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("}\n")
+    records, _ = tailer.poll()
+    assert [r["task_id"] for r in records] == ["b"]
+    assert tailer.poll() == ([], False)
+
+
+def test_tailer_resets_on_truncation(tmp_path):
+    log = tmp_path / "events.jsonl"
+    _append(log, {"task_id": "a"}, {"task_id": "b"})
+    tailer = JsonlTailer(log)
+    tailer.poll()
+
+    log.write_text(json.dumps({"task_id": "c"}) + "\n", encoding="utf-8")
+    records, reset = tailer.poll()
+    assert reset is True
+    assert [r["task_id"] for r in records] == ["c"]
+
+
+def test_tail_reader_reads_backwards_across_blocks(tmp_path):
+    log = tmp_path / "action_log.jsonl"
+    _append(log, *({"i": i, "actor": f"r{i % 3}", "pad": "x" * (i % 17)} for i in range(500)))
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("not json\n\n[1, 2]\n")
+        f.write('{"i": 500, "actor": "r0"')  # half-written record
+
+    for block_size in (7, 64, 65536):
+        tail = read_jsonl_tail(log, 5, block_size=block_size)
+        assert [entry["i"] for entry in tail] == [495, 496, 497, 498, 499]
+        assert [e["i"] for e in read_jsonl_tail(log, 10_000, block_size=block_size)] == list(range(500))
+
+    by_actor = read_jsonl_tail(log, 3, match=lambda e: e["actor"] == "r1", block_size=64)
+    assert [entry["i"] for entry in by_actor] == [493, 496, 499]
+    # The scan window counts every non-empty line, matching or not.
+    windowed = read_jsonl_tail(log, 100, match=lambda e: e["actor"] == "r1", max_scan_lines=9)
+    assert [entry["i"] for entry in windowed] == [496, 499]
+    assert read_jsonl_tail(tmp_path / "missing.jsonl", 5) == []
+
+
+def test_spend_accumulator_resumes_from_snapshot(tmp_path):
+    log = tmp_path / "execution_log.jsonl"
+    _append(log, {"budget_used": 0.25}, {"status": "in_progress"}, {"budget_used": "0.5"})
+
+    first = SpendAccumulator(log)
+    assert first.total() == pytest.approx(0.75)
+    assert first.snapshot_path.exists()
+
+    _append(log, {"budget_used": 0.1})
+    second = SpendAccumulator(log)
+    assert second._tailer.offset > 0
+    assert second.total() == pytest.approx(0.85)
+
+
+def test_spend_accumulator_ignores_snapshot_for_replaced_log(tmp_path):
+    log = tmp_path / "execution_log.jsonl"
+    _append(log, {"budget_used": 2.0})
+    SpendAccumulator(log).total()
+
+    log.unlink()
+    _append(log, {"budget_used": 0.3})
+    assert SpendAccumulator(log).total() == pytest.approx(0.3)
+
+
+def test_mtime_json_cache_rereads_after_change(tmp_path):
+    settings = tmp_path / "settings.json"
+    settings.write_text('{"budget_limit": 1}', encoding="utf-8")
+    cache = MtimeJsonCache()
+    assert cache.read(settings)["budget_limit"] == 1
+
+    settings.write_text('{"budget_limit": 25}', encoding="utf-8")
+    assert cache.read(settings)["budget_limit"] == 25
+    settings.unlink()
+    assert cache.read(settings, default={}) == {}
+
+
+def test_worker_is_halted_reads_shared_budget_ledger(monkeypatch, tmp_path):
+    log = tmp_path / "execution_log.jsonl"
+    kill_switch = tmp_path / "kill_switch.json"
+    ui_settings = tmp_path / "ui_settings.json"
+    ui_settings.write_text('{"budget_limit": 1.0}', encoding="utf-8")
+    monkeypatch.setattr(worker, "EXECUTION_LOG", log)
+    monkeypatch.setattr(worker, "KILL_SWITCH", kill_switch)
+    monkeypatch.setattr(worker, "UI_SETTINGS_FILE", ui_settings)
+    monkeypatch.setenv("VIVARIUM_BUDGET_LEDGER", str(tmp_path / "ledger.sqlite3"))
+
+    # The ledger starts from the execution log's spend history.
+    _append(log, {"task_id": "t1", "budget_used": 0.6})
+    assert worker._is_halted() is False
+
+    # Spend charged by another process (the execution API) halts the resident.
+    get_budget_ledger(tmp_path / "ledger.sqlite3").charge(SWARM_ACCOUNT, 0.5)
+    assert worker._is_halted() is True
+    assert json.loads(kill_switch.read_text(encoding="utf-8"))["halt"] is True
+
+
+def test_status_index_keeps_compact_records_and_resumes_from_snapshot(tmp_path):
+    log = tmp_path / "execution_log.jsonl"
+    _append(
+        log,
+        {"task_id": "t1", "status": "in_progress"},
+        {"task_id": "t1", "status": "completed", "safety_report": {"big": "x" * 1000}, "review_attempt": 1},
+    )
+    index = ExecutionStatusIndex(log, snapshot_interval=0)
+    records, reset = index.poll()
+    assert reset is False and len(records) == 2
+    assert index.tasks()["t1"] == {"task_id": "t1", "status": "completed", "review_attempt": 1}
+
+    snapshot = json.loads((tmp_path / "execution_log.jsonl.status.json").read_text(encoding="utf-8"))
+    assert snapshot["offset"] == log.stat().st_size
+    assert "safety_report" not in json.dumps(snapshot)
+
+    _append(log, {"task_id": "t2", "status": "queued"})
+    resumed = ExecutionStatusIndex(log)
+    assert resumed.loaded_from_snapshot is True
+    records, _ = resumed.poll()
+    assert [r["task_id"] for r in records] == ["t2"]
+    assert set(resumed.tasks()) == {"t1", "t2"}
+
+
+def test_control_panel_latest_statuses_tail_one_shared_index(monkeypatch, tmp_path):
+    from vivarium.runtime import control_panel_app as cp
+
+    log = tmp_path / "execution_log.jsonl"
+    monkeypatch.setattr(cp, "EXECUTION_LOG", log)
+    monkeypatch.setitem(cp._EXECUTION_STATUS_STATE, "index", None)
+    _append(
+        log,
+        {"task_id": "t1", "status": "in_progress"},
+        {"task_id": "t1", "status": "pending_review", "result_summary": "done", "safety_report": {"x": 1}},
+        {"task_id": "t2", "status": "failed", "errors": "boom"},
+    )
+    statuses = cp.latest_statuses(["t1", "t2", "missing"])
+    assert statuses["t1"] == ("pending_review", {"task_id": "t1", "status": "pending_review", "result_summary": "done"})
+    assert statuses["t2"][1]["errors"] == "boom"
+    assert statuses["missing"] == ("", {})
+
+    index = cp._execution_status_index()
+    _append(log, {"task_id": "t1", "status": "approved"})
+    assert cp._latest_execution_status("t1")[0] == "approved"
+    assert cp._execution_status_index() is index
+
+    # The panel's wider records never replace the worker's compact snapshot.
+    index.flush()
+    assert (tmp_path / "execution_log.jsonl.panel_status.json").exists()
+    assert ExecutionStatusIndex(log, snapshot_path=index.snapshot_path).loaded_from_snapshot is False
+
+
+def test_compaction_archives_superseded_events_and_keeps_spend(tmp_path):
+    log = tmp_path / "execution_log.jsonl"
+    _append(
+        log,
+        {"task_id": "t1", "status": "in_progress", "timestamp": "2026-01-02T10:00:00+00:00"},
+        {"task_id": "t1", "status": "requeue", "budget_used": 0.2, "timestamp": "2026-01-02T10:05:00+00:00"},
+        {"task_id": "t2", "status": "completed", "budget_used": 0.1, "timestamp": "2026-01-03T09:00:00+00:00"},
+        {"task_id": "t1", "status": "completed", "budget_used": 0.3, "timestamp": "2026-01-03T10:00:00+00:00"},
+    )
+    spend_before = SpendAccumulator(log, snapshot_path=tmp_path / "spend.json").total()
+
+    stats = compact_execution_log(log, archive_dir=tmp_path / "archive")
+    assert stats["kept"] == 2 and stats["archived"] == 2
+    segment = tmp_path / "archive" / "execution_log.2026-01-02.jsonl"
+    assert [json.loads(line)["status"] for line in segment.read_text(encoding="utf-8").splitlines()] == [
+        "in_progress",
+        "requeue",
+    ]
+
+    index = ExecutionStatusIndex(log, snapshot_path=tmp_path / "status.json")
+    index.poll()
+    assert {k: v["status"] for k, v in index.tasks().items()} == {"t1": "completed", "t2": "completed"}
+    spend_after = SpendAccumulator(log, snapshot_path=tmp_path / "spend2.json").total()
+    assert spend_after == pytest.approx(spend_before)
+
+    assert compact_execution_log(log, archive_dir=tmp_path / "archive")["archived"] == 0
+
+
+def test_worker_read_execution_log_survives_compaction(monkeypatch, tmp_path):
+    log = tmp_path / "execution_log.jsonl"
+    _append(log, {"task_id": "t1", "status": "in_progress"}, {"task_id": "t1", "status": "failed"})
+    monkeypatch.setattr(worker, "EXECUTION_LOG", log)
+    assert worker.read_execution_log()["tasks"]["t1"]["status"] == "failed"
+
+    worker.compact_execution_log_now(archive=False)
+    worker.append_execution_event("t2", "queued")
+    tasks = worker.read_execution_log()["tasks"]
+    assert tasks["t1"]["status"] == "failed"
+    assert tasks["t2"]["status"] == "queued"
@@ -0,0 +1,119 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import resident_onboarding
+from vivarium.runtime import swarm_enrichment
+from vivarium.runtime.prompt_context_cache import PromptContextCache, file_signature
+
+
+def test_cache_hits_until_version_changes_or_invalidated():
+    cache = PromptContextCache()
+    builds = []
+
+    def _build():
+        builds.append(1)
+        return f"value-{len(builds)}"
+
+    assert cache.get("alpha", "self", ("v1",), _build) == "value-1"
+    assert cache.get("alpha", "self", ("v1",), _build) == "value-1"
+    assert cache.get("beta", "self", ("v1",), _build) == "value-2"
+    assert cache.get("alpha", "self", ("v2",), _build) == "value-3"
+
+    assert cache.invalidate(["self"], scope="alpha") == 1
+    assert cache.get("alpha", "self", ("v2",), _build) == "value-4"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["invalidations"] == 1
+    assert stats["sections"]["self"] == {"hits": 1, "misses": 4}
+
+
+def test_cache_is_bounded():
+    cache = PromptContextCache(max_entries=2)
+    for scope in ("a", "b", "c"):
+        cache.get(scope, "s", 0, lambda: scope)
+    assert cache.stats()["entries"] == 2
+    assert cache.get("a", "s", 0, lambda: "rebuilt") == "rebuilt"
+
+
+def test_file_signature_tracks_rewrites(tmp_path):
+    target = tmp_path / "state.json"
+    assert file_signature(target) == (None,)
+    target.write_text("{}", encoding="utf-8")
+    first = file_signature(target)
+    target.write_text('{"a": 1}', encoding="utf-8")
+    assert file_signature(target) != first
+
+
+def _seed_line(context: str) -> str:
+    return next(line for line in context.splitlines() if "creativity_seed=" in line)
+
+
+def test_enrichment_context_is_cached_per_section(tmp_path):
+    enrichment = swarm_enrichment.EnrichmentSystem(workspace=tmp_path)
+    enrichment._save_free_time_balances({"identity_alpha": {"tokens": 40, "journal_tokens": 5}})
+
+    # The first render materializes journal rollups, so warm up twice.
+    enrichment.get_enrichment_context("identity_alpha", "Alpha")
+    first = enrichment.get_enrichment_context("identity_alpha", "Alpha")
+    misses = enrichment.context_cache_stats()["misses"]
+    second = enrichment.get_enrichment_context("identity_alpha", "Alpha")
+    stats = enrichment.context_cache_stats()
+
+    assert stats["misses"] == misses
+    assert stats["hits"] >= 7
+    # Only the creativity seed differs between cached renders.
+    assert first.replace(_seed_line(first), "") == second.replace(_seed_line(second), "")
+    assert "free_time=40/" in second
+
+
+def test_enrichment_context_rebuilds_after_writes(tmp_path):
+    enrichment = swarm_enrichment.EnrichmentSystem(workspace=tmp_path)
+    enrichment._save_free_time_balances({"identity_alpha": {"tokens": 40}})
+    assert "free_time=40/" in enrichment.get_enrichment_context("identity_alpha", "Alpha")
+
+    # In-process write method invalidates explicitly.
+    enrichment._save_free_time_balances({"identity_alpha": {"tokens": 41}})
+    assert "free_time=41/" in enrichment.get_enrichment_context("identity_alpha", "Alpha")
+
+    # Out-of-process write is caught by the file signature.
+    enrichment.free_time_file.write_text(json.dumps({"identity_alpha": {"tokens": 7}}), encoding="utf-8")
+    stat = enrichment.free_time_file.stat()
+    os.utime(enrichment.free_time_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert "free_time=7/" in enrichment.get_enrichment_context("identity_alpha", "Alpha")
+
+
+def test_wakeup_context_is_cached_until_state_changes():
+    identity = resident_onboarding.IdentityTemplate(
+        identity_id="identity_cache_test",
+        name="Cache",
+        summary="testing",
+    )
+    ctx = resident_onboarding.ResidentContext(
+        resident_id="resident_1",
+        identity=identity,
+        day_count=1,
+        cycle_id=1,
+        wallet={"free_time": 3, "journal": 1},
+        pre_identity_summary="",
+        dream_hint="tests",
+        notifications=[],
+        market_hint="quiet",
+    )
+    cache = resident_onboarding.WAKEUP_CONTEXT_CACHE
+    before = cache.stats()["sections"].get("wakeup", {"hits": 0, "misses": 0})
+
+    first = ctx.apply_to_prompt("task one")
+    ctx.apply_to_prompt("task two")
+    after = cache.stats()["sections"]["wakeup"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+    ctx.wallet["free_time"] = 9
+    assert "9 free time" in ctx.build_wakeup_context()
+    assert "3 free time" in first
@@ -0,0 +1,160 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime.queue_store import (
+    JsonQueueBackend,
+    QueueBackend,
+    SqliteQueueBackend,
+    get_queue_backend,
+    task_shard_key,
+)
+from vivarium.runtime.runtime_contract import validate_queue_contract
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, tmp_path):
+    queue_file = tmp_path / "queue.json"
+    if request.param == "json":
+        return JsonQueueBackend(queue_file)
+    return SqliteQueueBackend(tmp_path / "queue.sqlite3", export_path=queue_file)
+
+
+def test_backend_contract_is_abstract():
+    with pytest.raises(TypeError):
+        QueueBackend()
+
+
+def test_backend_round_trips_normalized_queue(backend):
+    added = backend.add_tasks([{"id": "t1", "prompt": "one"}, {"id": "t2", "prompt": "two"}])
+    assert added == ["t1", "t2"]
+
+    queue = backend.read()
+    assert validate_queue_contract(queue) == []
+    assert [t["id"] for t in queue["tasks"]] == ["t1", "t2"]
+    assert queue["tasks"][0]["status"] == "pending"
+    assert backend.export() == queue
+
+
+def test_apply_outcome_moves_and_keeps_position(backend):
+    backend.add_tasks([{"id": "t1"}, {"id": "t2"}, {"id": "t3"}])
+
+    assert backend.apply_outcome("t2", "requeue") is True
+    assert [t["id"] for t in backend.read()["tasks"]] == ["t1", "t2", "t3"]
+
+    assert backend.apply_outcome("t1", "approved") is True
+    assert backend.apply_outcome("t3", "failed") is True
+    assert backend.apply_outcome("missing", "failed") is False
+
+    queue = backend.read()
+    assert [t["id"] for t in queue["tasks"]] == ["t2"]
+    assert queue["completed"][0]["id"] == "t1" and queue["completed"][0]["status"] == "completed"
+    assert queue["failed"][0]["id"] == "t3" and queue["failed"][0]["status"] == "failed"
+
+
+def test_claim_is_exclusive(backend):
+    backend.add_tasks([{"id": "t1"}])
+    assert backend.claim("t1", "resident_a") is True
+    assert backend.claim("t1", "resident_b") is False
+    task = backend.get_task("t1")
+    assert task["status"] == "in_progress"
+    assert task["claimed_by"] == "resident_a"
+
+
+def test_indexed_lookups(backend):
+    backend.add_tasks([
+        {"id": "t1", "identity_id": "alpha"},
+        {"id": "t2", "resident_identity": "beta"},
+        {"id": "t3", "identity_id": "alpha", "status": "pending_review"},
+    ])
+    assert [t["id"] for t in backend.tasks_for_identity("alpha")] == ["t1", "t3"]
+    assert [t["id"] for t in backend.tasks_by_status("pending_review")] == ["t3"]
+    shard_ids = {t["id"] for t in backend.tasks_for_shard(task_shard_key("t2") % 4, 4)}
+    assert "t2" in shard_ids
+
+
+def test_concurrent_adds_do_not_lose_updates(backend):
+    def _worker(offset: int) -> None:
+        for i in range(10):
+            backend.add_tasks([{"id": f"w{offset}-{i}"}])
+
+    threads = [threading.Thread(target=_worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(backend.read()["tasks"]) == 40
+
+
+def test_sqlite_backend_exports_and_reimports_queue_json(tmp_path):
+    queue_file = tmp_path / "queue.json"
+    backend = SqliteQueueBackend(tmp_path / "queue.sqlite3", export_path=queue_file)
+    backend.add_tasks([{"id": "t1"}])
+    backend.flush_export()
+    exported = json.loads(queue_file.read_text(encoding="utf-8"))
+    assert [t["id"] for t in exported["tasks"]] == ["t1"]
+
+    exported["tasks"].append({"id": "hand_edit"})
+    queue_file.write_text(json.dumps(exported), encoding="utf-8")
+    assert [t["id"] for t in backend.read()["tasks"]] == ["t1", "hand_edit"]
+
+
+def test_sqlite_export_is_debounced(tmp_path):
+    queue_file = tmp_path / "queue.json"
+    backend = SqliteQueueBackend(tmp_path / "queue.sqlite3", export_path=queue_file, export_interval_seconds=60)
+    backend.add_tasks([{"id": "t1"}, {"id": "t2"}])
+    backend.flush_export()
+
+    backend.claim("t1", "resident_a")
+    backend.apply_outcome("t2", "approved")
+    exported = json.loads(queue_file.read_text(encoding="utf-8"))
+    assert [t["status"] for t in exported["tasks"]] == ["pending", "pending"]  # next export not due yet
+    assert backend.read()["completed"][0]["id"] == "t2"
+
+    backend.flush_export()
+    exported = json.loads(queue_file.read_text(encoding="utf-8"))
+    assert [t["id"] for t in exported["tasks"]] == ["t1"] and exported["completed"][0]["id"] == "t2"
+
+
+def test_sqlite_transaction_writes_only_changed_rows(tmp_path):
+    backend = SqliteQueueBackend(tmp_path / "queue.sqlite3", export_interval_seconds=60)
+    backend.add_tasks([{"id": f"t{i}"} for i in range(50)])
+    with backend.transaction():
+        pass  # first transaction stores the queue header
+    conn = backend._conn()
+
+    before = conn.total_changes
+    with backend.transaction() as queue:
+        queue["tasks"][10]["note"] = "edited"
+        del queue["tasks"][20]
+        queue["tasks"].append({"id": "t50"})
+    assert conn.total_changes - before == 3
+
+    assert backend.get_task("t10")["note"] == "edited"
+    assert [t["id"] for t in backend.open_queue()["tasks"]][-3:] == ["t48", "t49", "t50"]
+    assert backend.open_queue()["completed"] == []
+
+
+def test_takeover_claim_reclaims_in_progress_task(backend):
+    backend.add_tasks([{"id": "t1"}])
+    assert backend.claim("t1", "resident_a")
+    assert backend.claim("t1", "resident_b") is False
+    assert backend.claim("t1", "resident_b", takeover=True)
+    assert backend.get_task("t1")["claimed_by"] == "resident_b"
+    backend.apply_outcome("t1", "approved")
+    assert backend.claim("t1", "resident_c", takeover=True) is False
+
+
+def test_get_queue_backend_selects_kind_from_env(monkeypatch, tmp_path):
+    queue_file = tmp_path / "queue.json"
+    monkeypatch.setenv("VIVARIUM_QUEUE_BACKEND", "sqlite")
+    assert isinstance(get_queue_backend(queue_file), SqliteQueueBackend)
+    monkeypatch.setenv("VIVARIUM_QUEUE_BACKEND", "json")
+    assert isinstance(get_queue_backend(queue_file), JsonQueueBackend)
+    with pytest.raises(ValueError):
+        get_queue_backend(queue_file, kind="redis")
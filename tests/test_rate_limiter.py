@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import rate_limiter as rate_limiter_module
+from vivarium.runtime.rate_limiter import (
+    SharedRateLimiter,
+    load_model_rpm_limits,
+    parse_reset_seconds,
+)
+from vivarium.runtime.secure_api_wrapper import SecureAPIWrapper, create_admin_context
+
+MODEL = "llama-3.1-8b-instant"
+
+
+def _limiter(tmp_path, rpm=60, **kwargs):
+    return SharedRateLimiter(tmp_path / "limits.json", rpm_limits={MODEL: rpm}, **kwargs)
+
+
+def _acquire_in_child(state_file, results):
+    limiter = SharedRateLimiter(Path(state_file), rpm_limits={MODEL: 3})
+    results.put(limiter.acquire(MODEL, max_wait=0))
+
+
+def test_rpm_comes_from_model_specs():
+    limits = load_model_rpm_limits()
+    limiter = SharedRateLimiter(Path("unused.json"), rpm_limits=limits, default_rpm=7)
+    # Spec keys prefix the model id with a display name.
+    assert limiter.rpm_for("openai/gpt-oss-120b") == 1000
+    assert limiter.rpm_for(MODEL) == 1000
+    assert limiter.rpm_for("not-a-model") == 7
+
+
+def test_requests_per_minute_bucket_refills(tmp_path):
+    limiter = _limiter(tmp_path, rpm=2)
+    assert limiter.acquire(MODEL, max_wait=0)
+    assert limiter.acquire(MODEL, max_wait=0)
+    assert not limiter.acquire(MODEL, max_wait=0)
+    assert 0 < limiter.wait_time(MODEL) <= 30.0
+    assert limiter.stats()["denied"] == 1
+
+    # Other models have their own quota.
+    assert limiter.acquire("openai/gpt-oss-120b", max_wait=0)
+
+
+def test_quota_is_shared_across_processes(tmp_path):
+    state_file = tmp_path / "limits.json"
+    results = multiprocessing.Queue()
+    children = [
+        multiprocessing.Process(target=_acquire_in_child, args=(str(state_file), results))
+        for _ in range(5)
+    ]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join(timeout=10)
+    granted = sorted(results.get(timeout=5) for _ in children)
+    assert granted == [False, False, True, True, True]
+
+
+def test_token_limit_is_learned_from_headers(monkeypatch, tmp_path):
+    # Freeze the limiter's clock: buckets refill at tpm/60 tokens per second.
+    frozen = time.time()
+    monkeypatch.setattr(rate_limiter_module, "time", SimpleNamespace(time=lambda: frozen, sleep=time.sleep))
+    limiter = _limiter(tmp_path)
+    assert limiter.acquire(MODEL, tokens=50_000, max_wait=0)  # no TPM known yet
+
+    limiter.observe(MODEL, {"X-RateLimit-Limit-Tokens": "6000", "x-ratelimit-remaining-tokens": "1000"})
+    bucket = limiter.snapshot()[MODEL]
+    assert bucket["tpm"] == 6000
+    assert bucket["tokens"] == pytest.approx(1000)
+    assert not limiter.acquire(MODEL, tokens=3000, max_wait=0)
+    assert limiter.acquire(MODEL, tokens=500, max_wait=0)
+
+    # Actual usage above the estimate is charged after the call.
+    limiter.observe(MODEL, estimated_tokens=100, actual_tokens=600)
+    assert limiter.snapshot()[MODEL]["tokens"] < 100
+
+
+def test_retry_after_blocks_the_model(tmp_path):
+    limiter = _limiter(tmp_path)
+    limiter.observe(MODEL, {"retry-after": "20"})
+    assert limiter.wait_time(MODEL) > 19
+    assert not limiter.acquire(MODEL, max_wait=1)
+
+    # An exhausted daily request quota blocks until its reset.
+    limiter.observe("openai/gpt-oss-20b", {
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2m59.56s",
+    })
+    assert limiter.wait_time("openai/gpt-oss-20b") > 170
+
+
+def test_acquire_waits_for_refill(tmp_path):
+    limiter = _limiter(tmp_path, rpm=600)  # one request per 0.1s
+    while limiter.acquire(MODEL, max_wait=0):
+        pass
+    started = time.time()
+    assert limiter.acquire(MODEL, max_wait=2)
+    assert time.time() - started > 0
+    assert limiter.stats()["waited_seconds"] > 0
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [("7.66s", 7.66), ("2m59.56s", 179.56), ("500ms", 0.5), ("12", 12.0), ("1h", 3600.0), ("", None), (None, None)],
+)
+def test_parse_reset_seconds(value, seconds):
+    parsed = parse_reset_seconds(value)
+    assert parsed == pytest.approx(seconds) if seconds is not None else parsed is None
+
+
+def test_wrapper_rejects_when_quota_will_not_free_in_time(tmp_path):
+    limiter = _limiter(tmp_path, max_wait_seconds=1.0)
+    limiter.observe(MODEL, {"retry-after": "30"})
+    wrapper = SecureAPIWrapper(create_admin_context(), budget_limit=1.0, rate_limiter=limiter, response_cache=None)
+    events = []
+    wrapper.auditor.log = events.append
+
+    with pytest.raises(PermissionError, match="Rate limit exceeded"):
+        wrapper.call_llm("hello", model=MODEL)
+    assert events[-1]["event"] == "RATE_LIMITED"
+    assert events[-1]["retry_after"] > 1.0
+
+
+def test_legacy_swarm_rate_limit_maps_to_default_rpm_with_a_warning():
+    env = {k: v for k, v in os.environ.items() if k != "VIVARIUM_RATE_LIMIT_DEFAULT_RPM"}
+    env["SWARM_RATE_LIMIT"] = "12"
+    proc = subprocess.run(
+        [sys.executable, "-c", "from vivarium.runtime import config; print(config.RATE_LIMIT_DEFAULT_RPM)"],
+        cwd=Path(__file__).parent.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.strip() == "12"
+    assert "SWARM_RATE_LIMIT is deprecated" in proc.stderr
+
+
+def test_wrapper_rate_limit_argument_is_deprecated(tmp_path):
+    limiter = _limiter(tmp_path)
+    with pytest.warns(DeprecationWarning, match="rate_limit"):
+        wrapper = SecureAPIWrapper(create_admin_context(), rate_limit=60, rate_limiter=limiter, response_cache=None)
+    assert wrapper.rate_limiter is limiter
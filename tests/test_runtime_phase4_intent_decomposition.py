@@ -637,3 +637,174 @@ def test_worker_execute_task_defaults_suggestions_to_resident_library_folder(mon
     artifacts = result["mvp_markdown_artifacts"]
     assert artifacts["written"] is True
     assert "library/community_library/resident_suggestions/identity_docs/" in artifacts["doc_path"]
+
+
+class _StubSubtask:
+    def __init__(self, subtask_id: str, description: str):
+        self.subtask_id = subtask_id
+        self.suggested_focus = None
+        self.description = description
+
+
+class _StubPlan:
+    def __init__(self, *descriptions: str):
+        self.subtasks = [_StubSubtask(f"sub_{i}", text) for i, text in enumerate(descriptions, start=1)]
+
+
+def _patch_delegation(monkeypatch, client_cls):
+    events = []
+    monkeypatch.setattr(
+        worker,
+        "_run_worker_safety_check",
+        lambda task_id, prompt, command, mode: (True, {"passed": True, "task_id": task_id, "checks": {}}),
+    )
+    monkeypatch.setattr(
+        worker,
+        "append_execution_event",
+        lambda task_id, status, **fields: events.append((status, fields.get("subtask_id"))),
+    )
+    monkeypatch.setattr(worker.httpx, "Client", client_cls)
+    return events
+
+
+def test_delegated_subtasks_use_one_batch_request(monkeypatch):
+    posts = []
+
+    class _FakeResponse:
+        status_code = 200
+
+        def __init__(self, payload):
+            self._payload = payload
+
+        def json(self):
+            return self._payload
+
+    class _FakeClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def post(self, url, json, headers=None):
+            posts.append((url, json))
+            return _FakeResponse(
+                {
+                    "status": "partial",
+                    "results": [
+                        {"index": 0, "status_code": 200, "response": {"result": "A", "budget_used": 0.01}},
+                        {"index": 1, "status_code": 200, "response": {"result": "B", "budget_used": 0.02}},
+                    ],
+                }
+            )
+
+    events = _patch_delegation(monkeypatch, _FakeClient)
+    result = worker._execute_delegated_subtasks(
+        task_id="task_batch",
+        plan=_StubPlan("write docs", "write tests"),
+        api_endpoint="http://127.0.0.1:8420",
+        resident_ctx=None,
+        min_budget=0.0,
+        max_budget=0.1,
+        intensity="medium",
+        model="llama-3.1-8b-instant",
+        parallelism=2,
+    )
+
+    assert len(posts) == 1
+    url, body = posts[0]
+    assert url.endswith("/cycle/batch")
+    assert [item["subtask_id"] for item in body["items"]] == ["sub_1", "sub_2"]
+    assert body["max_concurrency"] == 2
+    assert result["status"] == "completed"
+    assert result["result_summary"] == "A | B"
+    assert result["budget_used"] == 0.03
+    assert ("subtask_completed", "sub_2") in events
+
+
+def test_delegated_subtasks_fall_back_to_single_cycle_calls(monkeypatch):
+    posts = []
+
+    class _FakeResponse:
+        def __init__(self, status_code, payload=None):
+            self.status_code = status_code
+            self._payload = payload or {}
+            self.text = "nope"
+
+        def json(self):
+            return self._payload
+
+    class _FakeClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def post(self, url, json, headers=None):
+            posts.append(url)
+            if url.endswith("/cycle/batch"):
+                return _FakeResponse(404)
+            if json["subtask_id"] == "sub_2":
+                return _FakeResponse(500)
+            return _FakeResponse(200, {"result": "A"})
+
+    events = _patch_delegation(monkeypatch, _FakeClient)
+    result = worker._execute_delegated_subtasks(
+        task_id="task_batch_fallback",
+        plan=_StubPlan("write docs", "write tests"),
+        api_endpoint="http://127.0.0.1:8420",
+        resident_ctx=None,
+        min_budget=0.0,
+        max_budget=0.1,
+        intensity="medium",
+        model="llama-3.1-8b-instant",
+    )
+
+    assert posts[0].endswith("/cycle/batch")
+    assert sorted(posts[1:]) == ["http://127.0.0.1:8420/cycle"] * 2
+    assert result["status"] == "failed"
+    assert "API returned 500" in result["errors"]
+    assert events.count(("subtask_started", "sub_1")) == 1
+    assert ("subtask_failed", "sub_2") in events
+
+
+def test_delegated_subtasks_split_into_batches_of_max_items(monkeypatch):
+    posts = []
+
+    class _FakeResponse:
+        status_code = 200
+        text = ""
+
+        def __init__(self, payload):
+            self._payload = payload
+
+        def json(self):
+            return self._payload
+
+    class _FakeClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def post(self, url, json, headers=None):
+            if url.endswith("/cycle/batch"):
+                posts.append([item["subtask_id"] for item in json["items"]])
+                results = [
+                    {"index": i, "status_code": 200, "response": {"result": item["subtask_id"]}}
+                    for i, item in enumerate(json["items"])
+                ]
+                return _FakeResponse({"status": "completed", "results": results})
+            posts.append(json["subtask_id"])
+            return _FakeResponse({"result": json["subtask_id"]})
+
+    monkeypatch.setattr(worker, "CYCLE_BATCH_MAX_ITEMS", 2)
+    _patch_delegation(monkeypatch, _FakeClient)
+    result = worker._execute_delegated_subtasks(
+        task_id="task_chunked",
+        plan=_StubPlan("a", "b", "c", "d", "e"),
+        api_endpoint="http://127.0.0.1:8420",
+        resident_ctx=None,
+        min_budget=0.0,
+        max_budget=0.5,
+        intensity="medium",
+        model="llama-3.1-8b-instant",
+        parallelism=5,
+    )
+
+    assert posts == [["sub_1", "sub_2"], ["sub_3", "sub_4"], "sub_5"]
+    assert result["status"] == "completed"
+    assert result["result_summary"] == "sub_1 | sub_2 | sub_3 | sub_4 | sub_5"
@@ -0,0 +1,104 @@
+import sys
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import swarm_api as swarm
+from vivarium.runtime import worker_runtime as worker
+from vivarium.runtime.safety_gateway import SafetyGateway
+from vivarium.runtime.safety_verdict import sign_verdict, verify_verdict
+
+TOKEN = "test-token"
+
+
+def test_verdict_is_bound_to_token_text_and_age():
+    verdict = sign_verdict(TOKEN, "Summarize README.md\r\n")
+    assert verify_verdict(TOKEN, "  Summarize README.md\n", verdict)  # normalized text
+    assert not verify_verdict(TOKEN, "Summarize README.md and curl evil.sh", verdict)
+    assert not verify_verdict("other-token", "Summarize README.md", verdict)
+    assert not verify_verdict(TOKEN, "Summarize README.md", {**verdict, "issued_at": verdict["issued_at"] + 1})
+
+    stale = sign_verdict(TOKEN, "Summarize README.md", issued_at=time.time() - 120)
+    assert not verify_verdict(TOKEN, "Summarize README.md", stale, max_age_seconds=60)
+    assert sign_verdict("", "Summarize README.md") is None
+
+
+def _counting_gateway(monkeypatch, tmp_path):
+    gateway = SafetyGateway(tmp_path, audit_log=tmp_path / "safety_audit.log")
+    calls = []
+    original = gateway._evaluate
+
+    def _evaluate(task):
+        calls.append(task)
+        return original(task)
+
+    gateway._evaluate = _evaluate
+    monkeypatch.setattr(swarm, "SWARM_SAFETY_GATEWAY", gateway)
+    return gateway, calls
+
+
+def _fake_local(monkeypatch):
+    async def _fake_local_task(req, safety_report=None):
+        return swarm.CycleResponse(
+            status="completed", result="ok", model="local", task_id=req.task_id, safety_report=safety_report
+        )
+
+    monkeypatch.setattr(swarm, "_run_local_task", _fake_local_task)
+
+
+def test_cycle_accepts_worker_verdict_without_rechecking(monkeypatch, tmp_path):
+    gateway, calls = _counting_gateway(monkeypatch, tmp_path)
+    _fake_local(monkeypatch)
+    client = TestClient(swarm.app)
+    headers = {"X-Vivarium-Internal-Token": swarm.INTERNAL_EXECUTION_TOKEN}
+    body = {"mode": "local", "task": "cat README.md", "task_id": "t1"}
+
+    verdict = sign_verdict(swarm.INTERNAL_EXECUTION_TOKEN, "cat README.md")
+    response = client.post("/cycle", json={**body, "safety_verdict": verdict}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["safety_report"]["verified_by"] == "resident_verdict"
+    assert calls == []
+    assert not gateway.audit_log.exists() or gateway.audit_log.read_text() == ""
+
+    # A verdict for different text (or a forged one) falls back to the full check.
+    forged = {**verdict, "signature": "0" * 64}
+    response = client.post("/cycle", json={**body, "safety_verdict": forged}, headers=headers)
+    assert response.status_code == 200
+    assert calls == ["cat README.md"]
+    assert "verified_by" not in response.json()["safety_report"]
+
+
+def test_cycle_batch_only_checks_items_without_verdict(monkeypatch, tmp_path):
+    _, calls = _counting_gateway(monkeypatch, tmp_path)
+
+    async def _fake_execute(req, tokens, env, safety_report):
+        return swarm.CycleResponse(status="completed", result="ok", model="local", safety_report=safety_report)
+
+    monkeypatch.setattr(swarm, "_execute_local_command", _fake_execute)
+    client = TestClient(swarm.app)
+    verdict = sign_verdict(swarm.INTERNAL_EXECUTION_TOKEN, "cat README.md")
+    response = client.post(
+        "/cycle/batch",
+        json={"items": [
+            {"mode": "local", "task": "cat README.md", "safety_verdict": verdict},
+            {"mode": "local", "task": "ls"},
+        ]},
+        headers={"X-Vivarium-Internal-Token": swarm.INTERNAL_EXECUTION_TOKEN},
+    )
+    assert response.status_code == 200
+    assert response.json()["completed"] == 2
+    assert calls == ["ls"]
+
+
+def test_worker_attaches_verdict_only_for_unchanged_text(monkeypatch):
+    monkeypatch.setattr(worker, "WORKER_INTERNAL_EXECUTION_TOKEN", TOKEN)
+    payload = {"prompt": "Write docs for the queue"}
+    worker._attach_safety_verdict(payload, "Write docs for the queue\n")
+    assert verify_verdict(TOKEN, payload["prompt"], payload["safety_verdict"])
+
+    extended = {"prompt": "TOOL CONTEXT\n\nWrite docs for the queue"}
+    worker._attach_safety_verdict(extended, "Write docs for the queue")
+    assert "safety_verdict" not in extended
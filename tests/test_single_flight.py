@@ -0,0 +1,151 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import swarm_api as swarm
+from vivarium.runtime.groq_client import GroqInferenceEngine
+from vivarium.runtime.single_flight import SingleFlight
+
+MODEL = "llama-3.1-8b-instant"
+
+
+def _run_threads(count, target):
+    results = [None] * count
+
+    def _worker(index):
+        results[index] = target()
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def _upstream():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "value"
+
+    def _call():
+        return flights.do("same", _upstream)
+
+    def _release_when_all_joined():
+        while flights.stats()["requests"] < 4:
+            time.sleep(0.005)
+        release.set()
+
+    threading.Thread(target=_release_when_all_joined).start()
+    results = _run_threads(4, _call)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert {value for value, _ in results} == {"value"}
+    stats = flights.stats()
+    assert (stats["upstream_calls"], stats["saved_calls"], stats["in_flight"]) == (1, 3, 0)
+
+    # Nothing is remembered once the flight lands.
+    assert flights.do("same", lambda: "fresh") == ("fresh", False)
+
+
+def test_followers_receive_the_leaders_exception():
+    flights = SingleFlight()
+
+    async def _boom():
+        await asyncio.sleep(0.05)
+        raise ValueError("upstream failed")
+
+    async def _run():
+        return await asyncio.gather(
+            *(flights.do_async("k", _boom) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    outcomes = asyncio.run(_run())
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert flights.stats()["saved_calls"] == 2
+
+
+class _Auditor:
+    def __init__(self):
+        self.events = []
+
+    def log(self, event):
+        self.events.append(event)
+
+
+class _SlowWrapper:
+    def __init__(self):
+        self.calls = []
+        self.auditor = _Auditor()
+
+    def estimate_cost_for_request(self, prompt, model):
+        return 0.0
+
+    def call_llm(self, **kwargs):
+        self.calls.append(kwargs["prompt"])
+        time.sleep(0.2)
+        return {"result": f"done:{kwargs['prompt']}", "model": kwargs["model"], "cost": 0.004}
+
+
+def test_identical_cycles_in_flight_are_coalesced(monkeypatch):
+    wrapper = _SlowWrapper()
+    monkeypatch.setattr(swarm, "SECURE_API_WRAPPER", wrapper)
+    monkeypatch.setattr(swarm, "validate_config", lambda require_groq_key=False: None)
+    monkeypatch.setattr(swarm, "CYCLE_FLIGHTS", SingleFlight())
+
+    async def _run_all():
+        requests = [
+            swarm.CycleRequest(prompt="review the diff", model=MODEL, task_id=f"t{i}")
+            for i in range(3)
+        ] + [swarm.CycleRequest(prompt="something else", model=MODEL, task_id="t3")]
+        return await asyncio.gather(*(swarm._run_groq_task(r) for r in requests))
+
+    responses = asyncio.run(_run_all())
+
+    assert sorted(wrapper.calls) == ["review the diff", "something else"]
+    assert [r.result for r in responses[:3]] == ["done:review the diff"] * 3
+    assert [r.task_id for r in responses] == ["t0", "t1", "t2", "t3"]
+    assert sorted(r.budget_used for r in responses[:3]) == [0.0, 0.0, 0.004]
+    coalesced = [e for e in wrapper.auditor.events if e["event"] == "API_CALL_COALESCED"]
+    assert len(coalesced) == 2
+    assert coalesced[0]["saved_cost"] == 0.004
+
+    stats = TestClient(swarm.app).get("/cycle/stats").json()
+    assert stats["cycle_coalescing"]["saved_calls"] == 2
+    assert stats["cycle_coalescing"]["upstream_calls"] == 2
+
+
+def test_groq_engine_coalesces_identical_requests(monkeypatch):
+    engine = GroqInferenceEngine.__new__(GroqInferenceEngine)
+    engine._flights = SingleFlight()
+    calls = []
+
+    def _upstream(*args, **kwargs):
+        calls.append(args)
+        time.sleep(0.2)
+        return {"result": "ok", "cost": 0.01, "total_cost_usd": 0.01}
+
+    monkeypatch.setattr(engine, "_execute_uncoalesced", _upstream)
+    results = _run_threads(3, lambda: engine.execute("same prompt", model=MODEL, max_tokens=32))
+
+    assert len(calls) == 1
+    assert sorted(r["cost"] for r in results) == [0.0, 0.0, 0.01]
+    assert sum(1 for r in results if r.get("coalesced")) == 2
+
+    # Streaming requests are never shared.
+    engine.execute("same prompt", model=MODEL, stream_callback=lambda text: True)
+    assert len(calls) == 2
+    assert engine._flights.stats()["saved_calls"] == 2
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import worker_runtime
+from vivarium.runtime.task_leases import LeaseTable
+
+
+def test_lease_is_exclusive_until_released(tmp_path):
+    table = LeaseTable(tmp_path / "leases.json")
+    assert table.acquire("t1", "resident_a") is True
+    assert table.acquire("t1", "resident_b") is False
+    assert table.leased_task_ids() == {"t1"}
+
+    table.release("t1", "resident_b")
+    assert table.leased_task_ids() == {"t1"}
+    table.release("t1", "resident_a")
+    assert table.leased_task_ids() == set()
+    assert table.acquire("t1", "resident_b") is True
+
+
+def test_expired_lease_is_reclaimed_and_renew_extends(tmp_path):
+    table = LeaseTable(tmp_path / "leases.json", ttl_seconds=1)
+    assert table.acquire("t1", "resident_a") is True
+    first_expiry = table.get("t1")["expires_at"]
+    time.sleep(0.05)
+    assert table.renew() == {"t1"}
+    assert table.get("t1")["expires_at"] > first_expiry
+
+    data = json.loads((tmp_path / "leases.json").read_text(encoding="utf-8"))
+    data["leases"]["t1"]["expires_at"] = time.time() - 1
+    (tmp_path / "leases.json").write_text(json.dumps(data), encoding="utf-8")
+    assert table.leased_task_ids() == set()
+    assert LeaseTable(tmp_path / "leases.json").acquire("t1", "resident_b") is True
+
+
+def test_lease_of_dead_process_is_reclaimed_immediately(tmp_path):
+    table_path = tmp_path / "leases.json"
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[2]);"
+        "from vivarium.runtime.task_leases import LeaseTable;"
+        "assert LeaseTable(sys.argv[1], ttl_seconds=3600).acquire('t1', 'crashed')"
+    )
+    subprocess.run(
+        [sys.executable, "-c", script, str(table_path), str(Path(__file__).parent.parent)],
+        check=True,
+    )
+    lease = json.loads(table_path.read_text(encoding="utf-8"))["leases"]["t1"]
+    assert lease["pid"] != os.getpid()
+
+    table = LeaseTable(table_path)
+    assert table.leased_task_ids() == set()
+    assert table.acquire("t1", "resident_b") is True
+
+
+def test_worker_lock_helpers_use_lease_table(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker_runtime, "LOCKS_DIR", tmp_path)
+    assert worker_runtime.try_acquire_lock("task-1") is True
+    assert worker_runtime.try_acquire_lock("task-1") is False
+    assert worker_runtime.leased_task_ids() == {"task-1"}
+    worker_runtime.release_lock("task-1")
+    assert worker_runtime.leased_task_ids() == set()
+    assert not list(tmp_path.glob("task-1*"))
+
+
+def test_heartbeat_stops_with_last_release_and_restarts_for_new_lease(tmp_path):
+    table = LeaseTable(tmp_path / "leases.json", ttl_seconds=30)
+    assert table.acquire("t1", "resident_a") is True
+    assert table.acquire("t2", "resident_a") is True
+    heartbeat = table._heartbeat
+    assert heartbeat is not None and heartbeat.is_alive()
+
+    table.release("t1", "resident_a")
+    assert table._heartbeat is heartbeat  # t2 still needs renewing
+    table.release("t2", "resident_a")
+    heartbeat.join(2.0)
+    assert not heartbeat.is_alive()
+    assert table._heartbeat is None
+
+    assert table.acquire("t3", "resident_a") is True
+    assert table._heartbeat is not None and table._heartbeat.is_alive()
+    table.stop_heartbeat()
+    assert table._heartbeat is None
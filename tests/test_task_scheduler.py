@@ -0,0 +1,107 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import worker_runtime
+from vivarium.runtime.task_scheduler import DependencyIndex
+
+
+def _ids(index: DependencyIndex):
+    return [t["id"] for t in index.ready_tasks()]
+
+
+def test_ready_set_follows_dependency_events():
+    index = DependencyIndex()
+    index.sync_queue([
+        {"id": "parent", "depends_on": ["a", "b"]},
+        {"id": "a"},
+        {"id": "b"},
+    ])
+    assert _ids(index) == ["a", "b"]
+    assert index.dependents_of("a") == {"parent"}
+
+    index.observe("a", "completed")
+    assert _ids(index) == ["b"]
+    index.observe("b", "pending_review")
+    assert _ids(index) == ["parent"]
+
+    index.observe("b", "requeue")
+    assert _ids(index) == ["b"]
+
+
+def test_phase4_skip_dependency_counts_as_satisfied():
+    index = DependencyIndex()
+    index.sync_queue([{"id": "parent", "depends_on": ["sub"]}, {"id": "sub"}])
+    assert _ids(index) == ["sub"]
+
+    index.sync_queue([{"id": "parent", "depends_on": ["sub"]}, {"id": "sub", "phase4_skip": True}])
+    assert _ids(index) == ["parent"]
+
+
+def test_sync_queue_tracks_changed_dependencies_and_removals():
+    index = DependencyIndex()
+    index.sync_queue([{"id": "t1"}, {"id": "t2"}])
+    index.sync_queue([{"id": "t1", "depends_on": ["t2"]}, {"id": "t2"}])
+    assert _ids(index) == ["t2"]
+
+    index.sync_queue([{"id": "t1", "depends_on": ["t2"]}])
+    assert _ids(index) == []
+    assert not index.is_ready("t2")
+
+    index.reset_statuses({"t2": "approved"})
+    assert _ids(index) == ["t1"]
+
+
+def test_find_and_execute_task_only_runs_ready_tasks(monkeypatch, tmp_path):
+    log_path = tmp_path / "execution_log.jsonl"
+    log_path.write_text(
+        json.dumps({"task_id": "done", "status": "completed"}) + "\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(worker_runtime, "EXECUTION_LOG", log_path)
+    monkeypatch.setattr(worker_runtime, "RESIDENT_SCAN_LIMIT", 0)
+
+    considered = []
+
+    def _fake_accept(task, resident_ctx, min_score):
+        considered.append(task["id"])
+        return False, "test"
+
+    monkeypatch.setattr(worker_runtime, "_should_accept_task", _fake_accept)
+    queue = {
+        "tasks": [
+            {"id": "done"},
+            {"id": "blocked", "depends_on": ["waiting"]},
+            {"id": "waiting"},
+            {"id": "unblocked", "depends_on": ["done"]},
+        ]
+    }
+    assert worker_runtime.find_and_execute_task(queue, None, 0.0, None) is False
+    assert considered == ["waiting", "unblocked"]
+
+    with open(log_path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"task_id": "waiting", "status": "completed"}) + "\n")
+    considered.clear()
+    worker_runtime.find_and_execute_task(queue, None, 0.0, None)
+    assert considered == ["blocked", "unblocked"]
+
+
+def test_claim_skips_task_finished_since_the_scan(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker_runtime, "EXECUTION_LOG", tmp_path / "execution_log.jsonl")
+    monkeypatch.setattr(worker_runtime, "LOCKS_DIR", tmp_path / "locks")
+    monkeypatch.setattr(worker_runtime, "QUEUE_FILE", tmp_path / "queue.json")
+    monkeypatch.setattr(worker_runtime, "RESIDENT_SCAN_LIMIT", 0)
+    monkeypatch.setattr(worker_runtime, "_should_accept_task", lambda task, ctx, score: (True, "ok"))
+    backend = worker_runtime.get_queue_backend(worker_runtime.QUEUE_FILE)
+    backend.add_tasks([{"id": "finished"}, {"id": "open"}])
+    scanned = worker_runtime.read_queue()
+    backend.apply_outcome("finished", "approved")  # another resident, after our scan
+
+    claimed = worker_runtime._claim_next_task(scanned, None, 0.0, None)
+    assert claimed is not None and claimed[0]["id"] == "open"
+    assert backend.get_task("open")["claimed_by"] == worker_runtime.RESIDENT_ID
+    assert worker_runtime.try_acquire_lock("finished")  # lease released again
+    worker_runtime.release_lock("finished")
+    worker_runtime.release_lock("open")
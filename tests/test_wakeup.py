@@ -0,0 +1,83 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vivarium.runtime import worker_runtime as worker
+from vivarium.runtime.wakeup import WorkSignal
+
+
+def test_work_signal_wakes_on_watched_file_change(tmp_path):
+    queue_file = tmp_path / "queue.json"
+    queue_file.write_text("{}", encoding="utf-8")
+    signal = WorkSignal([queue_file])
+    assert signal.start() is True
+    try:
+        signal.clear()
+        started = time.monotonic()
+        queue_file.write_text('{"tasks": []}', encoding="utf-8")
+        assert signal.wait(5.0) is True
+        assert time.monotonic() - started < 5.0
+    finally:
+        signal.stop()
+
+
+def test_work_signal_ignores_unwatched_files_and_times_out(tmp_path):
+    queue_file = tmp_path / "queue.json"
+    signal = WorkSignal([queue_file])
+    assert signal.start() is True
+    try:
+        signal.clear()
+        (tmp_path / "other.json").write_text("{}", encoding="utf-8")
+        assert signal.wait(0.3) is False
+    finally:
+        signal.stop()
+
+
+def test_idle_wait_falls_back_to_sleep_without_signal(monkeypatch):
+    slept = []
+    monkeypatch.setattr(worker.time, "sleep", lambda seconds: slept.append(seconds))
+    assert worker._idle_wait(None, 1.5) is False
+    assert slept == [1.5]
+
+
+def test_start_work_signal_respects_opt_out(monkeypatch):
+    monkeypatch.setattr(worker, "RESIDENT_EVENT_WAKEUP", False)
+    assert worker._start_work_signal() is None
+
+
+class _AlwaysWoken:
+    def clear(self):
+        pass
+
+    def wait(self, timeout):
+        return True
+
+
+def test_wakeups_without_work_count_toward_idle_exit(monkeypatch):
+    monkeypatch.delenv("VIVARIUM_WORKER_DAEMON", raising=False)
+    monkeypatch.setattr(worker, "_is_halted", lambda: False)
+    monkeypatch.setattr(worker, "read_queue", lambda: {"tasks": []})
+    monkeypatch.setattr(worker, "find_and_execute_task", lambda *args: False)
+    monkeypatch.setattr(worker, "_maybe_compact_execution_log", lambda: None)
+    monkeypatch.setattr(worker, "_resolve_idle_wait_seconds", lambda idle_count: 0.0)
+
+    assert worker._serial_worker_loop(None, None, None, _AlwaysWoken()) == 0
+
+
+def test_work_signal_does_not_watch_execution_log(monkeypatch):
+    watched = []
+
+    class _Signal:
+        def __init__(self, paths):
+            watched.extend(paths)
+
+        def start(self):
+            return True
+
+    monkeypatch.setattr(worker, "RESIDENT_EVENT_WAKEUP", True)
+    monkeypatch.setattr(worker, "WorkSignal", _Signal)
+    assert worker._start_work_signal() is not None
+    assert worker.QUEUE_FILE in watched
+    assert worker.EXECUTION_LOG not in watched
@@ -29,6 +29,7 @@ from pathlib import Path
 from typing import Optional, Callable, List, Dict
 from dataclasses import dataclass, asdict
 from vivarium.runtime.vivarium_scope import AUDIT_ROOT, ensure_scope_layout
+from vivarium.utils.jsonl_appender import get_appender
 
 ensure_scope_layout()
 
@@ -162,6 +163,9 @@ class ActionLogger:
         self.readable_log = self.log_file.with_suffix(".log")
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
         self.readable_log.parent.mkdir(parents=True, exist_ok=True)
+        # Shared group-commit appenders: handles stay open, concurrent calls batch.
+        self._jsonl_appender = get_appender(self.log_file)
+        self._readable_appender = get_appender(self.readable_log)
 
         # Write header on startup
         self._write_header()
@@ -174,9 +178,7 @@ class ActionLogger:
         header += f"{'DAY':<3} {'TIME':<8} | {'ACTOR':<12} | {'TYPE':<8} | {'ACTION':<14} | DETAIL\n"
         header += "-" * 95 + "\n"
 
-        with self._lock:
-            with open(self.readable_log, "a", encoding="utf-8") as f:
-                f.write(header)
+        self._readable_appender.append_line(header.rstrip("\n"))
 
     def set_context(self, actor: str = None, session_id: str = None):
         """Set the current actor/session context for subsequent logs."""
@@ -245,7 +247,7 @@ class ActionLogger:
             )
             # Write to JSONL for structured parsing
             try:
-                line = json.dumps(entry.to_dict(), default=str) + "\n"
+                line = json.dumps(entry.to_dict(), default=str)
             except (TypeError, ValueError):
                 line = json.dumps({
                     "timestamp": entry.timestamp,
@@ -255,13 +257,12 @@ class ActionLogger:
                     "detail": entry.detail,
                     "session_id": entry.session_id,
                     "metadata": None,
-                }) + "\n"
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(line)
+                })
 
-            # Write to readable log for human monitoring
-            with open(self.readable_log, "a", encoding="utf-8") as f:
-                f.write(entry.to_line() + "\n")
+        # Write outside the context lock so concurrent callers share a group commit:
+        # JSONL for structured parsing, readable log for human monitoring.
+        self._jsonl_appender.append_line(line)
+        self._readable_appender.append_line(entry.to_line())
 
         # Notify callbacks (for real-time streaming)
         for callback in self._callbacks:
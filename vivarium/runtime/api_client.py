@@ -0,0 +1,93 @@
+"""
+Process-wide pooled HTTP client for the loopback execution API.
+
+Residents used to open a fresh ``httpx.Client`` per task and per delegated
+subtask, paying a TCP handshake every time and never reusing a connection
+across the parallel subtask fan-out. ``get_api_client`` hands out one shared,
+thread-safe client per process with keep-alive and configurable pool limits
+(VIVARIUM_API_MAX_CONNECTIONS, VIVARIUM_API_MAX_KEEPALIVE_CONNECTIONS,
+VIVARIUM_API_KEEPALIVE_EXPIRY_SECONDS).
+
+If VIVARIUM_API_UDS names a Unix socket, requests go over it instead of TCP
+(start the API with ``uvicorn vivarium.runtime.swarm_api:app --uds <path>``).
+The request URL keeps its loopback host, so endpoint validation is unchanged.
+
+Callers must not close the shared client. ``close_api_client`` (run at exit)
+closes it; tests that swap ``httpx.Client`` call it first to drop the cached
+client.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import Any, List, Optional, Tuple
+
+import httpx
+
+from vivarium.runtime.config import (
+    API_KEEPALIVE_EXPIRY_SECONDS,
+    API_MAX_CONNECTIONS,
+    API_MAX_KEEPALIVE_CONNECTIONS,
+    API_UDS_PATH,
+)
+
+_CLIENT_LOCK = threading.Lock()
+_CLIENT: Optional[Any] = None
+_CLIENT_KEY: Optional[Tuple[Any, ...]] = None
+# Clients replaced after a settings change. Other threads may still be mid-request
+# on them, so they are only closed at shutdown (or when dropped by close_api_client).
+_RETIRED_CLIENTS: List[Any] = []
+
+
+def _build_client(timeout: float, uds_path: str) -> Any:
+    limits = httpx.Limits(
+        max_connections=max(1, API_MAX_CONNECTIONS),
+        max_keepalive_connections=max(0, API_MAX_KEEPALIVE_CONNECTIONS),
+        keepalive_expiry=max(0.0, API_KEEPALIVE_EXPIRY_SECONDS),
+    )
+    if uds_path:
+        transport = httpx.HTTPTransport(uds=uds_path, limits=limits)
+        return httpx.Client(timeout=timeout, transport=transport)
+    return httpx.Client(timeout=timeout, limits=limits)
+
+
+def get_api_client(timeout: float, uds_path: Optional[str] = None) -> Any:
+    """
+    Shared keep-alive client for the execution API.
+
+    Rebuilt only if the timeout/transport settings change; the replaced client
+    is retired, not closed, so in-flight requests on it can finish.
+    """
+    global _CLIENT, _CLIENT_KEY
+    uds = API_UDS_PATH if uds_path is None else uds_path
+    key = (float(timeout), uds)
+    with _CLIENT_LOCK:
+        if _CLIENT is not None and _CLIENT_KEY == key:
+            return _CLIENT
+        if _CLIENT is not None:
+            _RETIRED_CLIENTS.append(_CLIENT)
+        _CLIENT = _build_client(timeout, uds)
+        _CLIENT_KEY = key
+        return _CLIENT
+
+
+def _close_quietly(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+@atexit.register
+def close_api_client() -> None:
+    """Close the shared client and any retired ones (idempotent)."""
+    global _CLIENT, _CLIENT_KEY
+    with _CLIENT_LOCK:
+        clients = [*_RETIRED_CLIENTS, _CLIENT]
+        _RETIRED_CLIENTS.clear()
+        _CLIENT, _CLIENT_KEY = None, None
+    for client in clients:
+        _close_quietly(client)
@@ -0,0 +1,285 @@
+"""
+Cross-process budget ledger.
+
+Every process that spends or checks money - the execution API's
+``SecureAPIWrapper``, residents deciding whether to halt, ``CostTracker`` and
+the control panel - reads and writes one WAL-mode SQLite database instead of
+keeping a private in-memory counter, so a restarted API process or a second
+uvicorn worker no longer starts at $0 and a budget check is a single-row read.
+
+Per account the ledger holds committed ``spent`` plus open reservations:
+
+- ``reserve(account, amount, limit)`` atomically checks
+  ``spent + reserved + amount <= limit`` and records a reservation.
+- ``commit(account, reservation_id, actual)`` drops the reservation and adds the real
+  cost; ``release(reservation_id)`` drops it without charging.
+- ``charge`` adds spend directly (no limit check).
+
+A reservation left behind by a crashed process is reclaimed once its PID is
+gone or ``BUDGET_RESERVATION_TTL_SECONDS`` have passed.
+
+Accounts:
+
+- ``swarm`` is all-time spend. It is seeded with the ``budget_used`` total of
+  the execution log the first time it is touched, residents halt on it and
+  the control panel reports it. Nothing resets it.
+- ``api:<YYYY-MM-DD>`` (or ``api`` when ``SWARM_BUDGET_PERIOD=all``) is what
+  ``SWARM_BUDGET_LIMIT`` caps; commits there roll up into ``swarm`` in the
+  same transaction.
+- ``session:<host>:<pid>:<start time>`` is a ``CostTracker``'s per-run
+  account unless the caller names one.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from vivarium.runtime.config import BUDGET_RESERVATION_TTL_SECONDS
+from vivarium.runtime.log_index import SpendAccumulator
+from vivarium.runtime.task_leases import lease_is_live
+from vivarium.runtime.vivarium_scope import AUDIT_ROOT, BUDGET_LEDGER_FILE
+
+SWARM_ACCOUNT = "swarm"
+API_ACCOUNT = "api"
+SQLITE_BUSY_TIMEOUT_SECONDS = 30.0
+_HOSTNAME = socket.gethostname()
+
+
+def daily_account(prefix: str, now: Optional[float] = None) -> str:
+    """``prefix`` scoped to the current UTC day, e.g. ``api:2026-10-16``."""
+    return f"{prefix}:{time.strftime('%Y-%m-%d', time.gmtime(now))}"
+
+
+class BudgetLedger:
+    """WAL-mode SQLite ledger with atomic reserve/commit/release per account."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        seed_log: Optional[Path] = None,
+        reservation_ttl_seconds: float = BUDGET_RESERVATION_TTL_SECONDS,
+    ):
+        self.db_path = Path(db_path)
+        self.seed_log = Path(seed_log) if seed_log else None
+        self.reservation_ttl_seconds = max(1.0, float(reservation_ttl_seconds))
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    # -- connection / transaction plumbing ---------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=SQLITE_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS budget_accounts (
+                        account TEXT PRIMARY KEY,
+                        spent REAL NOT NULL DEFAULT 0,
+                        cache_hits INTEGER NOT NULL DEFAULT 0,
+                        cache_saved REAL NOT NULL DEFAULT 0,
+                        updated_at REAL NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS budget_reservations (
+                        reservation_id TEXT PRIMARY KEY,
+                        account TEXT NOT NULL,
+                        amount REAL NOT NULL,
+                        pid INTEGER NOT NULL,
+                        host TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_budget_reservations_account
+                        ON budget_reservations(account);
+                    """
+                )
+                self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def _write_txn(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _ensure_account(self, conn: sqlite3.Connection, account: str) -> None:
+        if conn.execute("SELECT 1 FROM budget_accounts WHERE account = ?", (account,)).fetchone():
+            return
+        seeded = 0.0
+        if account == SWARM_ACCOUNT and self.seed_log is not None and self.seed_log.exists():
+            try:
+                seeded = SpendAccumulator(self.seed_log).total()
+            except OSError:
+                seeded = 0.0
+        conn.execute(
+            "INSERT INTO budget_accounts (account, spent, updated_at) VALUES (?, ?, ?)",
+            (account, seeded, time.time()),
+        )
+
+    def _reclaim_stale(self, conn: sqlite3.Connection, account: str) -> None:
+        rows = conn.execute(
+            "SELECT reservation_id, pid, host, created_at FROM budget_reservations WHERE account = ?",
+            (account,),
+        ).fetchall()
+        stale = [
+            (reservation_id,)
+            for reservation_id, pid, host, created_at in rows
+            if not lease_is_live(
+                {"pid": pid, "host": host, "expires_at": created_at + self.reservation_ttl_seconds}
+            )
+        ]
+        if stale:
+            conn.executemany("DELETE FROM budget_reservations WHERE reservation_id = ?", stale)
+
+    @staticmethod
+    def _add_spent(conn: sqlite3.Connection, account: str, amount: float) -> None:
+        conn.execute(
+            "UPDATE budget_accounts SET spent = MAX(0, spent + ?), updated_at = ? WHERE account = ?",
+            (float(amount), time.time(), account),
+        )
+
+    # -- public API ---------------------------------------------------------
+
+    def reserve(self, account: str, amount: float, limit: float) -> Optional[str]:
+        """Hold ``amount`` against ``account`` if it fits under ``limit``; returns a reservation id or None."""
+        amount = max(0.0, float(amount))
+        with self._write_txn() as conn:
+            self._ensure_account(conn, account)
+            self._reclaim_stale(conn, account)
+            spent, reserved = self._totals(conn, account)
+            if spent + reserved + amount > float(limit):
+                return None
+            reservation_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO budget_reservations (reservation_id, account, amount, pid, host, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (reservation_id, account, amount, os.getpid(), _HOSTNAME, time.time()),
+            )
+        return reservation_id
+
+    def commit(
+        self,
+        account: str,
+        reservation_id: Optional[str],
+        actual: float,
+        rollup: Optional[str] = None,
+    ) -> None:
+        """
+        Replace a reservation with the call's actual cost (charged even if the
+        reservation was reclaimed); the cost is also added to ``rollup``.
+        """
+        with self._write_txn() as conn:
+            self._ensure_account(conn, account)
+            if reservation_id:
+                conn.execute("DELETE FROM budget_reservations WHERE reservation_id = ?", (reservation_id,))
+            self._add_spent(conn, account, max(0.0, float(actual)))
+            if rollup and rollup != account:
+                self._ensure_account(conn, rollup)
+                self._add_spent(conn, rollup, max(0.0, float(actual)))
+
+    def release(self, reservation_id: str) -> None:
+        """Drop a reservation without charging (the call failed or never happened)."""
+        with self._write_txn() as conn:
+            conn.execute("DELETE FROM budget_reservations WHERE reservation_id = ?", (reservation_id,))
+
+    def charge(self, account: str, amount: float) -> None:
+        """Add spend that was not reserved first."""
+        with self._write_txn() as conn:
+            self._ensure_account(conn, account)
+            self._add_spent(conn, account, max(0.0, float(amount)))
+
+    def record_cache_hit(self, account: str, saved: float, rollup: Optional[str] = None) -> None:
+        with self._write_txn() as conn:
+            for name in dict.fromkeys(name for name in (account, rollup) if name):
+                self._ensure_account(conn, name)
+                conn.execute(
+                    "UPDATE budget_accounts SET cache_hits = cache_hits + 1, cache_saved = cache_saved + ? "
+                    "WHERE account = ?",
+                    (max(0.0, float(saved)), name),
+                )
+
+    def reset(self, account: str, spent: float = 0.0) -> None:
+        """Set ``account``'s committed spend (open reservations are kept). The swarm account cannot be reset."""
+        if account == SWARM_ACCOUNT:
+            raise ValueError("the swarm account holds all-time spend and is never reset")
+        with self._write_txn() as conn:
+            self._ensure_account(conn, account)
+            conn.execute(
+                "UPDATE budget_accounts SET spent = ?, updated_at = ? WHERE account = ?",
+                (max(0.0, float(spent)), time.time(), account),
+            )
+
+    def spent(self, account: str = SWARM_ACCOUNT) -> float:
+        """Committed spend of ``account`` (one indexed row read)."""
+        return self.snapshot(account)["spent"]
+
+    def snapshot(self, account: str = SWARM_ACCOUNT) -> Dict[str, Any]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT spent, cache_hits, cache_saved, updated_at FROM budget_accounts WHERE account = ?",
+            (account,),
+        ).fetchone()
+        if row is None:
+            # First touch (e.g. a resident before the API ever charged): seed it.
+            with self._write_txn() as write_conn:
+                self._ensure_account(write_conn, account)
+            return self.snapshot(account)
+        _, reserved = self._totals(conn, account)
+        return {
+            "account": account,
+            "spent": float(row[0]),
+            "reserved": reserved,
+            "cache_hits": int(row[1]),
+            "cache_saved": float(row[2]),
+            "updated_at": float(row[3]),
+        }
+
+    @staticmethod
+    def _totals(conn: sqlite3.Connection, account: str) -> tuple[float, float]:
+        spent_row = conn.execute("SELECT spent FROM budget_accounts WHERE account = ?", (account,)).fetchone()
+        reserved_row = conn.execute(
+            "SELECT COALESCE(SUM(amount), 0) FROM budget_reservations WHERE account = ?", (account,)
+        ).fetchone()
+        return float(spent_row[0] if spent_row else 0.0), float(reserved_row[0] or 0.0)
+
+
+_LEDGERS: Dict[Path, BudgetLedger] = {}
+_LEDGERS_LOCK = threading.Lock()
+
+
+def get_budget_ledger(db_path: Optional[Path] = None, seed_log: Optional[Path] = None) -> BudgetLedger:
+    """
+    Shared ledger for ``db_path`` (default: VIVARIUM_BUDGET_LEDGER or the
+    scope's ledger file). A new swarm account is seeded from ``seed_log``
+    (default: the audit execution log).
+    """
+    resolved = Path(db_path or os.environ.get("VIVARIUM_BUDGET_LEDGER") or BUDGET_LEDGER_FILE)
+    with _LEDGERS_LOCK:
+        ledger = _LEDGERS.get(resolved)
+        if ledger is None:
+            ledger = BudgetLedger(resolved, seed_log=seed_log or AUDIT_ROOT / "execution_log.jsonl")
+            _LEDGERS[resolved] = ledger
+        return ledger
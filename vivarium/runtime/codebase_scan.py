@@ -0,0 +1,214 @@
+"""
+Incremental codebase scan for ``/plan``.
+
+``scan_codebase`` used to read every ``.py`` file in the repository on each
+planning call just to count lines and look for ``def test_``. The scanner here
+keeps the per-file result in a JSON cache keyed by relative path, mtime and
+size, so a repeated scan only stats files and reads the ones that changed:
+
+- The tree is listed with ``os.scandir`` in ``os.walk`` order (a directory's
+  files, then its subdirectories), so the file list matches the old scan.
+- Changed files are read in a thread pool (``CODEBASE_SCAN_WORKERS``).
+- ``BlockedPathMatcher`` turns the read blocklists into one string-prefix test,
+  used both here and for local-command path checks.
+
+The cache is rewritten (tmp file + ``os.replace``) only when an entry changed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from vivarium.runtime.config import CODEBASE_SCAN_WORKERS
+
+CACHE_VERSION = 1
+
+
+class BlockedPathMatcher:
+    """Precompiled ``(root, reason)`` rules: a path is blocked if it is a root or lies under one."""
+
+    def __init__(self, rules: Iterable[Tuple[Path, str]]):
+        self._rules: List[Tuple[str, str]] = [(str(Path(root)), reason) for root, reason in rules]
+        self._exact = {}
+        for root, reason in self._rules:
+            self._exact.setdefault(root, reason)
+        self._prefixes = tuple(root.rstrip(os.sep) + os.sep for root, _ in self._rules)
+
+    def reason(self, path: Any) -> Optional[str]:
+        """Reason of the first rule covering ``path`` (an absolute, resolved path), else None."""
+        text = str(path)
+        exact = self._exact.get(text)
+        if exact is not None or not text.startswith(self._prefixes):
+            return exact
+        for (root, reason), prefix in zip(self._rules, self._prefixes):
+            if text == root or text.startswith(prefix):
+                return reason
+        return None
+
+
+def _read_file_stats(path: str) -> Optional[Tuple[int, bool]]:
+    """(line count, defines ``def test_``) of a source file; None if unreadable."""
+    try:
+        content = Path(path).read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        return None
+    return len(content.splitlines()), "def test_" in content
+
+
+class CodebaseScanner:
+    """Scans ``.py`` files under ``root`` and remembers unchanged files between scans."""
+
+    def __init__(
+        self,
+        root: Path,
+        ignore_dirs: Iterable[str],
+        blocked: BlockedPathMatcher,
+        cache_file: Optional[Path] = None,
+        max_workers: int = CODEBASE_SCAN_WORKERS,
+    ):
+        self.root = Path(root).resolve()
+        self.ignore_dirs = frozenset(ignore_dirs)
+        self.blocked = blocked
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.max_workers = max(1, int(max_workers))
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self.last_scan: Dict[str, int] = {"files": 0, "read": 0, "reused": 0}
+
+    # -- cache I/O ----------------------------------------------------------
+
+    def _load_entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        entries: Dict[str, Dict[str, Any]] = {}
+        if self.cache_file is not None:
+            try:
+                data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION and data.get("root") == str(self.root):
+                files = data.get("files")
+                if isinstance(files, dict):
+                    entries = files
+        self._entries = entries
+        return entries
+
+    def _store_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        if self.cache_file is None:
+            return
+        payload = {"version": CACHE_VERSION, "root": str(self.root), "files": entries}
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_name(f".{self.cache_file.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass
+
+    # -- walk ---------------------------------------------------------------
+
+    def _walk(self) -> List[Tuple[str, str, int, int]]:
+        """(rel_path, abs_path, mtime_ns, size) of every scannable .py file, in os.walk order."""
+        found: List[Tuple[str, str, int, int]] = []
+        root_len = len(str(self.root)) + 1
+        pending: List[str] = [str(self.root)]
+        while pending:
+            directory = pending.pop()
+            if self.blocked.reason(directory):
+                continue
+            subdirs: List[str] = []
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = list(iterator)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        # Like os.walk, symlinked directories are listed but not entered.
+                        if (
+                            not entry.is_symlink()
+                            and entry.name not in self.ignore_dirs
+                            and not entry.name.startswith(".")
+                        ):
+                            subdirs.append(entry.path)
+                        continue
+                    if not entry.name.endswith(".py"):
+                        continue
+                    real = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+                    if self.blocked.reason(real):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found.append((entry.path[root_len:], entry.path, stat.st_mtime_ns, stat.st_size))
+            pending.extend(reversed(subdirs))
+        return found
+
+    # -- public API ---------------------------------------------------------
+
+    def scan(self) -> Dict[str, Any]:
+        """Same result shape as the old full scan: totals, per-file info and test files."""
+        with self._lock:
+            cached = self._load_entries()
+            found = self._walk()
+            fresh: Dict[str, Dict[str, Any]] = {}
+            to_read: List[Tuple[str, str, int, int]] = []
+            for rel_path, abs_path, mtime_ns, size in found:
+                entry = cached.get(rel_path)
+                if entry and entry.get("mtime_ns") == mtime_ns and entry.get("size") == size:
+                    fresh[rel_path] = entry
+                else:
+                    to_read.append((rel_path, abs_path, mtime_ns, size))
+
+            if to_read:
+                workers = min(self.max_workers, len(to_read))
+                if workers > 1:
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        stats = list(pool.map(_read_file_stats, [item[1] for item in to_read]))
+                else:
+                    stats = [_read_file_stats(item[1]) for item in to_read]
+                for (rel_path, _, mtime_ns, size), result in zip(to_read, stats):
+                    if result is None:
+                        continue
+                    lines, defines_tests = result
+                    fresh[rel_path] = {
+                        "mtime_ns": mtime_ns,
+                        "size": size,
+                        "lines": lines,
+                        "defines_tests": defines_tests,
+                    }
+
+            if to_read or len(fresh) != len(cached):
+                self._store_entries(fresh)
+            self._entries = fresh
+            self.last_scan = {"files": len(found), "read": len(to_read), "reused": len(found) - len(to_read)}
+            return _summarize(found, fresh)
+
+
+def _summarize(found: Sequence[Tuple[str, str, int, int]], entries: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    file_info: List[Dict[str, Any]] = []
+    test_files: List[str] = []
+    total_lines = 0
+    for rel_path, _, _, _ in found:
+        entry = entries.get(rel_path)
+        if entry is None:
+            continue
+        lines = int(entry["lines"])
+        total_lines += lines
+        has_tests = "test" in rel_path.lower() or bool(entry.get("defines_tests"))
+        file_info.append({"path": rel_path, "lines": lines, "has_tests": has_tests})
+        if has_tests:
+            test_files.append(rel_path)
+    return {
+        "total_files": len(file_info),
+        "total_lines": total_lines,
+        "files": file_info,
+        "test_files": test_files,
+        "has_tests": len(test_files) > 0,
+    }
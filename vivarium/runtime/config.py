@@ -54,9 +54,89 @@ DEFAULT_MAX_BUDGET = 0.10
 # Timeout in seconds for acquiring locks before operation fails
 LOCK_TIMEOUT_SECONDS = 300
 
+# Task lease lifetime; residents renew held leases every third of this.
+TASK_LEASE_TTL_SECONDS = _safe_float_env("VIVARIUM_TASK_LEASE_TTL_SECONDS", 60.0)
+
+# Budget reservations left by a crashed process are reclaimed after this long
+# (or as soon as their PID is gone on this host).
+BUDGET_RESERVATION_TTL_SECONDS = _safe_float_env("VIVARIUM_BUDGET_RESERVATION_TTL_SECONDS", 1800.0)
+
+# SWARM_BUDGET_LIMIT caps the execution API's spend per UTC day ("day") or over
+# the ledger's lifetime ("all"); either way spend also rolls up into the
+# all-time swarm account.
+SWARM_BUDGET_PERIOD = os.environ.get("SWARM_BUDGET_PERIOD", "day").strip().lower()
+
+# The SQLite queue backend rewrites its queue.json export at most this often
+# (in the background); 0 exports inside every write transaction.
+QUEUE_EXPORT_INTERVAL_SECONDS = _safe_float_env("VIVARIUM_QUEUE_EXPORT_INTERVAL_SECONDS", 1.0)
+
+# How long a resident's signed safety verdict is accepted by /cycle in place of
+# re-running the safety checks.
+SAFETY_VERDICT_TTL_SECONDS = _safe_float_env("VIVARIUM_SAFETY_VERDICT_TTL_SECONDS", 900.0)
+
+# Safety verdicts memoized per gateway, keyed by task text hash.
+SAFETY_VERDICT_CACHE_SIZE = _safe_int_env("VIVARIUM_SAFETY_VERDICT_CACHE_SIZE", 1024)
+
+# Threads reading changed .py files during the incremental /plan codebase scan.
+CODEBASE_SCAN_WORKERS = _safe_int_env("VIVARIUM_CODEBASE_SCAN_WORKERS", 8)
+
+# Seconds between control panel insights rollup polls of the runtime logs.
+INSIGHTS_ROLLUP_INTERVAL_SECONDS = _safe_float_env("VIVARIUM_INSIGHTS_ROLLUP_INTERVAL_SECONDS", 5.0)
+
+# Live log streaming to control panel clients: entries buffered per client
+# (oldest dropped beyond this), coalescing delay per batch, and how long an
+# unacknowledged batch holds back the next one.
+LOG_STREAM_CLIENT_BUFFER = _safe_int_env("VIVARIUM_LOG_STREAM_CLIENT_BUFFER", 1000)
+LOG_STREAM_TICK_SECONDS = _safe_float_env("VIVARIUM_LOG_STREAM_TICK_SECONDS", 0.1)
+LOG_STREAM_ACK_TIMEOUT_SECONDS = _safe_float_env("VIVARIUM_LOG_STREAM_ACK_TIMEOUT_SECONDS", 10.0)
+
 # Timeout in seconds for API requests to external services
 API_TIMEOUT_SECONDS = 120
 
+# Pooled resident -> execution API client (keep-alive; optional Unix socket transport).
+API_MAX_CONNECTIONS = _safe_int_env("VIVARIUM_API_MAX_CONNECTIONS", 32)
+API_MAX_KEEPALIVE_CONNECTIONS = _safe_int_env("VIVARIUM_API_MAX_KEEPALIVE_CONNECTIONS", 16)
+API_KEEPALIVE_EXPIRY_SECONDS = _safe_float_env("VIVARIUM_API_KEEPALIVE_EXPIRY_SECONDS", 30.0)
+API_UDS_PATH = os.environ.get("VIVARIUM_API_UDS", "").strip()
+
+# /cycle execution: max tasks running at once per API process (LLM calls run in
+# a thread pool of this size, local commands as async subprocesses).
+CYCLE_MAX_CONCURRENCY = _safe_int_env("VIVARIUM_CYCLE_MAX_CONCURRENCY", 8)
+# Max items accepted by one POST /cycle/batch.
+CYCLE_BATCH_MAX_ITEMS = _safe_int_env("VIVARIUM_CYCLE_BATCH_MAX_ITEMS", 32)
+# Characters of local command output returned to the caller (rest is discarded while streaming).
+LOCAL_OUTPUT_MAX_CHARS = _safe_int_env("VIVARIUM_LOCAL_OUTPUT_MAX_CHARS", 1000)
+
+# Optional on-disk LLM response cache (SecureAPIWrapper.call_llm). Calls with an
+# explicit temperature above LLM_CACHE_MAX_TEMPERATURE (and no seed) bypass it.
+LLM_CACHE_ENABLED = (
+    os.environ.get("VIVARIUM_LLM_CACHE", "0").strip().lower()
+    not in {"0", "false", "no"}
+)
+LLM_CACHE_TTL_SECONDS = _safe_float_env("VIVARIUM_LLM_CACHE_TTL_SECONDS", 86400.0)
+LLM_CACHE_MAX_ENTRIES = _safe_int_env("VIVARIUM_LLM_CACHE_MAX_ENTRIES", 2000)
+LLM_CACHE_MAX_TEMPERATURE = _safe_float_env("VIVARIUM_LLM_CACHE_MAX_TEMPERATURE", 1.0)
+
+# Shared per-model Groq rate limits (requests and tokens per minute). RPM comes
+# from vivarium/scout/config/groq_model_specs.json and TPM is learned from
+# x-ratelimit-* response headers; these defaults cover models/limits not known yet
+# (TPM 0 = unlimited until the API reports one).
+# SWARM_RATE_LIMIT (the old per-wrapper requests/minute cap) is deprecated; it
+# only stands in for VIVARIUM_RATE_LIMIT_DEFAULT_RPM when that is unset.
+RATE_LIMIT_DEFAULT_RPM = _safe_int_env(
+    "VIVARIUM_RATE_LIMIT_DEFAULT_RPM", _safe_int_env("SWARM_RATE_LIMIT", 30)
+)
+if os.environ.get("SWARM_RATE_LIMIT") is not None:
+    print(
+        "CONFIG WARNING: SWARM_RATE_LIMIT is deprecated; Groq calls use shared per-model "
+        "limits (model specs + response headers). Set VIVARIUM_RATE_LIMIT_DEFAULT_RPM instead "
+        f"(now {RATE_LIMIT_DEFAULT_RPM} RPM for models without a spec).",
+        file=sys.stderr,
+    )
+RATE_LIMIT_DEFAULT_TPM = _safe_int_env("VIVARIUM_RATE_LIMIT_DEFAULT_TPM", 0)
+# Longest a call waits for quota before it is rejected as rate limited.
+RATE_LIMIT_MAX_WAIT_SECONDS = _safe_float_env("VIVARIUM_RATE_LIMIT_MAX_WAIT_SECONDS", 30.0)
+
 # Worker subprocess timeout (seconds)
 WORKER_TIMEOUT_SECONDS = int(os.environ.get("WORKER_TIMEOUT_SECONDS", "900"))
 
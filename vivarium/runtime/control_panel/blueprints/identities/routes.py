@@ -4,13 +4,12 @@ from __future__ import annotations
 import json
 import math
 import secrets
-from collections import deque
 from datetime import datetime, timezone
-from pathlib import Path
 
 from flask import Blueprint, current_app, jsonify, request
 
 from vivarium.runtime import resident_onboarding
+from vivarium.runtime.log_index import read_jsonl_tail
 from vivarium.utils import get_timestamp, read_json, write_json
 
 bp = Blueprint("identities", __name__, url_prefix="/api")
@@ -77,27 +76,6 @@ def _reserve_creativity_seed(seed: str) -> bool:
     return True
 
 
-def _read_jsonl_tail(path: Path, max_lines: int = 12000) -> list:
-    if not path.exists():
-        return []
-    lines = deque(maxlen=max_lines)
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                entry = line.strip()
-                if entry:
-                    lines.append(entry)
-    except Exception:
-        return []
-    payloads = []
-    for line in lines:
-        try:
-            payloads.append(json.loads(line))
-        except Exception:
-            continue
-    return payloads
-
-
 @bp.route("/identities", methods=["GET"])
 def get_identities():
     """GET /api/identities - List all identities."""
@@ -286,27 +264,20 @@ def get_identity_profile(identity_id):
                 except Exception:
                     pass
 
-        recent_actions = []
-        if ACTION_LOG.exists():
-            try:
-                with open(ACTION_LOG, "r") as f:
-                    lines = f.readlines()[-200:]
-                    for line in reversed(lines):
-                        try:
-                            entry = json.loads(line.strip())
-                            if entry.get("actor") == identity_id:
-                                recent_actions.append({
-                                    "timestamp": entry.get("timestamp"),
-                                    "type": entry.get("action_type"),
-                                    "action": entry.get("action"),
-                                    "detail": entry.get("detail"),
-                                })
-                                if len(recent_actions) >= 20:
-                                    break
-                        except Exception:
-                            pass
-            except Exception:
-                pass
+        recent_actions = [
+            {
+                "timestamp": entry.get("timestamp"),
+                "type": entry.get("action_type"),
+                "action": entry.get("action"),
+                "detail": entry.get("detail"),
+            }
+            for entry in reversed(read_jsonl_tail(
+                ACTION_LOG,
+                20,
+                match=lambda entry: entry.get("actor") == identity_id,
+                max_scan_lines=200,
+            ))
+        ]
 
         task_success_rate = 0
         if data.get("tasks_completed", 0) + data.get("tasks_failed", 0) > 0:
@@ -412,13 +383,21 @@ def get_identity_log(identity_id):
     cycle_id_param = request.args.get("cycle_id", type=int)
 
     cycle_seconds = resident_onboarding.get_resident_cycle_seconds()
-    action_entries = _read_jsonl_tail(ACTION_LOG, max_lines=safe_limit * 2)
-    execution_entries = _read_jsonl_tail(EXECUTION_LOG, max_lines=safe_limit * 2)
 
     def actor_matches(entry: dict) -> bool:
         actor = str(entry.get("actor") or entry.get("worker_id") or entry.get("identity_id") or "").strip()
         return actor == identity_id
 
+    def execution_actor_matches(entry: dict) -> bool:
+        return (entry.get("worker_id") or entry.get("identity_id") or "worker") == identity_id
+
+    # Only this identity's records are parsed into the result; the scan window
+    # stays the last 2 * limit lines of each log.
+    action_entries = read_jsonl_tail(ACTION_LOG, safe_limit * 2, match=actor_matches, max_scan_lines=safe_limit * 2)
+    execution_entries = read_jsonl_tail(
+        EXECUTION_LOG, safe_limit * 2, match=execution_actor_matches, max_scan_lines=safe_limit * 2
+    )
+
     def ts_to_cycle(ts) -> int:
         if not ts:
             return 0
@@ -3,9 +3,11 @@ from __future__ import annotations
 
 import json
 from collections import Counter
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
-from flask import Blueprint, current_app, jsonify
+from flask import Blueprint, jsonify, request
+
+from vivarium.runtime.queue_store import get_queue_backend
 
 bp = Blueprint("insights", __name__, url_prefix="/api")
 
@@ -16,16 +18,9 @@ def _app_helpers():
     from vivarium.runtime.control_panel.blueprints.stop_toggle import get_stop_status
     return (
         app.QUEUE_FILE,
-        app.EXECUTION_LOG,
-        app.ACTION_LOG,
-        app.DISCUSSIONS_DIR,
         app.INSIGHTS_SOCIAL_UNREAD_WARN,
-        app._read_jsonl_tail,
-        app._read_api_audit_entries,
-        app._parse_iso_timestamp,
-        app._extract_usd_cost,
-        app._count_discussion_messages_since,
-        app._trend_snapshot,
+        app._insights_rollup,
+        app._trend_from_counts,
         app._format_usd_display,
         app.get_identities,
         app.get_messages_to_human,
@@ -41,16 +36,9 @@ def api_insights():
     """Aggregate queue/execution/social/safety signals for quick UI scanning."""
     (
         QUEUE_FILE,
-        EXECUTION_LOG,
-        ACTION_LOG,
-        DISCUSSIONS_DIR,
         INSIGHTS_SOCIAL_UNREAD_WARN,
-        _read_jsonl_tail,
-        _read_api_audit_entries,
-        _parse_iso_timestamp,
-        _extract_usd_cost,
-        _count_discussion_messages_since,
-        _trend_snapshot,
+        _insights_rollup,
+        _trend_from_counts,
         _format_usd_display,
         get_identities,
         get_messages_to_human,
@@ -61,52 +49,28 @@ def api_insights():
     ) = _app_helpers()
 
     now = datetime.now(timezone.utc)
-    cutoff = now - timedelta(hours=24)
-
-    queue = {}
-    if QUEUE_FILE.exists():
-        try:
-            with open(QUEUE_FILE, "r", encoding="utf-8") as f:
-                queue = json.load(f)
-        except Exception:
-            queue = {}
+    now_epoch = now.timestamp()
+    rollup = _insights_rollup()
+    day_counts = rollup.totals(now_epoch - 24 * 3600, now=now_epoch)
+    running_totals = rollup.running_totals()
+
+    try:
+        queue = get_queue_backend(QUEUE_FILE).read()
+    except Exception:
+        queue = {}
     queue_tasks = queue.get("tasks", []) if isinstance(queue.get("tasks"), list) else []
     queue_completed = queue.get("completed", []) if isinstance(queue.get("completed"), list) else []
     queue_failed = queue.get("failed", []) if isinstance(queue.get("failed"), list) else []
     queue_summary = {"open": len(queue_tasks), "completed": len(queue_completed), "failed": len(queue_failed)}
 
-    execution_entries = _read_jsonl_tail(EXECUTION_LOG)
-    completed_24h = approved_24h = failed_24h = requeue_24h = pending_review_24h = 0
-    last_event_at = None
-    for entry in execution_entries:
-        status = str(entry.get("status") or "").strip().lower()
-        timestamp = _parse_iso_timestamp(entry.get("timestamp"))
-        if timestamp and (last_event_at is None or timestamp > last_event_at):
-            last_event_at = timestamp
-        if not timestamp or timestamp < cutoff:
-            continue
-        if status in {"completed", "approved"}:
-            completed_24h += 1
-        if status == "approved":
-            approved_24h += 1
-        if status == "failed":
-            failed_24h += 1
-        if status == "requeue":
-            requeue_24h += 1
-        if status == "pending_review":
-            pending_review_24h += 1
-
-    failure_streak = 0
-    for entry in reversed(execution_entries):
-        status = str(entry.get("status") or "").strip().lower()
-        if not status:
-            continue
-        if status == "failed":
-            failure_streak += 1
-            continue
-        if status in {"in_progress", "pending_review", "requeue"}:
-            continue
-        break
+    completed_24h = int(day_counts.get("status:completed", 0) + day_counts.get("status:approved", 0))
+    approved_24h = int(day_counts.get("status:approved", 0))
+    failed_24h = int(day_counts.get("status:failed", 0))
+    requeue_24h = int(day_counts.get("status:requeue", 0))
+    pending_review_24h = int(day_counts.get("status:pending_review", 0))
+    failure_streak = int(running_totals["execution"].get("failure_streak", 0))
+    last_event_epoch = running_totals["execution"].get("last_event_at")
+    last_event_at = datetime.fromtimestamp(last_event_epoch, timezone.utc) if last_event_epoch else None
 
     reviewed_total = approved_24h + failed_24h + requeue_24h
     approval_rate_24h = round((approved_24h / reviewed_total) * 100, 1) if reviewed_total > 0 else None
@@ -121,66 +85,20 @@ def api_insights():
         "last_event_at": last_event_at.isoformat() if last_event_at else None,
     }
 
-    execution_cost_all_time = sum(
-        float(e.get("budget_used"))
-        for e in execution_entries
-        if e.get("budget_used") is not None
-    )
+    execution_cost_all_time = float(running_totals["execution"].get("cost", 0.0))
+    action_cost_all_time = float(running_totals["action"].get("cost", 0.0))
 
-    action_entries = _read_jsonl_tail(ACTION_LOG, max_lines=60000)
-    api_audit_entries = _read_api_audit_entries(max_lines=60000)
-    action_cost_all_time = sum(
-        _extract_usd_cost(e.get("detail", ""))
-        for e in action_entries
-        if str(e.get("action_type") or "").strip().upper() == "API"
-    )
+    api_calls_24h = int(day_counts.get("api_calls", 0))
+    api_cost_24h = day_counts.get("api_cost", 0.0) + day_counts.get("execution_cost", 0.0)
+    safety_blocks_24h = int(day_counts.get("safety_blocks", 0))
+    errors_24h = int(day_counts.get("action:ERROR", 0))
+    actor_counter = Counter({
+        key.split(":", 1)[1]: int(value) for key, value in day_counts.items() if key.startswith("actor:")
+    })
 
-    api_calls_24h = api_cost_24h = safety_blocks_24h = errors_24h = 0
-    actor_counter = Counter()
-    action_type_timestamps = {}
-    for entry in action_entries:
-        timestamp = _parse_iso_timestamp(entry.get("timestamp"))
-        if not timestamp:
-            continue
-        action_type = str(entry.get("action_type") or "").strip().upper() or "UNKNOWN"
-        action_type_timestamps.setdefault(action_type, []).append(timestamp)
-        if timestamp < cutoff:
-            continue
-        actor = str(entry.get("actor") or "").strip()
-        action_blob = f"{entry.get('action', '')} {entry.get('detail', '')}".upper()
-        if actor and actor not in {"SYSTEM", "UNKNOWN"}:
-            actor_counter[actor] += 1
-        if action_type == "API":
-            api_calls_24h += 1
-            api_cost_24h += _extract_usd_cost(entry.get("detail", ""))
-        if action_type == "SAFETY" and "BLOCKED" in action_blob:
-            safety_blocks_24h += 1
-        if action_type == "ERROR":
-            errors_24h += 1
-
-    for entry in execution_entries:
-        timestamp = _parse_iso_timestamp(entry.get("timestamp"))
-        if not timestamp or timestamp < cutoff:
-            continue
-        budget_used = entry.get("budget_used")
-        if budget_used is not None:
-            try:
-                api_cost_24h += float(budget_used)
-            except (TypeError, ValueError):
-                pass
-
-    api_calls_24h_from_audit = 0
-    api_cost_24h_from_audit = api_cost_all_time_from_audit = 0.0
-    for entry in api_audit_entries:
-        try:
-            cost_val = float(entry.get("cost", 0))
-        except (TypeError, ValueError):
-            cost_val = 0.0
-        api_cost_all_time_from_audit += cost_val
-        ts = _parse_iso_timestamp(entry.get("timestamp"))
-        if ts and ts >= cutoff:
-            api_calls_24h_from_audit += 1
-            api_cost_24h_from_audit += cost_val
+    api_calls_24h_from_audit = int(day_counts.get("audit_calls", 0))
+    api_cost_24h_from_audit = day_counts.get("audit_cost", 0.0)
+    api_cost_all_time_from_audit = float(running_totals["audit"].get("cost", 0.0))
 
     if api_calls_24h == 0 and api_calls_24h_from_audit > 0:
         api_calls_24h = api_calls_24h_from_audit
@@ -197,7 +115,7 @@ def api_insights():
         "errors_24h": errors_24h,
     }
 
-    budget_events_24h = sum(1 for ts in action_type_timestamps.get("BUDGET", []) if ts >= cutoff)
+    budget_events_24h = int(day_counts.get("action:BUDGET", 0))
     ui_settings = load_ui_settings()
     task_min_budget = float(ui_settings.get("task_min_budget", 0.05) or 0.05)
     task_max_budget = float(ui_settings.get("task_max_budget", max(task_min_budget, 0.10)) or max(task_min_budget, 0.10))
@@ -235,7 +153,7 @@ def api_insights():
         "open_bounties": open_bounties,
         "claimed_bounties": claimed_bounties,
         "completed_bounties": completed_bounties,
-        "chat_messages_24h": _count_discussion_messages_since(cutoff),
+        "chat_messages_24h": int(day_counts.get("messages", 0)),
     }
 
     backlog_pressure = "low"
@@ -263,23 +181,10 @@ def api_insights():
 
     health_summary = {"state": health_state, "kill_switch": kill_switch, "backlog_pressure": backlog_pressure}
 
-    dm_timestamps = []
-    if DISCUSSIONS_DIR.exists():
-        for room_file in DISCUSSIONS_DIR.glob("dm__*.jsonl"):
-            try:
-                with open(room_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if not line.strip():
-                            continue
-                        try:
-                            payload = json.loads(line)
-                        except Exception:
-                            continue
-                        ts = _parse_iso_timestamp(payload.get("timestamp"))
-                        if ts:
-                            dm_timestamps.append(ts)
-            except Exception:
-                continue
+    trend_windows = rollup.trend_windows(now_epoch)
+
+    def _trend(metric: str) -> dict:
+        return _trend_from_counts(**{name: counts.get(metric, 0) for name, counts in trend_windows.items()})
 
     metric_cards = []
     queue_open = int(queue_summary["open"])
@@ -379,7 +284,7 @@ def api_insights():
         "details": [f"Health state: {health_state.upper()}", f"Backlog pressure: {backlog_pressure}", f"Failure streak: {failure_streak}", f"Kill switch: {'ON' if kill_switch else 'OFF'}"],
     })
 
-    dm_trends = _trend_snapshot(dm_timestamps, now)
+    dm_trends = _trend("dm_messages")
     metric_cards.append({
         "id": "dm_activity",
         "label": "DM Activity",
@@ -395,8 +300,11 @@ def api_insights():
         ],
     })
 
-    for action_type in sorted(action_type_timestamps.keys()):
-        snapshot = _trend_snapshot(action_type_timestamps[action_type], now)
+    action_types = {
+        key.split(":", 1)[1] for counts in trend_windows.values() for key in counts if key.startswith("action:")
+    }
+    for action_type in sorted(action_types):
+        snapshot = _trend(f"action:{action_type}")
         tone = "teal" if snapshot["day"] > 0 else ""
         if action_type in {"ERROR"} and snapshot["day"] > 0:
             tone = "bad"
@@ -426,5 +334,6 @@ def api_insights():
         "social": social_summary,
         "identities": identities_summary,
         "health": health_summary,
+        "usage": rollup.usage(request.args.get("days", 1, type=int) or 1, now=now_epoch),
         "metric_cards": metric_cards,
     })
@@ -1,4 +1,4 @@
-"""Logs blueprint: recent logs and raw log file endpoints."""
+"""Logs blueprint: recent logs, raw log file and live stream stats endpoints."""
 from __future__ import annotations
 
 from flask import Blueprint, jsonify, request, current_app
@@ -18,6 +18,7 @@ def _app_helpers():
         app._read_jsonl_tail,
         app._read_api_audit_entries,
         app._map_execution_entry_to_log,
+        app._is_stream_progress_entry,
         app._map_api_audit_entry_to_log,
         app._entry_timestamp_sort_key,
         app._log_entry_dedupe_key,
@@ -35,6 +36,7 @@ def get_logs_recent():
         _read_jsonl_tail,
         _read_api_audit_entries,
         _map_execution_entry_to_log,
+        _is_stream_progress_entry,
         _map_api_audit_entry_to_log,
         _entry_timestamp_sort_key,
         _log_entry_dedupe_key,
@@ -47,6 +49,8 @@ def get_logs_recent():
     api_audit_entries = _read_api_audit_entries(max_lines=safe_limit)
     mapped_execution = []
     for raw in execution_entries:
+        if _is_stream_progress_entry(raw):
+            continue  # live output only; the final entry carries the result
         mapped_execution.append(_map_execution_entry_to_log(raw))
     mapped_api_audit = []
     for raw in api_audit_entries:
@@ -100,3 +104,11 @@ def get_logs_raw():
     except Exception as exc:
         return jsonify({'success': False, 'error': str(exc)}), 500
     return current_app.response_class(raw_text, mimetype="text/plain")
+
+
+@bp.route('/logs/stream_stats', methods=['GET'])
+def get_logs_stream_stats():
+    """GET /api/logs/stream_stats - Live log stream counters (published, emitted, dropped entries; batches; clients)."""
+    from vivarium.runtime import control_panel_app as app
+
+    return jsonify({'success': True, **app.LOG_STREAM.stats()})
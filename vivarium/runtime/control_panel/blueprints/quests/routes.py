@@ -7,7 +7,7 @@ from datetime import datetime
 from flask import Blueprint, current_app, jsonify, request
 
 from vivarium.utils import read_json, write_json
-from vivarium.runtime.runtime_contract import normalize_queue, normalize_task
+from vivarium.runtime.queue_store import get_queue_backend
 
 QUEST_DEFAULT_BUDGET = 0.20
 QUEST_DEFAULT_UPFRONT_TIP = 10
@@ -219,10 +219,7 @@ def quest_resume():
     paused_task = quest.get("paused_task")
     if isinstance(paused_task, dict) and paused_task.get("id"):
         queue_file = current_app.config["QUEUE_FILE"]
-        queue = normalize_queue(read_json(queue_file, default={}))
-        if not any(str(t.get("id") or "") == str(paused_task.get("id")) for t in queue.get("tasks", [])):
-            queue.setdefault("tasks", []).append(normalize_task(paused_task))
-            write_json(queue_file, normalize_queue(queue))
+        get_queue_backend(queue_file).add_tasks([paused_task], skip_existing=True)
     quest["paused_task"] = None
     quest["manual_paused"] = False
     quest["status"] = "active"
@@ -6,8 +6,9 @@ from datetime import datetime, timezone
 
 from flask import Blueprint, current_app, jsonify, request
 
-from vivarium.runtime.runtime_contract import normalize_queue, normalize_task
-from vivarium.utils import append_jsonl, read_json, write_json
+from vivarium.runtime.queue_store import get_queue_backend
+from vivarium.runtime.runtime_contract import normalize_task
+from vivarium.runtime.log_index import append_execution_record
 
 bp = Blueprint("queue", __name__, url_prefix="/api")
 
@@ -30,6 +31,13 @@ def _queue_helpers():
     )
 
 
+def _latest_statuses(task_ids) -> dict:
+    """Batch (status, latest record) lookup from the control panel's status index."""
+    from vivarium.runtime.control_panel_app import latest_statuses
+
+    return latest_statuses(task_ids)
+
+
 def _get_one_time_tasks_list() -> list:
     """Fetch one-time task definitions for queue/state contract."""
     try:
@@ -64,17 +72,6 @@ def api_queue_add():
     instruction = (data.get("instruction") or "").strip()
     if not instruction:
         return jsonify({"success": False, "error": "instruction is required"}), 400
-    QUEUE_FILE = current_app.config["QUEUE_FILE"]
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
-    existing_ids = {t.get("id") for t in queue.get("tasks", []) if t.get("id")}
-    if not task_id:
-        task_id = f"task-{int(time.time() * 1000)}"
-    if task_id in existing_ids:
-        base = task_id
-        suffix = 1
-        while f"{base}-{suffix}" in existing_ids:
-            suffix += 1
-        task_id = f"{base}-{suffix}"
     load_ui_settings, _, _, _, _ = _queue_helpers()
     ui_settings = load_ui_settings()
     override_model = bool(ui_settings.get("override_model"))
@@ -84,19 +81,29 @@ def api_queue_add():
     max_budget = float(ui_settings.get("task_max_budget", max(min_budget, 0.10)))
     if max_budget < min_budget:
         max_budget = min_budget
-    task = normalize_task({
-        "id": task_id,
-        "type": "cycle",
-        "prompt": instruction,
-        "min_budget": min_budget,
-        "max_budget": max_budget,
-        "intensity": "medium",
-        "model": task_model,
-        "depends_on": [],
-        "parallel_safe": True,
-    })
-    queue.setdefault("tasks", []).append(task)
-    write_json(QUEUE_FILE, normalize_queue(queue))
+    QUEUE_FILE = current_app.config["QUEUE_FILE"]
+    with get_queue_backend(QUEUE_FILE).transaction() as queue:
+        existing_ids = {t.get("id") for t in queue.get("tasks", []) if t.get("id")}
+        if not task_id:
+            task_id = f"task-{int(time.time() * 1000)}"
+        if task_id in existing_ids:
+            base = task_id
+            suffix = 1
+            while f"{base}-{suffix}" in existing_ids:
+                suffix += 1
+            task_id = f"{base}-{suffix}"
+        task = normalize_task({
+            "id": task_id,
+            "type": "cycle",
+            "prompt": instruction,
+            "min_budget": min_budget,
+            "max_budget": max_budget,
+            "intensity": "medium",
+            "model": task_model,
+            "depends_on": [],
+            "parallel_safe": True,
+        })
+        queue.setdefault("tasks", []).append(task)
     return jsonify({"success": True, "task_id": task_id})
 
 
@@ -113,31 +120,30 @@ def api_queue_update():
         return jsonify({"success": False, "error": "instruction is required"}), 400
 
     QUEUE_FILE = current_app.config["QUEUE_FILE"]
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
-    tasks = list(queue.get("tasks", []))
-    target_idx = None
-    for idx, task in enumerate(tasks):
-        if str(task.get("id") or "").strip() == task_id:
-            target_idx = idx
-            break
-    if target_idx is None:
-        return jsonify({"success": False, "error": "task not found in open queue"}), 404
-
-    final_id = new_task_id or task_id
-    existing_ids = {
-        str(t.get("id") or "").strip()
-        for i, t in enumerate(tasks)
-        if i != target_idx and str(t.get("id") or "").strip()
-    }
-    if final_id in existing_ids:
-        return jsonify({"success": False, "error": f"task id already exists: {final_id}"}), 409
-
-    updated = dict(tasks[target_idx])
-    updated["id"] = final_id
-    updated["prompt"] = instruction
-    tasks[target_idx] = normalize_task(updated)
-    queue["tasks"] = tasks
-    write_json(QUEUE_FILE, normalize_queue(queue))
+    with get_queue_backend(QUEUE_FILE).transaction() as queue:
+        tasks = list(queue.get("tasks", []))
+        target_idx = None
+        for idx, task in enumerate(tasks):
+            if str(task.get("id") or "").strip() == task_id:
+                target_idx = idx
+                break
+        if target_idx is None:
+            return jsonify({"success": False, "error": "task not found in open queue"}), 404
+
+        final_id = new_task_id or task_id
+        existing_ids = {
+            str(t.get("id") or "").strip()
+            for i, t in enumerate(tasks)
+            if i != target_idx and str(t.get("id") or "").strip()
+        }
+        if final_id in existing_ids:
+            return jsonify({"success": False, "error": f"task id already exists: {final_id}"}), 409
+
+        updated = dict(tasks[target_idx])
+        updated["id"] = final_id
+        updated["prompt"] = instruction
+        tasks[target_idx] = normalize_task(updated)
+        queue["tasks"] = tasks
     return jsonify({"success": True, "task_id": final_id})
 
 
@@ -150,19 +156,18 @@ def api_queue_delete():
         return jsonify({"success": False, "error": "task_id is required"}), 400
 
     QUEUE_FILE = current_app.config["QUEUE_FILE"]
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
     removed_from = None
-    for section in ("tasks", "completed", "failed"):
-        items = list(queue.get(section, []))
-        new_items = [item for item in items if str(item.get("id") or "").strip() != task_id]
-        if len(new_items) != len(items):
-            queue[section] = new_items
-            removed_from = section
-            break
+    with get_queue_backend(QUEUE_FILE).transaction() as queue:
+        for section in ("tasks", "completed", "failed"):
+            items = list(queue.get(section, []))
+            new_items = [item for item in items if str(item.get("id") or "").strip() != task_id]
+            if len(new_items) != len(items):
+                queue[section] = new_items
+                removed_from = section
+                break
     if not removed_from:
         return jsonify({"success": False, "error": "task not found"}), 404
 
-    write_json(QUEUE_FILE, normalize_queue(queue))
     return jsonify({"success": True, "task_id": task_id, "removed_from": removed_from})
 
 
@@ -170,17 +175,17 @@ def api_queue_delete():
 def api_queue_state():
     """Return queue tasks for UI visualization, including tasks pending human approval."""
     QUEUE_FILE = current_app.config["QUEUE_FILE"]
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
+    queue = get_queue_backend(QUEUE_FILE).read()
     open_tasks = queue.get("tasks", []) if isinstance(queue.get("tasks"), list) else []
     completed = queue.get("completed", []) if isinstance(queue.get("completed"), list) else []
     failed = queue.get("failed", []) if isinstance(queue.get("failed"), list) else []
-    _, _, _latest_execution_status, _, _ = _queue_helpers()
+    statuses = _latest_statuses(task.get("id") for task in open_tasks[:50] if task.get("id"))
     pending_review = []
     for task in open_tasks[:50]:
         tid = task.get("id")
         if not tid:
             continue
-        status, last_event = _latest_execution_status(tid)
+        status, last_event = statuses[str(tid)]
         if status != "pending_review":
             continue
         pending_review.append({
@@ -292,7 +297,7 @@ def api_queue_task_approve():
     identity_id = str(last_event.get("identity_id") or last_event.get("worker_id") or "").strip()
     QUEUE_FILE = current_app.config["QUEUE_FILE"]
     EXECUTION_LOG = current_app.config["EXECUTION_LOG"]
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
+    queue = get_queue_backend(QUEUE_FILE).read()
     task = next((t for t in queue.get("tasks", []) if t.get("id") == task_id), None)
     if not task:
         return jsonify({"success": False, "error": "Task not found in queue"}), 404
@@ -307,7 +312,7 @@ def api_queue_task_approve():
         "tip_tokens": tip_tokens,
         "feedback_sent": bool(feedback),
     }
-    append_jsonl(EXECUTION_LOG, approved_record)
+    append_execution_record(EXECUTION_LOG, approved_record)
     _apply_queue_outcome(task_id, "approved")
     from vivarium.runtime.worker_runtime import apply_phase5_reward_for_human_approval
     reward_out = apply_phase5_reward_for_human_approval(
@@ -380,7 +385,7 @@ def api_queue_task_requeue():
         }), 409
     QUEUE_FILE = current_app.config["QUEUE_FILE"]
     EXECUTION_LOG = current_app.config["EXECUTION_LOG"]
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
+    queue = get_queue_backend(QUEUE_FILE).read()
     if not any(t.get("id") == task_id for t in queue.get("tasks", [])):
         return jsonify({"success": False, "error": "Task not found in queue"}), 404
     requeue_record = {
@@ -390,7 +395,7 @@ def api_queue_task_requeue():
         "requested_by": "human_operator",
         "reason": "try_again",
     }
-    append_jsonl(EXECUTION_LOG, requeue_record)
+    append_execution_record(EXECUTION_LOG, requeue_record)
     _apply_queue_outcome(task_id, "requeue")
     return jsonify({"success": True, "task_id": task_id})
 
@@ -411,7 +416,7 @@ def api_queue_task_remove():
         }), 409
     QUEUE_FILE = current_app.config["QUEUE_FILE"]
     EXECUTION_LOG = current_app.config["EXECUTION_LOG"]
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
+    queue = get_queue_backend(QUEUE_FILE).read()
     if not any(t.get("id") == task_id for t in queue.get("tasks", [])):
         return jsonify({"success": False, "error": "Task not found in queue"}), 404
     remove_record = {
@@ -421,6 +426,6 @@ def api_queue_task_remove():
         "errors": "Removed by human operator",
         "removed_by": "human_operator",
     }
-    append_jsonl(EXECUTION_LOG, remove_record)
+    append_execution_record(EXECUTION_LOG, remove_record)
     _apply_queue_outcome(task_id, "failed")
     return jsonify({"success": True, "task_id": task_id})
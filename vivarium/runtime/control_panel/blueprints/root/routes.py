@@ -1,16 +1,24 @@
-"""Root blueprint: index and favicon."""
+"""Root blueprint: index, precompiled frontend assets and favicon."""
 from __future__ import annotations
 
-from flask import Blueprint, render_template_string
+from flask import Blueprint
 
-from vivarium.runtime.control_panel.frontend_template import CONTROL_PANEL_HTML
+from vivarium.runtime.control_panel.frontend_assets import INDEX_PAGE, STATIC_ASSETS, asset_response
 
 bp = Blueprint("root", __name__)
 
 
 @bp.route("/")
 def index():
-    return render_template_string(CONTROL_PANEL_HTML)
+    return asset_response(INDEX_PAGE)
+
+
+@bp.route("/assets/<name>")
+def frontend_asset(name: str):
+    asset = STATIC_ASSETS.get(name)
+    if asset is None:
+        return ("", 404)
+    return asset_response(asset)
 
 
 @bp.route("/favicon.ico")
@@ -1,4 +1,4 @@
-"""Stop toggle blueprint: kill switch for runtime (emergency stop)."""
+"""Stop toggle blueprint: kill switch for runtime (emergency stop) and shared budget status."""
 from __future__ import annotations
 
 import json
@@ -7,6 +7,8 @@ from pathlib import Path
 
 from flask import Blueprint, current_app, jsonify
 
+from vivarium.runtime.budget_ledger import SWARM_ACCOUNT, get_budget_ledger
+
 bp = Blueprint('stop_toggle', __name__, url_prefix='/api')
 
 
@@ -71,3 +73,33 @@ def api_toggle_stop():
     if socketio:
         socketio.emit('stop_status', {'stopped': new_status})
     return jsonify({'stopped': new_status})
+
+
+def _budget_limit() -> float:
+    """UI budget limit (same default and floor the resident halt check uses)."""
+    path = current_app.config.get('UI_SETTINGS_FILE')
+    try:
+        with open(path) as f:
+            return max(0.01, float(json.load(f).get('budget_limit', 1.0) or 1.0))
+    except Exception:
+        return 1.0
+
+
+@bp.route('/budget', methods=['GET'])
+def api_budget():
+    """GET /api/budget - All-time spend from the shared budget ledger vs the budget limit."""
+    ledger = get_budget_ledger(
+        current_app.config.get('BUDGET_LEDGER'),
+        seed_log=current_app.config.get('EXECUTION_LOG'),
+    )
+    snapshot = ledger.snapshot(SWARM_ACCOUNT)
+    limit = _budget_limit()
+    return jsonify({
+        'success': True,
+        'spent': round(snapshot['spent'], 6),
+        'reserved': round(snapshot['reserved'], 6),
+        'budget_limit': limit,
+        'remaining': round(max(0.0, limit - snapshot['spent'] - snapshot['reserved']), 6),
+        'cache_hits': snapshot['cache_hits'],
+        'cache_saved': round(snapshot['cache_saved'], 6),
+    })
@@ -5,6 +5,8 @@ import shutil
 
 from flask import Blueprint, jsonify, request
 
+from vivarium.runtime.queue_store import get_queue_backend
+
 bp = Blueprint("system", __name__, url_prefix="/api")
 
 
@@ -73,7 +75,7 @@ def api_system_fresh_reset():
             "completed": [],
             "failed": [],
         }
-        write_json(QUEUE_FILE, fresh_queue)
+        get_queue_backend(QUEUE_FILE).replace(fresh_queue)
 
         local_swarm_dir = CODE_ROOT / ".swarm"
         local_swarm_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,138 @@
+"""
+Precompiled, cacheable control panel frontend.
+
+``CONTROL_PANEL_HTML`` used to go through ``render_template_string`` on every
+page load: Jinja re-parsed ~250 KB of template and the page went out
+uncompressed with ``Cache-Control: no-store``. At import this module:
+
+- renders the template once (it takes no per-request context);
+- moves the inline ``<style>`` and the main ``<script>`` into
+  ``panel.<hash>.css`` / ``panel.<hash>.js``, served under ``/assets/`` with
+  content-hash ETags and immutable caching (a changed file gets a new name);
+- precompresses every asset with gzip, and brotli when the ``brotli``
+  package is installed.
+
+The page itself is revalidated on each load (``no-cache`` + ETag), so a reload
+costs a 304 for the page and nothing for the assets.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+from flask import Response, request
+from jinja2 import Template
+
+from vivarium.runtime.control_panel.frontend_template import CONTROL_PANEL_HTML
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+ASSET_URL_PREFIX = "/assets/"
+# Hashed asset names never change content, so browsers may keep them for a year.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# The page names the current assets, so it is revalidated on every load.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class FrontendAsset:
+    name: str
+    mimetype: str
+    body: bytes
+    digest: str
+    cache_control: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def etag(self, encoding: str = "") -> str:
+        return f"{self.digest}-{encoding}" if encoding else self.digest
+
+
+def build_asset(name: str, mimetype: str, text: str, cache_control: str) -> FrontendAsset:
+    """Encode ``text`` once and precompress it for every supported content coding."""
+    body = text.encode("utf-8")
+    encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if BROTLI_AVAILABLE:
+        encoded["br"] = brotli.compress(body, quality=11)
+    return FrontendAsset(
+        name=name,
+        mimetype=mimetype,
+        body=body,
+        digest=hashlib.sha256(body).hexdigest()[:16],
+        cache_control=cache_control,
+        encoded=encoded,
+    )
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+def split_inline_assets(html: str) -> Tuple[str, str, str]:
+    """
+    Return (page, css, js): the head ``<style>`` block and the script block
+    that closes ``<body>``, with the page linking to their hashed names.
+    """
+    head_end = html.index("</head>")
+    style_open = html.index("<style>")
+    style_close = html.index("</style>", style_open)
+    script_open = html.rindex("<script>")
+    script_close = html.index("</script>", script_open)
+    if style_close > head_end or not html[script_close + len("</script>"):].lstrip().startswith("</body>"):
+        raise ValueError("control panel template layout changed: expected <style> in <head> and a closing <script>")
+
+    css = html[style_open + len("<style>"):style_close]
+    js = html[script_open + len("<script>"):script_close]
+    css_link = f'<link rel="stylesheet" href="{ASSET_URL_PREFIX}panel.{_content_hash(css)}.css">'
+    js_tag = f'<script src="{ASSET_URL_PREFIX}panel.{_content_hash(js)}.js"></script>'
+    page = (
+        html[:style_open]
+        + css_link
+        + html[style_close + len("</style>"):script_open]
+        + js_tag
+        + html[script_close + len("</script>"):]
+    )
+    return page, css, js
+
+
+def build_frontend(template_source: str) -> Tuple[FrontendAsset, Dict[str, FrontendAsset]]:
+    """Render the template once and split it into the page plus hashed static assets."""
+    page, css, js = split_inline_assets(Template(template_source).render())
+    assets = {}
+    for ext, mimetype, text in (("css", "text/css", css), ("js", "application/javascript", js)):
+        name = f"panel.{_content_hash(text)}.{ext}"
+        assets[name] = build_asset(name, mimetype, text, IMMUTABLE_CACHE_CONTROL)
+    return build_asset("index.html", "text/html", page, REVALIDATE_CACHE_CONTROL), assets
+
+
+INDEX_PAGE, STATIC_ASSETS = build_frontend(CONTROL_PANEL_HTML)
+
+
+def _preferred_encoding(asset: FrontendAsset) -> str:
+    accepted = request.accept_encodings
+    for encoding in ("br", "gzip"):
+        if encoding in asset.encoded and accepted.quality(encoding) > 0:
+            return encoding
+    return ""
+
+
+def asset_response(asset: FrontendAsset) -> Response:
+    """Serve ``asset`` in the best accepted encoding; 304 when the client already has it."""
+    encoding = _preferred_encoding(asset)
+    tags = [asset.etag(), *(asset.etag(enc) for enc in asset.encoded)]
+    if any(request.if_none_match.contains(tag) for tag in tags):
+        response = Response(status=304)
+    else:
+        body = asset.encoded[encoding] if encoding else asset.body
+        response = Response(body, mimetype=asset.mimetype)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(asset.etag(encoding))
+    response.headers["Cache-Control"] = asset.cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
@@ -577,6 +577,25 @@ CONTROL_PANEL_HTML = '''
             display: flex;
             gap: 1rem;
         }
+        .live-output {
+            flex: 0 0 auto;
+            max-height: 30%;
+            overflow-y: auto;
+        }
+        .live-output-task {
+            padding: 0.4rem 1rem;
+            border-bottom: 1px solid var(--border);
+            font-size: 0.8rem;
+        }
+        .live-output-task .live-output-head {
+            color: var(--teal);
+            margin-bottom: 0.2rem;
+        }
+        .live-output-task pre {
+            margin: 0;
+            white-space: pre-wrap;
+            color: var(--text-dim);
+        }
         .log-empty {
             color: var(--text-dim);
             padding: 0.8rem 0.2rem;
@@ -1584,6 +1603,7 @@ CONTROL_PANEL_HTML = '''
                 <span style="min-width: 80px;">Model</span>
                 <span style="flex: 1;">Detail</span>
             </div>
+            <div class="live-output" id="liveOutput"></div>
             <div class="log-container" id="logContainer">
                 <div id="logEmptyState" class="log-empty">Waiting for log entries...</div>
             </div>
@@ -1818,8 +1838,22 @@ CONTROL_PANEL_HTML = '''
                 if (dot) dot.classList.add('stopped');
             });
 
-            socket.on('log_entry', (entry) => {
-                addLogEntry(entry);
+            // One batch per watcher tick; ack it so the server sends the next.
+            socket.on('log_batch', (payload, ack) => {
+                const items = (payload && Array.isArray(payload.items)) ? payload.items : [];
+                items.forEach(item => {
+                    if (item.type === 'task_output') {
+                        updateLiveOutput(item.entry);
+                    } else {
+                        addLogEntry(item.entry);
+                        clearLiveOutputForEntry(item.entry);
+                    }
+                });
+                if (payload && payload.summary) {
+                    showToast(`Live log fell behind: ${payload.summary.dropped} entries skipped, reloading recent logs`, 'info');
+                    loadRecentLogs();
+                }
+                if (typeof ack === 'function') ack();
             });
 
             socket.on('identities', (data) => {
@@ -1839,6 +1873,46 @@ CONTROL_PANEL_HTML = '''
             console.warn('socket.io unavailable; using polling-only UI mode');
         }
 
+        // Streamed partial output of running tasks; a task's block is dropped
+        // once its completed/failed execution entry arrives.
+        function updateLiveOutput(data) {
+            const taskId = data && data.task_id;
+            const container = document.getElementById('liveOutput');
+            if (!taskId || !container) return;
+            let block = container.querySelector(`[data-task-id="${CSS.escape(taskId)}"]`);
+            if (!block) {
+                block = document.createElement('div');
+                block.className = 'live-output-task';
+                block.dataset.taskId = taskId;
+                block.innerHTML = '<div class="live-output-head"></div><pre></pre>';
+                container.appendChild(block);
+            }
+            const tokens = Number.isFinite(Number(data.output_tokens)) ? ` (${Number(data.output_tokens)}t)` : '';
+            block.querySelector('.live-output-head').textContent = `${data.actor || 'worker'} · ${taskId}${tokens}`;
+            const pre = block.querySelector('pre');
+            if (typeof data.delta === 'string') {
+                // Deltas are appended; if one was missed (reload, dropped batch) restart at this chunk.
+                const offset = Number(data.offset) || 0;
+                const known = Number(block.dataset.chars || 0);
+                const text = (offset === known ? pre.textContent : (offset ? '…' : '')) + data.delta;
+                pre.textContent = text.length > 4000 ? text.slice(-4000) : text;
+                block.dataset.chars = String(Number(data.chars) || offset + data.delta.length);
+            } else {
+                pre.textContent = data.partial_output || '';
+            }
+            pre.scrollTop = pre.scrollHeight;
+        }
+
+        function clearLiveOutputForEntry(entry) {
+            if (!entry || entry.action_type !== 'EXECUTION') return;
+            if (entry.action !== 'completed' && entry.action !== 'failed') return;
+            const taskId = entry.metadata && entry.metadata.task_id;
+            const container = document.getElementById('liveOutput');
+            if (!taskId || !container) return;
+            const block = container.querySelector(`[data-task-id="${CSS.escape(taskId)}"]`);
+            if (block) block.remove();
+        }
+
         function addLogEntry(entry) {
             const entryKey = [
                 entry.timestamp || '',
@@ -0,0 +1,132 @@
+"""
+Batched, backpressured Socket.IO delivery of live log entries.
+
+LogWatcher used to emit one ``log_entry`` / ``task_output`` event per log line
+to every client, so a burst of 5k lines meant 5k separately serialized emits.
+``LogStream`` keeps a bounded buffer per connected client instead:
+
+- Entries published during a watcher tick go out as one ``log_batch`` event,
+  ``{"items": [{"type": "log_entry" | "task_output", "entry": {...}}, ...]}``,
+  in log order.
+- A client gets its next batch only after acknowledging the previous one
+  (or after ``ack_timeout`` seconds), so a slow client never has more than
+  one batch in flight.
+- While a client lags, new entries wait in its buffer; beyond
+  ``buffer_size`` the oldest are dropped and the next batch carries
+  ``summary = {"dropped": n, "by_type": {...}}`` so the UI can show the gap
+  and backfill from ``/api/logs/recent``.
+
+``stats()`` reports published, emitted and dropped entry counts.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from vivarium.runtime.config import LOG_STREAM_ACK_TIMEOUT_SECONDS, LOG_STREAM_CLIENT_BUFFER
+
+BATCH_EVENT = "log_batch"
+
+
+class _ClientBuffer:
+    __slots__ = ("items", "dropped", "in_flight_since")
+
+    def __init__(self, size: int):
+        self.items: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self.dropped: Counter = Counter()
+        self.in_flight_since: Optional[float] = None
+
+
+class LogStream:
+    """Per-client bounded buffers drained as one acknowledged batch per tick."""
+
+    def __init__(
+        self,
+        socketio_instance,
+        buffer_size: int = LOG_STREAM_CLIENT_BUFFER,
+        ack_timeout: float = LOG_STREAM_ACK_TIMEOUT_SECONDS,
+        on_ack: Optional[Callable[[], None]] = None,
+    ):
+        self.socketio = socketio_instance
+        self.buffer_size = max(1, int(buffer_size))
+        self.ack_timeout = max(0.0, float(ack_timeout))
+        self.on_ack = on_ack
+        self._lock = threading.Lock()
+        self._clients: Dict[str, _ClientBuffer] = {}
+        self._counters = Counter({"published": 0, "emitted": 0, "dropped": 0, "batches": 0, "summaries": 0})
+
+    def connect(self, sid: str) -> None:
+        with self._lock:
+            self._clients.setdefault(sid, _ClientBuffer(self.buffer_size))
+
+    def disconnect(self, sid: str) -> None:
+        with self._lock:
+            self._clients.pop(sid, None)
+
+    def publish(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Queue ``(event type, entry)`` pairs for every connected client."""
+        wrapped = [{"type": kind, "entry": entry} for kind, entry in items]
+        if not wrapped:
+            return
+        with self._lock:
+            self._counters["published"] += len(wrapped)
+            for client in self._clients.values():
+                for item in wrapped:
+                    if len(client.items) == self.buffer_size:
+                        evicted = client.items.popleft()
+                        client.dropped[evicted["type"]] += 1
+                        self._counters["dropped"] += 1
+                    client.items.append(item)
+
+    def has_in_flight(self) -> bool:
+        with self._lock:
+            return any(client.in_flight_since is not None for client in self._clients.values())
+
+    def flush(self) -> int:
+        """Emit one batch to each client that has entries and no unacknowledged batch. Returns batches sent."""
+        now = time.monotonic()
+        outgoing: List[Tuple[str, Dict[str, Any]]] = []
+        with self._lock:
+            for sid, client in self._clients.items():
+                if client.in_flight_since is not None and now - client.in_flight_since < self.ack_timeout:
+                    continue
+                if not client.items and not client.dropped:
+                    client.in_flight_since = None
+                    continue
+                payload: Dict[str, Any] = {"items": list(client.items)}
+                if client.dropped:
+                    payload["summary"] = {
+                        "dropped": sum(client.dropped.values()),
+                        "by_type": dict(client.dropped),
+                    }
+                    self._counters["summaries"] += 1
+                    client.dropped = Counter()
+                client.items.clear()
+                client.in_flight_since = now
+                self._counters["batches"] += 1
+                self._counters["emitted"] += len(payload["items"])
+                outgoing.append((sid, payload))
+        for sid, payload in outgoing:
+            try:
+                self.socketio.emit(BATCH_EVENT, payload, to=sid, callback=lambda *_args, sid=sid: self._acked(sid))
+            except Exception:
+                self._acked(sid)
+        return len(outgoing)
+
+    def _acked(self, sid: str) -> None:
+        with self._lock:
+            client = self._clients.get(sid)
+            if client is not None:
+                client.in_flight_since = None
+        if self.on_ack is not None:
+            self.on_ack()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "clients": len(self._clients),
+                "buffered": sum(len(client.items) for client in self._clients.values()),
+            }
@@ -41,5 +41,6 @@ def apply_security_headers(response):
     response.headers["X-Frame-Options"] = "DENY"
     response.headers["X-Content-Type-Options"] = "nosniff"
     response.headers["Referrer-Policy"] = "no-referrer"
-    response.headers["Cache-Control"] = "no-store"
+    # Frontend assets set their own caching; everything else stays uncached.
+    response.headers.setdefault("Cache-Control", "no-store")
     return response
@@ -23,9 +23,9 @@ import subprocess
 import sys
 import time
 import threading
-from collections import Counter, deque
+from collections import Counter
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from flask import Flask, render_template_string, jsonify, request
 from flask_socketio import SocketIO, emit
 from watchdog.observers import Observer
@@ -33,9 +33,14 @@ from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 from vivarium.runtime import config as runtime_config
 from vivarium.runtime import resident_onboarding
+from vivarium.runtime.insights_rollup import InsightsRollup
+from vivarium.runtime.log_index import COMPACT_STATUS_FIELDS, ExecutionStatusIndex, read_jsonl_tail
+from vivarium.runtime.queue_store import get_queue_backend
 from vivarium.runtime.runtime_contract import normalize_queue, normalize_task
 from vivarium.runtime.vivarium_scope import (
     AUDIT_ROOT,
+    BUDGET_LEDGER_FILE,
+    INSIGHTS_ROLLUP_FILE,
     MUTABLE_ROOT,
     MUTABLE_SWARM_DIR,
     SECURITY_ROOT,
@@ -43,6 +48,7 @@ from vivarium.runtime.vivarium_scope import (
 )
 from vivarium.utils import read_json, write_json, get_timestamp, append_jsonl
 from vivarium.runtime.control_panel.frontend_template import CONTROL_PANEL_HTML
+from vivarium.runtime.control_panel.log_stream import LogStream
 from vivarium.runtime.control_panel.middleware import (
     enforce_localhost_only,
     apply_security_headers,
@@ -66,6 +72,7 @@ CODE_ROOT = Path(__file__).resolve().parents[2]
 WORKSPACE = MUTABLE_ROOT
 ACTION_LOG = AUDIT_ROOT / "action_log.jsonl"
 EXECUTION_LOG = AUDIT_ROOT / "execution_log.jsonl"
+STREAM_PROGRESS_LOG = AUDIT_ROOT / "stream_progress.jsonl"
 QUEUE_FILE = WORKSPACE / "queue.json"
 KILL_SWITCH = MUTABLE_SWARM_DIR / "kill_switch.json"
 FREE_TIME_BALANCES = MUTABLE_SWARM_DIR / "free_time_balances.json"
@@ -98,6 +105,7 @@ app.config.update({
     'EXECUTION_LOG': EXECUTION_LOG,
     'QUEUE_FILE': QUEUE_FILE,
     'KILL_SWITCH': KILL_SWITCH,
+    'BUDGET_LEDGER': os.environ.get("VIVARIUM_BUDGET_LEDGER") or BUDGET_LEDGER_FILE,
     'FREE_TIME_BALANCES': FREE_TIME_BALANCES,
     'IDENTITIES_DIR': IDENTITIES_DIR,
     'DISCUSSIONS_DIR': DISCUSSIONS_DIR,
@@ -147,7 +155,10 @@ def handle_500(e):
 # Track last read position (lock guards against race with watcher thread + poll)
 last_log_position = 0
 last_execution_log_position = 0
+last_stream_progress_position = 0
 _log_watcher_lock = threading.Lock()
+# Per-client batched delivery of watcher entries; see control_panel/log_stream.py.
+LOG_STREAM = LogStream(socketio)
 
 # Centralized policy limits (UI/runtime tuning).
 RESIDENT_COUNT_MIN = 1
@@ -381,57 +392,102 @@ CONTROL_PANEL_PORT = _safe_int_env("VIVARIUM_CONTROL_PANEL_PORT", 8421)
 
 
 class LogWatcher(FileSystemEventHandler):
-    """Watch action/execution logs and stream entries to UI."""
+    """Watch action/execution logs and stream entries to UI in batches (see log_stream.LogStream)."""
 
-    def __init__(self, socketio_instance):
-        self.socketio = socketio_instance
-        self.last_position = 0
-
-    def on_modified(self, event):
-        try:
-            name = Path(event.src_path).name
-        except Exception:
-            name = event.src_path or ""
-        if name == "action_log.jsonl" or name == "execution_log.jsonl":
-            self.send_new_entries()
+    WATCHED_NAMES = {"action_log.jsonl", "execution_log.jsonl", "stream_progress.jsonl"}
 
-    def send_new_entries(self):
+    def __init__(self, socketio_instance, stream=None):
+        self.socketio = socketio_instance
+        self.stream = stream if stream is not None else LogStream(socketio_instance)
+        self.wake = threading.Event()
+        self._changed = threading.Event()
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+        if any(path and Path(path).name in self.WATCHED_NAMES for path in paths):
+            self._changed.set()
+            self.wake.set()
+
+    def skip_to_end(self):
+        """Start streaming from the current end of the logs (history comes from /api/logs/recent)."""
         global last_log_position
         global last_execution_log_position
-        action_lines = []
-        exec_lines = []
+        global last_stream_progress_position
         with _log_watcher_lock:
-            if not ACTION_LOG.exists():
-                last_log_position = 0
-            else:
-                size = ACTION_LOG.stat().st_size
-                if size < last_log_position:
-                    last_log_position = 0
-                with open(ACTION_LOG, "r", encoding="utf-8") as f:
-                    f.seek(last_log_position)
-                    action_lines = f.readlines()
-                    last_log_position = f.tell()
-            if not EXECUTION_LOG.exists():
-                last_execution_log_position = 0
-            else:
-                size = EXECUTION_LOG.stat().st_size
-                if size < last_execution_log_position:
-                    last_execution_log_position = 0
-                with open(EXECUTION_LOG, "r", encoding="utf-8") as f:
-                    f.seek(last_execution_log_position)
-                    exec_lines = f.readlines()
-                    last_execution_log_position = f.tell()
+            last_log_position = ACTION_LOG.stat().st_size if ACTION_LOG.exists() else 0
+            last_execution_log_position = EXECUTION_LOG.stat().st_size if EXECUTION_LOG.exists() else 0
+            last_stream_progress_position = STREAM_PROGRESS_LOG.stat().st_size if STREAM_PROGRESS_LOG.exists() else 0
+
+    @staticmethod
+    def _read_appended(path, position):
+        """Lines appended to ``path`` since ``position``; restarts at 0 after truncation or rotation."""
+        if not path.exists():
+            return [], 0
+        if path.stat().st_size < position:
+            position = 0
+        with open(path, "r", encoding="utf-8") as f:
+            f.seek(position)
+            lines = f.readlines()
+            return lines, f.tell()
+
+    def read_new_entries(self):
+        """Return ``[(event, entry), ...]`` for lines appended since the last read, in log order."""
+        global last_log_position
+        global last_execution_log_position
+        global last_stream_progress_position
+        with _log_watcher_lock:
+            action_lines, last_log_position = self._read_appended(ACTION_LOG, last_log_position)
+            exec_lines, last_execution_log_position = self._read_appended(EXECUTION_LOG, last_execution_log_position)
+            progress_lines, last_stream_progress_position = self._read_appended(
+                STREAM_PROGRESS_LOG, last_stream_progress_position
+            )
+        items = []
         for line in action_lines:
             try:
-                entry = json.loads(line.strip())
-                self.socketio.emit("log_entry", entry)
+                items.append(("log_entry", json.loads(line.strip())))
+            except Exception:
+                pass
+        # Live output before execution records: a task's last delta is written before
+        # its completion, which clears the live-output block in the UI.
+        for line in progress_lines:
+            try:
+                items.append(("task_output", _map_stream_progress_entry(json.loads(line.strip()))))
             except Exception:
                 pass
         for line in exec_lines:
             try:
                 raw = json.loads(line.strip())
-                mapped = _map_execution_entry_to_log(raw)
-                self.socketio.emit("log_entry", mapped)
+                if _is_stream_progress_entry(raw):
+                    items.append(("task_output", _map_stream_progress_entry(raw)))
+                    continue
+                items.append(("log_entry", _map_execution_entry_to_log(raw)))
+            except Exception:
+                pass
+        return items
+
+    def send_new_entries(self):
+        self.stream.publish(self.read_new_entries())
+        self.stream.flush()
+
+    def run(self, tick_seconds=None):
+        """
+        Sleep until a file event (or a batch ack) wakes us, then wait one tick so
+        a burst of appends becomes one batch. Only wakes on a timer while a
+        batch is awaiting its ack, so an ack timeout still frees the client.
+        """
+        tick = runtime_config.LOG_STREAM_TICK_SECONDS if tick_seconds is None else tick_seconds
+        while True:
+            self.wake.wait(timeout=self.stream.ack_timeout if self.stream.has_in_flight() else None)
+            time.sleep(tick)
+            self.wake.clear()
+            try:
+                if self._changed.is_set():
+                    self._changed.clear()
+                    self.send_new_entries()
+                else:
+                    self.stream.flush()
             except Exception:
                 pass
 
@@ -505,9 +561,15 @@ def on_socket_connect():
     """Reject websocket connections from non-loopback clients."""
     if not is_request_from_loopback():
         return False
+    LOG_STREAM.connect(request.sid)
     return None
 
 
+@socketio.on('disconnect')
+def on_socket_disconnect(*_args):
+    LOG_STREAM.disconnect(request.sid)
+
+
 # Identity API routes moved to blueprints/identities/routes.py
 # Stop toggle routes moved to blueprints/stop_toggle/routes.py
 
@@ -896,14 +958,14 @@ def _enqueue_identity_task(
     max_budget: float,
     model: str | None = None,
 ) -> dict:
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
     task_model = (str(model).strip() if model else None) or None
     if task_model is None:
         ui_settings = load_ui_settings()
         override_model = bool(ui_settings.get("override_model"))
         ui_model = str(ui_settings.get("model") or "auto")
         task_model = ui_model if override_model and ui_model != "auto" else None
-    queue.setdefault("tasks", []).append(
+    backend = get_queue_backend(QUEUE_FILE)
+    backend.add_tasks([
         normalize_task(
             {
                 "id": task_id,
@@ -919,24 +981,21 @@ def _enqueue_identity_task(
                 "parallel_safe": True,
             }
         )
-    )
-    write_json(QUEUE_FILE, normalize_queue(queue))
-    return queue
+    ])
+    return backend.read()
 
 
 def _remove_open_queue_task(task_id: str) -> tuple[dict | None, dict]:
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
-    tasks = list(queue.get("tasks", []))
     picked = None
-    kept = []
-    for task in tasks:
-        if picked is None and str(task.get("id") or "") == str(task_id):
-            picked = dict(task)
-            continue
-        kept.append(task)
-    queue["tasks"] = kept
-    write_json(QUEUE_FILE, normalize_queue(queue))
-    return picked, queue
+    with get_queue_backend(QUEUE_FILE).transaction() as queue:
+        kept = []
+        for task in list(queue.get("tasks", [])):
+            if picked is None and str(task.get("id") or "") == str(task_id):
+                picked = dict(task)
+                continue
+            kept.append(task)
+        queue["tasks"] = kept
+    return picked, normalize_queue(queue)
 
 
 def _apply_queue_outcome(task_id: str, final_status: str) -> None:
@@ -945,24 +1004,59 @@ def _apply_queue_outcome(task_id: str, final_status: str) -> None:
     _impl(task_id, final_status)
 
 
+# Latest status per task for quests and queue review, tailed incrementally
+# from EXECUTION_LOG. Besides the compact status fields it keeps the two
+# fields the panel shows next to a status; it snapshots to its own sidecar
+# so it never overwrites the worker's ``.status.json``.
+PANEL_STATUS_FIELDS = COMPACT_STATUS_FIELDS + ("result_summary", "errors")
+_EXECUTION_STATUS_STATE: dict = {"index": None}
+_EXECUTION_STATUS_LOCK = threading.Lock()
+
+
+def _execution_status_index() -> ExecutionStatusIndex:
+    with _EXECUTION_STATUS_LOCK:
+        index = _EXECUTION_STATUS_STATE["index"]
+        if index is None or index.log_path != EXECUTION_LOG:
+            if index is not None:
+                index.flush()
+            index = ExecutionStatusIndex(
+                EXECUTION_LOG,
+                snapshot_path=EXECUTION_LOG.with_name(f"{EXECUTION_LOG.name}.panel_status.json"),
+                fields=PANEL_STATUS_FIELDS,
+            )
+            _EXECUTION_STATUS_STATE["index"] = index
+        return index
+
+
+def latest_statuses(task_ids) -> dict[str, tuple[str, dict]]:
+    """Map each task id to (latest status, latest record); unknown tasks get ("", {})."""
+    ids = [str(task_id) for task_id in task_ids]
+    index = _execution_status_index()
+    try:
+        index.poll()
+    except OSError:
+        pass
+    records = index.latest(ids)
+    out = {}
+    for task_id in ids:
+        latest = records.get(task_id) or {}
+        out[task_id] = (str(latest.get("status") or ""), latest)
+    return out
+
+
 def _latest_execution_status(task_id: str) -> tuple[str, dict]:
-    entries = _read_jsonl_tail(EXECUTION_LOG, max_lines=12000)
-    latest = {}
-    for entry in entries:
-        if str(entry.get("task_id") or "") == str(task_id):
-            latest = entry
-    status = str(latest.get("status") or "")
-    return status, latest
+    return latest_statuses([task_id])[str(task_id)]
 
 
 def _refresh_mailbox_quests_state() -> list[dict]:
     quests = _load_mailbox_quests()
     changed = False
+    statuses = latest_statuses(str(quest.get("task_id") or "").strip() for quest in quests)
     for quest in quests:
         task_id = str(quest.get("task_id") or "").strip()
         if not task_id:
             continue
-        status, latest = _latest_execution_status(task_id)
+        status, latest = statuses[task_id]
         previous = str(quest.get("status") or "")
         mapped = previous
         if status in {"queued", "in_progress", "pending_review", "requeue"}:
@@ -1023,11 +1117,6 @@ def enqueue_human_suggestion(request_text: str) -> str | None:
     suggestion = (request_text or "").strip()
     if not suggestion:
         return None
-    queue = normalize_queue(read_json(QUEUE_FILE, default={}))
-    task_id = f"suggestion-{int(time.time() * 1000)}"
-    existing_ids = {t.get("id") for t in queue.get("tasks", []) if t.get("id")}
-    while task_id in existing_ids:
-        task_id = f"suggestion-{int(time.time() * 1000)}"
     ui_settings = load_ui_settings()
     override_model = bool(ui_settings.get("override_model"))
     model = str(ui_settings.get("model") or "auto")
@@ -1039,19 +1128,23 @@ def enqueue_human_suggestion(request_text: str) -> str | None:
     max_budget = max(max_budget, SUGGESTION_MAX_BUDGET)
     if max_budget < min_budget:
         max_budget = min_budget
-    task = normalize_task({
-        "id": task_id,
-        "type": "cycle",
-        "prompt": suggestion,
-        "min_budget": min_budget,
-        "max_budget": max_budget,
-        "intensity": "medium",
-        "model": task_model,
-        "depends_on": [],
-        "parallel_safe": True,
-    })
-    queue.setdefault("tasks", []).append(task)
-    write_json(QUEUE_FILE, normalize_queue(queue))
+    with get_queue_backend(QUEUE_FILE).transaction() as queue:
+        task_id = f"suggestion-{int(time.time() * 1000)}"
+        existing_ids = {t.get("id") for t in queue.get("tasks", []) if t.get("id")}
+        while task_id in existing_ids:
+            task_id = f"suggestion-{int(time.time() * 1000)}"
+        task = normalize_task({
+            "id": task_id,
+            "type": "cycle",
+            "prompt": suggestion,
+            "min_budget": min_budget,
+            "max_budget": max_budget,
+            "intensity": "medium",
+            "model": task_model,
+            "depends_on": [],
+            "parallel_safe": True,
+        })
+        queue.setdefault("tasks", []).append(task)
     return task_id
 
 
@@ -1257,9 +1350,10 @@ def add_completed_request(request_text: str):
 
 def _reset_log_watcher_positions() -> None:
     """Reset log watcher positions for fresh reset maintenance."""
-    global last_log_position, last_execution_log_position
+    global last_log_position, last_execution_log_position, last_stream_progress_position
     last_log_position = 0
     last_execution_log_position = 0
+    last_stream_progress_position = 0
 
 
 def _dm_enrichment():
@@ -1286,26 +1380,9 @@ def _parse_iso_timestamp(value):
     return parsed
 
 
-def _read_jsonl_tail(path: Path, max_lines: int = 12000):
-    if not path.exists():
-        return []
-    lines = deque(maxlen=max_lines)
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            for line in f:
-                entry = line.strip()
-                if entry:
-                    lines.append(entry)
-    except Exception:
-        return []
-
-    payloads = []
-    for line in lines:
-        try:
-            payloads.append(json.loads(line))
-        except Exception:
-            continue
-    return payloads
+def _read_jsonl_tail(path: Path, max_lines: int = 12000, match=None, max_scan_lines=None):
+    """Last ``max_lines`` records of ``path`` (optionally filtered), read backwards from EOF."""
+    return read_jsonl_tail(path, max_lines, match=match, max_scan_lines=max_scan_lines)
 
 
 def _format_usd_display(amount: float) -> str:
@@ -1347,16 +1424,6 @@ def _log_entry_dedupe_key(entry: dict) -> tuple[str, str, str, str, str, str]:
     )
 
 
-def _extract_usd_cost(detail: str) -> float:
-    matches = re.findall(r"\$([0-9]+(?:\.[0-9]+)?)", str(detail or ""))
-    if not matches:
-        return 0.0
-    try:
-        return float(matches[-1])
-    except (TypeError, ValueError):
-        return 0.0
-
-
 def _extract_token_count(detail: str) -> int:
     match = re.search(r"([0-9]+)\s*tokens?\b", str(detail or ""), flags=re.IGNORECASE)
     if not match:
@@ -1490,6 +1557,27 @@ def _map_api_audit_entry_to_log(raw: dict) -> dict:
     }
 
 
+def _is_stream_progress_entry(raw: dict) -> bool:
+    """Partial-output events older residents appended to the execution log while streaming."""
+    return bool(raw.get("stream_progress"))
+
+
+def _map_stream_progress_entry(raw: dict) -> dict:
+    """Live-output record for the UI: a ``delta`` at ``offset`` (stream_progress.jsonl) or a legacy ``partial_output``."""
+    entry = {
+        "timestamp": raw.get("timestamp"),
+        "task_id": raw.get("task_id"),
+        "actor": raw.get("worker_id") or raw.get("identity_id") or "worker",
+        "output_tokens": raw.get("output_tokens"),
+        "model": raw.get("model"),
+    }
+    if "delta" in raw:
+        entry.update(delta=raw.get("delta") or "", offset=raw.get("offset") or 0, chars=raw.get("chars"))
+    else:
+        entry["partial_output"] = raw.get("partial_output") or ""
+    return entry
+
+
 def _map_execution_entry_to_log(raw: dict) -> dict:
     meta = {"task_id": raw.get("task_id")}
     if raw.get("model"):
@@ -1522,55 +1610,17 @@ def _map_execution_entry_to_log(raw: dict) -> dict:
     }
 
 
-def _count_discussion_messages_since(cutoff: datetime) -> int:
-    total = 0
-    if not DISCUSSIONS_DIR.exists():
-        return total
-    for room_file in DISCUSSIONS_DIR.glob("*.jsonl"):
-        try:
-            with open(room_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        payload = json.loads(line)
-                    except Exception:
-                        continue
-                    timestamp = _parse_iso_timestamp(payload.get("timestamp"))
-                    if timestamp and timestamp >= cutoff:
-                        total += 1
-        except Exception:
-            continue
-    return total
-
-
-def _count_in_window(timestamps: list[datetime], start: datetime, end: datetime | None = None) -> int:
-    if end is None:
-        return sum(1 for ts in timestamps if ts >= start)
-    return sum(1 for ts in timestamps if start <= ts < end)
-
-
 def _pct_change(current: float, baseline: float | None) -> float | None:
     if baseline is None or baseline <= 0:
         return None
     return round(((current - baseline) / baseline) * 100.0, 1)
 
 
-def _trend_snapshot(timestamps: list[datetime], now: datetime) -> dict:
-    day_start = now - timedelta(days=1)
-    week_start = now - timedelta(days=7)
-    month_start = now - timedelta(days=30)
-    prev_3w_start = now - timedelta(days=28)
-    prev_3m_start = now - timedelta(days=120)
-
-    day_count = _count_in_window(timestamps, day_start)
-    week_count = _count_in_window(timestamps, week_start)
-    month_count = _count_in_window(timestamps, month_start)
-
-    prev_3w_total = _count_in_window(timestamps, prev_3w_start, week_start)
-    prev_3m_total = _count_in_window(timestamps, prev_3m_start, month_start)
-    prev_daily_3w_avg = prev_3w_total / 21.0 if prev_3w_total > 0 else None
-    prev_daily_3m_avg = prev_3m_total / 90.0 if prev_3m_total > 0 else None
+def _trend_from_counts(day: float, week: float, month: float, prev_3w: float, prev_3m: float) -> dict:
+    """Day/week/month counts plus day change vs the 3-week and 3-month daily baselines."""
+    day_count, week_count, month_count = int(day), int(week), int(month)
+    prev_daily_3w_avg = prev_3w / 21.0 if prev_3w > 0 else None
+    prev_daily_3m_avg = prev_3m / 90.0 if prev_3m > 0 else None
 
     return {
         "day": day_count,
@@ -1583,32 +1633,64 @@ def _trend_snapshot(timestamps: list[datetime], now: datetime) -> dict:
     }
 
 
+# Insights rollup: hour/day bucketed counters over the execution, action, API
+# audit and discussion logs, persisted to INSIGHTS_ROLLUP_FILE.
+_INSIGHTS_ROLLUP_STATE: dict = {"rollup": None}
+_INSIGHTS_ROLLUP_LOCK = threading.Lock()
+
+
+def _insights_rollup() -> InsightsRollup:
+    """Rollup for the current log paths, polled up to date."""
+    with _INSIGHTS_ROLLUP_LOCK:
+        rollup = _INSIGHTS_ROLLUP_STATE["rollup"]
+        sources = (
+            EXECUTION_LOG,
+            ACTION_LOG,
+            (API_AUDIT_LOG_FILE, LEGACY_API_AUDIT_LOG_FILE),
+            DISCUSSIONS_DIR,
+            INSIGHTS_ROLLUP_FILE,
+        )
+        if rollup is None or _INSIGHTS_ROLLUP_STATE.get("sources") != sources:
+            if rollup is not None:
+                rollup.flush()
+            rollup = InsightsRollup(
+                EXECUTION_LOG,
+                ACTION_LOG,
+                [API_AUDIT_LOG_FILE, LEGACY_API_AUDIT_LOG_FILE],
+                DISCUSSIONS_DIR,
+                rollup_path=INSIGHTS_ROLLUP_FILE,
+            )
+            _INSIGHTS_ROLLUP_STATE.update({"rollup": rollup, "sources": sources})
+    try:
+        rollup.poll()
+    except OSError:
+        pass
+    return rollup
+
+
 # Insights route moved to blueprints/insights - DELETED api_insights
 # System/DM/Chatrooms routes moved to blueprints - DELETED
 
-def background_watcher():
-    """Background thread to watch log file and push updates."""
-    watcher = LogWatcher(socketio)
+def _use_native_watchdog() -> bool:
+    """inotify on Linux by default; elsewhere polling is more stable (e.g. FSEvents on some macOS/python combinations)."""
+    raw = str(os.environ.get("VIVARIUM_USE_NATIVE_WATCHDOG", "")).strip().lower()
+    if raw:
+        return raw in {"1", "true", "yes"}
+    return sys.platform.startswith("linux")
+
 
-    # Initial load of existing entries (either log can have content)
-    if ACTION_LOG.exists() or EXECUTION_LOG.exists() or API_AUDIT_LOG_FILE.exists() or LEGACY_API_AUDIT_LOG_FILE.exists():
-        watcher.send_new_entries()
+def background_watcher():
+    """Background thread to watch log file and push batched updates."""
+    watcher = LogWatcher(socketio, LOG_STREAM)
+    LOG_STREAM.on_ack = watcher.wake.set
+    watcher.skip_to_end()
 
-    # Polling is more stable on some macOS/python combinations than FSEvents.
-    use_native = str(os.environ.get("VIVARIUM_USE_NATIVE_WATCHDOG", "")).strip().lower() in {"1", "true", "yes"}
-    observer = Observer() if use_native else PollingObserver(timeout=1.0)
+    # File events are the only trigger: no fixed-interval re-read of the logs.
+    observer = Observer() if _use_native_watchdog() else PollingObserver(timeout=1.0)
     observer.schedule(watcher, str(ACTION_LOG.parent), recursive=False)
     observer.start()
-
-    # Periodic poll so logs update even when FS events are unreliable (e.g. macOS).
-    log_poll_interval = 0.33
     try:
-        while True:
-            time.sleep(log_poll_interval)
-            try:
-                watcher.send_new_entries()
-            except Exception:
-                pass
+        watcher.run()
     except Exception:
         pass
     try:
@@ -1618,6 +1700,16 @@ def background_watcher():
         pass
 
 
+def insights_rollup_periodically():
+    """Keep the insights rollup current so /api/insights only reads a few new bytes."""
+    while True:
+        time.sleep(runtime_config.INSIGHTS_ROLLUP_INTERVAL_SECONDS)
+        try:
+            _insights_rollup()
+        except Exception:
+            pass
+
+
 def push_identities_periodically():
     """Push identity updates every 5 seconds."""
     while True:
@@ -1647,6 +1739,7 @@ if __name__ == '__main__':
     if _should_start_background_threads(HOT_RELOAD_ENABLED):
         threading.Thread(target=background_watcher, daemon=True).start()
         threading.Thread(target=push_identities_periodically, daemon=True).start()
+        threading.Thread(target=insights_rollup_periodically, daemon=True).start()
 
     run_kwargs = {
         "host": CONTROL_PANEL_HOST,
@@ -12,11 +12,14 @@ Provides LocalInferenceEngine that routes to Groq's API with:
 import os
 import json
 import time
-import threading
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
+from vivarium.runtime.llm_response_cache import llm_request_key
+from vivarium.runtime.rate_limiter import get_rate_limiter
+from vivarium.runtime.single_flight import SingleFlight
+
 # Groq SDK import
 try:
     from groq import Groq
@@ -182,6 +185,38 @@ DEFAULT_SYSTEM_PROMPT = (
 )
 
 
+def resolve_model_alias(model: str) -> str:
+    """Resolve model alias to actual Groq model ID."""
+    # Check if it's an alias
+    if model.lower() in MODEL_ALIASES:
+        return MODEL_ALIASES[model.lower()]
+
+    # Check if it's a direct model ID
+    if model in GROQ_MODELS:
+        return model
+
+    # Check for partial matches (e.g., "llama-3.1-8b" -> "llama-3.1-8b-instant")
+    for model_id in GROQ_MODELS:
+        if model.lower() in model_id.lower():
+            return model_id
+
+    # Default to fast model
+    print(f"[GROQ] Unknown model '{model}', defaulting to openai/gpt-oss-120b")
+    return "openai/gpt-oss-120b"
+
+
+def select_request_model(model: str) -> str:
+    """Groq model ID a request for ``model`` is actually sent to (and rate limited under)."""
+    resolved = resolve_model_alias(model)
+
+    # If they explicitly asked for a specific model (8b, 70b, guard), use it
+    if resolved in ["llama-3.1-8b-instant", "llama-3.3-70b-versatile", "llama-guard-3-8b"]:
+        return resolved
+
+    # Default: GPT-OSS 120B
+    return "openai/gpt-oss-120b"
+
+
 class GroqInferenceEngine:
     """
     Local inference engine using Groq API.
@@ -214,30 +249,15 @@ class GroqInferenceEngine:
         self.total_output_tokens = 0
         self.request_count = 0
 
-        # Rate limiting state (thread-safe)
-        # Groq free tier: 30 requests/minute = 2 seconds between requests
-        self._rate_lock = threading.Lock()
-        self.last_request_time = 0
-        self.min_request_interval = 2.0  # 2 seconds between requests (Groq rate limit)
+        # Per-model RPM/TPM quota shared with every other process on this host
+        self.rate_limiter = get_rate_limiter()
+
+        # Identical concurrent requests share one upstream call.
+        self._flights = SingleFlight()
 
     def _resolve_model(self, model: str) -> str:
         """Resolve model alias to actual Groq model ID."""
-        # Check if it's an alias
-        if model.lower() in MODEL_ALIASES:
-            return MODEL_ALIASES[model.lower()]
-
-        # Check if it's a direct model ID
-        if model in GROQ_MODELS:
-            return model
-
-        # Check for partial matches (e.g., "llama-3.1-8b" -> "llama-3.1-8b-instant")
-        for model_id in GROQ_MODELS:
-            if model.lower() in model_id.lower():
-                return model_id
-
-        # Default to fast model
-        print(f"[GROQ] Unknown model '{model}', defaulting to openai/gpt-oss-120b")
-        return "openai/gpt-oss-120b"
+        return resolve_model_alias(model)
 
     def _select_model_for_complexity(self, base_model: str, complexity_score: float) -> str:
         """
@@ -254,22 +274,44 @@ class GroqInferenceEngine:
         Returns:
             Selected model ID
         """
-        resolved = self._resolve_model(base_model)
+        return select_request_model(base_model)
 
-        # If they explicitly asked for a specific model (8b, 70b, guard), use it
-        if resolved in ["llama-3.1-8b-instant", "llama-3.3-70b-versatile", "llama-guard-3-8b"]:
-            return resolved
+    def _rate_limit_wait(self, model_id: str, estimated_tokens: int) -> bool:
+        """Wait for the model's shared RPM/TPM quota; False if it stays exhausted too long."""
+        return self.rate_limiter.acquire(model_id, estimated_tokens)
 
-        # Default: GPT-OSS 120B
-        return "openai/gpt-oss-120b"
+    def _retry_after(self, model_id: str, estimated_tokens: int) -> Optional[float]:
+        """Seconds until the shared limiter would admit this request again (None if unknown)."""
+        if self.rate_limiter is None:
+            return None
+        try:
+            return round(self.rate_limiter.wait_time(model_id, estimated_tokens), 2)
+        except (OSError, ValueError, TypeError):
+            return None
 
-    def _rate_limit_wait(self):
-        """Enforce rate limiting between requests (thread-safe)."""
-        with self._rate_lock:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.min_request_interval:
-                time.sleep(self.min_request_interval - elapsed)
-            self.last_request_time = time.time()
+    def _observe_rate_limits(
+        self,
+        model_id: str,
+        headers: Any,
+        estimated_tokens: int,
+        actual_tokens: Optional[int] = None,
+    ) -> None:
+        """Feed x-ratelimit-*/Retry-After headers and real usage back into the shared limiter."""
+        if self.rate_limiter is None:
+            return
+        try:
+            self.rate_limiter.observe(model_id, headers, estimated_tokens, actual_tokens)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def _create_completion(self, create_kwargs: Dict[str, Any]) -> Tuple[Any, Any]:
+        """Issue the request; returns (completion or stream, response headers or None)."""
+        completions = self.client.chat.completions
+        raw_api = getattr(completions, "with_raw_response", None)
+        if raw_api is None:
+            return completions.create(**create_kwargs), None
+        raw = raw_api.create(**create_kwargs)
+        return raw.parse(), getattr(raw, "headers", None)
 
     def execute(
         self,
@@ -283,11 +325,16 @@ class GroqInferenceEngine:
         seed: Optional[int] = None,
         task_type: Optional[str] = None,
         system_prompt: Optional[str] = None,
+        stream_callback: Optional[Callable[[str], Optional[bool]]] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         """
         Execute a prompt using Groq API.
 
+        Concurrent identical non-streaming requests are coalesced: one
+        upstream call is made and the other callers receive its result with
+        ``coalesced=True`` and a cost of 0.
+
         Args:
             prompt: The prompt to execute
             model: Model name or alias
@@ -296,10 +343,56 @@ class GroqInferenceEngine:
             temperature: Sampling temperature
             timeout: Request timeout in seconds
             system_prompt: Optional system instruction override
+            stream_callback: If set, the completion is streamed and each text
+                delta is passed to it as it arrives; returning False stops
+                generation early (the result then has ``stopped_early=True``)
 
         Returns:
             Dict with keys: result, cost, input_tokens, output_tokens, model, elapsed
         """
+        if stream_callback is not None:
+            # Streams deliver deltas to one caller; never shared.
+            return self._execute_uncoalesced(
+                prompt, model, complexity_score, max_tokens, temperature, top_p, timeout,
+                seed, task_type, system_prompt, stream_callback, **kwargs,
+            )
+
+        key = llm_request_key(prompt, model, {
+            "system_prompt": system_prompt or kwargs.get("system_prompt"),
+            "temperature": temperature,
+            "seed": seed,
+            "top_p": top_p,
+            "max_tokens": max_tokens,
+            "task_type": task_type,
+        })
+        result, shared = self._flights.do(
+            key,
+            lambda: self._execute_uncoalesced(
+                prompt, model, complexity_score, max_tokens, temperature, top_p, timeout,
+                seed, task_type, system_prompt, None, **kwargs,
+            ),
+        )
+        if shared:
+            # The leader already paid for (and counted) the upstream call.
+            return {**result, "cost": 0.0, "total_cost_usd": 0.0, "coalesced": True}
+        return result
+
+    def _execute_uncoalesced(
+        self,
+        prompt: str,
+        model: str = "openai/gpt-oss-120b",  # DEFAULT: GPT-OSS 120B
+        complexity_score: float = 0.0,  # Ignored - Groq Compound handles this automatically
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        timeout: int = 600,
+        seed: Optional[int] = None,
+        task_type: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        stream_callback: Optional[Callable[[str], Optional[bool]]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Single upstream request (see ``execute``)."""
         start_time = time.time()
 
         # Select appropriate model
@@ -323,13 +416,27 @@ class GroqInferenceEngine:
                 "cost": 0.0
             }
 
-        # Enforce rate limiting
-        self._rate_limit_wait()
+        from vivarium.utils.llm_cost import rough_token_count
+
+        system_message = (system_prompt or kwargs.get("system_prompt") or DEFAULT_SYSTEM_PROMPT).strip()
+        if not system_message:
+            system_message = DEFAULT_SYSTEM_PROMPT
+        estimated_tokens = rough_token_count(f"{system_message}\n{prompt}")
 
+        # Wait for this model's share of the (host-wide) rate limit
+        if not self._rate_limit_wait(model_id, estimated_tokens):
+            return {
+                "error": "rate_limit",
+                "error_message": f"Local rate limit for {model_id} still exhausted after waiting",
+                "returncode": 429,
+                "retry_after": self._retry_after(model_id, estimated_tokens),
+                "result": "",
+                "cost": 0.0,
+                "elapsed": time.time() - start_time
+            }
+
+        streamed_deltas = [0]
         try:
-            system_message = (system_prompt or kwargs.get("system_prompt") or DEFAULT_SYSTEM_PROMPT).strip()
-            if not system_message:
-                system_message = DEFAULT_SYSTEM_PROMPT
             # Make API request
             create_kwargs = {
                 "model": model_id,
@@ -345,12 +452,35 @@ class GroqInferenceEngine:
                 create_kwargs["top_p"] = top_p
             if seed is not None:
                 create_kwargs["seed"] = seed
-            response = self.client.chat.completions.create(**create_kwargs)
+            stopped_early = False
+            if stream_callback is not None:
+                create_kwargs["stream"] = True
+                stream, headers = self._create_completion(create_kwargs)
+
+                def _forward(delta: str) -> Optional[bool]:
+                    streamed_deltas[0] += 1
+                    return stream_callback(delta)
+
+                result_text, usage, stopped_early = self._consume_stream(stream, _forward)
+            else:
+                response, headers = self._create_completion(create_kwargs)
+                result_text = response.choices[0].message.content or ""
+                usage = response.usage
 
             # Extract response
-            result_text = response.choices[0].message.content or ""
-            input_tokens = response.usage.prompt_tokens if response.usage else 0
-            output_tokens = response.usage.completion_tokens if response.usage else 0
+            if usage is not None:
+                input_tokens = usage.prompt_tokens
+                output_tokens = usage.completion_tokens
+            elif stream_callback is not None:
+                # Stream cut off before the final usage chunk: approximate.
+                input_tokens = rough_token_count(f"{system_message}\n{prompt}")
+                output_tokens = rough_token_count(result_text)
+            else:
+                input_tokens = output_tokens = 0
+            self._observe_rate_limits(
+                model_id, headers, estimated_tokens,
+                (input_tokens + output_tokens) if usage is not None else None,
+            )
 
             # Calculate cost via shared llm_cost module
             from vivarium.utils.llm_cost import estimate_cost
@@ -365,7 +495,7 @@ class GroqInferenceEngine:
 
             elapsed = time.time() - start_time
 
-            return {
+            result = {
                 "result": result_text,
                 "returncode": 0,
                 "cost": cost,
@@ -377,17 +507,25 @@ class GroqInferenceEngine:
                 "elapsed": elapsed,
                 "timestamp": datetime.now().isoformat()
             }
+            if stream_callback is not None:
+                result["streamed"] = True
+                result["stopped_early"] = stopped_early
+            return result
 
         except Exception as e:
             elapsed = time.time() - start_time
             error_msg = str(e)
+            # 429s carry Retry-After / x-ratelimit-* headers on the error response
+            self._observe_rate_limits(
+                model_id, getattr(getattr(e, "response", None), "headers", None), estimated_tokens,
+            )
 
             # Check for specific error types
             if "rate_limit" in error_msg.lower():
-                # Try fallback model if we hit rate limit on primary
-                if model_id == "openai/gpt-oss-120b":
+                # Try fallback model if we hit rate limit on primary. A stream that
+                # already delivered deltas can't be replayed without duplicating them.
+                if model_id == "openai/gpt-oss-120b" and not streamed_deltas[0]:
                     print(f"[GROQ] Rate limit on 120B, falling back to 70B...")
-                    time.sleep(2)  # Brief wait before fallback
                     return self.execute(
                         prompt=prompt,
                         model="llama-3.3-70b-versatile",  # Fallback
@@ -399,11 +537,14 @@ class GroqInferenceEngine:
                         seed=seed,
                         task_type=task_type,
                         system_prompt=system_message,
+                        stream_callback=stream_callback,
                     )
                 return {
                     "error": "rate_limit",
                     "error_message": error_msg,
                     "returncode": 429,
+                    # Upstream Retry-After was just fed into the limiter above.
+                    "retry_after": self._retry_after(model_id, estimated_tokens),
                     "result": "",
                     "cost": 0.0,
                     "elapsed": elapsed
@@ -427,6 +568,32 @@ class GroqInferenceEngine:
                     "elapsed": elapsed
                 }
 
+    @staticmethod
+    def _consume_stream(stream: Any, callback: Callable[[str], Optional[bool]]) -> Tuple[str, Any, bool]:
+        """Drain a streamed completion; returns (text, usage or None, stopped_early)."""
+        parts = []
+        usage = None
+        stopped_early = False
+        try:
+            for chunk in stream:
+                # Groq reports usage on the final chunk under x_groq; OpenAI-style under usage.
+                chunk_usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or getattr(chunk, "usage", None)
+                if chunk_usage is not None:
+                    usage = chunk_usage
+                choices = getattr(chunk, "choices", None) or []
+                delta = getattr(choices[0].delta, "content", None) if choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                if callback(delta) is False:
+                    stopped_early = True
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+        return "".join(parts), usage, stopped_early
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cumulative usage statistics."""
         return {
@@ -434,7 +601,8 @@ class GroqInferenceEngine:
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
             "total_requests": self.request_count,
-            "avg_cost_per_request": self.total_cost / max(self.request_count, 1)
+            "avg_cost_per_request": self.total_cost / max(self.request_count, 1),
+            "coalescing": self._flights.stats(),
         }
 
     def check_budget(self, budget_limit: float) -> Tuple[bool, float]:
@@ -463,6 +631,12 @@ def get_groq_engine() -> GroqInferenceEngine:
     return _groq_engine
 
 
+def get_groq_engine_stats() -> Optional[Dict[str, Any]]:
+    """Usage/coalescing stats of the global engine, or None if not created yet."""
+    engine = _groq_engine
+    return engine.get_stats() if engine is not None else None
+
+
 def execute_with_groq(
     prompt: str,
     model: str = "openai/gpt-oss-120b",  # DEFAULT: GPT-OSS 120B
@@ -0,0 +1,481 @@
+"""
+Pre-aggregated counters behind ``/api/insights``.
+
+The insights endpoint used to re-read up to 60k action-log lines, 12k
+execution-log lines, both API audit logs and every discussion file on each
+request. ``InsightsRollup`` tails those files with ``JsonlTailer`` and folds
+each new record into hour and day buckets of counters, so a request sums a
+bounded number of buckets whatever the log sizes:
+
+- Hour buckets cover the last ``HOUR_RETENTION_HOURS`` (windows starting
+  inside it are hour-resolved), day buckets the last ``DAY_RETENTION_DAYS``
+  (longer windows are day-resolved).
+- A bucket is a flat ``name -> number`` map: ``status:failed``,
+  ``action:API``, ``identity_cost:<id>``, ``model_tokens:<model>``, ...
+- Buckets are kept per source kind, so a truncated or replaced file (e.g.
+  after execution-log compaction) only rebuilds that kind.
+
+Buckets, running totals and tailer offsets are persisted atomically to a small
+JSON rollup file and reused on restart while the logs' head fingerprints match.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from vivarium.runtime.log_index import (
+    COMPACTION_CHECKPOINT_TYPE,
+    JsonlTailer,
+    _atomic_write_json,
+    _head_fingerprint,
+)
+
+ROLLUP_VERSION = 1
+HOUR_SECONDS = 3600
+DAY_SECONDS = 86400
+HOUR_RETENTION_HOURS = 48
+DAY_RETENTION_DAYS = 121
+MAX_RANGE_DAYS = 120
+
+KINDS = ("execution", "action", "audit", "discussion")
+COMPLETED_STATUSES = frozenset({"completed", "approved"})
+# Statuses that neither extend nor break a run of failures.
+STREAK_NEUTRAL_STATUSES = frozenset({"in_progress", "pending_review", "requeue"})
+IGNORED_ACTORS = frozenset({"SYSTEM", "UNKNOWN"})
+
+# Counter prefix -> field name in the per-identity / per-model usage breakdown.
+IDENTITY_COUNTERS = {
+    "actor": "actions",
+    "identity_cost": "cost",
+    "identity_tasks": "tasks",
+    "identity_messages": "messages",
+}
+MODEL_COUNTERS = {"model_calls": "calls", "model_cost": "cost", "model_tokens": "tokens"}
+
+_USD_PATTERN = re.compile(r"\$([0-9]+(?:\.[0-9]+)?)")
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """UTC epoch seconds of an ISO timestamp (naive means UTC, ``Z`` accepted)."""
+    if value is None:
+        return None
+    raw = str(value).strip()
+    if not raw:
+        return None
+    if raw.endswith("Z"):
+        raw = raw[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _number(value: Any) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if math.isfinite(number) else 0.0
+
+
+def _usd_cost(detail: Any) -> float:
+    """Last ``$<amount>`` in an action-log detail string."""
+    matches = _USD_PATTERN.findall(str(detail or ""))
+    return _number(matches[-1]) if matches else 0.0
+
+
+def _bump(target: Dict[str, float], counters: Dict[str, float]) -> None:
+    for key, value in counters.items():
+        target[key] = target.get(key, 0) + value
+
+
+def _empty_kind() -> Dict[str, Any]:
+    return {"hours": {}, "days": {}, "totals": {}}
+
+
+def _unique_paths(paths: Iterable[Path]) -> List[Path]:
+    """Drop paths that resolve to a file already listed (current and legacy audit log may coincide)."""
+    seen = set()
+    unique: List[Path] = []
+    for path in paths:
+        resolved = Path(path).resolve()
+        if resolved not in seen:
+            seen.add(resolved)
+            unique.append(Path(path))
+    return unique
+
+
+class InsightsRollup:
+    """Hour/day bucketed counters over the runtime logs, maintained incrementally."""
+
+    def __init__(
+        self,
+        execution_log: Path,
+        action_log: Path,
+        api_audit_logs: Iterable[Path],
+        discussions_dir: Path,
+        rollup_path: Path,
+        save_interval: float = 30.0,
+    ):
+        self.execution_log = Path(execution_log)
+        self.action_log = Path(action_log)
+        self.api_audit_logs = _unique_paths(api_audit_logs)
+        self.discussions_dir = Path(discussions_dir)
+        self.rollup_path = Path(rollup_path)
+        self.save_interval = max(0.0, float(save_interval))
+        self._lock = threading.Lock()
+        self._kinds: Dict[str, Dict[str, Any]] = {kind: _empty_kind() for kind in KINDS}
+        self._tailers: Dict[str, Tuple[str, JsonlTailer]] = {}
+        self._hour_floor = 0
+        self._day_floor = 0
+        self._dirty = False
+        self._last_saved_at = time.monotonic()
+        self.loaded_from_rollup = self._load()
+
+    @property
+    def signature(self) -> Dict[str, Any]:
+        """The sources this rollup was built from; a stored rollup for other sources is ignored."""
+        return {
+            "execution": str(self.execution_log),
+            "action": str(self.action_log),
+            "audit": [str(path) for path in self.api_audit_logs],
+            "discussions": str(self.discussions_dir),
+        }
+
+    # -- persistence --------------------------------------------------------
+
+    def _load(self) -> bool:
+        try:
+            data = json.loads(self.rollup_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != ROLLUP_VERSION:
+            return False
+        if data.get("sources") != self.signature:
+            return False
+        files = data.get("files")
+        kinds = data.get("kinds")
+        if not isinstance(files, dict) or not isinstance(kinds, dict):
+            return False
+
+        tailers: Dict[str, Tuple[str, JsonlTailer]] = {}
+        stale = set()
+        for key, meta in files.items():
+            try:
+                kind = meta["kind"]
+                offset = int(meta["offset"])
+                stat = Path(key).stat()
+                if meta.get("inode") != stat.st_ino or offset > stat.st_size:
+                    stale.add(kind)
+                    continue
+                if meta.get("head") != _head_fingerprint(Path(key), offset):
+                    stale.add(kind)
+                    continue
+            except (OSError, KeyError, TypeError, ValueError):
+                if isinstance(meta, dict) and meta.get("kind") in KINDS:
+                    stale.add(meta["kind"])
+                continue
+            tailers[key] = (kind, JsonlTailer(Path(key), offset=offset, inode=meta.get("inode")))
+
+        for kind in KINDS:
+            stored = kinds.get(kind)
+            if kind in stale or not isinstance(stored, dict):
+                continue
+            try:
+                self._kinds[kind] = {
+                    "hours": {int(k): dict(v) for k, v in stored.get("hours", {}).items()},
+                    "days": {int(k): dict(v) for k, v in stored.get("days", {}).items()},
+                    "totals": dict(stored.get("totals", {})),
+                }
+            except (AttributeError, TypeError, ValueError):
+                stale.add(kind)
+                continue
+            for key, (tailer_kind, tailer) in tailers.items():
+                if tailer_kind == kind:
+                    self._tailers[key] = (tailer_kind, tailer)
+        return not stale
+
+    def _save(self) -> None:
+        try:
+            files = {
+                key: {
+                    "kind": kind,
+                    "offset": tailer.offset,
+                    "inode": tailer.inode,
+                    "head": _head_fingerprint(tailer.path, tailer.offset),
+                }
+                for key, (kind, tailer) in self._tailers.items()
+                if tailer.inode is not None
+            }
+            _atomic_write_json(
+                self.rollup_path,
+                {
+                    "version": ROLLUP_VERSION,
+                    "sources": self.signature,
+                    "saved_at": datetime.now(timezone.utc).isoformat(),
+                    "files": files,
+                    "kinds": self._kinds,
+                },
+            )
+        except OSError:
+            return
+        self._dirty = False
+        self._last_saved_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Write the rollup file now if anything changed since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    # -- ingestion ----------------------------------------------------------
+
+    def _sources(self) -> List[Tuple[str, Path]]:
+        sources = [("execution", self.execution_log), ("action", self.action_log)]
+        sources += [("audit", path) for path in self.api_audit_logs]
+        if self.discussions_dir.is_dir():
+            sources += [("discussion", path) for path in sorted(self.discussions_dir.glob("*.jsonl"))]
+        return sources
+
+    def _tailer(self, kind: str, path: Path) -> JsonlTailer:
+        key = str(path)
+        if key not in self._tailers:
+            self._tailers[key] = (kind, JsonlTailer(path))
+        return self._tailers[key][1]
+
+    def _reset_kind(self, kind: str) -> None:
+        """Drop a kind's buckets and rewind its files so the next poll rebuilds it."""
+        self._kinds[kind] = _empty_kind()
+        for tailer_kind, tailer in self._tailers.values():
+            if tailer_kind == kind:
+                tailer.offset = 0
+                tailer.inode = None
+        self._dirty = True
+
+    def _add(self, kind: str, ts: float, counters: Dict[str, float]) -> None:
+        hour = int(ts // HOUR_SECONDS)
+        day = int(ts // DAY_SECONDS)
+        if day < self._day_floor:
+            return
+        buckets = self._kinds[kind]
+        if hour >= self._hour_floor:
+            _bump(buckets["hours"].setdefault(hour, {}), counters)
+        _bump(buckets["days"].setdefault(day, {}), counters)
+
+    def _ingest_execution(self, record: Dict[str, Any]) -> None:
+        totals = self._kinds["execution"]["totals"]
+        cost = _number(record.get("budget_used"))
+        totals["cost"] = totals.get("cost", 0.0) + cost
+        status = str(record.get("status") or "").strip().lower()
+        ts = _epoch(record.get("timestamp"))
+        if ts is not None and ts > totals.get("last_event_at", 0.0):
+            totals["last_event_at"] = ts
+        if status == "failed":
+            totals["failure_streak"] = totals.get("failure_streak", 0) + 1
+        elif status and status not in STREAK_NEUTRAL_STATUSES:
+            totals["failure_streak"] = 0
+        # A compaction checkpoint carries superseded spend: all-time only.
+        if ts is None or record.get("type") == COMPACTION_CHECKPOINT_TYPE:
+            return
+        counters: Dict[str, float] = {}
+        if status:
+            counters[f"status:{status}"] = 1
+        if record.get("budget_used") is not None:
+            counters["execution_cost"] = cost
+        identity = str(record.get("identity_id") or record.get("worker_id") or "").strip()
+        if identity and cost:
+            counters[f"identity_cost:{identity}"] = cost
+        if status in COMPLETED_STATUSES:
+            counters["tasks_completed"] = 1
+            if identity:
+                counters[f"identity_tasks:{identity}"] = 1
+        if counters:
+            self._add("execution", ts, counters)
+
+    def _ingest_action(self, record: Dict[str, Any]) -> None:
+        action_type = str(record.get("action_type") or "").strip().upper() or "UNKNOWN"
+        cost = _usd_cost(record.get("detail", "")) if action_type == "API" else 0.0
+        if action_type == "API":
+            totals = self._kinds["action"]["totals"]
+            totals["cost"] = totals.get("cost", 0.0) + cost
+        ts = _epoch(record.get("timestamp"))
+        if ts is None:
+            return
+        counters: Dict[str, float] = {f"action:{action_type}": 1}
+        actor = str(record.get("actor") or "").strip()
+        if actor and actor not in IGNORED_ACTORS:
+            counters[f"actor:{actor}"] = 1
+        if action_type == "API":
+            counters["api_calls"] = 1
+            counters["api_cost"] = cost
+        if action_type == "SAFETY" and "BLOCKED" in f"{record.get('action', '')} {record.get('detail', '')}".upper():
+            counters["safety_blocks"] = 1
+        self._add("action", ts, counters)
+
+    def _ingest_audit(self, record: Dict[str, Any]) -> None:
+        cost = _number(record.get("cost", 0))
+        totals = self._kinds["audit"]["totals"]
+        totals["cost"] = totals.get("cost", 0.0) + cost
+        ts = _epoch(record.get("timestamp"))
+        if ts is None:
+            return
+        tokens = _number(record.get("input_tokens")) + _number(record.get("output_tokens"))
+        counters: Dict[str, float] = {"audit_calls": 1, "audit_cost": cost, "audit_tokens": tokens}
+        model = str(record.get("model") or "").strip()
+        if model:
+            counters[f"model_calls:{model}"] = 1
+            counters[f"model_cost:{model}"] = cost
+            counters[f"model_tokens:{model}"] = tokens
+        self._add("audit", ts, counters)
+
+    def _ingest_discussion(self, record: Dict[str, Any], is_dm: bool) -> None:
+        ts = _epoch(record.get("timestamp"))
+        if ts is None:
+            return
+        counters: Dict[str, float] = {"messages": 1}
+        if is_dm:
+            counters["dm_messages"] = 1
+        author = str(record.get("author_id") or "").strip()
+        if author:
+            counters[f"identity_messages:{author}"] = 1
+        self._add("discussion", ts, counters)
+
+    def _ingest(self, kind: str, path: Path, records: List[Dict[str, Any]]) -> None:
+        if kind == "execution":
+            for record in records:
+                self._ingest_execution(record)
+        elif kind == "action":
+            for record in records:
+                self._ingest_action(record)
+        elif kind == "audit":
+            for record in records:
+                self._ingest_audit(record)
+        else:
+            is_dm = path.name.startswith("dm__")
+            for record in records:
+                self._ingest_discussion(record, is_dm)
+
+    def _prune(self) -> None:
+        for buckets in self._kinds.values():
+            for level, floor in (("hours", self._hour_floor), ("days", self._day_floor)):
+                old = [index for index in buckets[level] if index < floor]
+                for index in old:
+                    del buckets[level][index]
+                if old:
+                    self._dirty = True
+
+    def poll(self) -> int:
+        """Fold records appended since the last poll into the buckets. Returns how many were read."""
+        with self._lock:
+            now = time.time()
+            self._hour_floor = int(now // HOUR_SECONDS) - HOUR_RETENTION_HOURS
+            self._day_floor = int(now // DAY_SECONDS) - DAY_RETENTION_DAYS
+            sources = self._sources()
+            live = {str(path) for _, path in sources}
+            for key in [key for key in self._tailers if key not in live]:
+                # A vanished file (e.g. a deleted discussion room) leaves stale counts behind.
+                kind = self._tailers.pop(key)[0]
+                self._reset_kind(kind)
+
+            by_kind: Dict[str, List[Path]] = {}
+            for kind, path in sources:
+                by_kind.setdefault(kind, []).append(path)
+            consumed = 0
+            for kind, paths in by_kind.items():
+                batches = []
+                reset = False
+                for path in paths:
+                    records, file_reset = self._tailer(kind, path).poll()
+                    reset = reset or file_reset
+                    batches.append((path, records))
+                if reset:
+                    self._reset_kind(kind)
+                    batches = [(path, self._tailer(kind, path).poll()[0]) for path in paths]
+                for path, records in batches:
+                    self._ingest(kind, path, records)
+                    consumed += len(records)
+            if consumed:
+                self._dirty = True
+            self._prune()
+            if self._dirty and time.monotonic() - self._last_saved_at >= self.save_interval:
+                self._save()
+            return consumed
+
+    # -- queries ------------------------------------------------------------
+
+    def totals(self, since: float, until: Optional[float] = None, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Summed counters for records in ``[since, until)`` (epoch seconds).
+
+        Hour-resolved when ``since`` lies within the hour retention, otherwise
+        day-resolved: the bucket holding ``since`` is counted whole.
+        """
+        now = time.time() if now is None else now
+        if since >= now - HOUR_RETENTION_HOURS * HOUR_SECONDS:
+            level, size = "hours", HOUR_SECONDS
+        else:
+            level, size = "days", DAY_SECONDS
+        first = int(since // size)
+        last = int(until // size) if until is not None else None
+        out: Dict[str, float] = {}
+        with self._lock:
+            for buckets in self._kinds.values():
+                for index, counters in buckets[level].items():
+                    if index >= first and (last is None or index < last):
+                        _bump(out, counters)
+        return out
+
+    def running_totals(self) -> Dict[str, Dict[str, float]]:
+        """All-time totals per kind (cost, last execution event, failure streak)."""
+        with self._lock:
+            return {kind: dict(buckets["totals"]) for kind, buckets in self._kinds.items()}
+
+    def trend_windows(self, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Counter totals for the day/week/month windows and the 3-week/3-month baselines."""
+        now = time.time() if now is None else now
+        return {
+            "day": self.totals(now - DAY_SECONDS, now=now),
+            "week": self.totals(now - 7 * DAY_SECONDS, now=now),
+            "month": self.totals(now - 30 * DAY_SECONDS, now=now),
+            "prev_3w": self.totals(now - 28 * DAY_SECONDS, now - 7 * DAY_SECONDS, now=now),
+            "prev_3m": self.totals(now - MAX_RANGE_DAYS * DAY_SECONDS, now - 30 * DAY_SECONDS, now=now),
+        }
+
+    def usage(self, days: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """Cost, tokens, tasks and messages over the last ``days`` (1-120), by identity and model."""
+        now = time.time() if now is None else now
+        days = min(max(1, int(days)), MAX_RANGE_DAYS)
+        counters = self.totals(now - days * DAY_SECONDS, now=now)
+        by_identity: Dict[str, Dict[str, float]] = {}
+        by_model: Dict[str, Dict[str, float]] = {}
+        for key, value in counters.items():
+            prefix, _, name = key.partition(":")
+            if prefix in IDENTITY_COUNTERS:
+                by_identity.setdefault(name, {})[IDENTITY_COUNTERS[prefix]] = value
+            elif prefix in MODEL_COUNTERS:
+                by_model.setdefault(name, {})[MODEL_COUNTERS[prefix]] = value
+        for rows in (by_identity, by_model):
+            for row in rows.values():
+                if "cost" in row:
+                    row["cost"] = round(row["cost"], 6)
+        api_cost = counters.get("api_cost", 0.0) or counters.get("audit_cost", 0.0)
+        return {
+            "days": days,
+            "cost": round(counters.get("execution_cost", 0.0) + api_cost, 6),
+            "api_calls": int(counters.get("api_calls", 0) or counters.get("audit_calls", 0)),
+            "tokens": int(counters.get("audit_tokens", 0)),
+            "tasks": int(counters.get("tasks_completed", 0)),
+            "messages": int(counters.get("messages", 0)),
+            "by_identity": by_identity,
+            "by_model": by_model,
+        }
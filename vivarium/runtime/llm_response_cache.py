@@ -0,0 +1,223 @@
+"""
+Content-addressed, on-disk cache of LLM responses.
+
+Retries, requeues, review loops and repeated delegated subtasks re-send the
+exact same request to Groq. ``LLMResponseCache`` stores successful
+``call_llm`` results keyed by a SHA-256 of the normalized request (model,
+system prompt, prompt, temperature, seed and the other sampling settings), so
+an identical request is answered from disk:
+
+- One JSON file per key under the cache directory (written atomically, safe
+  to share between processes).
+- Entries older than ``ttl_seconds`` are treated as misses and removed.
+- A hit touches the file's mtime. The entry count is kept in memory (counted
+  once from the directory), so a write costs no directory scan; only when the
+  count passes ``max_entries`` is the directory listed and the least recently
+  used entries evicted down to 90% of capacity. The rescan also corrects the
+  count for entries other processes added.
+- Requests with an explicit temperature above ``max_temperature`` and no
+  seed are not cacheable (their output is meant to vary).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from vivarium.runtime.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_TEMPERATURE,
+    LLM_CACHE_TTL_SECONDS,
+)
+from vivarium.runtime.vivarium_scope import LLM_RESPONSE_CACHE_DIR
+
+CACHE_KEY_VERSION = 1
+# call_llm kwargs that change the completion; everything else (timeouts,
+# audit fields, callbacks) is ignored when building the key.
+KEYED_SETTINGS = ("system_prompt", "temperature", "seed", "top_p", "max_tokens", "task_type")
+
+
+def llm_request_key(prompt: str, model: str, settings: Dict[str, Any]) -> str:
+    """SHA-256 of the normalized request; identical completions share a key."""
+    normalized = {
+        "v": CACHE_KEY_VERSION,
+        "model": str(model or "").strip(),
+        "prompt": str(prompt or "").replace("\r\n", "\n").strip(),
+    }
+    for name in KEYED_SETTINGS:
+        value = settings.get(name)
+        if isinstance(value, str):
+            value = value.replace("\r\n", "\n").strip()
+        normalized[name] = value
+    encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Directory-backed request-hash -> result cache with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        root: Path,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        max_temperature: float = LLM_CACHE_MAX_TEMPERATURE,
+    ):
+        self.root = Path(root)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self.max_temperature = float(max_temperature)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._entries: Optional[int] = None  # counted lazily, then maintained in memory
+
+    def is_cacheable(self, settings: Dict[str, Any]) -> bool:
+        temperature = settings.get("temperature")
+        if temperature is None or settings.get("seed") is not None:
+            return True
+        return float(temperature) <= self.max_temperature
+
+    @staticmethod
+    def key_for(prompt: str, model: str, settings: Dict[str, Any]) -> str:
+        return llm_request_key(prompt, model, settings)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key``, or None (missing/expired/corrupt)."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+            fresh = time.time() - float(entry.get("stored_at", 0)) <= self.ttl_seconds
+            result = entry.get("result") if fresh else None
+        except (OSError, ValueError, TypeError, AttributeError):
+            result = None
+        if not isinstance(result, dict):
+            removed = path.exists() and self._discard(path)
+            with self._lock:
+                self.misses += 1
+                if removed and self._entries:
+                    self._entries -= 1
+            return None
+        try:
+            os.utime(path, None)  # recency for LRU eviction
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        entry = {"key": key, "stored_at": time.time(), "result": result}
+        path = self._path(key)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._ensure_counted()
+            replacing = path.exists()
+            fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=".tmp-", suffix=".json")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(entry, handle, default=str)
+            os.replace(tmp_name, path)
+        except OSError:
+            self._discard(Path(tmp_name))
+            return
+        with self._lock:
+            self.stores += 1
+            if not replacing:
+                self._entries = (self._entries or 0) + 1
+            over_capacity = (self._entries or 0) > self.max_entries
+        if over_capacity:
+            self._evict_over_capacity()
+
+    def clear(self) -> None:
+        if not self.root.exists():
+            return
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".json"):
+                self._discard(Path(entry.path))
+        with self._lock:
+            self._entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": self._entries,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _list_entries(self) -> List[os.DirEntry]:
+        return [
+            entry for entry in os.scandir(self.root)
+            if entry.name.endswith(".json") and not entry.name.startswith(".tmp-")
+        ]
+
+    def _ensure_counted(self) -> None:
+        with self._lock:
+            if self._entries is not None:
+                return
+        try:
+            count = len(self._list_entries())
+        except OSError:
+            count = 0
+        with self._lock:
+            if self._entries is None:
+                self._entries = count
+
+    def _evict_over_capacity(self) -> None:
+        try:
+            entries = self._list_entries()
+        except OSError:
+            return
+        # Evict to a low-water mark so the next scan is max_entries / 10 writes away.
+        excess = len(entries) - (self.max_entries - self.max_entries // 10)
+        if len(entries) <= self.max_entries or excess <= 0:
+            with self._lock:
+                self._entries = len(entries)
+            return
+
+        def _mtime(entry: os.DirEntry) -> float:
+            try:
+                return entry.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        entries.sort(key=_mtime)
+        evicted = sum(1 for entry in entries[:excess] if self._discard(Path(entry.path)))
+        with self._lock:
+            self.evictions += evicted
+            self._entries = len(entries) - evicted
+
+    @staticmethod
+    def _discard(path: Path) -> bool:
+        try:
+            path.unlink()
+        except OSError:
+            return False
+        return True
+
+
+def default_response_cache() -> Optional[LLMResponseCache]:
+    """The configured cache, or None when VIVARIUM_LLM_CACHE is off."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    return LLMResponseCache(LLM_RESPONSE_CACHE_DIR)
@@ -0,0 +1,530 @@
+"""
+Incremental indexes over append-only runtime logs.
+
+The execution log only ever grows, so anything derived from it (spend totals,
+latest status per task) can be maintained by remembering a byte offset and
+consuming only the bytes appended since the last poll. This module holds the
+shared primitives:
+
+- JsonlTailer           : offset-tracking JSONL reader (truncation/rotation aware)
+- read_jsonl_tail       : last N (optionally filtered) records, read backwards from EOF
+- SpendAccumulator      : running ``budget_used`` total with a sidecar snapshot
+- ExecutionStatusIndex  : compact latest-status-per-task map with a sidecar snapshot
+- compact_execution_log : drop superseded events, optionally archiving them by day
+- MtimeJsonCache        : JSON file reads memoized by (inode, mtime, size)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from vivarium.utils.file_lock import exclusive_fd_lock
+from vivarium.utils.jsonl_appender import get_appender
+
+
+def _atomic_write_json(path: Path, payload: Dict[str, Any]) -> None:
+    """Write JSON via temp file + rename so readers never see a partial snapshot."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+_FINGERPRINT_BYTES = 256
+
+
+def _head_fingerprint(path: Path, length: int) -> str:
+    """Digest of the first bytes of an append-only file (stable for its lifetime)."""
+    with open(path, "rb") as f:
+        head = f.read(min(length, _FINGERPRINT_BYTES))
+    return hashlib.sha1(head).hexdigest()
+
+
+class JsonlTailer:
+    """
+    Read only the records appended to a JSONL file since the previous poll.
+
+    Only complete (newline-terminated) lines are consumed, so a record that a
+    concurrent writer has half-flushed is picked up on the next poll instead of
+    being dropped. If the file shrinks or its inode changes, the tailer restarts
+    from offset 0 and reports ``reset=True`` so callers can drop derived state.
+    """
+
+    def __init__(self, path: Path, offset: int = 0, inode: Optional[int] = None):
+        self.path = Path(path)
+        self.offset = max(0, int(offset))
+        self.inode = inode
+
+    def poll(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return (new_records, reset)."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            reset = self.offset > 0
+            self.offset = 0
+            self.inode = None
+            return [], reset
+
+        reset = False
+        if (self.inode is not None and stat.st_ino != self.inode) or stat.st_size < self.offset:
+            self.offset = 0
+            reset = True
+        self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return [], reset
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return [], reset
+        self.offset += end + 1
+
+        records: List[Dict[str, Any]] = []
+        for raw_line in chunk[: end + 1].splitlines():
+            raw_line = raw_line.strip()
+            if not raw_line:
+                continue
+            try:
+                record = json.loads(raw_line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records, reset
+
+
+TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def _parse_record(raw_line: bytes) -> Optional[Dict[str, Any]]:
+    raw_line = raw_line.strip()
+    if not raw_line:
+        return None
+    try:
+        record = json.loads(raw_line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def read_jsonl_tail(
+    path: Path,
+    max_lines: int,
+    match: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    max_scan_lines: Optional[int] = None,
+    block_size: int = TAIL_BLOCK_BYTES,
+) -> List[Dict[str, Any]]:
+    """
+    Last ``max_lines`` records of a JSONL file, oldest first.
+
+    The file is read backwards from EOF in ``block_size`` chunks (``pread``),
+    so the cost depends on how far back the wanted records are, not on the
+    file size. ``match`` filters records while scanning; ``max_scan_lines``
+    stops after that many non-empty lines even if fewer records matched.
+    Unparseable lines and non-object records are skipped.
+    """
+    if max_lines <= 0:
+        return []
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return []
+    newest_first: List[Dict[str, Any]] = []
+    scanned = 0
+    try:
+        position = os.fstat(fd).st_size
+        carry = b""
+        while position > 0:
+            start = max(0, position - max(1, int(block_size)))
+            data = os.pread(fd, position - start, start) + carry
+            position = start
+            lines = data.split(b"\n")
+            # The first piece may continue in the previous block; keep it for the next read.
+            carry = lines.pop(0) if position > 0 else b""
+            for raw_line in reversed(lines):
+                if not raw_line.strip():
+                    continue
+                scanned += 1
+                record = _parse_record(raw_line)
+                if record is not None and (match is None or match(record)):
+                    newest_first.append(record)
+                    if len(newest_first) >= max_lines:
+                        return newest_first[::-1]
+                if max_scan_lines is not None and scanned >= max_scan_lines:
+                    return newest_first[::-1]
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+    return newest_first[::-1]
+
+
+class SpendAccumulator:
+    """
+    Running sum of ``budget_used`` across an execution log.
+
+    The total and the byte offset it covers are persisted to a sidecar JSON
+    snapshot, so a freshly started process resumes from the snapshot and only
+    replays bytes appended after it. The snapshot is keyed by inode, offset and
+    a fingerprint of the log's first bytes; a truncated or replaced log
+    invalidates it automatically.
+    """
+
+    def __init__(self, log_path: Path, snapshot_path: Optional[Path] = None):
+        self.log_path = Path(log_path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.log_path.with_name(
+            f"{self.log_path.name}.spend.json"
+        )
+        self._lock = threading.Lock()
+        self._total = 0.0
+        self._tailer = JsonlTailer(self.log_path)
+        self._load_snapshot()
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            offset = int(snapshot.get("offset", 0))
+            inode = snapshot.get("inode")
+            total = float(snapshot.get("total", 0.0))
+            stat = self.log_path.stat()
+            if inode != stat.st_ino or offset > stat.st_size:
+                return
+            if snapshot.get("head") != _head_fingerprint(self.log_path, offset):
+                return
+        except (OSError, ValueError, TypeError, AttributeError):
+            return
+        self._tailer = JsonlTailer(self.log_path, offset=offset, inode=inode)
+        self._total = total
+
+    def _save_snapshot(self) -> None:
+        try:
+            _atomic_write_json(
+                self.snapshot_path,
+                {
+                    "offset": self._tailer.offset,
+                    "inode": self._tailer.inode,
+                    "head": _head_fingerprint(self.log_path, self._tailer.offset),
+                    "total": self._total,
+                },
+            )
+        except OSError:
+            pass
+
+    def total(self) -> float:
+        """Return all-time spend, consuming only bytes appended since the last call."""
+        with self._lock:
+            try:
+                records, reset = self._tailer.poll()
+            except OSError:
+                return self._total
+            if reset:
+                self._total = 0.0
+            for record in records:
+                spent = record.get("budget_used")
+                if spent is None:
+                    continue
+                try:
+                    self._total += float(spent)
+                except (TypeError, ValueError):
+                    pass
+            if records or reset:
+                self._save_snapshot()
+            return self._total
+
+
+def append_execution_record(log_path: Path, record: Dict[str, Any]) -> None:
+    """
+    Append to the execution log through the shared group-commit appender.
+
+    The execution log is never size-rotated (status indexes need its full
+    history); ``compact_execution_log`` is how it is kept small.
+    """
+    get_appender(log_path, max_bytes=0).append(record)
+
+
+# Fields kept per task in memory and in the status snapshot. Everything the
+# runtime reads back from "latest event for task" is here; bulky fields
+# (safety_report, errors, review_issues, result_summary, ...) stay in the log.
+COMPACT_STATUS_FIELDS: Tuple[str, ...] = (
+    "task_id",
+    "status",
+    "timestamp",
+    "resident_id",
+    "worker_id",
+    "identity_id",
+    "identity_name",
+    "model",
+    "budget_used",
+    "review_attempt",
+    "review_verdict",
+    "review_confidence",
+)
+
+
+def compact_status_record(
+    event: Dict[str, Any], fields: Tuple[str, ...] = COMPACT_STATUS_FIELDS
+) -> Dict[str, Any]:
+    return {key: event[key] for key in fields if event.get(key) is not None}
+
+
+class ExecutionStatusIndex:
+    """
+    Latest compact status record per task, derived from the execution log.
+
+    A sidecar snapshot (``<log>.status.json``) stores the compact map together
+    with the byte offset, inode and head fingerprint it covers, so a cold start
+    loads the snapshot and tails only newer bytes instead of replaying the whole
+    log. The snapshot is rewritten atomically at most every
+    ``snapshot_interval`` seconds while new events arrive (and on ``flush``).
+    ``fields`` widens or narrows the kept record; a snapshot written with a
+    different field set is ignored.
+    """
+
+    def __init__(
+        self,
+        log_path: Path,
+        snapshot_path: Optional[Path] = None,
+        snapshot_interval: float = 30.0,
+        fields: Tuple[str, ...] = COMPACT_STATUS_FIELDS,
+    ):
+        self.log_path = Path(log_path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.log_path.with_name(
+            f"{self.log_path.name}.status.json"
+        )
+        self.snapshot_interval = max(0.0, float(snapshot_interval))
+        self.fields = tuple(fields)
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._tailer = JsonlTailer(self.log_path)
+        self._dirty = False
+        self._last_saved_at = 0.0
+        self.loaded_from_snapshot = self._load_snapshot()
+
+    def _load_snapshot(self) -> bool:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            offset = int(snapshot.get("offset", 0))
+            inode = snapshot.get("inode")
+            tasks = snapshot.get("tasks")
+            if tuple(snapshot.get("fields") or COMPACT_STATUS_FIELDS) != self.fields:
+                return False
+            stat = self.log_path.stat()
+            if not isinstance(tasks, dict) or inode != stat.st_ino or offset > stat.st_size:
+                return False
+            if snapshot.get("head") != _head_fingerprint(self.log_path, offset):
+                return False
+        except (OSError, ValueError, TypeError, AttributeError):
+            return False
+        self._tailer = JsonlTailer(self.log_path, offset=offset, inode=inode)
+        self._tasks = {str(k): v for k, v in tasks.items() if isinstance(v, dict)}
+        self._last_saved_at = time.monotonic()
+        return True
+
+    def _save_snapshot(self) -> None:
+        try:
+            log_size = self.log_path.stat().st_size
+            _atomic_write_json(
+                self.snapshot_path,
+                {
+                    "offset": self._tailer.offset,
+                    "inode": self._tailer.inode,
+                    "log_size": log_size,
+                    "head": _head_fingerprint(self.log_path, self._tailer.offset),
+                    "saved_at": datetime.now(timezone.utc).isoformat(),
+                    "fields": list(self.fields),
+                    "tasks": self._tasks,
+                },
+            )
+        except OSError:
+            return
+        self._dirty = False
+        self._last_saved_at = time.monotonic()
+
+    def poll(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Consume new log bytes. Returns (new compact records, reset)."""
+        with self._lock:
+            records, reset = self._tailer.poll()
+            if reset:
+                self._tasks = {}
+                self._dirty = True
+            compact: List[Dict[str, Any]] = []
+            for event in records:
+                task_id = event.get("task_id")
+                if not task_id:
+                    continue
+                record = compact_status_record(event, self.fields)
+                self._tasks[str(task_id)] = record
+                compact.append(record)
+            if compact:
+                self._dirty = True
+            if self._dirty and (reset or time.monotonic() - self._last_saved_at >= self.snapshot_interval):
+                self._save_snapshot()
+            return compact, reset
+
+    def tasks(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._tasks)
+
+    def latest(self, task_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Records for the given task ids only (tasks never logged are left out)."""
+        with self._lock:
+            return {
+                str(task_id): self._tasks[str(task_id)]
+                for task_id in task_ids
+                if str(task_id) in self._tasks
+            }
+
+    def flush(self) -> None:
+        """Write the snapshot now if anything changed since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save_snapshot()
+
+
+COMPACTION_CHECKPOINT_TYPE = "compaction_checkpoint"
+
+
+def compact_execution_log(log_path: Path, archive_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Rewrite the execution log keeping only the latest event per task.
+
+    Superseded events (and unparseable lines) are dropped, or appended to
+    ``archive_dir/<log stem>.<YYYY-MM-DD>.jsonl`` by event date when an archive
+    directory is given. Their ``budget_used`` is carried forward in a single
+    leading checkpoint record without a ``task_id``, so all-time spend derived
+    from the log is unchanged. Runs with the log file flocked; group-commit
+    appenders block on the same lock and reopen the replaced file afterwards.
+    """
+    log_path = Path(log_path)
+    stats: Dict[str, Any] = {"kept": 0, "archived": 0, "segments": []}
+    try:
+        handle = open(log_path, "rb")
+    except OSError:
+        return stats
+    with handle, exclusive_fd_lock(handle.fileno(), log_path.resolve()):
+        try:
+            if os.fstat(handle.fileno()).st_ino != os.stat(log_path).st_ino:
+                return stats  # compacted by someone else while we waited
+            raw_lines = handle.read().splitlines()
+        except OSError:
+            return stats
+
+        parsed: List[Tuple[bytes, Optional[Dict[str, Any]]]] = []
+        latest: Dict[str, int] = {}
+        for raw in raw_lines:
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                record = None
+            if not isinstance(record, dict):
+                record = None
+            parsed.append((raw, record))
+            if record is not None and record.get("task_id"):
+                latest[str(record["task_id"])] = len(parsed) - 1
+
+        kept: List[bytes] = []
+        superseded: Dict[str, List[bytes]] = {}
+        carried_spend = 0.0
+        checkpoints = 0
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        for position, (raw, record) in enumerate(parsed):
+            if record is not None:
+                task_id = record.get("task_id")
+                is_checkpoint = record.get("type") == COMPACTION_CHECKPOINT_TYPE
+                if (task_id and latest.get(str(task_id)) == position) or (not task_id and not is_checkpoint):
+                    kept.append(raw)
+                    continue
+                try:
+                    carried_spend += float(record.get("budget_used") or 0.0)
+                except (TypeError, ValueError):
+                    pass
+                if is_checkpoint:
+                    checkpoints += 1
+                    continue
+                day = str(record.get("timestamp") or "")[:10] or today
+            else:
+                day = today
+            superseded.setdefault(day, []).append(raw)
+
+        archived = sum(len(lines) for lines in superseded.values())
+        if not archived and checkpoints <= 1:
+            stats["kept"] = len(kept)
+            return stats
+
+        if archive_dir is not None:
+            archive_dir = Path(archive_dir)
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            for day in sorted(superseded):
+                segment = archive_dir / f"{log_path.stem}.{day}.jsonl"
+                with open(segment, "ab") as f:
+                    f.write(b"\n".join(superseded[day]) + b"\n")
+                stats["segments"].append(str(segment))
+
+        checkpoint = {
+            "type": COMPACTION_CHECKPOINT_TYPE,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "budget_used": round(carried_spend, 10),
+            "archived_events": archived,
+        }
+        tmp_path = log_path.with_name(f".{log_path.name}.{os.getpid()}.compact.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(checkpoint, ensure_ascii=False).encode("utf-8") + b"\n")
+            for raw in kept:
+                f.write(raw + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, log_path)
+        stats["kept"] = len(kept)
+        stats["archived"] = archived
+    return stats
+
+
+class MtimeJsonCache:
+    """Memoize parsed JSON files, re-reading only when (inode, mtime_ns, size) changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Path, Tuple[Tuple[int, int, int], Any]] = {}
+
+    def read(self, path: Path, default: Any = None) -> Any:
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return default
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return default
+        with self._lock:
+            self._entries[path] = (key, data)
+        return data
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(path), None)
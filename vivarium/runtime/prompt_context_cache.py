@@ -0,0 +1,111 @@
+"""
+Per-identity cache for prompt-context sections.
+
+Every task and delegated subtask rebuilds the same resident preamble (wakeup
+context, enrichment option tree). The inputs rarely change between calls, so
+``PromptContextCache`` memoizes each rendered section per identity:
+
+- A section is keyed by ``(scope, section)`` and stored with a *version*: the
+  caller passes the current version (usually ``file_signature`` of the files
+  the section reads) and the cached value is reused only if it matches.
+- ``invalidate`` marks sections dirty explicitly, for writers in this process
+  whose change might not move the file signature (same-tick rewrite).
+- ``stats`` reports hits, misses and invalidations, overall and per section.
+
+Values that must differ on every call (e.g. random seeds) must be composed
+outside the cached section.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def file_signature(*paths: Path) -> Tuple[Any, ...]:
+    """(inode, mtime_ns, size) per path; missing files yield ``None``."""
+    signature: List[Optional[Tuple[int, int, int]]] = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class PromptContextCache:
+    """Thread-safe, bounded (scope, section) -> value cache with dirty tracking."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        # (scope, section) -> [version, value, dirty]
+        self._entries: "OrderedDict[Tuple[Hashable, str], list]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._section_counts: Dict[str, Dict[str, int]] = {}
+
+    def get(self, scope: Hashable, section: str, version: Hashable, build: Callable[[], T]) -> T:
+        """Return the cached value for ``version`` or build, store and return it."""
+        key = (scope, section)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry[2] and entry[0] == version:
+                self._entries.move_to_end(key)
+                self._count(section, "hits")
+                return entry[1]
+            self._count(section, "misses")
+        value = build()
+        with self._lock:
+            self._entries[key] = [version, value, False]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, sections: Optional[Iterable[str]] = None, scope: Optional[Hashable] = None) -> int:
+        """Mark matching sections dirty (all scopes/sections when omitted)."""
+        wanted = None if sections is None else set(sections)
+        marked = 0
+        with self._lock:
+            for (entry_scope, section), entry in self._entries.items():
+                if scope is not None and entry_scope != scope:
+                    continue
+                if wanted is not None and section not in wanted:
+                    continue
+                if not entry[2]:
+                    entry[2] = True
+                    marked += 1
+            self.invalidations += marked
+        return marked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "sections": {name: dict(counts) for name, counts in self._section_counts.items()},
+            }
+
+    def _count(self, section: str, field: str) -> None:
+        setattr(self, field, getattr(self, field) + 1)
+        counts = self._section_counts.setdefault(section, {"hits": 0, "misses": 0})
+        counts[field] += 1
@@ -0,0 +1,596 @@
+"""
+Pluggable task-queue storage.
+
+Residents, the swarm API and the control panel all mutate the shared task
+queue. Every backend here returns data shaped by ``normalize_queue`` so callers
+keep working against the canonical queue.json contract, but state changes run
+inside a cross-process transaction instead of an unlocked read-modify-write.
+
+Backends:
+- JsonQueueBackend   : queue.json guarded by an flock'd sidecar lock file,
+                       written atomically (default).
+- SqliteQueueBackend : WAL-mode SQLite with one row per task and indexes on
+                       section/status, shard and identity. A transaction only
+                       writes the rows it changed. queue.json is kept as a JSON
+                       export for tooling that still reads the file: it is
+                       rewritten in the background at most once per
+                       ``QUEUE_EXPORT_INTERVAL_SECONDS`` (so it may lag the
+                       database by that much) and is re-imported if edited
+                       out-of-band.
+
+Select the backend with VIVARIUM_QUEUE_BACKEND=json|sqlite.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from vivarium.runtime.config import QUEUE_EXPORT_INTERVAL_SECONDS
+from vivarium.runtime.runtime_contract import normalize_queue, normalize_task
+from vivarium.utils import read_json
+from vivarium.utils.file_lock import exclusive_lock
+
+QUEUE_SECTIONS: Tuple[str, ...] = ("tasks", "completed", "failed")
+TERMINAL_SUCCESS_STATUSES = {"completed", "approved", "ready_for_merge"}
+TERMINAL_FAILURE_STATUSES = {"failed"}
+CLAIMABLE_STATUSES = {"pending", "requeue"}
+SQLITE_BUSY_TIMEOUT_SECONDS = 30.0
+
+
+def task_shard_key(task_id: str) -> int:
+    """Stable 32-bit shard key (same hash worker_runtime uses for shard assignment)."""
+    digest = hashlib.sha1(str(task_id).encode("utf-8")).hexdigest()
+    return int(digest[:8], 16)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _write_queue_json(path: Path, queue: Dict[str, Any]) -> None:
+    """Write queue.json atomically with the same formatting as utils.write_json."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(queue, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def apply_outcome_to_queue(queue: Dict[str, Any], task_id: str, final_status: str) -> bool:
+    """
+    Move/update an open task according to its execution outcome (in place).
+
+    - approved/completed/ready_for_merge -> move from open tasks to completed
+    - failed -> move from open tasks to failed
+    - requeue/pending_review/etc -> keep task in open queue at the same position
+    """
+    tasks = list(queue.get("tasks", []))
+    task_index = next((idx for idx, task in enumerate(tasks) if task.get("id") == task_id), None)
+    if task_index is None:
+        return False
+
+    task = dict(tasks.pop(task_index))
+    if final_status in TERMINAL_SUCCESS_STATUSES:
+        task["status"] = "completed"
+        queue.setdefault("completed", []).append(task)
+    elif final_status in TERMINAL_FAILURE_STATUSES:
+        task["status"] = "failed"
+        queue.setdefault("failed", []).append(task)
+    else:
+        task["status"] = "pending" if final_status == "requeue" else final_status
+        tasks.insert(task_index, task)
+    queue["tasks"] = tasks
+    return True
+
+
+class QueueBackend(ABC):
+    """Storage contract shared by all queue backends."""
+
+    @abstractmethod
+    def read(self) -> Dict[str, Any]:
+        """Return the full queue normalized to the queue.json contract."""
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[Dict[str, Any]]:
+        """Yield the current queue for in-place mutation; persisted atomically on exit."""
+
+    def replace(self, queue: Dict[str, Any]) -> None:
+        """Overwrite the stored queue."""
+        with self.transaction() as current:
+            current.clear()
+            current.update(normalize_queue(queue))
+
+    def export(self) -> Dict[str, Any]:
+        """JSON export for the normalize_queue contract (same as ``read``)."""
+        return self.read()
+
+    def add_tasks(self, tasks: List[Dict[str, Any]], *, skip_existing: bool = False) -> List[str]:
+        """Append tasks to the open queue; returns the ids actually added."""
+        added: List[str] = []
+        with self.transaction() as queue:
+            open_tasks = queue.setdefault("tasks", [])
+            existing = {str(t.get("id")) for t in open_tasks if t.get("id")} if skip_existing else set()
+            for task in tasks:
+                normalized = normalize_task(task)
+                task_id = str(normalized.get("id") or "")
+                if skip_existing and task_id in existing:
+                    continue
+                open_tasks.append(normalized)
+                existing.add(task_id)
+                added.append(task_id)
+        return added
+
+    def apply_outcome(self, task_id: str, final_status: str) -> bool:
+        """Atomically record a task's execution outcome in the queue."""
+        with self.transaction() as queue:
+            return apply_outcome_to_queue(queue, task_id, final_status)
+
+    def claim(self, task_id: str, owner: str, *, takeover: bool = False) -> bool:
+        """
+        Atomically mark a pending open task as claimed by ``owner``.
+
+        ``takeover`` claims any open task whatever its status; for callers that
+        already hold the task's lease, so an earlier claim is from a dead owner.
+        """
+        with self.transaction() as queue:
+            for task in queue.get("tasks", []):
+                if task.get("id") != task_id:
+                    continue
+                if not takeover and task.get("status", "pending") not in CLAIMABLE_STATUSES:
+                    return False
+                task["status"] = "in_progress"
+                task["claimed_by"] = owner
+                task["claimed_at"] = _utc_now_iso()
+                return True
+        return False
+
+    def open_queue(self) -> Dict[str, Any]:
+        """The queue header and open tasks only (``completed``/``failed`` left empty)."""
+        queue = self.read()
+        queue["completed"], queue["failed"] = [], []
+        return queue
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        queue = self.read()
+        for section in QUEUE_SECTIONS:
+            for task in queue.get(section, []):
+                if task.get("id") == task_id:
+                    return task
+        return None
+
+    def tasks_by_status(self, status: str, section: str = "tasks") -> List[Dict[str, Any]]:
+        return [t for t in self.read().get(section, []) if t.get("status") == status]
+
+    def tasks_for_shard(self, shard_id: int, shard_count: int) -> List[Dict[str, Any]]:
+        return [
+            t for t in self.read().get("tasks", [])
+            if t.get("id") and task_shard_key(t["id"]) % shard_count == shard_id
+        ]
+
+    def tasks_for_identity(self, identity_id: str) -> List[Dict[str, Any]]:
+        return [
+            t for t in self.read().get("tasks", [])
+            if identity_id in (t.get("identity_id"), t.get("resident_identity"))
+        ]
+
+
+class JsonQueueBackend(QueueBackend):
+    """queue.json with an flock'd sidecar lock and atomic replace-on-write."""
+
+    def __init__(self, queue_file: Path):
+        self.queue_file = Path(queue_file)
+        self.lock_file = self.queue_file.with_name(f"{self.queue_file.name}.lock")
+
+    def read(self) -> Dict[str, Any]:
+        return normalize_queue(read_json(self.queue_file, default={}))
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Any]]:
+        with exclusive_lock(self.lock_file):
+            queue = self.read()
+            yield queue
+            _write_queue_json(self.queue_file, normalize_queue(queue))
+
+
+class SqliteQueueBackend(QueueBackend):
+    """WAL-mode SQLite queue with row-level claim/complete and indexed lookups."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        export_path: Optional[Path] = None,
+        export_interval_seconds: float = QUEUE_EXPORT_INTERVAL_SECONDS,
+    ):
+        self.db_path = Path(db_path)
+        self.export_path = Path(export_path) if export_path else None
+        self.export_interval_seconds = max(0.0, float(export_interval_seconds))
+        self._local = threading.local()
+        self._export_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._export_timer: Optional[threading.Timer] = None
+        self._last_export = 0.0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS queue_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS queue_tasks (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT,
+                section TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                status TEXT,
+                shard_key INTEGER,
+                identity_id TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_queue_tasks_section_pos ON queue_tasks(section, position);
+            CREATE INDEX IF NOT EXISTS idx_queue_tasks_status ON queue_tasks(section, status);
+            CREATE INDEX IF NOT EXISTS idx_queue_tasks_task_id ON queue_tasks(task_id);
+            CREATE INDEX IF NOT EXISTS idx_queue_tasks_shard ON queue_tasks(shard_key);
+            CREATE INDEX IF NOT EXISTS idx_queue_tasks_identity ON queue_tasks(identity_id);
+            """
+        )
+
+    # -- connection / transaction plumbing ---------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=SQLITE_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write_txn(self, export: bool = True) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._import_external_edits(conn)
+            yield conn
+            if export and self.export_interval_seconds <= 0:
+                self._write_export(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        if export and self.export_interval_seconds > 0:
+            self._schedule_export()
+
+    @contextmanager
+    def _read_txn(self) -> Iterator[sqlite3.Connection]:
+        self._refresh_from_export()
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.execute("COMMIT")
+
+    def _meta_get(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM queue_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _meta_set(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute(
+            "INSERT INTO queue_meta(key, value) VALUES(?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def _export_signature(self) -> Optional[str]:
+        if self.export_path is None:
+            return None
+        try:
+            stat = self.export_path.stat()
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _import_external_edits(self, conn: sqlite3.Connection) -> None:
+        """Adopt queue.json if it was written by someone other than this backend."""
+        signature = self._export_signature()
+        if signature is None or signature == self._meta_get(conn, "export_signature"):
+            return
+        try:
+            queue = normalize_queue(read_json(self.export_path, default={}))
+        except (OSError, ValueError):
+            return
+        self._store_queue(conn, queue)
+        self._meta_set(conn, "export_signature", signature)
+
+    def _write_export(self, conn: sqlite3.Connection) -> None:
+        """Refresh queue.json inside a write transaction so exports never go stale-out-of-order."""
+        if self.export_path is None:
+            return
+        try:
+            _write_queue_json(self.export_path, self._load_queue(conn))
+        except OSError:
+            return
+        self._last_export = time.monotonic()
+        signature = self._export_signature()
+        if signature is not None:
+            self._meta_set(conn, "export_signature", signature)
+
+    def _schedule_export(self) -> None:
+        """Debounce queue.json: one background export per interval covers every write before it."""
+        if self.export_path is None:
+            return
+        with self._export_lock:
+            if self._export_timer is not None:
+                return
+            delay = max(0.0, self._last_export + self.export_interval_seconds - time.monotonic())
+            timer = threading.Timer(delay, self.flush_export)
+            timer.daemon = True
+            self._export_timer = timer
+            _PENDING_EXPORTS.add(self)
+        timer.start()
+
+    def flush_export(self) -> None:
+        """Write any pending queue.json export now (waits for one already being written)."""
+        with self._flush_lock:
+            with self._export_lock:
+                timer, self._export_timer = self._export_timer, None
+                _PENDING_EXPORTS.discard(self)
+            if timer is None:
+                return
+            timer.cancel()
+            try:
+                with self._write_txn(export=False) as conn:
+                    self._write_export(conn)
+            except sqlite3.Error:
+                pass
+
+    # -- row <-> queue mapping ---------------------------------------------
+
+    @staticmethod
+    def _row_values(task: Dict[str, Any], section: str, position: int) -> Tuple[Any, ...]:
+        task_id = task.get("id")
+        identity = task.get("identity_id") or task.get("resident_identity")
+        return (
+            str(task_id) if task_id else None,
+            section,
+            position,
+            task.get("status"),
+            task_shard_key(task_id) if task_id else None,
+            str(identity) if identity else None,
+            json.dumps(task, ensure_ascii=False),
+        )
+
+    def _insert(self, conn: sqlite3.Connection, task: Dict[str, Any], section: str, position: int) -> None:
+        conn.execute(
+            "INSERT INTO queue_tasks(task_id, section, position, status, shard_key, identity_id, payload) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?)",
+            self._row_values(task, section, position),
+        )
+
+    def _next_position(self, conn: sqlite3.Connection, section: str) -> int:
+        row = conn.execute("SELECT MAX(position) FROM queue_tasks WHERE section = ?", (section,)).fetchone()
+        return (row[0] if row and row[0] is not None else -1) + 1
+
+    def _store_queue(self, conn: sqlite3.Connection, queue: Dict[str, Any]) -> None:
+        """
+        Persist ``queue``, touching only rows whose section, order or payload changed.
+
+        Rows are matched to tasks by id (tasks without one by payload). A kept
+        row keeps its position while the order is still increasing, so removing
+        or appending tasks does not renumber the rest of the section.
+        """
+        normalized = normalize_queue(queue)
+        pool: Dict[Any, List[Tuple[int, str, int, str]]] = {}
+        for seq, task_id, section, position, payload in conn.execute(
+            "SELECT seq, task_id, section, position, payload FROM queue_tasks ORDER BY section, position, seq"
+        ):
+            pool.setdefault(task_id if task_id is not None else ("payload", payload), []).append(
+                (seq, section, position, payload)
+            )
+        for section in QUEUE_SECTIONS:
+            last_position = -1
+            for task in normalized.get(section, []):
+                if not isinstance(task, dict):
+                    continue
+                values = self._row_values(task, section, 0)
+                payload = values[-1]
+                candidates = pool.get(values[0] if values[0] is not None else ("payload", payload))
+                if not candidates:
+                    last_position += 1
+                    self._insert(conn, task, section, last_position)
+                    continue
+                seq, old_section, old_position, old_payload = candidates.pop(0)
+                position = old_position if old_section == section and old_position > last_position else last_position + 1
+                last_position = position
+                if (old_section, old_position, old_payload) != (section, position, payload):
+                    conn.execute(
+                        "UPDATE queue_tasks SET task_id = ?, section = ?, position = ?, status = ?, "
+                        "shard_key = ?, identity_id = ?, payload = ? WHERE seq = ?",
+                        self._row_values(task, section, position) + (seq,),
+                    )
+        stale = [(seq,) for rows in pool.values() for seq, _, _, _ in rows]
+        if stale:
+            conn.executemany("DELETE FROM queue_tasks WHERE seq = ?", stale)
+        header = json.dumps({k: v for k, v in normalized.items() if k not in QUEUE_SECTIONS}, ensure_ascii=False)
+        if header != self._meta_get(conn, "header"):
+            self._meta_set(conn, "header", header)
+
+    def _load_queue(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        header_raw = self._meta_get(conn, "header")
+        queue: Dict[str, Any] = json.loads(header_raw) if header_raw else {}
+        for section in QUEUE_SECTIONS:
+            queue[section] = [
+                json.loads(row[0])
+                for row in conn.execute(
+                    "SELECT payload FROM queue_tasks WHERE section = ? ORDER BY position, seq",
+                    (section,),
+                )
+            ]
+        return normalize_queue(queue)
+
+    def _select(self, where: str, params: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        with self._read_txn() as conn:
+            rows = conn.execute(
+                f"SELECT payload FROM queue_tasks WHERE {where} ORDER BY position, seq",
+                params,
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _refresh_from_export(self) -> None:
+        conn = self._conn()
+        if self._export_signature() in (None, self._meta_get(conn, "export_signature")):
+            return
+        with self._write_txn(export=False):
+            pass  # imports the edited queue.json
+
+    # -- QueueBackend API ---------------------------------------------------
+
+    def read(self) -> Dict[str, Any]:
+        with self._read_txn() as conn:
+            return self._load_queue(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Any]]:
+        with self._write_txn() as conn:
+            queue = self._load_queue(conn)
+            yield queue
+            self._store_queue(conn, queue)
+
+    def add_tasks(self, tasks: List[Dict[str, Any]], *, skip_existing: bool = False) -> List[str]:
+        added: List[str] = []
+        with self._write_txn() as conn:
+            position = self._next_position(conn, "tasks")
+            for task in tasks:
+                normalized = normalize_task(task)
+                task_id = str(normalized.get("id") or "")
+                if skip_existing and task_id and conn.execute(
+                    "SELECT 1 FROM queue_tasks WHERE section = 'tasks' AND task_id = ?", (task_id,)
+                ).fetchone():
+                    continue
+                self._insert(conn, normalized, "tasks", position)
+                position += 1
+                added.append(task_id)
+        return added
+
+    def apply_outcome(self, task_id: str, final_status: str) -> bool:
+        with self._write_txn() as conn:
+            row = conn.execute(
+                "SELECT seq, payload FROM queue_tasks WHERE section = 'tasks' AND task_id = ? "
+                "ORDER BY position, seq LIMIT 1",
+                (task_id,),
+            ).fetchone()
+            if row is None:
+                return False
+            seq, payload = row
+            task = json.loads(payload)
+            if final_status in TERMINAL_SUCCESS_STATUSES or final_status in TERMINAL_FAILURE_STATUSES:
+                section = "completed" if final_status in TERMINAL_SUCCESS_STATUSES else "failed"
+                task["status"] = section
+                position = self._next_position(conn, section)
+            else:
+                section = "tasks"
+                task["status"] = "pending" if final_status == "requeue" else final_status
+                position = conn.execute("SELECT position FROM queue_tasks WHERE seq = ?", (seq,)).fetchone()[0]
+            conn.execute(
+                "UPDATE queue_tasks SET section = ?, position = ?, status = ?, payload = ? WHERE seq = ?",
+                (section, position, task["status"], json.dumps(task, ensure_ascii=False), seq),
+            )
+            return True
+
+    def claim(self, task_id: str, owner: str, *, takeover: bool = False) -> bool:
+        claimable = "" if takeover else " AND (status IS NULL OR status IN ('pending', 'requeue'))"
+        with self._write_txn() as conn:
+            row = conn.execute(
+                "SELECT seq, payload FROM queue_tasks WHERE section = 'tasks' AND task_id = ?"
+                f"{claimable} LIMIT 1",
+                (task_id,),
+            ).fetchone()
+            if row is None:
+                return False
+            seq, payload = row
+            task = json.loads(payload)
+            task.update({"status": "in_progress", "claimed_by": owner, "claimed_at": _utc_now_iso()})
+            conn.execute(
+                "UPDATE queue_tasks SET status = ?, payload = ? WHERE seq = ?",
+                ("in_progress", json.dumps(task, ensure_ascii=False), seq),
+            )
+            return True
+
+    def open_queue(self) -> Dict[str, Any]:
+        with self._read_txn() as conn:
+            header_raw = self._meta_get(conn, "header")
+        queue: Dict[str, Any] = json.loads(header_raw) if header_raw else {}
+        queue.update(tasks=self._select("section = 'tasks'", ()), completed=[], failed=[])
+        return normalize_queue(queue)
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("task_id = ?", (str(task_id),))
+        return rows[0] if rows else None
+
+    def tasks_by_status(self, status: str, section: str = "tasks") -> List[Dict[str, Any]]:
+        return self._select("section = ? AND status = ?", (section, status))
+
+    def tasks_for_shard(self, shard_id: int, shard_count: int) -> List[Dict[str, Any]]:
+        return self._select("section = 'tasks' AND shard_key % ? = ?", (int(shard_count), int(shard_id)))
+
+    def tasks_for_identity(self, identity_id: str) -> List[Dict[str, Any]]:
+        return self._select("section = 'tasks' AND identity_id = ?", (str(identity_id),))
+
+
+# Backends with a debounced queue.json export still to write; flushed at exit.
+_PENDING_EXPORTS: "weakref.WeakSet[SqliteQueueBackend]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_exports() -> None:
+    for backend in list(_PENDING_EXPORTS):
+        backend.flush_export()
+
+
+_BACKENDS: Dict[Tuple[str, str], QueueBackend] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def get_queue_backend(queue_file: Path, kind: Optional[str] = None) -> QueueBackend:
+    """
+    Return the (cached) queue backend for ``queue_file``.
+
+    ``kind`` defaults to VIVARIUM_QUEUE_BACKEND (json|sqlite). The SQLite
+    database lives next to queue.json as ``queue.sqlite3`` and keeps queue.json
+    as its JSON export.
+    """
+    kind = (kind or os.environ.get("VIVARIUM_QUEUE_BACKEND") or "json").strip().lower()
+    queue_file = Path(queue_file)
+    key = (kind, str(queue_file.resolve()))
+    with _BACKENDS_LOCK:
+        backend = _BACKENDS.get(key)
+        if backend is None:
+            if kind == "sqlite":
+                backend = SqliteQueueBackend(
+                    queue_file.with_name(f"{queue_file.stem}.sqlite3"),
+                    export_path=queue_file,
+                )
+            elif kind == "json":
+                backend = JsonQueueBackend(queue_file)
+            else:
+                raise ValueError(f"Unknown queue backend '{kind}' (expected json or sqlite)")
+            _BACKENDS[key] = backend
+        return backend
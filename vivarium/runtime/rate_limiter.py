@@ -0,0 +1,274 @@
+"""
+Per-model Groq rate limiting shared by every process on the host.
+
+Each model gets two token buckets - requests per minute and tokens per
+minute - stored in one small JSON state file that is only rewritten under an
+exclusive flock, so all residents and API processes draw from the same quota
+instead of each pacing itself (the old fixed 2-second gap and 60/min limiter
+capped the whole swarm far below the real limits).
+
+- RPM comes from ``scout/config/groq_model_specs.json``
+  (``RATE_LIMIT_DEFAULT_RPM`` for models not listed there).
+- TPM is learned from the ``x-ratelimit-limit-tokens`` response header;
+  until a model reports one it is ``RATE_LIMIT_DEFAULT_TPM`` (0 = unlimited).
+- ``x-ratelimit-remaining-*`` headers pull the buckets down to what the API
+  says is left; ``Retry-After`` (or an exhausted daily request quota) blocks
+  the model until the indicated time.
+
+``acquire`` waits up to ``max_wait`` seconds for capacity; ``wait_time``
+reports the wait without consuming anything; ``observe`` feeds response
+headers and actual token usage back into the buckets.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from vivarium.runtime.config import (
+    RATE_LIMIT_DEFAULT_RPM,
+    RATE_LIMIT_DEFAULT_TPM,
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+)
+from vivarium.runtime.vivarium_scope import RATE_LIMIT_STATE_FILE
+from vivarium.utils.file_lock import exclusive_lock
+
+MODEL_SPECS_FILE = Path(__file__).resolve().parents[1] / "scout" / "config" / "groq_model_specs.json"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_reset_seconds(value: Any) -> Optional[float]:
+    """Parse Groq reset/Retry-After values ("7.66s", "2m59.56s", "500ms", "12") into seconds."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def load_model_rpm_limits(specs_file: Path = MODEL_SPECS_FILE) -> Dict[str, int]:
+    """``{spec key: rpm_limit}`` from groq_model_specs.json (empty if unreadable)."""
+    try:
+        specs = json.loads(Path(specs_file).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(specs, dict):
+        return {}
+    limits: Dict[str, int] = {}
+    for key, spec in specs.items():
+        try:
+            limits[str(key)] = int(spec["rpm_limit"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return limits
+
+
+class SharedRateLimiter:
+    """Flock-protected per-model RPM/TPM token buckets in a shared state file."""
+
+    def __init__(
+        self,
+        state_file: Path,
+        rpm_limits: Optional[Mapping[str, int]] = None,
+        default_rpm: int = RATE_LIMIT_DEFAULT_RPM,
+        default_tpm: int = RATE_LIMIT_DEFAULT_TPM,
+        max_wait_seconds: float = RATE_LIMIT_MAX_WAIT_SECONDS,
+    ):
+        self.state_file = Path(state_file)
+        self.lock_file = self.state_file.with_name(f"{self.state_file.name}.lock")
+        self.rpm_limits = dict(load_model_rpm_limits() if rpm_limits is None else rpm_limits)
+        self.default_rpm = max(1, int(default_rpm))
+        self.default_tpm = max(0, int(default_tpm))
+        self.max_wait_seconds = max(0.0, float(max_wait_seconds))
+        self._stats_lock = threading.Lock()
+        self.granted = 0
+        self.denied = 0
+        self.waited_seconds = 0.0
+
+    def rpm_for(self, model: str) -> int:
+        """Spec RPM for ``model``; spec keys may carry a display-name prefix before the model id."""
+        model = str(model or "")
+        if model in self.rpm_limits:
+            return self.rpm_limits[model]
+        for key, rpm in self.rpm_limits.items():
+            if model and key.endswith(model):
+                return rpm
+        return self.default_rpm
+
+    # -- state I/O ----------------------------------------------------------
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        models = data.get("models") if isinstance(data, dict) else None
+        return models if isinstance(models, dict) else {}
+
+    def _store(self, models: Dict[str, Dict[str, Any]]) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_name(f".{self.state_file.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"models": models}, indent=2), encoding="utf-8")
+        os.replace(tmp, self.state_file)
+
+    def _bucket(self, models: Dict[str, Dict[str, Any]], model: str, now: float) -> Dict[str, Any]:
+        """Refilled bucket for ``model`` (created full on first use)."""
+        bucket = models.get(model)
+        rpm = float(self.rpm_for(model))
+        if not isinstance(bucket, dict):
+            tpm = float(self.default_tpm)
+            bucket = {"rpm": rpm, "tpm": tpm, "requests": rpm, "tokens": tpm, "updated_at": now, "blocked_until": 0.0}
+            models[model] = bucket
+            return bucket
+        bucket["rpm"] = rpm
+        tpm = float(bucket.get("tpm") or 0.0)
+        elapsed = max(0.0, now - float(bucket.get("updated_at") or now))
+        bucket["requests"] = min(rpm, float(bucket.get("requests", rpm)) + elapsed * rpm / 60.0)
+        if tpm > 0:
+            bucket["tokens"] = min(tpm, float(bucket.get("tokens", tpm)) + elapsed * tpm / 60.0)
+        bucket["updated_at"] = now
+        return bucket
+
+    @staticmethod
+    def _wait_needed(bucket: Dict[str, Any], tokens: int, now: float) -> float:
+        wait = max(0.0, float(bucket.get("blocked_until") or 0.0) - now)
+        rpm = float(bucket["rpm"])
+        if bucket["requests"] < 1.0:
+            wait = max(wait, (1.0 - bucket["requests"]) * 60.0 / rpm)
+        tpm = float(bucket.get("tpm") or 0.0)
+        if tpm > 0 and tokens > 0:
+            needed = min(float(tokens), tpm)  # a request larger than TPM waits for a full bucket
+            if bucket["tokens"] < needed:
+                wait = max(wait, (needed - bucket["tokens"]) * 60.0 / tpm)
+        return wait
+
+    # -- public API ---------------------------------------------------------
+
+    def wait_time(self, model: str, tokens: int = 0) -> float:
+        """Seconds until ``model`` could serve a request of ``tokens`` (nothing is consumed)."""
+        now = time.time()
+        with exclusive_lock(self.lock_file):
+            bucket = self._bucket(self._load(), model, now)
+        return self._wait_needed(bucket, max(0, int(tokens)), now)
+
+    def acquire(self, model: str, tokens: int = 0, max_wait: Optional[float] = None) -> bool:
+        """
+        Take one request (and ``tokens`` estimated tokens) from ``model``'s quota.
+
+        Sleeps while the quota refills; returns False if that would take
+        longer than ``max_wait`` (default ``max_wait_seconds``).
+        """
+        tokens = max(0, int(tokens))
+        budget = self.max_wait_seconds if max_wait is None else max(0.0, float(max_wait))
+        started = time.time()
+        deadline = started + budget
+        while True:
+            now = time.time()
+            with exclusive_lock(self.lock_file):
+                models = self._load()
+                bucket = self._bucket(models, model, now)
+                wait = self._wait_needed(bucket, tokens, now)
+                if wait <= 0:
+                    bucket["requests"] -= 1.0
+                    if bucket.get("tpm"):
+                        bucket["tokens"] -= tokens
+                    self._store(models)
+            if wait <= 0:
+                with self._stats_lock:
+                    self.granted += 1
+                    self.waited_seconds += now - started
+                return True
+            if now + wait > deadline:
+                with self._stats_lock:
+                    self.denied += 1
+                return False
+            time.sleep(wait)
+
+    def observe(
+        self,
+        model: str,
+        headers: Optional[Mapping[str, Any]] = None,
+        estimated_tokens: int = 0,
+        actual_tokens: Optional[int] = None,
+    ) -> None:
+        """Adapt ``model``'s buckets from response headers and the call's real token usage."""
+        lowered = {str(k).lower(): v for k, v in dict(headers or {}).items()}
+        if not lowered and actual_tokens is None:
+            return
+        now = time.time()
+        with exclusive_lock(self.lock_file):
+            models = self._load()
+            bucket = self._bucket(models, model, now)
+            try:
+                tpm = float(lowered["x-ratelimit-limit-tokens"])
+            except (KeyError, TypeError, ValueError):
+                tpm = 0.0
+            if tpm > 0 and tpm != bucket.get("tpm"):
+                previous = float(bucket.get("tpm") or 0.0)
+                bucket["tpm"] = tpm
+                bucket["tokens"] = tpm if previous <= 0 else min(tpm, float(bucket.get("tokens", tpm)))
+            if actual_tokens is not None and bucket.get("tpm"):
+                # Settle the pre-call estimate against real usage (may leave a debt).
+                bucket["tokens"] = max(-bucket["tpm"], bucket["tokens"] - (int(actual_tokens) - int(estimated_tokens)))
+            try:
+                remaining_tokens = float(lowered["x-ratelimit-remaining-tokens"])
+            except (KeyError, TypeError, ValueError):
+                remaining_tokens = None
+            if remaining_tokens is not None and bucket.get("tpm"):
+                bucket["tokens"] = min(bucket["tokens"], remaining_tokens)
+            # Groq's request headers describe the daily quota: block only once it is spent.
+            try:
+                requests_exhausted = float(lowered["x-ratelimit-remaining-requests"]) <= 0
+            except (KeyError, TypeError, ValueError):
+                requests_exhausted = False
+            blocked_until = float(bucket.get("blocked_until") or 0.0)
+            reset_requests = parse_reset_seconds(lowered.get("x-ratelimit-reset-requests"))
+            if requests_exhausted and reset_requests is not None:
+                blocked_until = max(blocked_until, now + reset_requests)
+            retry_after = parse_reset_seconds(lowered.get("retry-after"))
+            if retry_after is not None:
+                blocked_until = max(blocked_until, now + retry_after)
+            bucket["blocked_until"] = blocked_until
+            self._store(models)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current (refilled) buckets of every model seen so far."""
+        now = time.time()
+        with exclusive_lock(self.lock_file):
+            models = self._load()
+            return {model: dict(self._bucket(models, model, now)) for model in list(models)}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "granted": self.granted,
+                "denied": self.denied,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+_shared_limiter: Optional[SharedRateLimiter] = None
+_shared_limiter_guard = threading.Lock()
+
+
+def get_rate_limiter() -> SharedRateLimiter:
+    """Process-wide limiter backed by the host-wide state file."""
+    global _shared_limiter
+    with _shared_limiter_guard:
+        if _shared_limiter is None:
+            _shared_limiter = SharedRateLimiter(RATE_LIMIT_STATE_FILE)
+        return _shared_limiter
@@ -23,6 +23,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from vivarium.utils import read_json, write_json
 from vivarium.runtime.secure_api_wrapper import AuditLogger
+from vivarium.runtime.prompt_context_cache import PromptContextCache
+from vivarium.runtime.queue_store import get_queue_backend
 
 try:
     from vivarium.runtime.vivarium_scope import MUTABLE_SWARM_DIR
@@ -47,6 +49,8 @@ LEGACY_IDENTITY_LOCKS_FILE = IDENTITY_LOCKS_FILE
 RESIDENT_DAYS_FILE = MUTABLE_SWARM_DIR / "resident_days.json"
 IDENTITY_LOCKS_FILE = MUTABLE_SWARM_DIR / "identity_locks.json"
 COMMUNITY_LIBRARY_ROOT = "library/community_library"
+# Rendered wakeup preambles, keyed by identity and the ResidentContext state.
+WAKEUP_CONTEXT_CACHE = PromptContextCache()
 BOOTSTRAP_IDENTITY_COUNT = 8
 AUTO_BOOTSTRAP_IDENTITIES = os.environ.get("VIVARIUM_BOOTSTRAP_IDENTITIES", "0").strip().lower() in {
     "1",
@@ -333,6 +337,16 @@ class ResidentContext:
         return ((self.day_count - 1) % 7) + 1
 
     def build_wakeup_context(self) -> str:
+        # repr() of the dataclass covers every field the preamble reads, so any
+        # change (wallet, notifications, mutable profile, day) re-renders it.
+        return WAKEUP_CONTEXT_CACHE.get(
+            self.identity.identity_id,
+            "wakeup",
+            repr(self),
+            self._render_wakeup_context,
+        )
+
+    def _render_wakeup_context(self) -> str:
         statement = (self.identity.identity_statement or "").strip()
         if not statement:
             statement = (
@@ -826,7 +840,7 @@ def _load_token_rates(workspace: Path) -> List[str]:
 
 
 def _build_world_state(workspace: Path) -> WorldState:
-    queue = read_json(workspace / "queue.json", default={})
+    queue = get_queue_backend(workspace / "queue.json").read()
     open_tasks = len(queue.get("tasks", []))
     bounties = _load_bounties(workspace)
     slot_summary = _summarize_bounty_slots(bounties)
@@ -1,14 +1,26 @@
 """
 Safety Gateway - FIXED VERSION
 Added semantic intent detection to avoid blocking safety design tasks.
+
+The blocking rules of the four checkers share one table of literal anchors
+(``SafetyScanner``), so a task is first scanned once for any of them. Only
+texts that contain an anchor run the checkers one by one to produce the exact
+report; everything else passes from that scan. Verdicts are memoized per
+gateway in an LRU keyed by the SHA-256 of the task text.
 """
 
+import hashlib
 import json
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from vivarium.runtime.config import SAFETY_VERDICT_CACHE_SIZE
+from vivarium.utils.jsonl_appender import get_appender
+
 try:
     from experiments_sandbox import is_core_protected
 except ImportError:
@@ -21,17 +33,58 @@ except ImportError:
         return False
 
 
+# Rule tables shared by the checkers and the combined scanner.
+CONSTITUTIONAL_SAFETY_INDICATORS = [
+    r'\b(DESIGN|IMPLEMENT|CREATE|BUILD)\s*:',
+    r'\b(block|prevent|deny|reject|validate|sanitize|filter)\b',
+    r'\b(safe|security|gateway|proxy|allowlist|blocklist)\b',
+    r'\b(audit|review|research|document)\b.*\b(security|safety)\b',
+    r'\bread[_\-\s]?only\b',
+]
+CONSTITUTIONAL_SAFETY_INTENTS = [
+    r'\b(block|prevent|deny|reject)\b.{0,50}\b(exfiltrat|credential|network)',
+    r'\b(exfiltrat|credential|network).{0,50}\b(block|prevent|deny|reject)\b',
+]
+CONSTITUTIONAL_VIOLATIONS = [
+    (r'\bexfiltrate\s+data\s+to\b', "Data exfiltration to external"),
+    (r'\bsend\s+secrets\s+to\b', "Sending secrets externally"),
+    (r'\bself[_\s]replicate\s+to\s+external\b', "Self-replication"),
+    (r'\bphone\s+home\b', "Phone-home behavior"),
+]
+SYSTEM_DIRS = ["/etc/passwd", "/etc/shadow", "C:\\Windows\\System32"]
+NETWORK_SAFETY_INDICATORS = [
+    r'\b(DESIGN|IMPLEMENT|CREATE|BUILD)\s*:',
+    r'\b(block|prevent|deny|reject|validate|proxy|gateway)\b',
+]
+NETWORK_VIOLATIONS = [
+    (r'\bcurl\s+.*\|\s*bash\b', "Piping curl to bash"),
+    (r'\bwget\s+.*\|\s*sh\b', "Piping wget to shell"),
+]
+PROMPT_INJECTION_PATTERNS = [
+    r'ignore\s+previous\s+instructions',
+    r'disregard\s+all\s+above',
+    r'forget\s+everything',
+    r'override\s+constraints',
+    r'</system>',
+    r'<\|im_start\|>',
+]
+# Literal every blocking rule above needs in the lowered task text.
+VIOLATION_ANCHORS = [
+    "exfiltrate", "secrets", "replicate", "phone",
+    *(d.lower() for d in SYSTEM_DIRS),
+    "curl", "wget",
+    "ignore", "disregard", "forget", "override", "</system>", "<|im_start|>",
+]
+
+
 class ConstitutionalChecker:
+    _violations = [(re.compile(pattern), name) for pattern, name in CONSTITUTIONAL_VIOLATIONS]
+    _intents = [re.compile(pattern, re.IGNORECASE) for pattern in CONSTITUTIONAL_SAFETY_INTENTS]
+
     def __init__(self, constraints_file: Path):
         self.constraints_file = constraints_file
         self.constraints = self._load_constraints()
-        self.safety_indicators = [
-            re.compile(r'\b(DESIGN|IMPLEMENT|CREATE|BUILD)\s*:', re.IGNORECASE),
-            re.compile(r'\b(block|prevent|deny|reject|validate|sanitize|filter)\b', re.IGNORECASE),
-            re.compile(r'\b(safe|security|gateway|proxy|allowlist|blocklist)\b', re.IGNORECASE),
-            re.compile(r'\b(audit|review|research|document)\b.*\b(security|safety)\b', re.IGNORECASE),
-            re.compile(r'\bread[_\-\s]?only\b', re.IGNORECASE),
-        ]
+        self.safety_indicators = [re.compile(p, re.IGNORECASE) for p in CONSTITUTIONAL_SAFETY_INDICATORS]
 
     def _load_constraints(self) -> dict:
         if not self.constraints_file.exists():
@@ -43,49 +96,39 @@ class ConstitutionalChecker:
         for pattern in self.safety_indicators:
             if pattern.search(task):
                 return True
-        if re.search(r'\b(block|prevent|deny|reject)\b.{0,50}\b(exfiltrat|credential|network)', task, re.IGNORECASE):
-            return True
-        if re.search(r'\b(exfiltrat|credential|network).{0,50}\b(block|prevent|deny|reject)\b', task, re.IGNORECASE):
-            return True
-        return False
+        return any(pattern.search(task) for pattern in self._intents)
 
     def check(self, task: str) -> Tuple[bool, str]:
         if self._is_safety_design_task(task):
             return True, "Constitutional check passed (safety design task)"
         task_lower = task.lower()
-        malicious_patterns = [
-            (r'\bexfiltrate\s+data\s+to\b', "Data exfiltration to external"),
-            (r'\bsend\s+secrets\s+to\b', "Sending secrets externally"),
-            (r'\bself[_\s]replicate\s+to\s+external\b', "Self-replication"),
-            (r'\bphone\s+home\b', "Phone-home behavior"),
-        ]
-        for pattern, name in malicious_patterns:
-            if re.search(pattern, task_lower):
+        for pattern, name in self._violations:
+            if pattern.search(task_lower):
                 return False, f"Constitutional violation: {name}"
         return True, "Constitutional check passed"
 
 
 class WorkspaceSandbox:
+    _exemption = re.compile(r'\b(protect|block|prevent)\b')
+
     def __init__(self, workspace: Path):
         self.workspace = workspace.resolve()
 
     def check(self, task: str) -> Tuple[bool, str]:
-        system_dirs = ["/etc/passwd", "/etc/shadow", "C:\\Windows\\System32"]
         task_lower = task.lower()
-        for sys_dir in system_dirs:
+        for sys_dir in SYSTEM_DIRS:
             if sys_dir.lower() in task_lower:
-                if re.search(r'\b(protect|block|prevent)\b', task_lower):
+                if self._exemption.search(task_lower):
                     continue
                 return False, f"Workspace violation: System directory access '{sys_dir}'"
         return True, "Workspace sandbox check passed"
 
 
 class NetworkGuard:
+    _violations = [(re.compile(pattern, re.IGNORECASE), name) for pattern, name in NETWORK_VIOLATIONS]
+
     def __init__(self):
-        self.safety_indicators = [
-            re.compile(r'\b(DESIGN|IMPLEMENT|CREATE|BUILD)\s*:', re.IGNORECASE),
-            re.compile(r'\b(block|prevent|deny|reject|validate|proxy|gateway)\b', re.IGNORECASE),
-        ]
+        self.safety_indicators = [re.compile(p, re.IGNORECASE) for p in NETWORK_SAFETY_INDICATORS]
 
     def _is_safety_design_task(self, task: str) -> bool:
         for pattern in self.safety_indicators:
@@ -96,41 +139,86 @@ class NetworkGuard:
     def check(self, task: str) -> Tuple[bool, str]:
         if self._is_safety_design_task(task):
             return True, "Network guard check passed (safety design task)"
-        malicious = [
-            (r'\bcurl\s+.*\|\s*bash\b', "Piping curl to bash"),
-            (r'\bwget\s+.*\|\s*sh\b', "Piping wget to shell"),
-        ]
-        for pattern, name in malicious:
-            if re.search(pattern, task, re.IGNORECASE):
+        for pattern, name in self._violations:
+            if pattern.search(task):
                 return False, f"Network violation: {name}"
         return True, "Network guard check passed"
 
 
 class PromptSanitizer:
+    _compiled = [(pattern, re.compile(pattern)) for pattern in PROMPT_INJECTION_PATTERNS]
+
     def __init__(self):
-        self.injection_patterns = [
-            r'ignore\s+previous\s+instructions',
-            r'disregard\s+all\s+above',
-            r'forget\s+everything',
-            r'override\s+constraints',
-            r'</system>',
-            r'<\|im_start\|>',
-        ]
+        self.injection_patterns = list(PROMPT_INJECTION_PATTERNS)
 
     def check(self, task: str) -> Tuple[bool, str]:
         task_lower = task.lower()
-        for pattern in self.injection_patterns:
-            if re.search(pattern, task_lower):
+        for pattern, compiled in self._compiled:
+            if compiled.search(task_lower):
                 return False, f"Prompt injection detected: '{pattern}'"
         return True, "Prompt sanitization check passed"
 
 
+class SafetyScanner:
+    """
+    Single-pass prefilter over all blocking rules, built once from the rule tables.
+
+    Every blocking rule needs one of ``VIOLATION_ANCHORS`` in the lowered
+    text. A text without any anchor passes every checker, so only the
+    ``safety design`` flags (which pick the pass reason) are left to compute.
+    A hit means the checkers must run in order: design-task exemptions and
+    rule precedence decide the report.
+    """
+
+    def __init__(self):
+        self.anchors = tuple(VIOLATION_ANCHORS)
+        self.network_design = [re.compile(p, re.IGNORECASE) for p in NETWORK_SAFETY_INDICATORS]
+        self.constitutional_design = [
+            re.compile(p, re.IGNORECASE)
+            for p in CONSTITUTIONAL_SAFETY_INDICATORS + CONSTITUTIONAL_SAFETY_INTENTS
+        ]
+
+    def first_violation(self, task: str) -> Optional[str]:
+        """First anchor found in ``task``, or None when every checker passes."""
+        task_lower = task.lower()
+        for anchor in self.anchors:
+            if anchor in task_lower:
+                return anchor
+        return None
+
+    def passed_checks(self, task: str) -> Dict[str, Dict]:
+        """Checker results for a text with no anchor (same reasons as the checkers)."""
+        network_design = any(p.search(task) for p in self.network_design)
+        # Network indicators are a subset of the constitutional ones.
+        constitutional_design = network_design or any(p.search(task) for p in self.constitutional_design)
+        return {
+            "constitutional": {
+                "passed": True,
+                "reason": "Constitutional check passed (safety design task)"
+                if constitutional_design
+                else "Constitutional check passed",
+            },
+            "workspace": {"passed": True, "reason": "Workspace sandbox check passed"},
+            "network": {
+                "passed": True,
+                "reason": "Network guard check passed (safety design task)"
+                if network_design
+                else "Network guard check passed",
+            },
+            "prompt": {"passed": True, "reason": "Prompt sanitization check passed"},
+        }
+
+
+SCANNER = SafetyScanner()
+
+
 class SafetyGateway:
     def __init__(
         self,
         workspace: Path,
         constraints_file: Optional[Path] = None,
         audit_log: Optional[Path] = None,
+        verdict_cache_size: int = SAFETY_VERDICT_CACHE_SIZE,
     ):
         self.workspace = workspace
         if constraints_file is None:
@@ -143,34 +231,90 @@ class SafetyGateway:
         self.prompt_sanitizer = PromptSanitizer()
         self.audit_log = audit_log or (workspace / "safety_audit.log")
         self.audit_log.parent.mkdir(parents=True, exist_ok=True)
+        self.verdict_cache_size = max(0, int(verdict_cache_size))
+        # sha256(task) -> (passed, blocked_reason, checks)
+        self._verdicts: "OrderedDict[str, Tuple[bool, Optional[str], Dict]]" = OrderedDict()
+        self._verdicts_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def pre_execute_safety_check(self, task: str) -> Tuple[bool, Dict]:
-        report = {
+        report = self._evaluate(task)
+        self._audit_log(report)
+        return report["passed"], report
+
+    def pre_execute_safety_check_many(self, tasks: List[str]) -> List[Tuple[bool, Dict]]:
+        """Check several tasks in one pass: identical texts are evaluated once and
+        all audit entries are written with a single append."""
+        reports_by_text: Dict[str, Dict] = {}
+        results = []
+        for task in tasks:
+            report = reports_by_text.get(task)
+            if report is None:
+                report = self._evaluate(task)
+                reports_by_text[task] = report
+            results.append((report["passed"], dict(report)))
+        if reports_by_text:
+            self._audit_log_lines([json.dumps(r) for r in reports_by_text.values()])
+        return results
+
+    def _evaluate(self, task: str) -> Dict:
+        passed, blocked_reason, checks = self._verdict(task)
+        return {
             "timestamp": datetime.now().isoformat(),
             "task": task,
-            "checks": {},
-            "passed": True,
-            "blocked_reason": None
+            "checks": {name: dict(result) for name, result in checks.items()},
+            "passed": passed,
+            "blocked_reason": blocked_reason,
         }
+
+    def _verdict(self, task: str) -> Tuple[bool, Optional[str], Dict]:
+        key = hashlib.sha256(task.encode("utf-8", "surrogatepass")).hexdigest()
+        with self._verdicts_lock:
+            cached = self._verdicts.get(key)
+            if cached is not None:
+                self._verdicts.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+        verdict = self._scan(task)
+        if self.verdict_cache_size:
+            with self._verdicts_lock:
+                self._verdicts[key] = verdict
+                while len(self._verdicts) > self.verdict_cache_size:
+                    self._verdicts.popitem(last=False)
+        return verdict
+
+    def _scan(self, task: str) -> Tuple[bool, Optional[str], Dict]:
+        if SCANNER.first_violation(task) is None:
+            return True, None, SCANNER.passed_checks(task)
         checks = [
             ("constitutional", self.constitutional_checker),
             ("workspace", self.workspace_sandbox),
             ("network", self.network_guard),
             ("prompt", self.prompt_sanitizer)
         ]
+        results: Dict[str, Dict] = {}
         for check_name, checker in checks:
             passed, reason = checker.check(task)
-            report["checks"][check_name] = {"passed": passed, "reason": reason}
+            results[check_name] = {"passed": passed, "reason": reason}
             if not passed:
-                report["passed"] = False
-                report["blocked_reason"] = reason
-                break
-        self._audit_log(report)
-        return report["passed"], report
+                return False, reason, results
+        return True, None, results
+
+    def cache_stats(self) -> Dict[str, int]:
+        with self._verdicts_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "entries": len(self._verdicts),
+            }
 
     def _audit_log(self, report: dict) -> None:
+        self._audit_log_lines([json.dumps(report)])
+
+    def _audit_log_lines(self, lines: List[str]) -> None:
         try:
-            with open(self.audit_log, 'a') as f:
-                f.write(json.dumps(report) + "\n")
+            get_appender(self.audit_log).append_line("\n".join(lines))
         except Exception as e:
             print(f"Warning: Could not write to safety audit log: {e}")
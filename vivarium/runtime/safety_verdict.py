@@ -0,0 +1,78 @@
+"""
+Signed safety verdicts passed from residents to the execution API.
+
+A resident safety-checks every task (and every delegated subtask) with its own
+``SafetyGateway`` before calling ``/cycle``. Instead of the API running the same
+checks again and appending a second report to ``safety_audit.log``, the
+resident attaches a verdict signed with HMAC-SHA256 under the internal
+execution token:
+
+    {"passed": true, "text_sha256": ..., "issued_at": ..., "signature": ...}
+
+The API accepts it in place of ``pre_execute_safety_check`` only when the
+signature is valid, the verdict is younger than ``SAFETY_VERDICT_TTL_SECONDS``
+and ``text_sha256`` matches the normalized text the API would have checked;
+anything else falls back to a full check. Only passing verdicts are issued.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+from typing import Any, Dict, Optional
+
+from vivarium.runtime.config import SAFETY_VERDICT_TTL_SECONDS
+
+
+def normalize_task_text(text: Optional[str]) -> str:
+    """Text a verdict is bound to: stripped, with CRLF/CR line endings as LF."""
+    return (text or "").replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def task_text_digest(text: Optional[str]) -> str:
+    return hashlib.sha256(normalize_task_text(text).encode("utf-8")).hexdigest()
+
+
+def _signature(token: str, text_sha256: str, issued_at: float) -> str:
+    message = f"v1|passed|{text_sha256}|{issued_at:.6f}".encode("utf-8")
+    return hmac.new(token.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def sign_verdict(token: str, task_text: str, issued_at: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Passing verdict for ``task_text`` (None without a token or text)."""
+    if not token or not normalize_task_text(task_text):
+        return None
+    issued = round(time.time() if issued_at is None else float(issued_at), 6)
+    digest = task_text_digest(task_text)
+    return {
+        "passed": True,
+        "text_sha256": digest,
+        "issued_at": issued,
+        "signature": _signature(token, digest, issued),
+    }
+
+
+def verify_verdict(
+    token: str,
+    task_text: str,
+    verdict: Any,
+    max_age_seconds: float = SAFETY_VERDICT_TTL_SECONDS,
+) -> bool:
+    """True if ``verdict`` is a fresh, correctly signed pass for ``task_text``."""
+    if not token or not isinstance(verdict, dict) or verdict.get("passed") is not True:
+        return False
+    digest = verdict.get("text_sha256")
+    signature = verdict.get("signature")
+    try:
+        issued_at = float(verdict.get("issued_at"))
+    except (TypeError, ValueError):
+        return False
+    if not isinstance(digest, str) or not isinstance(signature, str):
+        return False
+    age = time.time() - issued_at
+    if age > max_age_seconds or age < -60.0:  # allow small clock skew between hosts
+        return False
+    if not hmac.compare_digest(digest, task_text_digest(task_text)):
+        return False
+    return hmac.compare_digest(signature, _signature(token, digest, issued_at))
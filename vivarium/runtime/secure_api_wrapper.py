@@ -9,23 +9,29 @@ this wrapper.
 
 Security guarantees:
 - Role-based access control (admin vs LAN user)
-- Budget enforcement (hard limits, cannot be bypassed)
+- Budget enforcement (hard limits shared by all processes, cannot be bypassed)
 - Audit logging (all calls logged with user context)
-- Rate limiting (prevents abuse)
+- Rate limiting (per-model RPM/TPM quota shared across processes)
 - Constitutional checks (no dangerous requests)
 - File access validation (respects permission tiers)
+- Optional response cache (identical requests served from disk at $0)
 """
 
 import os
 import json
 import time
 import hashlib
-import threading
+import warnings
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict
 
+from vivarium.runtime.budget_ledger import SWARM_ACCOUNT, BudgetLedger, daily_account, get_budget_ledger
+from vivarium.runtime.llm_response_cache import LLMResponseCache, default_response_cache
+from vivarium.runtime.rate_limiter import SharedRateLimiter, get_rate_limiter
+from vivarium.utils.jsonl_appender import get_appender
+
 # Security context
 @dataclass
 class SecurityContext:
@@ -49,84 +55,91 @@ class AuditLogger:
         resolved_log_file = log_file or os.environ.get("VIVARIUM_API_AUDIT_LOG", "api_audit.log")
         self.log_file = Path(resolved_log_file)
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.Lock()
+        self._appender = get_appender(self.log_file)
 
     def log(self, event: Dict[str, Any]):
-        """Log an API call event."""
-        with self._lock:
-            entry = {
-                "timestamp": datetime.now().isoformat(),
-                **event
-            }
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(entry) + '\n')
+        """Log an API call event (group-committed with concurrent callers)."""
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            **event
+        }
+        self._appender.append_line(json.dumps(entry))
 
 # Budget enforcer
 class BudgetEnforcer:
-    """Thread-safe budget enforcement."""
+    """
+    Budget enforcement against the cross-process budget ledger.
 
-    def __init__(self, limit: float = 2.0):
+    The limit applies to ``account`` - per UTC day when ``period`` is "day",
+    otherwise over its lifetime. Spend on any other account is rolled up
+    into the all-time swarm account.
+    """
+
+    def __init__(
+        self,
+        limit: float = 2.0,
+        ledger: Optional[BudgetLedger] = None,
+        account: str = SWARM_ACCOUNT,
+        period: str = "all",
+    ):
         self._limit = limit
-        self._spent = 0.0
-        self._lock = threading.Lock()
+        self._ledger = ledger
+        self.account = account
+        self.period = period
+
+    @property
+    def ledger(self) -> BudgetLedger:
+        # Resolved lazily so constructing a wrapper never touches the database.
+        if self._ledger is None:
+            self._ledger = get_budget_ledger()
+        return self._ledger
+
+    @property
+    def current_account(self) -> str:
+        """Ledger account the limit applies to right now (rolls over at UTC midnight for "day")."""
+        if self.period == "day":
+            return daily_account(self.account)
+        return self.account
+
+    @property
+    def _rollup(self) -> Optional[str]:
+        return SWARM_ACCOUNT if self.account != SWARM_ACCOUNT else None
 
     @property
     def remaining(self) -> float:
-        with self._lock:
-            return self._limit - self._spent
+        snapshot = self.ledger.snapshot(self.current_account)
+        return self._limit - snapshot["spent"] - snapshot["reserved"]
 
-    def check_and_deduct(self, cost: float) -> bool:
+    def reserve(self, cost: float) -> Optional[str]:
         """
-        Check if budget allows this cost and deduct if approved.
-        Returns True if allowed, False if would exceed budget.
+        Reserve ``cost`` if the shared budget allows it.
+        Returns a reservation id, or None if it would exceed the budget.
         """
-        with self._lock:
-            if self._spent + cost > self._limit:
-                return False
-            self._spent += cost
-            return True
-
-    def refund(self, amount: float) -> None:
-        """Return reserved budget (e.g. after pre-call estimation)."""
-        with self._lock:
-            self._spent = max(0.0, self._spent - amount)
-
-    def deduct_actual(self, amount: float) -> None:
-        """Apply actual cost after API call (post-call reconciliation)."""
-        with self._lock:
-            self._spent += amount
+        return self.ledger.reserve(self.current_account, cost, self._limit)
+
+    def commit(self, reservation_id: Optional[str], actual: float) -> None:
+        """Settle a reservation at the call's actual cost (post-call reconciliation)."""
+        self.ledger.commit(self.current_account, reservation_id, actual, rollup=self._rollup)
+
+    def release(self, reservation_id: Optional[str]) -> None:
+        """Return a reservation unused (e.g. the call failed)."""
+        if reservation_id:
+            self.ledger.release(reservation_id)
+
+    def record_cache_hit(self, saved: float) -> None:
+        """Account a response served from cache: charged $0, ``saved`` not spent."""
+        self.ledger.record_cache_hit(self.current_account, saved, rollup=self._rollup)
+
+    def reset(self) -> None:
+        """Start the current budget window over (the all-time swarm account is never reset)."""
+        self.ledger.reset(self.current_account)
 
     def get_spent(self) -> float:
-        with self._lock:
-            return self._spent
-
-# Rate limiter
-class RateLimiter:
-    """Token bucket rate limiter."""
-
-    def __init__(self, calls_per_minute: int = 60):
-        self.calls_per_minute = calls_per_minute
-        self.tokens = calls_per_minute
-        self.last_update = time.time()
-        self._lock = threading.Lock()
-
-    def allow_request(self) -> bool:
-        """Check if request is allowed under rate limit."""
-        with self._lock:
-            now = time.time()
-            elapsed = now - self.last_update
-
-            # Refill tokens based on time elapsed
-            self.tokens = min(
-                self.calls_per_minute,
-                self.tokens + (elapsed * self.calls_per_minute / 60)
-            )
-            self.last_update = now
+        return self.ledger.spent(self.current_account)
 
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return True
-            return False
+    def get_cache_savings(self) -> Dict[str, Any]:
+        snapshot = self.ledger.snapshot(self.current_account)
+        return {"cache_hits": snapshot["cache_hits"], "cache_saved": snapshot["cache_saved"]}
 
 # Constitutional checker
 class ConstitutionalChecker:
@@ -178,13 +191,28 @@ class SecureAPIWrapper:
         self,
         context: SecurityContext,
         budget_limit: float = 2.0,
-        rate_limit: int = 60
+        rate_limiter: Optional[SharedRateLimiter] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        budget_ledger: Optional[BudgetLedger] = None,
+        budget_account: str = SWARM_ACCOUNT,
+        budget_period: str = "all",
+        rate_limit: Optional[int] = None,
     ):
+        if rate_limit is not None:
+            warnings.warn(
+                "SecureAPIWrapper(rate_limit=...) is deprecated and ignored: calls draw from the "
+                "shared per-model limiter (pass rate_limiter=, or set VIVARIUM_RATE_LIMIT_DEFAULT_RPM).",
+                DeprecationWarning,
+                stacklevel=2,
+            )
         self.context = context
         self.auditor = AuditLogger()
-        self.budget = BudgetEnforcer(budget_limit)
-        self.rate_limiter = RateLimiter(rate_limit)
+        self.budget = BudgetEnforcer(
+            budget_limit, ledger=budget_ledger, account=budget_account, period=budget_period
+        )
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
         self.constitutional = ConstitutionalChecker()
+        self.response_cache = response_cache if response_cache is not None else default_response_cache()
 
     def call_llm(
         self,
@@ -197,26 +225,18 @@ class SecureAPIWrapper:
 
         Performs all security checks before allowing the call.
         Returns result dict or raises PermissionError.
+
+        With a response cache configured, an identical earlier request is
+        answered from cache (``cached=True``, cost $0); pass
+        ``cache_bypass=True`` to always call the API.
         """
 
         audit_call_type = str(kwargs.pop("audit_call_type", "task_execution") or "task_execution").strip()
         audit_task_id = kwargs.pop("audit_task_id", None)
         audit_identity_id = kwargs.pop("audit_identity_id", None)
+        cache_bypass = bool(kwargs.pop("cache_bypass", False))
 
-        # 1. Rate limiting
-        if not self.rate_limiter.allow_request():
-            self.auditor.log({
-                "event": "RATE_LIMITED",
-                "user": self.context.user_id,
-                "role": self.context.role,
-                "model": model,
-                "call_type": audit_call_type,
-                "task_id": audit_task_id,
-                "identity_id": audit_identity_id,
-            })
-            raise PermissionError("Rate limit exceeded. Please wait before making more requests.")
-
-        # 2. Constitutional check
+        # 1. Constitutional check (before the cache: a cached answer must not bypass it)
         allowed, reason = self.constitutional.is_allowed(prompt, self.context)
         if not allowed:
             self.auditor.log({
@@ -231,14 +251,61 @@ class SecureAPIWrapper:
             })
             raise PermissionError(f"Request violates constitutional rules: {reason}")
 
-        # 3. Estimate cost (before calling) – reservation only
+        # 2. Cache lookup: a hit never reaches the API, the rate limiter or the budget reservation.
+        cache_key = None
+        if self.response_cache is not None and not cache_bypass and self.response_cache.is_cacheable(kwargs):
+            cache_key = self.response_cache.key_for(prompt, model, kwargs)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                saved_cost = float(cached.get("cost") or 0.0)
+                self.budget.record_cache_hit(saved_cost)
+                self.auditor.log({
+                    "event": "API_CALL_CACHE_HIT",
+                    "user": self.context.user_id,
+                    "role": self.context.role,
+                    "model": model,
+                    "cost": 0.0,
+                    "saved_cost": saved_cost,
+                    "cache_key": cache_key[:16],
+                    "input_tokens": cached.get("input_tokens", 0),
+                    "output_tokens": cached.get("output_tokens", 0),
+                    "call_type": audit_call_type,
+                    "task_id": audit_task_id,
+                    "identity_id": audit_identity_id,
+                })
+                stream_callback = kwargs.get("stream_callback")
+                if stream_callback is not None and cached.get("result"):
+                    stream_callback(cached["result"])
+                return {**cached, "cost": 0.0, "total_cost_usd": 0.0, "cached": True, "cached_cost": saved_cost}
+
+        # 3. Rate limiting: fail fast if the model's shared quota won't free up in time
+        # (the engine takes the actual request slot right before calling Groq).
+        from vivarium.runtime.groq_client import select_request_model
         from vivarium.utils.llm_cost import estimate_cost, rough_token_count
 
         estimated_input_tokens = rough_token_count(prompt)
+        rate_wait = self.rate_limiter.wait_time(select_request_model(model), estimated_input_tokens)
+        if rate_wait > self.rate_limiter.max_wait_seconds:
+            self.auditor.log({
+                "event": "RATE_LIMITED",
+                "user": self.context.user_id,
+                "role": self.context.role,
+                "model": model,
+                "retry_after": round(rate_wait, 2),
+                "call_type": audit_call_type,
+                "task_id": audit_task_id,
+                "identity_id": audit_identity_id,
+            })
+            raise PermissionError(
+                f"Rate limit exceeded for {model}. Retry in {rate_wait:.1f}s."
+            )
+
+        # 4. Estimate cost (before calling) – reservation only
         estimated_cost = estimate_cost(model, estimated_input_tokens, 500)
 
-        # 4. Budget check – reserve estimated cost
-        if not self.budget.check_and_deduct(estimated_cost):
+        # 5. Budget check – reserve estimated cost
+        reservation = self.budget.reserve(estimated_cost)
+        if reservation is None:
             self.auditor.log({
                 "event": "BUDGET_EXCEEDED",
                 "user": self.context.user_id,
@@ -254,19 +321,18 @@ class SecureAPIWrapper:
                 f"Requested: ${estimated_cost:.4f}"
             )
 
-        # 5. Make the actual API call
+        # 6. Make the actual API call
         try:
             # Import here to avoid circular dependency
             from vivarium.runtime.groq_client import execute_with_groq
 
             result = execute_with_groq(prompt=prompt, model=model, **kwargs)
 
-            # 6. Post-call reconciliation: apply actual cost
+            # 7. Post-call reconciliation: apply actual cost
             actual_cost = result.get("cost", 0.0)
-            self.budget.refund(estimated_cost)
-            self.budget.deduct_actual(actual_cost)
+            self.budget.commit(reservation, actual_cost)
 
-            # 7. Audit the call
+            # 8. Audit the call
             self.auditor.log({
                 "event": "API_CALL_SUCCESS",
                 "user": self.context.user_id,
@@ -280,11 +346,19 @@ class SecureAPIWrapper:
                 "identity_id": audit_identity_id,
             })
 
+            if (
+                cache_key is not None
+                and not result.get("error")
+                and not result.get("stopped_early")
+                and result.get("returncode", 0) == 0
+            ):
+                self.response_cache.put(cache_key, result)
+
             return result
 
         except Exception as e:
             # Refund reservation on failure
-            self.budget.refund(estimated_cost)
+            self.budget.release(reservation)
 
             self.auditor.log({
                 "event": "API_CALL_FAILURE",
@@ -311,6 +385,7 @@ class SecureAPIWrapper:
             "role": self.context.role,
             "budget_spent": self.budget.get_spent(),
             "budget_remaining": self.budget.remaining,
+            **self.budget.get_cache_savings(),
         }
 
 
@@ -0,0 +1,119 @@
+"""
+Single-flight coalescing of identical in-flight calls.
+
+When several callers ask for the same thing at the same time (residents
+picking up near-identical subtasks, the same review prompt), only the first
+caller for a key (the *leader*) runs the work; callers arriving while it is
+in flight wait and receive the leader's result (or exception). Nothing is
+remembered once the call finishes - this is not a cache.
+
+``SingleFlight.do`` coalesces threads; ``SingleFlight.do_async`` coalesces
+coroutines on one event loop. Both return ``(value, shared)`` where
+``shared`` is True for followers, so callers can avoid double-charging.
+``stats`` reports upstream calls and how many were saved.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Thread- and asyncio-aware call coalescer keyed by request identity."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Tuple[int, Hashable], "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """Run ``func`` once per concurrent ``key``; followers block for its result."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+        try:
+            flight.value = func()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.value, False
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Await ``func()`` once per concurrent ``key`` on the running loop."""
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            future = self._async_flights.get(loop_key)
+            if future is None:
+                future = loop.create_future()
+                self._async_flights[loop_key] = future
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+        if not leader:
+            # shield: a cancelled follower must not cancel the leader's result.
+            return await asyncio.shield(future), True
+        try:
+            value = await func()
+        except BaseException as exc:
+            if not future.done():
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+                    future.exception()  # mark retrieved when there are no followers
+            raise
+        else:
+            future.set_result(value)
+            return value, False
+        finally:
+            with self._lock:
+                self._async_flights.pop(loop_key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights) + len(self._async_flights)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.calls + self.shared
+            return {
+                "requests": requests,
+                "upstream_calls": self.calls,
+                "saved_calls": self.shared,
+                "in_flight": len(self._flights) + len(self._async_flights),
+                "saved_rate": round(self.shared / requests, 4) if requests else 0.0,
+            }
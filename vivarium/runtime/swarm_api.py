@@ -2,38 +2,57 @@
 Vivarium API Server (Groq + Local Execution)
 
 Endpoints:
-  POST /cycle  - Execute one cycle task (Groq or local command)
+  POST /cycle       - Execute one cycle task (Groq or local command)
+  POST /cycle/batch - Execute several cycle tasks concurrently (results in order)
   POST /plan   - Scan codebase and write tasks to queue.json
   GET  /status - Queue summary
 """
 
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
 
+import asyncio
+import functools
 import json
+import math
 import os
 import re
 import shlex
-import subprocess
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from ipaddress import ip_address
 from pathlib import Path
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, model_validator
 
+from vivarium.runtime.budget_ledger import API_ACCOUNT
+from vivarium.runtime.codebase_scan import BlockedPathMatcher, CodebaseScanner
 from vivarium.runtime.config import (
+    API_UDS_PATH,
+    CYCLE_BATCH_MAX_ITEMS,
+    CYCLE_MAX_CONCURRENCY,
     DEFAULT_GROQ_MODEL,
+    LOCAL_OUTPUT_MAX_CHARS,
+    SWARM_BUDGET_PERIOD,
     validate_model_id,
     validate_config,
 )
 from vivarium.runtime.inference_engine import estimate_complexity
+from vivarium.runtime.llm_response_cache import llm_request_key
+from vivarium.runtime.queue_store import get_queue_backend
 from vivarium.runtime.runtime_contract import normalize_queue, normalize_task
 from vivarium.runtime.safety_gateway import SafetyGateway
+from vivarium.runtime.safety_verdict import verify_verdict
 from vivarium.runtime.secure_api_wrapper import SecureAPIWrapper, create_admin_context
-from vivarium.utils import read_json, write_json
+from vivarium.runtime.single_flight import SingleFlight
+from vivarium.utils.llm_cost import estimate_cost, rough_token_count
 from vivarium.runtime.vivarium_scope import (
     AUDIT_ROOT,
+    CODEBASE_SCAN_CACHE_FILE,
     MUTABLE_QUEUE_FILE,
     MUTABLE_ROOT,
     SECURITY_ROOT,
@@ -99,6 +118,18 @@ JOURNAL_PRIVACY_READ_BLOCKLIST = (
     (REPO_ROOT / "vivarium" / "world" / "mutable" / ".swarm" / "journal_votes.json").resolve(),
 )
 READ_BLOCKLIST = PHYSICS_READ_BLOCKLIST + SECURITY_READ_BLOCKLIST + JOURNAL_PRIVACY_READ_BLOCKLIST
+READ_BLOCK_MATCHER = BlockedPathMatcher(
+    [(root, "Local command blocked: physics files are restricted in MVP mode") for root in PHYSICS_READ_BLOCKLIST]
+    + [
+        (
+            root,
+            "Local command blocked: journal files are private "
+            "(blind review excerpts are exposed only via journal voting APIs)",
+        )
+        for root in JOURNAL_PRIVACY_READ_BLOCKLIST
+    ]
+    + [(root, "Local command blocked: security files are restricted in MVP mode") for root in SECURITY_READ_BLOCKLIST]
+)
 RG_BLOCKED_GLOBS = (
     "vivarium/physics/**",
     "vivarium/meta/security/**",
@@ -162,16 +193,27 @@ def _build_safety_gateway() -> Optional[SafetyGateway]:
         return None
 
 
+def _build_codebase_scanner() -> CodebaseScanner:
+    return CodebaseScanner(
+        REPO_ROOT,
+        ignore_dirs=IGNORE_DIRS,
+        blocked=READ_BLOCK_MATCHER,
+        cache_file=CODEBASE_SCAN_CACHE_FILE,
+    )
+
+
 def _build_secure_wrapper() -> SecureAPIWrapper:
     return SecureAPIWrapper(
         context=create_admin_context(user_id="swarm_api"),
         budget_limit=_safe_float_env("SWARM_BUDGET_LIMIT", 5.0),
-        rate_limit=_safe_int_env("SWARM_RATE_LIMIT", 60),
+        budget_account=API_ACCOUNT,
+        budget_period=SWARM_BUDGET_PERIOD,
     )
 
 
 SWARM_SAFETY_GATEWAY = _build_safety_gateway()
 SECURE_API_WRAPPER = _build_secure_wrapper()
+CODEBASE_SCANNER = _build_codebase_scanner()
 INTERNAL_EXECUTION_TOKEN = get_execution_token()
 SWARM_ENFORCE_INTERNAL_TOKEN = (
     os.environ.get("SWARM_ENFORCE_INTERNAL_TOKEN", "1").strip().lower()
@@ -183,6 +225,43 @@ MVP_DOCS_ONLY_MODE = (
 )
 LOOPBACK_HOST_ALIASES = {"localhost", "testclient"}
 
+# /cycle work must never block the event loop: LLM calls (sync SDK, rate-limit
+# sleeps) run in this pool and local commands run as asyncio subprocesses.
+# A per-loop semaphore caps how many tasks execute at once.
+_CYCLE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_CYCLE_EXECUTOR_LOCK = threading.Lock()
+_CYCLE_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+# Identical LLM cycles in flight at the same time share one call_llm.
+CYCLE_FLIGHTS = SingleFlight()
+
+
+def _cycle_executor() -> ThreadPoolExecutor:
+    global _CYCLE_EXECUTOR
+    with _CYCLE_EXECUTOR_LOCK:
+        if _CYCLE_EXECUTOR is None:
+            _CYCLE_EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, CYCLE_MAX_CONCURRENCY),
+                thread_name_prefix="cycle-llm",
+            )
+        return _CYCLE_EXECUTOR
+
+
+def _cycle_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _CYCLE_SLOTS.get(loop)
+    if slots is None:
+        slots = asyncio.Semaphore(max(1, CYCLE_MAX_CONCURRENCY))
+        _CYCLE_SLOTS[loop] = slots
+    return slots
+
+
+async def _run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call on the /cycle thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cycle_executor(), functools.partial(func, *args, **kwargs))
+
 
 class CycleRequest(BaseModel):
     """
@@ -198,6 +277,8 @@ class CycleRequest(BaseModel):
         timeout: Local command timeout (seconds).
         min_budget/max_budget/intensity: Optional metadata for logging.
         task_id: Optional task identifier (echoed in response).
+        safety_verdict: Optional resident-signed safety verdict for the task
+            text; when valid, the API's own safety check is skipped.
     """
 
     prompt: Optional[str] = None
@@ -211,6 +292,7 @@ class CycleRequest(BaseModel):
     max_budget: Optional[float] = None
     intensity: Optional[str] = None
     task_id: Optional[str] = None
+    safety_verdict: Optional[Dict[str, Any]] = None
 
     @model_validator(mode="after")
     def validate_budget_bounds(self) -> "CycleRequest":
@@ -241,6 +323,38 @@ class CycleResponse(BaseModel):
     safety_report: Optional[Dict[str, Any]] = None
 
 
+class CycleBatchRequest(BaseModel):
+    """
+    Request model for the /cycle/batch endpoint.
+
+    Attributes:
+        items: Cycle requests to execute; results come back in the same order.
+        max_concurrency: Optional per-batch cap (never above the server limit).
+    """
+
+    items: List[CycleRequest] = Field(..., min_length=1, max_length=CYCLE_BATCH_MAX_ITEMS)
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class CycleBatchItem(BaseModel):
+    """Outcome of one batch item: ``response`` on success, ``error`` otherwise."""
+
+    index: int
+    status_code: int
+    response: Optional[CycleResponse] = None
+    error: Optional[str] = None
+    retry_after: Optional[int] = None  # seconds, on 429
+
+
+class CycleBatchResponse(BaseModel):
+    """Response model for the /cycle/batch endpoint."""
+
+    status: str
+    completed: int
+    failed: int
+    results: List[CycleBatchItem]
+
+
 def _is_loopback_host(host: Optional[str]) -> bool:
     value = (host or "").strip().lower()
     if not value:
@@ -263,6 +377,14 @@ def _request_client_host(request: Request) -> str:
     return ""
 
 
+def _is_unix_socket_request(request: Request) -> bool:
+    """uvicorn --uds leaves both peer and server address unset; only trusted when the UDS is configured."""
+    if not API_UDS_PATH or (request.headers.get("x-forwarded-for") or "").strip():
+        return False
+    scope = getattr(request, "scope", {}) or {}
+    return scope.get("client") is None and scope.get("server") is None
+
+
 def _enforce_internal_api_access(
     request: Request,
     provided_token: Optional[str],
@@ -271,7 +393,7 @@ def _enforce_internal_api_access(
     require_token: bool = True,
 ) -> None:
     client_host = _request_client_host(request)
-    if not _is_loopback_host(client_host):
+    if not (_is_loopback_host(client_host) or _is_unix_socket_request(request)):
         raise HTTPException(
             status_code=403,
             detail=f"{endpoint} is localhost-only",
@@ -308,6 +430,59 @@ def _pre_execute_safety_report(task_text: str, task_id: Optional[str]) -> Dict[s
     return report
 
 
+def _pre_execute_safety_reports(targets: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+    """Batch form of ``_pre_execute_safety_report`` for (task_text, task_id) pairs."""
+    check_many = getattr(SWARM_SAFETY_GATEWAY, "pre_execute_safety_check_many", None)
+    if check_many is None:
+        return [_pre_execute_safety_report(text, task_id) for text, task_id in targets]
+    reports: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+    pending = []
+    for index, (text, task_id) in enumerate(targets):
+        if text.strip():
+            pending.append(index)
+        else:
+            reports[index] = _pre_execute_safety_report(text, task_id)
+    checked = check_many([targets[index][0] for index in pending]) if pending else []
+    for index, (passed, report) in zip(pending, checked):
+        report["task_id"] = targets[index][1]
+        report["passed"] = passed
+        reports[index] = report
+    return reports
+
+
+def _verified_safety_report(req: CycleRequest) -> Optional[Dict[str, Any]]:
+    """Report for a request carrying a valid resident verdict (the resident already audited the check)."""
+    if not req.safety_verdict or not verify_verdict(
+        INTERNAL_EXECUTION_TOKEN, _safety_target(req), req.safety_verdict
+    ):
+        return None
+    return {
+        "passed": True,
+        "blocked_reason": None,
+        "checks": {},
+        "task_id": req.task_id,
+        "verified_by": "resident_verdict",
+        "verdict_issued_at": req.safety_verdict.get("issued_at"),
+    }
+
+
+def _cycle_safety_report(req: CycleRequest) -> Dict[str, Any]:
+    return _verified_safety_report(req) or _pre_execute_safety_report(_safety_target(req), req.task_id)
+
+
+def _cycle_safety_reports(reqs: List[CycleRequest]) -> List[Dict[str, Any]]:
+    """Batch form of ``_cycle_safety_report``: only requests without a valid verdict are checked."""
+    reports: List[Optional[Dict[str, Any]]] = [_verified_safety_report(req) for req in reqs]
+    unverified = [index for index, report in enumerate(reports) if report is None]
+    if unverified:
+        checked = _pre_execute_safety_reports(
+            [(_safety_target(reqs[index]), reqs[index].task_id) for index in unverified]
+        )
+        for index, report in zip(unverified, checked):
+            reports[index] = report
+    return reports
+
+
 def _extract_primary_command(command: str) -> Optional[str]:
     try:
         tokens = shlex.split(command, posix=True)
@@ -340,19 +515,7 @@ def _is_within(path: Path, root: Path) -> bool:
 
 
 def _blocked_read_reason(path: Path) -> Optional[str]:
-    for blocked_root in PHYSICS_READ_BLOCKLIST:
-        if _is_within(path, blocked_root):
-            return "Local command blocked: physics files are restricted in MVP mode"
-    for blocked_root in JOURNAL_PRIVACY_READ_BLOCKLIST:
-        if _is_within(path, blocked_root):
-            return (
-                "Local command blocked: journal files are private "
-                "(blind review excerpts are exposed only via journal voting APIs)"
-            )
-    for blocked_root in SECURITY_READ_BLOCKLIST:
-        if _is_within(path, blocked_root):
-            return "Local command blocked: security files are restricted in MVP mode"
-    return None
+    return READ_BLOCK_MATCHER.reason(path)
 
 
 def _is_path_token(token: str) -> bool:
@@ -498,29 +661,294 @@ async def cycle(
         endpoint="/cycle",
     )
 
+    _validate_cycle_shape(req)
+    safety_report = _cycle_safety_report(req)
+    _require_safety_passed(safety_report)
+
+    async with _cycle_slots():
+        if _is_local_cycle(req):
+            return await _run_local_task(req, safety_report=safety_report)
+        return await _run_groq_task(req, safety_report=safety_report)
+
+
+@app.post("/cycle/batch", response_model=CycleBatchResponse)
+async def cycle_batch(
+    batch: CycleBatchRequest,
+    request: Request,
+    x_vivarium_internal_token: Optional[str] = Header(
+        default=None,
+        alias="X-Vivarium-Internal-Token",
+    ),
+) -> CycleBatchResponse:
+    """
+    Execute several /cycle requests (e.g. delegated subtasks) in one call.
+
+    All items are validated up front in one pass (shape, safety scan with a
+    single audit write, model/cost/budget checks), then the valid ones run
+    concurrently under the server-side limit. A failing item does not fail
+    the batch; its status code and error are reported in its result slot.
+    """
+    _enforce_internal_api_access(
+        request,
+        x_vivarium_internal_token,
+        endpoint="/cycle/batch",
+    )
+
+    items = batch.items
+    results: List[Optional[CycleBatchItem]] = [None] * len(items)
+
+    def _fail(index: int, exc: HTTPException) -> None:
+        retry_after = (exc.headers or {}).get("Retry-After")
+        results[index] = CycleBatchItem(
+            index=index,
+            status_code=exc.status_code,
+            error=str(exc.detail),
+            retry_after=int(retry_after) if retry_after is not None else None,
+        )
+
+    shaped: List[int] = []
+    for index, req in enumerate(items):
+        try:
+            _validate_cycle_shape(req)
+        except HTTPException as exc:
+            _fail(index, exc)
+            continue
+        shaped.append(index)
+
+    reports = _cycle_safety_reports([items[i] for i in shaped])
+    prepared: List[Tuple[int, Dict[str, Any]]] = []
+    for index, safety_report in zip(shaped, reports):
+        req = items[index]
+        try:
+            _require_safety_passed(safety_report)
+            if _is_local_cycle(req):
+                tokens, env = _prepare_local_command(req)
+                plan = {"local": True, "tokens": tokens, "env": env}
+            else:
+                model, call_kwargs = _prepare_groq_call(req)
+                plan = {"local": False, "model": model, "call_kwargs": call_kwargs}
+        except HTTPException as exc:
+            _fail(index, exc)
+            continue
+        except ValueError as exc:  # model not in whitelist
+            _fail(index, HTTPException(status_code=400, detail=str(exc)))
+            continue
+        plan["safety_report"] = safety_report
+        prepared.append((index, plan))
+
+    prepared = _admit_within_budget(items, prepared, _fail)
+
+    limit = min(batch.max_concurrency or CYCLE_MAX_CONCURRENCY, CYCLE_MAX_CONCURRENCY)
+    batch_slots = asyncio.Semaphore(max(1, limit))
+
+    async def _run(index: int, plan: Dict[str, Any]) -> None:
+        req = items[index]
+        async with batch_slots, _cycle_slots():
+            try:
+                if plan["local"]:
+                    response = await _execute_local_command(req, plan["tokens"], plan["env"], plan["safety_report"])
+                else:
+                    response = await _execute_groq_call(req, plan["model"], plan["call_kwargs"], plan["safety_report"])
+            except HTTPException as exc:
+                _fail(index, exc)
+                return
+        results[index] = CycleBatchItem(index=index, status_code=200, response=response)
+
+    await asyncio.gather(*(_run(index, plan) for index, plan in prepared))
+
+    completed = sum(1 for item in results if item is not None and item.status_code == 200)
+    failed = len(items) - completed
+    status = "completed" if not failed else ("failed" if not completed else "partial")
+    return CycleBatchResponse(status=status, completed=completed, failed=failed, results=results)
+
+
+def _admit_within_budget(
+    items: List[CycleRequest],
+    prepared: List[Tuple[int, Dict[str, Any]]],
+    fail: Any,
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Check the whole batch against the shared budget before anything runs.
+
+    Each call_llm still reserves its own estimate, but without this every item
+    would start and the later ones would fail mid-batch once the budget ran out.
+    LLM items are admitted in order while their summed estimates fit.
+    """
+    if all(plan["local"] for _, plan in prepared):
+        return prepared
+    remaining = SECURE_API_WRAPPER.budget.remaining
+    admitted: List[Tuple[int, Dict[str, Any]]] = []
+    for index, plan in prepared:
+        if not plan["local"]:
+            estimate = SECURE_API_WRAPPER.estimate_cost_for_request(items[index].prompt, plan["model"])
+            if estimate > remaining:
+                fail(index, HTTPException(
+                    status_code=403,
+                    detail=(
+                        f"Budget exceeded for batch. Remaining: ${max(0.0, remaining):.4f}, "
+                        f"Requested: ${estimate:.4f}"
+                    ),
+                ))
+                continue
+            remaining -= estimate
+        admitted.append((index, plan))
+    return admitted
+
+
+@app.post("/cycle/stream")
+async def cycle_stream(
+    req: CycleRequest,
+    request: Request,
+    x_vivarium_internal_token: Optional[str] = Header(
+        default=None,
+        alias="X-Vivarium-Internal-Token",
+    ),
+) -> StreamingResponse:
+    """
+    Streaming variant of /cycle (Server-Sent Events).
+
+    Validation (access, shape, safety, model, estimated budget) happens before
+    the stream opens and fails with the same status codes as /cycle. After
+    that the body is a ``text/event-stream`` of:
+
+    - ``delta``: ``{"text", "output_tokens"}`` per streamed completion chunk
+    - ``result``: the final CycleResponse (``status="budget_exceeded"`` when
+      the running cost passed ``max_budget`` and generation was cut off)
+    - ``error``: ``{"status_code", "detail"}`` if execution failed mid-stream
+
+    Local commands produce a single ``result`` (or ``error``) event.
+    """
+    _enforce_internal_api_access(
+        request,
+        x_vivarium_internal_token,
+        endpoint="/cycle/stream",
+    )
+
+    _validate_cycle_shape(req)
+    safety_report = _cycle_safety_report(req)
+    _require_safety_passed(safety_report)
+
+    if _is_local_cycle(req):
+        tokens, env = _prepare_local_command(req)
+        events = _single_result_events(lambda: _execute_local_command(req, tokens, env, safety_report))
+    else:
+        try:
+            model, call_kwargs = _prepare_groq_call(req)
+        except ValueError as exc:  # model not in whitelist
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        events = _stream_groq_events(req, model, call_kwargs, safety_report)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def _sse_error(exc: HTTPException) -> str:
+    payload: Dict[str, Any] = {"status_code": exc.status_code, "detail": str(exc.detail)}
+    retry_after = (exc.headers or {}).get("Retry-After")
+    if retry_after is not None:
+        payload["retry_after"] = int(retry_after)
+    return _sse_event("error", payload)
+
+
+async def _single_result_events(run: Callable[[], Awaitable[CycleResponse]]) -> AsyncIterator[str]:
+    async with _cycle_slots():
+        try:
+            response = await run()
+        except HTTPException as exc:
+            yield _sse_error(exc)
+            return
+    yield _sse_event("result", response.model_dump())
+
+
+async def _stream_groq_events(
+    req: CycleRequest,
+    model: str,
+    call_kwargs: Dict[str, Any],
+    safety_report: Dict[str, Any],
+) -> AsyncIterator[str]:
+    """Relay streamed deltas from call_llm (running on the cycle pool) as SSE."""
+    loop = asyncio.get_running_loop()
+    deltas: asyncio.Queue = asyncio.Queue()
+    done = object()
+    stop = threading.Event()  # set when the client goes away
+    input_tokens = rough_token_count(req.prompt or "")
+    state = {"output_tokens": 0, "cut_off": False}
+
+    def _on_delta(text: str) -> bool:
+        if stop.is_set():
+            return False
+        # Groq streams roughly one token per chunk.
+        state["output_tokens"] += 1
+        loop.call_soon_threadsafe(deltas.put_nowait, {"text": text, "output_tokens": state["output_tokens"]})
+        if req.max_budget is not None:
+            running_cost = estimate_cost(model, input_tokens, state["output_tokens"])
+            if running_cost > req.max_budget:
+                state["cut_off"] = True
+                return False
+        return True
+
+    async with _cycle_slots():
+        call = asyncio.ensure_future(_run_blocking(SECURE_API_WRAPPER.call_llm, **call_kwargs, stream_callback=_on_delta))
+        call.add_done_callback(lambda _: deltas.put_nowait(done))
+        try:
+            while True:
+                item = await deltas.get()
+                if item is done:
+                    break
+                yield _sse_event("delta", item)
+            try:
+                try:
+                    result = call.result()
+                except Exception as exc:
+                    raise _llm_call_http_error(exc) from exc
+                response = _groq_cycle_response(req, model, result, safety_report, cut_off=state["cut_off"])
+            except HTTPException as exc:
+                yield _sse_error(exc)
+                return
+            yield _sse_event("result", response.model_dump())
+        finally:
+            stop.set()
+
+
+def _validate_cycle_shape(req: CycleRequest) -> None:
     if not req.prompt and not req.task:
         raise HTTPException(status_code=400, detail="prompt or task must be provided")
-
     mode = (req.mode or "").lower().strip()
     if mode and mode not in {"llm", "local"}:
         raise HTTPException(status_code=400, detail="mode must be 'llm' or 'local'")
 
-    safety_target = (req.task or req.prompt or "").strip()
-    safety_report = _pre_execute_safety_report(safety_target, req.task_id)
+
+def _safety_target(req: CycleRequest) -> str:
+    return (req.task or req.prompt or "").strip()
+
+
+def _require_safety_passed(safety_report: Dict[str, Any]) -> None:
     if not safety_report.get("passed"):
         blocked_reason = safety_report.get("blocked_reason", "blocked by safety gateway")
         raise HTTPException(status_code=403, detail=f"Safety check failed: {blocked_reason}")
 
-    if mode == "local" or (not mode and req.task and not req.prompt):
-        return _run_local_task(req, safety_report=safety_report)
 
-    return await _run_groq_task(req, safety_report=safety_report)
+def _is_local_cycle(req: CycleRequest) -> bool:
+    mode = (req.mode or "").lower().strip()
+    return mode == "local" or (not mode and bool(req.task) and not req.prompt)
 
 
 async def _run_groq_task(
     req: CycleRequest,
     safety_report: Optional[Dict[str, Any]] = None,
 ) -> CycleResponse:
+    model, call_kwargs = _prepare_groq_call(req)
+    return await _execute_groq_call(req, model, call_kwargs, safety_report)
+
+
+def _prepare_groq_call(req: CycleRequest) -> Tuple[str, Dict[str, Any]]:
+    """Pick the model and enforce the estimated-cost budget; returns (model, call_llm kwargs)."""
     if not req.prompt:
         raise HTTPException(status_code=400, detail="llm mode requires prompt")
     validate_config(require_groq_key=True)
@@ -569,16 +997,76 @@ async def _run_groq_task(
     }
     if req.temperature is not None:
         call_kwargs["temperature"] = req.temperature
-    try:
-        result = SECURE_API_WRAPPER.call_llm(**call_kwargs)
-    except PermissionError as exc:
+    return model, call_kwargs
+
+
+async def _execute_groq_call(
+    req: CycleRequest,
+    model: str,
+    call_kwargs: Dict[str, Any],
+    safety_report: Optional[Dict[str, Any]] = None,
+) -> CycleResponse:
+    async def _call() -> Dict[str, Any]:
+        try:
+            return await _run_blocking(SECURE_API_WRAPPER.call_llm, **call_kwargs)
+        except Exception as exc:
+            raise _llm_call_http_error(exc) from exc
+
+    key = llm_request_key(call_kwargs["prompt"], model, call_kwargs)
+    result, shared = await CYCLE_FLIGHTS.do_async(key, _call)
+    if shared:
+        auditor = getattr(SECURE_API_WRAPPER, "auditor", None)
+        if auditor is not None:
+            auditor.log({
+                "event": "API_CALL_COALESCED",
+                "task_id": req.task_id,
+                "model": model,
+                "cost": 0.0,
+                "saved_cost": result.get("cost"),
+            })
+        # Only the leading request is charged for the shared upstream call.
+        result = {**result, "cost": 0.0, "total_cost_usd": 0.0, "coalesced": True}
+    return _groq_cycle_response(req, model, result, safety_report)
+
+
+_RETRY_IN_PATTERN = re.compile(r"Retry in ([0-9.]+)s")
+
+
+def _rate_limited_error(detail: str, retry_after: Optional[float]) -> HTTPException:
+    """429 with a whole-second Retry-After (at least 1) so callers back off instead of retrying at once."""
+    seconds = max(1, math.ceil(retry_after or 0))
+    return HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(seconds)})
+
+
+def _llm_call_http_error(exc: Exception) -> HTTPException:
+    if isinstance(exc, PermissionError):
         detail = str(exc)
-        status_code = 429 if "Rate limit" in detail else 403
-        raise HTTPException(status_code=status_code, detail=detail) from exc
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Secure Groq execution failed: {exc}") from exc
+        if "Rate limit" in detail:
+            match = _RETRY_IN_PATTERN.search(detail)
+            return _rate_limited_error(detail, float(match.group(1)) if match else None)
+        return HTTPException(status_code=403, detail=detail)
+    return HTTPException(status_code=500, detail=f"Secure Groq execution failed: {exc}")
+
+
+def _groq_cycle_response(
+    req: CycleRequest,
+    model: str,
+    result: Dict[str, Any],
+    safety_report: Optional[Dict[str, Any]] = None,
+    cut_off: bool = False,
+) -> CycleResponse:
+    """Map a call_llm result to a CycleResponse, enforcing the actual-cost budget.
 
+    ``cut_off`` means a stream was stopped once its running cost passed
+    ``max_budget``: the partial output is returned as ``budget_exceeded``
+    instead of failing the request.
+    """
     if result.get("error"):
+        if result["error"] == "rate_limit" or result.get("returncode") == 429:
+            raise _rate_limited_error(
+                f"Rate limit exceeded for {model}: {result.get('error_message') or result['error']}",
+                result.get("retry_after"),
+            )
         raise HTTPException(status_code=500, detail=f"Groq API error: {result['error']}")
 
     result_text = result.get("result", "")
@@ -587,9 +1075,11 @@ async def _run_groq_task(
         "completion_tokens": result.get("output_tokens", 0),
     }
     budget_used = result.get("cost")
-    if (
+    if not isinstance(budget_used, (int, float)):
+        budget_used = None
+    if cut_off or (
         req.max_budget is not None
-        and isinstance(budget_used, (int, float))
+        and budget_used is not None
         and budget_used > req.max_budget
     ):
         SECURE_API_WRAPPER.auditor.log({
@@ -598,30 +1088,89 @@ async def _run_groq_task(
             "model": model,
             "actual_cost": budget_used,
             "task_max_budget": req.max_budget,
+            "cutoff": cut_off,
         })
-        raise HTTPException(
-            status_code=403,
-            detail=(
-                f"Actual cost ${budget_used:.6f} exceeded task max budget "
-                f"${req.max_budget:.6f}"
-            ),
-        )
+        if not cut_off:
+            raise HTTPException(
+                status_code=403,
+                detail=(
+                    f"Actual cost ${budget_used:.6f} exceeded task max budget "
+                    f"${req.max_budget:.6f}"
+                ),
+            )
 
     return CycleResponse(
-        status="completed",
+        status="budget_exceeded" if cut_off else "completed",
         result=result_text,
         model=result.get("model", model),
         task_id=req.task_id,
         usage=usage,
-        budget_used=round(budget_used, 6) if isinstance(budget_used, (int, float)) else None,
+        budget_used=round(budget_used, 6) if budget_used is not None else None,
         safety_report=safety_report,
     )
 
 
-def _run_local_task(
+async def _read_capped(stream: asyncio.StreamReader, limit_bytes: int) -> bytes:
+    """Drain ``stream`` to EOF, keeping only the first ``limit_bytes`` bytes."""
+    kept = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return bytes(kept)
+        room = limit_bytes - len(kept)
+        if room > 0:
+            kept += chunk[:room]
+
+
+async def _run_local_process(tokens: List[str], env: Dict[str, str], timeout: float) -> Tuple[int, str]:
+    """
+    Run an argv command without blocking the loop; returns (exit code, output).
+
+    Output is stdout followed by stderr, clipped to LOCAL_OUTPUT_MAX_CHARS.
+    Both pipes are drained to EOF so the child never stalls on a full pipe,
+    but bytes past the cap are dropped as they arrive rather than buffered.
+    Raises asyncio.TimeoutError (after killing the child) on timeout.
+    """
+    max_chars = max(0, LOCAL_OUTPUT_MAX_CHARS)
+    limit_bytes = max_chars * 4  # UTF-8 worst case
+    process = await asyncio.create_subprocess_exec(
+        *tokens,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=REPO_ROOT,
+        env=env,
+    )
+    try:
+        stdout, stderr, _ = await asyncio.wait_for(
+            asyncio.gather(
+                _read_capped(process.stdout, limit_bytes),
+                _read_capped(process.stderr, limit_bytes),
+                process.wait(),
+            ),
+            timeout=timeout,
+        )
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    output = stdout.decode("utf-8", errors="replace")[:max_chars]
+    if len(output) < max_chars:
+        output += stderr.decode("utf-8", errors="replace")
+    return process.returncode, output[:max_chars]
+
+
+async def _run_local_task(
     req: CycleRequest,
     safety_report: Optional[Dict[str, Any]] = None,
 ) -> CycleResponse:
+    tokens, env = _prepare_local_command(req)
+    return await _execute_local_command(req, tokens, env, safety_report)
+
+
+def _prepare_local_command(req: CycleRequest) -> Tuple[List[str], Dict[str, str]]:
+    """Validate the local command against policy; returns (argv, env)."""
     task = (req.task or "").strip()
     if not task:
         raise HTTPException(status_code=400, detail="local mode requires task")
@@ -637,28 +1186,26 @@ def _run_local_task(
     env = _build_local_env(tokens)
 
     _enforce_local_token_scope(tokens)
-    tokens = _apply_rg_blocklist_globs(tokens)
+    return _apply_rg_blocklist_globs(tokens), env
+
 
+async def _execute_local_command(
+    req: CycleRequest,
+    tokens: List[str],
+    env: Dict[str, str],
+    safety_report: Optional[Dict[str, Any]] = None,
+) -> CycleResponse:
     start_time = time.time()
     try:
-        process = subprocess.run(
-            tokens,
-            shell=False,
-            capture_output=True,
-            text=True,
-            timeout=req.timeout,
-            cwd=REPO_ROOT,
-            env=env,
-        )
-    except subprocess.TimeoutExpired:
+        returncode, output = await _run_local_process(tokens, env, req.timeout)
+    except asyncio.TimeoutError:
         raise HTTPException(status_code=500, detail=f"Task timeout after {req.timeout}s")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Task execution error: {e}")
 
     elapsed_time = time.time() - start_time
-    output = (process.stdout + process.stderr)[:1000]
-    status = "completed" if process.returncode == 0 else "failed"
-    result = f"Task executed in {elapsed_time:.2f}s with exit code {process.returncode}"
+    status = "completed" if returncode == 0 else "failed"
+    result = f"Task executed in {elapsed_time:.2f}s with exit code {returncode}"
 
     intensity = req.intensity or "medium"
     intensity_multiplier = {"low": 0.5, "medium": 1.0, "high": 1.5}.get(intensity, 1.0)
@@ -674,13 +1221,11 @@ def _run_local_task(
         model="local",
         task_id=req.task_id,
         budget_used=round(budget_used, 4) if budget_used is not None else None,
-        exit_code=process.returncode,
+        exit_code=returncode,
         safety_report=safety_report,
     )
 
 
-
-
 @app.post("/plan")
 async def plan(
     request: Request,
@@ -706,9 +1251,9 @@ async def plan(
 
     validate_config(require_groq_key=True)
 
-    scan_result = scan_codebase()
+    scan_result = await asyncio.to_thread(scan_codebase)
     tasks = await analyze_with_groq(scan_result)
-    write_tasks_to_queue(tasks)
+    await asyncio.to_thread(write_tasks_to_queue, tasks)
 
     return {
         "status": "planned",
@@ -719,50 +1264,8 @@ async def plan(
 
 
 def scan_codebase() -> Dict[str, Any]:
-    """Scan all .py files in the codebase (skipping large vendor dirs)."""
-    file_info: List[Dict[str, Any]] = []
-    total_lines = 0
-    test_files: List[str] = []
-
-    for root, dirs, files in os.walk(REPO_ROOT):
-        root_path = Path(root).resolve()
-        if _blocked_read_reason(root_path):
-            dirs[:] = []
-            continue
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS and not d.startswith(".")]
-        for filename in files:
-            if not filename.endswith(".py"):
-                continue
-            path = Path(root) / filename
-            if _blocked_read_reason(path.resolve()):
-                continue
-            try:
-                content = path.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
-
-            lines = len(content.splitlines())
-            total_lines += lines
-
-            rel_path = str(path.relative_to(REPO_ROOT))
-            has_tests = "test" in rel_path.lower() or "def test_" in content
-
-            file_info.append({
-                "path": rel_path,
-                "lines": lines,
-                "has_tests": has_tests,
-            })
-
-            if has_tests:
-                test_files.append(rel_path)
-
-    return {
-        "total_files": len(file_info),
-        "total_lines": total_lines,
-        "files": file_info,
-        "test_files": test_files,
-        "has_tests": len(test_files) > 0,
-    }
+    """Scan all .py files in the codebase (skipping large vendor dirs); unchanged files come from the scan cache."""
+    return CODEBASE_SCANNER.scan()
 
 
 def _summarize_scan(scan_result: Dict[str, Any], max_files: int = 120) -> str:
@@ -806,7 +1309,9 @@ Return a JSON array of tasks. Each task should have:
 Return ONLY valid JSON array, no other text."""
 
     try:
-        result = SECURE_API_WRAPPER.call_llm(
+        # Off the event loop: the rate limiter may sleep up to its max wait.
+        result = await _run_blocking(
+            SECURE_API_WRAPPER.call_llm,
             prompt=prompt,
             model=DEFAULT_GROQ_MODEL,
             max_tokens=1024,
@@ -814,9 +1319,7 @@ Return ONLY valid JSON array, no other text."""
             timeout=60,
         )
     except PermissionError as exc:
-        detail = str(exc)
-        status_code = 429 if "Rate limit" in detail else 403
-        raise HTTPException(status_code=status_code, detail=detail) from exc
+        raise _llm_call_http_error(exc) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Secure Groq planning failed: {exc}") from exc
 
@@ -864,13 +1367,31 @@ Return ONLY valid JSON array, no other text."""
 
 
 def write_tasks_to_queue(tasks: List[Dict[str, Any]]) -> None:
-    """Write tasks to queue.json."""
+    """Replace the queue with freshly planned tasks (atomic via the queue backend)."""
     queue = normalize_queue({
         "tasks": [normalize_task(task) for task in tasks],
         "completed": [],
         "failed": [],
     })
-    write_json(QUEUE_FILE, queue)
+    get_queue_backend(QUEUE_FILE).replace(queue)
+
+
+@app.get("/cycle/stats")
+async def cycle_stats(request: Request) -> Dict[str, Any]:
+    """Request coalescing metrics for /cycle and the Groq engine."""
+    _enforce_internal_api_access(
+        request,
+        provided_token=None,
+        endpoint="/cycle/stats",
+        require_token=False,
+    )
+    from vivarium.runtime.groq_client import get_groq_engine_stats
+
+    engine_stats = get_groq_engine_stats()
+    return {
+        "cycle_coalescing": CYCLE_FLIGHTS.stats(),
+        "groq_coalescing": engine_stats["coalescing"] if engine_stats else None,
+    }
 
 
 @app.get("/status")
@@ -884,7 +1405,7 @@ async def status(request: Request) -> Dict[str, int]:
     )
 
     if QUEUE_FILE.exists():
-        queue = normalize_queue(read_json(QUEUE_FILE, default={}))
+        queue = get_queue_backend(QUEUE_FILE).read()
         if queue:
             return {
                 "tasks": len(queue.get("tasks", [])),
@@ -48,6 +48,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from statistics import mean, stdev
 from vivarium.runtime.vivarium_scope import SECURITY_ROOT, MUTABLE_ROOT
+from vivarium.runtime.prompt_context_cache import PromptContextCache, file_signature
 from vivarium.runtime.config import (
     DISCUSSION_MESSAGE_MAX_CHARS,
     DISCUSSION_PREVIEW_MAX_CHARS,
@@ -458,6 +459,9 @@ class EnrichmentSystem:
         self.guilds_file = self.workspace / ".swarm" / "guilds.json"
         self.legacy_teams_file = self.workspace / ".swarm" / "teams.json"
 
+        # Rendered get_enrichment_context sections, per identity.
+        self._context_cache = PromptContextCache()
+
     DISCUSSION_ROOMS = (
         "town_hall",
         "human_async",
@@ -1362,6 +1366,7 @@ class EnrichmentSystem:
         self.guild_votes_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.guild_votes_file, 'w') as f:
             json.dump(votes, f, indent=2)
+        self._invalidate_context("guild")
 
     def _load_disputes(self) -> dict:
         if self.disputes_file.exists():
@@ -2225,6 +2230,7 @@ class EnrichmentSystem:
         journal_file = self.journals_dir / f"{identity_id}.jsonl"
         with open(journal_file, 'a') as f:
             f.write(json.dumps(journal_entry) + '\n')
+        self._invalidate_context("memory")
         self.refresh_journal_rollups(identity_id)
 
         review_excerpt = (
@@ -2319,6 +2325,7 @@ class EnrichmentSystem:
         self.journal_rollups_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.journal_rollups_file, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2)
+        self._invalidate_context("memory")
 
     def _summarize_journal_bucket(self, entries: List[Dict[str, Any]], max_chars: Optional[int] = None) -> str:
         if not entries:
@@ -4955,6 +4962,7 @@ This is my time. I can enjoy it without pressure.
         messages_file.parent.mkdir(parents=True, exist_ok=True)
         with open(messages_file, 'a') as f:
             f.write(json.dumps(message) + '\n')
+        self._invalidate_context("mailbox")
 
         # Mirror to async shared room so human chat works as group async stream.
         self.post_discussion_message(
@@ -5227,6 +5235,7 @@ I take a moment to read these before starting my task.
     def _save_free_time_balances(self, balances: Dict[str, Any]):
         with open(self.free_time_file, 'w') as f:
             json.dump(balances, f, indent=2)
+        self._invalidate_context("self")
 
     # ─────────────────────────────────────────────────────────────────────
     # IDENTITY RESPEC - Change core identity attributes (ARPG-style scaling)
@@ -6585,6 +6594,7 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
         self.bounties_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.bounties_file, 'w') as f:
             json.dump(bounties, f, indent=2)
+        self._invalidate_context("bounties")
 
     def _load_guilds(self) -> list:
         """Load all guilds (with legacy team migration)."""
@@ -6610,6 +6620,7 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
         self.guilds_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.guilds_file, 'w') as f:
             json.dump(guilds, f, indent=2)
+        self._invalidate_context("bounties", "guild")
 
     def _load_teams(self) -> list:
         """Backward compatibility wrapper for guilds."""
@@ -7100,6 +7111,7 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
         # Append to invites file
         with open(self.invites_file, 'a') as f:
             f.write(json.dumps(invite.to_dict()) + '\n')
+        self._invalidate_context("self")
 
         print(f"[ENRICHMENT] {from_name} invited {to_name} to {activity} at the {location}")
         return invite
@@ -7195,6 +7207,7 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
 
         with open(self.universe_file, 'w') as f:
             json.dump(index, f, indent=2)
+        self._invalidate_context("library")
 
     def get_library_catalog(self) -> Dict[str, Any]:
         """Get the library catalog."""
@@ -7240,8 +7253,46 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
             with open(work_file, 'w') as f:
                 json.dump(work.to_dict(), f, indent=2)
 
-    def get_enrichment_context(self, identity_id: str, identity_name: str) -> str:
-        """Generate compact enrichment context with deterministic option-tree summaries."""
+    # Files each cached context section reads; a change to any of them (or an
+    # explicit invalidation from a write method below) rebuilds the section.
+    def _context_section_sources(self, section: str, identity_id: str) -> Tuple[Path, ...]:
+        swarm_dir = self.workspace / ".swarm"
+        if section == "self":
+            return (self.free_time_file, self.invites_file)
+        if section == "memory":
+            return (self.journal_rollups_file, self.journals_dir / f"{identity_id}.jsonl")
+        if section == "mailbox":
+            return (
+                swarm_dir / "messages_from_human.json",
+                swarm_dir / "messages_to_human.jsonl",
+                SECURITY_ROOT / "local_ui_settings.json",
+            )
+        if section == "bounties":
+            return (self.bounties_file, self.guilds_file, self.legacy_teams_file)
+        if section == "guild":
+            return (self.guilds_file, self.legacy_teams_file, self.guild_votes_file)
+        if section == "library":
+            return (self.universe_file,)
+        if section == "respec":
+            return (swarm_dir / "identities" / f"{identity_id}.json",)
+        raise ValueError(f"unknown context section: {section}")
+
+    def _cached_context_section(self, section: str, identity_id: str, build):
+        # Library state is global; every other section is per identity.
+        scope = "" if section == "library" else identity_id
+        version = file_signature(*self._context_section_sources(section, identity_id))
+        return self._context_cache.get(scope, section, version, build)
+
+    def _invalidate_context(self, *sections: str) -> None:
+        cache = getattr(self, "_context_cache", None)
+        if cache is not None:
+            cache.invalidate(sections or None)
+
+    def context_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the per-identity enrichment context cache."""
+        return self._context_cache.stats()
+
+    def _context_self_summary(self, identity_id: str) -> str:
         balances = self.get_all_balances(identity_id)
         free_time = int(balances.get("free_time", 0))
         journal_tokens = int(balances.get("journal", 0))
@@ -7250,11 +7301,14 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
         pending_invites = self.get_pending_invites(identity_id)
         badges = self.get_badges(identity_id) or []
         recent_badges = badges[-self.CONTEXT_BADGE_PREVIEW_LIMIT:]
-        responses = self.check_human_responses(identity_id)
-        pending_messages = self._get_pending_messages_to_human(identity_id)
-        human_name = self._human_username()
-        catalog = self.get_library_catalog()
+        invite_preview = ", ".join(str(inv.from_name) for inv in pending_invites[: self.CONTEXT_INVITE_PREVIEW_LIMIT]) if pending_invites else "none"
+        badge_preview = ", ".join(str(b.get("category", "")) for b in recent_badges if b.get("category")) or "none"
+        return (
+            f"free_time={free_time}/{free_time_cap}, journal={journal_tokens}/{self.MAX_JOURNAL_TOKENS}, "
+            f"badges_recent={len(recent_badges)} [{badge_preview}], pending_invites={len(pending_invites)} [{invite_preview}]"
+        )
 
+    def _context_memory_summary(self, identity_id: str) -> str:
         # Deterministic memory metrics (no inference summaries).
         rollups = self.get_journal_rollups(
             identity_id,
@@ -7283,8 +7337,21 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
                     continue
                 token_counts[raw] = token_counts.get(raw, 0) + 1
         top_terms = [k for k, _ in sorted(token_counts.items(), key=lambda kv: kv[1], reverse=True)[: self.CONTEXT_TOP_TERMS]]
+        return (
+            f"daily_entries={daily_entries}, weekly_entries={weekly_entries}, "
+            f"recent_reflections={len(recent_journals)}, top_terms={', '.join(top_terms) if top_terms else 'none'}"
+        )
+
+    def _context_mailbox_summary(self, identity_id: str) -> str:
+        responses = self.check_human_responses(identity_id)
+        pending_messages = self._get_pending_messages_to_human(identity_id)
+        human_name = self._human_username()
+        return (
+            f"pending_to_human={len(pending_messages)}, replies_received={len(responses)}, "
+            f"send_cost={self.MESSAGE_HUMAN_COST}, human_name={human_name}"
+        )
 
-        # Bounty / guild metrics (compact menu-ready snapshots).
+    def _context_bounty_summary(self, identity_id: str) -> str:
         open_bounties = self.get_open_bounties()
         my_bounties = self.get_my_bounties(identity_id)
         bounty_rewards: List[float] = []
@@ -7295,37 +7362,63 @@ I can call: respec_identity(new_name='MyNewName', reason='My reflection on why..
                 continue
         average_bounty_reward = mean(bounty_rewards) if bounty_rewards else 0.0
         max_bounty_reward = max(bounty_rewards) if bounty_rewards else 0.0
+        return (
+            f"open={len(open_bounties)}, my_active={len(my_bounties)}, "
+            f"avg_reward={average_bounty_reward:.1f}, max_reward={max_bounty_reward:.1f}"
+        )
+
+    def _context_guild_summary(self, identity_id: str) -> str:
         my_guild = self.get_my_guild(identity_id)
         all_guilds = self.get_guilds()
         leaderboard = self.get_guild_leaderboard(limit=self.CONTEXT_GUILD_LEADERBOARD_LIMIT)
         pending_guild_requests = self.get_pending_guild_requests(identity_id) if my_guild else []
+        leaderboard_preview = ", ".join(str(g.get("name", "")) for g in leaderboard if g.get("name")) or "none"
+        return (
+            f"mine={'yes' if my_guild else 'no'}, total_guilds={len(all_guilds)}, "
+            f"pending_votes={len(pending_guild_requests)}, leaderboard_top={leaderboard_preview}"
+        )
 
-        # Library metrics.
+    def _context_library_summary(self) -> str:
+        catalog = self.get_library_catalog()
         works = list(catalog.get("works", []))
         works_recent = sorted(works, key=lambda x: x.get("created_at", ""), reverse=True)[: self.CONTEXT_RECENT_WORK_LIMIT]
         series_count = len(catalog.get("series", {}) or {})
+        recent_titles = "; ".join(str(w.get("title", "untitled"))[:self.CONTEXT_LIBRARY_TITLE_PREVIEW_CHARS] for w in works_recent) if works_recent else "none"
+        return f"works={len(works)}, series={series_count}, recent_titles={recent_titles}"
 
-        # Respec metrics.
+    def _context_respec_summary(self, identity_id: str) -> str:
         respec_info = self.calculate_respec_cost(identity_id)
         respec_cost = int(respec_info.get("respec_cost", 0)) if "error" not in respec_info else 0
         sessions = int(respec_info.get("sessions", 0)) if "error" not in respec_info else 0
+        return f"respec_cost={respec_cost}, sessions={sessions}"
+
+    def get_enrichment_context(self, identity_id: str, identity_name: str) -> str:
+        """Generate compact enrichment context with deterministic option-tree summaries.
 
+        Each section is cached per identity (see ``_context_section_sources``);
+        only the creativity seed is regenerated on every call.
+        """
+        section = self._cached_context_section
+        self_summary = section("self", identity_id, lambda: self._context_self_summary(identity_id))
+        memory_summary = section("memory", identity_id, lambda: self._context_memory_summary(identity_id))
+        mailbox_summary = section("mailbox", identity_id, lambda: self._context_mailbox_summary(identity_id))
+        bounty_summary = section("bounties", identity_id, lambda: self._context_bounty_summary(identity_id))
+        guild_summary = section("guild", identity_id, lambda: self._context_guild_summary(identity_id))
+        library_summary = section("library", identity_id, self._context_library_summary)
+        respec_summary = section("respec", identity_id, lambda: self._context_respec_summary(identity_id))
         creativity_seed = self._fresh_creativity_seed()
-        invite_preview = ", ".join(str(inv.from_name) for inv in pending_invites[: self.CONTEXT_INVITE_PREVIEW_LIMIT]) if pending_invites else "none"
-        badge_preview = ", ".join(str(b.get("category", "")) for b in recent_badges if b.get("category")) or "none"
-        leaderboard_preview = ", ".join(str(g.get("name", "")) for g in leaderboard if g.get("name")) or "none"
 
         lines = [
             "CONTEXT OPTION TREE (PROGRAMMATIC SNAPSHOT)",
             "- All values below are computed from live state (no inferred prose recap).",
             "",
-            f"- checkSelf() -> id={identity_name}, free_time={free_time}/{free_time_cap}, journal={journal_tokens}/{self.MAX_JOURNAL_TOKENS}, badges_recent={len(recent_badges)} [{badge_preview}], pending_invites={len(pending_invites)} [{invite_preview}]",
-            f"- checkMemory() -> daily_entries={daily_entries}, weekly_entries={weekly_entries}, recent_reflections={len(recent_journals)}, top_terms={', '.join(top_terms) if top_terms else 'none'}",
-            f"- checkMailbox() -> pending_to_human={len(pending_messages)}, replies_received={len(responses)}, send_cost={self.MESSAGE_HUMAN_COST}, human_name={human_name}",
-            f"- checkBounties() -> open={len(open_bounties)}, my_active={len(my_bounties)}, avg_reward={average_bounty_reward:.1f}, max_reward={max_bounty_reward:.1f}",
-            f"- checkGuild() -> mine={'yes' if my_guild else 'no'}, total_guilds={len(all_guilds)}, pending_votes={len(pending_guild_requests)}, leaderboard_top={leaderboard_preview}",
-            f"- checkLibrary() -> works={len(works)}, series={series_count}, recent_titles={'; '.join(str(w.get('title', 'untitled'))[:self.CONTEXT_LIBRARY_TITLE_PREVIEW_CHARS] for w in works_recent) if works_recent else 'none'}",
-            f"- checkIdentityTools() / getSelfInfo() -> respec_cost={respec_cost}, sessions={sessions}, creativity_seed={creativity_seed}",
+            f"- checkSelf() -> id={identity_name}, {self_summary}",
+            f"- checkMemory() -> {memory_summary}",
+            f"- checkMailbox() -> {mailbox_summary}",
+            f"- checkBounties() -> {bounty_summary}",
+            f"- checkGuild() -> {guild_summary}",
+            f"- checkLibrary() -> {library_summary}",
+            f"- checkIdentityTools() / getSelfInfo() -> {respec_summary}, creativity_seed={creativity_seed}",
             "",
             "POSSIBLE MOVES (mix and match as needed):",
             "- 1) checkBounties() then call claim_bounty(bounty_id) if ROI is good.",
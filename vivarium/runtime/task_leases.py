@@ -0,0 +1,225 @@
+"""
+Renewable task leases shared by every resident.
+
+Replaces the one-JSON-file-per-task locks under ``task_locks/``. All leases
+live in a single table (``task_locks/leases.json``) that is only rewritten
+under an exclusive flock, so acquiring, renewing and releasing are atomic
+across processes, and the scan loop can ask "which tasks are leased?" with one
+read instead of an ``exists``/``read_json`` pair per task.
+
+A lease expires ``ttl_seconds`` after its last renewal. While a process holds
+leases, a daemon heartbeat thread renews them every ``ttl / 3`` seconds, so a
+long-running task keeps its lease and a crashed resident's lease lapses within
+one TTL instead of a fixed five-minute timeout. A lease whose owning PID no
+longer exists on this host is reclaimed immediately.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from vivarium.utils import get_timestamp
+from vivarium.utils.file_lock import exclusive_lock
+
+LEASE_TABLE_FILENAME = "leases.json"
+DEFAULT_LEASE_TTL_SECONDS = 60.0
+_HOSTNAME = socket.gethostname()
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def lease_is_live(lease: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """True if ``lease`` has not expired and its owner process (if local) still runs."""
+    if not isinstance(lease, dict):
+        return False
+    now = time.time() if now is None else now
+    try:
+        if float(lease.get("expires_at", 0)) <= now:
+            return False
+    except (TypeError, ValueError):
+        return False
+    if lease.get("host") == _HOSTNAME:
+        try:
+            pid = int(lease.get("pid", 0))
+        except (TypeError, ValueError):
+            return False
+        if pid != os.getpid() and not _pid_alive(pid):
+            return False
+    return True
+
+
+class LeaseTable:
+    """Flock-protected lease table with heartbeat renewal for leases held by this process."""
+
+    def __init__(self, table_path: Path, ttl_seconds: float = DEFAULT_LEASE_TTL_SECONDS):
+        self.table_path = Path(table_path)
+        self.lock_file = self.table_path.with_name(f"{self.table_path.name}.lock")
+        self.ttl_seconds = max(1.0, float(ttl_seconds))
+        self._held: Dict[str, str] = {}
+        self._held_lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
+
+    # -- table I/O ----------------------------------------------------------
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.table_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        leases = data.get("leases") if isinstance(data, dict) else None
+        return leases if isinstance(leases, dict) else {}
+
+    def _store(self, leases: Dict[str, Dict[str, Any]]) -> None:
+        self.table_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.table_path.with_name(f".{self.table_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"leases": leases}, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.table_path)
+
+    @staticmethod
+    def _prune(leases: Dict[str, Dict[str, Any]], now: float) -> bool:
+        dead = [task_id for task_id, lease in leases.items() if not lease_is_live(lease, now)]
+        for task_id in dead:
+            del leases[task_id]
+        return bool(dead)
+
+    # -- public API ---------------------------------------------------------
+
+    def acquire(self, task_id: str, owner: str) -> bool:
+        """Take the lease on ``task_id``; False while any live lease on it exists."""
+        now = time.time()
+        with exclusive_lock(self.lock_file):
+            leases = self._load()
+            self._prune(leases, now)
+            if task_id in leases:
+                return False
+            leases[task_id] = {
+                "owner": owner,
+                "pid": os.getpid(),
+                "host": _HOSTNAME,
+                "acquired_at": get_timestamp(),
+                "expires_at": now + self.ttl_seconds,
+            }
+            self._store(leases)
+        with self._held_lock:
+            self._held[task_id] = owner
+        self._ensure_heartbeat()
+        return True
+
+    def renew(self, task_ids: Optional[Set[str]] = None) -> Set[str]:
+        """
+        Extend leases this process holds (all of them by default).
+
+        Returns the task ids that were renewed; leases lost to another owner
+        (e.g. after this process stalled past its TTL) are forgotten.
+        """
+        with self._held_lock:
+            held = {tid: owner for tid, owner in self._held.items() if task_ids is None or tid in task_ids}
+        if not held:
+            return set()
+        now = time.time()
+        renewed: Set[str] = set()
+        with exclusive_lock(self.lock_file):
+            leases = self._load()
+            self._prune(leases, now)
+            for task_id, owner in held.items():
+                current = leases.get(task_id)
+                if current is not None and current.get("owner") != owner:
+                    continue
+                lease = dict(current or {"owner": owner, "acquired_at": get_timestamp()})
+                lease.update({"pid": os.getpid(), "host": _HOSTNAME, "expires_at": now + self.ttl_seconds})
+                leases[task_id] = lease
+                renewed.add(task_id)
+            self._store(leases)
+        lost = set(held) - renewed
+        if lost:
+            with self._held_lock:
+                for task_id in lost:
+                    self._held.pop(task_id, None)
+        return renewed
+
+    def release(self, task_id: str, owner: Optional[str] = None) -> None:
+        """Drop the lease on ``task_id`` (only if held by ``owner`` when given); the heartbeat stops with the last lease."""
+        with self._held_lock:
+            self._held.pop(task_id, None)
+            if not self._held:
+                self._stop_heartbeat_locked()
+        with exclusive_lock(self.lock_file):
+            leases = self._load()
+            current = leases.get(task_id)
+            if current is None:
+                return
+            if owner is not None and current.get("owner") != owner:
+                return
+            del leases[task_id]
+            self._store(leases)
+
+    def leased_task_ids(self) -> Set[str]:
+        """Bulk view of tasks with a live lease (one read, no lock needed: writes are atomic)."""
+        now = time.time()
+        return {task_id for task_id, lease in self._load().items() if lease_is_live(lease, now)}
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        lease = self._load().get(task_id)
+        return dict(lease) if lease is not None and lease_is_live(lease) else None
+
+    # -- heartbeat ----------------------------------------------------------
+
+    def _ensure_heartbeat(self) -> None:
+        with self._held_lock:
+            if self._heartbeat is not None and self._heartbeat.is_alive():
+                return
+            # A fresh stop event per thread, so stopping an old heartbeat can
+            # never cancel the one started for a newer lease.
+            self._heartbeat_stop = threading.Event()
+            self._heartbeat = threading.Thread(
+                target=self._heartbeat_loop,
+                args=(self._heartbeat_stop,),
+                name=f"lease-heartbeat-{self.table_path.parent.name}",
+                daemon=True,
+            )
+            self._heartbeat.start()
+
+    def _heartbeat_loop(self, stop: threading.Event) -> None:
+        interval = self.ttl_seconds / 3.0
+        while not stop.wait(interval):
+            with self._held_lock:
+                if not self._held:
+                    self._stop_heartbeat_locked()
+                    return
+            try:
+                self.renew()
+            except OSError:
+                # Transient I/O failure: try again next tick; the TTL covers a missed beat.
+                continue
+
+    def _stop_heartbeat_locked(self) -> Optional[threading.Thread]:
+        thread = self._heartbeat
+        self._heartbeat = None
+        self._heartbeat_stop.set()
+        return thread
+
+    def stop_heartbeat(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop renewing leases (held leases then expire after their TTL)."""
+        with self._held_lock:
+            thread = self._stop_heartbeat_locked()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
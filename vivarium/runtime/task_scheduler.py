@@ -0,0 +1,164 @@
+"""
+Incremental dependency index for the resident task scan.
+
+``check_dependencies_complete`` answers "can this task run?" by rebuilding a
+queue lookup per candidate, which makes every scan O(n^2) once phase-4
+decomposition fans a queue out into many subtasks. ``DependencyIndex`` keeps
+the same answer up to date instead:
+
+- reverse edges dependency -> dependents, rebuilt only for tasks whose
+  ``depends_on`` changed since the last ``sync_queue``;
+- the set of unmet dependencies per open task;
+- a ready-set of open tasks that are not done, not ``phase4_skip`` and have
+  no unmet dependencies.
+
+Status changes arrive one execution-log event at a time via ``observe``; only
+the dependents of that task are re-evaluated. Semantics match
+``check_dependencies_complete`` / ``is_task_done``: ``pending_review`` counts
+as satisfied for dependents but done for the task itself, and a dependency on
+an open ``phase4_skip`` task is treated as satisfied.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+SATISFIED_STATUSES = frozenset({"completed", "approved", "ready_for_merge", "pending_review"})
+DONE_STATUSES = frozenset({"completed", "approved", "ready_for_merge", "failed", "pending_review"})
+
+
+class DependencyIndex:
+    """Ready-set of open queue tasks, maintained from queue syncs and status events."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._order: Dict[str, int] = {}
+        self._deps: Dict[str, Tuple[str, ...]] = {}
+        self._unmet: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._skipped: Set[str] = set()
+        self._status: Dict[str, Optional[str]] = {}
+        self._ready: Set[str] = set()
+
+    # -- internal helpers (caller holds the lock) ---------------------------
+
+    def _is_satisfied(self, task_id: str) -> bool:
+        return task_id in self._skipped or self._status.get(task_id) in SATISFIED_STATUSES
+
+    def _refresh_ready(self, task_id: str) -> None:
+        if (
+            task_id in self._tasks
+            and task_id not in self._skipped
+            and self._status.get(task_id) not in DONE_STATUSES
+            and not self._unmet.get(task_id)
+        ):
+            self._ready.add(task_id)
+        else:
+            self._ready.discard(task_id)
+
+    def _recheck_dependents(self, task_id: str) -> None:
+        satisfied = self._is_satisfied(task_id)
+        for child in self._dependents.get(task_id, ()):
+            unmet = self._unmet.get(child)
+            if unmet is None:
+                continue
+            if satisfied:
+                unmet.discard(task_id)
+            else:
+                unmet.add(task_id)
+            self._refresh_ready(child)
+
+    def _set_deps(self, task_id: str, deps: Tuple[str, ...]) -> None:
+        for dep in self._deps.get(task_id, ()):
+            children = self._dependents.get(dep)
+            if children is not None:
+                children.discard(task_id)
+                if not children:
+                    del self._dependents[dep]
+        self._deps[task_id] = deps
+        for dep in deps:
+            self._dependents.setdefault(dep, set()).add(task_id)
+        self._unmet[task_id] = {dep for dep in deps if not self._is_satisfied(dep)}
+
+    def _set_skipped(self, task_id: str, skipped: bool) -> None:
+        if skipped == (task_id in self._skipped):
+            return
+        if skipped:
+            self._skipped.add(task_id)
+        else:
+            self._skipped.discard(task_id)
+        self._recheck_dependents(task_id)
+
+    def _remove(self, task_id: str) -> None:
+        self._set_deps(task_id, ())
+        self._deps.pop(task_id, None)
+        self._unmet.pop(task_id, None)
+        self._tasks.pop(task_id, None)
+        self._order.pop(task_id, None)
+        self._ready.discard(task_id)
+        self._set_skipped(task_id, False)
+
+    # -- public API ---------------------------------------------------------
+
+    def sync_queue(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """
+        Align the index with the open ``tasks`` list of a freshly read queue.
+
+        Work per task is O(1) unless its dependencies or ``phase4_skip`` flag
+        changed; tasks that left the open list are dropped.
+        """
+        with self._lock:
+            seen: Set[str] = set()
+            for task in tasks:
+                if not isinstance(task, dict) or not task.get("id"):
+                    continue
+                task_id = str(task["id"])
+                if task_id in seen:
+                    continue
+                seen.add(task_id)
+                deps = tuple(str(dep) for dep in (task.get("depends_on") or []) if dep)
+                self._tasks[task_id] = task
+                self._order[task_id] = len(seen)
+                if task_id not in self._unmet or self._deps.get(task_id) != deps:
+                    self._set_deps(task_id, deps)
+                self._set_skipped(task_id, bool(task.get("phase4_skip")))
+                self._refresh_ready(task_id)
+            for task_id in [tid for tid in self._tasks if tid not in seen]:
+                self._remove(task_id)
+
+    def observe(self, task_id: str, status: Optional[str]) -> None:
+        """Record the latest execution-log status for ``task_id``."""
+        if not task_id:
+            return
+        with self._lock:
+            was_satisfied = self._is_satisfied(task_id)
+            self._status[task_id] = status
+            if self._is_satisfied(task_id) != was_satisfied:
+                self._recheck_dependents(task_id)
+            self._refresh_ready(task_id)
+
+    def reset_statuses(self, statuses: Optional[Mapping[str, Optional[str]]] = None) -> None:
+        """Replace all known statuses (log rotated/truncated or rebuilt from a fallback)."""
+        with self._lock:
+            self._status = dict(statuses or {})
+            for task_id, deps in self._deps.items():
+                self._unmet[task_id] = {dep for dep in deps if not self._is_satisfied(dep)}
+            self._ready.clear()
+            for task_id in self._tasks:
+                self._refresh_ready(task_id)
+
+    def ready_tasks(self) -> List[Dict[str, Any]]:
+        """Ready tasks in queue order."""
+        with self._lock:
+            ordered = sorted(self._ready, key=lambda tid: self._order.get(tid, 0))
+            return [self._tasks[tid] for tid in ordered]
+
+    def is_ready(self, task_id: str) -> bool:
+        with self._lock:
+            return task_id in self._ready
+
+    def dependents_of(self, task_id: str) -> Set[str]:
+        with self._lock:
+            return set(self._dependents.get(task_id, ()))
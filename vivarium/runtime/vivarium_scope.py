@@ -30,6 +30,11 @@ CHANGE_CONTROL_ROOT = META_ROOT / "change_control"
 CHECKPOINT_ROOT = CHANGE_CONTROL_ROOT / "checkpoints"
 CHANGE_JOURNAL_FILE = CHANGE_CONTROL_ROOT / "change_journal.jsonl"
 EXECUTION_TOKEN_FILE = SECURITY_ROOT / "internal_execution_token.txt"
+BUDGET_LEDGER_FILE = AUDIT_ROOT / "budget_ledger.sqlite3"
+LLM_RESPONSE_CACHE_DIR = META_ROOT / "cache" / "llm_responses"
+RATE_LIMIT_STATE_FILE = META_ROOT / "cache" / "groq_rate_limits.json"
+CODEBASE_SCAN_CACHE_FILE = META_ROOT / "cache" / "codebase_scan.json"
+INSIGHTS_ROLLUP_FILE = META_ROOT / "cache" / "insights_rollup.json"
 
 MUTABLE_QUEUE_FILE = MUTABLE_ROOT / "queue.json"
 MUTABLE_DATA_DIR = MUTABLE_ROOT / "data"
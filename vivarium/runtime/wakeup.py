@@ -0,0 +1,112 @@
+"""
+Event-driven wakeup for idle residents.
+
+Instead of sleeping a fixed interval between queue scans, an idle resident
+blocks on a WorkSignal that is set as soon as any watched file (queue.json,
+kill switch, runtime speed, UI settings) is created, modified or atomically
+replaced. Every writer in the tree (add_task, /plan, the control panel queue
+blueprint, other residents recording task outcomes) already touches one of
+those files, so no writer has to opt in. The execution log is deliberately not
+watched: it is appended on every status change and would wake every idle
+resident for records that never make new work claimable.
+
+The sleep-based poll stays as the fallback: if watchdog is unavailable or the
+observer cannot start (e.g. inotify watch limit reached), ``wait`` degrades to
+a plain timed sleep.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Set
+
+if TYPE_CHECKING:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    from watchdog.observers.api import BaseObserver
+else:
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:  # pragma: no cover - watchdog is a core requirement
+        FileSystemEventHandler = object
+        Observer = None
+
+
+class _WatchedFileHandler(FileSystemEventHandler):
+    def __init__(self, names: Set[str], on_change):
+        self._names = names
+        self._on_change = on_change
+
+    def on_any_event(self, event):
+        if getattr(event, "is_directory", False):
+            return
+        for raw_path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if raw_path and Path(str(raw_path)).name in self._names:
+                self._on_change()
+                return
+
+
+class WorkSignal:
+    """A threading.Event that is set whenever one of the watched files changes."""
+
+    def __init__(self, watch_files: Iterable[Path]):
+        self._event = threading.Event()
+        self._observer: Optional[BaseObserver] = None
+        by_dir: Dict[Path, Set[str]] = {}
+        for path in watch_files:
+            path = Path(path)
+            by_dir.setdefault(path.parent, set()).add(path.name)
+        self._watch_dirs = by_dir
+
+    @property
+    def active(self) -> bool:
+        """True while the filesystem observer is running."""
+        return self._observer is not None
+
+    def start(self) -> bool:
+        """Start watching; returns False (polling fallback) if the observer cannot run."""
+        if self._observer is not None:
+            return True
+        if Observer is None:
+            return False
+        observer = Observer()
+        try:
+            for directory, names in self._watch_dirs.items():
+                directory.mkdir(parents=True, exist_ok=True)
+                observer.schedule(_WatchedFileHandler(names, self.notify), str(directory), recursive=False)
+            observer.daemon = True
+            observer.start()
+        except Exception:
+            try:
+                observer.stop()
+            except Exception:
+                pass
+            return False
+        self._observer = observer
+        return True
+
+    def stop(self) -> None:
+        observer, self._observer = self._observer, None
+        if observer is None:
+            return
+        try:
+            observer.stop()
+            observer.join(timeout=2.0)
+        except Exception:
+            pass
+
+    def notify(self) -> None:
+        """Wake any waiter (also usable in-process, e.g. after local enqueue)."""
+        self._event.set()
+
+    def clear(self) -> None:
+        """Forget earlier changes; call right before scanning so later writes still wake us."""
+        self._event.clear()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Block until a watched file changes or ``timeout`` elapses. Returns True if woken."""
+        woke = self._event.wait(timeout)
+        self._event.clear()
+        return woke
@@ -22,11 +22,12 @@ import threading
 import httpx
 from dataclasses import dataclass
 from ipaddress import ip_address
-from typing import Callable, Iterable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Set, Tuple
 from urllib.parse import urlparse
 from vivarium.utils import (
     read_json,
@@ -37,8 +38,10 @@ from vivarium.utils import (
     ensure_dir,
     format_error,
 )
+from vivarium.utils.jsonl_appender import get_appender
+from vivarium.runtime.api_client import get_api_client
 from vivarium.runtime.config import (
-    LOCK_TIMEOUT_SECONDS,
+    TASK_LEASE_TTL_SECONDS,
     API_TIMEOUT_SECONDS,
     DEFAULT_MIN_BUDGET,
     DEFAULT_MAX_BUDGET,
@@ -48,10 +51,24 @@ from vivarium.runtime.config import (
     TASK_REVIEW_EXCERPT_MAX_CHARS,
     REQUIRE_HUMAN_APPROVAL_DEFAULT,
     AUTO_APPROVE_MIN_CONFIDENCE,
+    CYCLE_BATCH_MAX_ITEMS,
     validate_model_id,
     validate_config,
 )
-from vivarium.runtime.runtime_contract import normalize_queue, normalize_task, is_known_execution_status
+from vivarium.runtime.runtime_contract import normalize_task, is_known_execution_status
+from vivarium.runtime.budget_ledger import SWARM_ACCOUNT, BudgetLedger, get_budget_ledger
+from vivarium.runtime.log_index import (
+    ExecutionStatusIndex,
+    MtimeJsonCache,
+    append_execution_record,
+    compact_execution_log,
+    compact_status_record,
+)
+from vivarium.runtime.queue_store import get_queue_backend
+from vivarium.runtime.safety_verdict import normalize_task_text, sign_verdict
+from vivarium.runtime.task_leases import LEASE_TABLE_FILENAME, LeaseTable
+from vivarium.runtime.task_scheduler import DependencyIndex
+from vivarium.runtime.wakeup import WorkSignal
 from vivarium.runtime.vivarium_scope import (
     AUDIT_ROOT,
     MUTABLE_COMMUNITY_LIBRARY_ROOT,
@@ -116,6 +133,9 @@ REPO_ROOT: Path = Path(__file__).resolve().parents[2]
 QUEUE_FILE: Path = MUTABLE_QUEUE_FILE
 LOCKS_DIR: Path = MUTABLE_LOCKS_DIR
 EXECUTION_LOG: Path = AUDIT_ROOT / "execution_log.jsonl"
+# Live /cycle/stream output (deltas + counters). Kept out of EXECUTION_LOG, which
+# is for state transitions and is replayed by status indexes and compaction.
+STREAM_PROGRESS_LOG: Path = AUDIT_ROOT / "stream_progress.jsonl"
 KILL_SWITCH: Path = MUTABLE_SWARM_DIR / "kill_switch.json"
 UI_SETTINGS_FILE: Path = SECURITY_ROOT / "local_ui_settings.json"
 MESSAGES_TO_HUMAN_PATH: Path = MUTABLE_SWARM_DIR / "messages_to_human.jsonl"
@@ -128,6 +148,17 @@ MAX_IDLE_CYCLES: int = 10  # Exit after N consecutive idle checks
 DEFAULT_INTENSITY: str = "medium"
 DEFAULT_TASK_TYPE: str = "cycle"
 CYCLE_EXECUTION_ENDPOINT: str = "/cycle"
+CYCLE_BATCH_ENDPOINT: str = "/cycle/batch"
+CYCLE_STREAM_ENDPOINT: str = "/cycle/stream"
+# Stream LLM completions from /cycle/stream and append partial-output progress to STREAM_PROGRESS_LOG.
+RESIDENT_STREAM_CYCLE: bool = (
+    os.environ.get("RESIDENT_STREAM_CYCLE", "0").strip().lower()
+    not in {"0", "false", "no"}
+)
+STREAM_PROGRESS_INTERVAL_SECONDS: float = float(os.environ.get("RESIDENT_STREAM_PROGRESS_INTERVAL_SECONDS", "0.5"))
+STREAM_PROGRESS_TAIL_CHARS: int = int(os.environ.get("RESIDENT_STREAM_PROGRESS_TAIL_CHARS", "2000"))
+# The progress log is disposable: rotate it instead of letting it grow.
+STREAM_PROGRESS_LOG_MAX_BYTES: int = int(os.environ.get("RESIDENT_STREAM_PROGRESS_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
 DEFAULT_MIN_SCORE: float = float(os.environ.get("RESIDENT_MIN_SCORE", "0"))
 ENRICHMENT_RECALL_MAX_CHARS: int = 600
 ENRICHMENT_RECALL_LIMIT: int = 4
@@ -146,6 +177,18 @@ RESIDENT_SHARD_ID_RAW: str = os.environ.get("RESIDENT_SHARD_ID", "auto").strip()
 RESIDENT_SCAN_LIMIT: int = int(os.environ.get("RESIDENT_SCAN_LIMIT", "0"))
 RESIDENT_BACKOFF_MAX: int = int(os.environ.get("RESIDENT_BACKOFF_MAX", "5"))
 RESIDENT_JITTER_MAX: float = float(os.environ.get("RESIDENT_JITTER_MAX", "0.5"))
+RESIDENT_CONCURRENCY: int = max(1, int(os.environ.get("RESIDENT_CONCURRENCY", "1")))
+EXECUTION_SNAPSHOT_INTERVAL_SECONDS: float = float(os.environ.get("VIVARIUM_EXECUTION_SNAPSHOT_INTERVAL_SECONDS", "30"))
+# Auto-compact the execution log when an idle resident sees it above this size (0 = only via CLI).
+EXECUTION_LOG_COMPACT_BYTES: int = int(os.environ.get("VIVARIUM_EXECUTION_LOG_COMPACT_BYTES", "0"))
+EXECUTION_LOG_ARCHIVE_ENABLED: bool = (
+    os.environ.get("VIVARIUM_EXECUTION_LOG_ARCHIVE", "1").strip().lower()
+    not in {"0", "false", "no"}
+)
+RESIDENT_EVENT_WAKEUP: bool = (
+    os.environ.get("RESIDENT_EVENT_WAKEUP", "1").strip().lower()
+    not in {"0", "false", "no"}
+)
 MAX_REQUEUE_ATTEMPTS: int = int(os.environ.get("RESIDENT_MAX_REQUEUE_ATTEMPTS", "3"))
 RUNTIME_SPEED_FILE: Path = MUTABLE_SWARM_DIR / "runtime_speed.json"
 DEFAULT_RUNTIME_WAIT_SECONDS: float = float(os.environ.get("VIVARIUM_RUNTIME_WAIT_SECONDS", str(WORKER_CHECK_INTERVAL)))
@@ -211,8 +254,12 @@ MVP_PLANNING_TEXT_MARKERS: Tuple[str, ...] = (
     "i would create",
 )
 
-_EXECUTION_LOG_STATE: Dict[str, Any] = {"offset": 0, "size": 0, "tasks": {}}
+_EXECUTION_LOG_STATE: Dict[str, Any] = {"index": None}
 _EXECUTION_LOG_LOCK = threading.Lock()
+_RUNTIME_FILE_CACHE = MtimeJsonCache()
+_DEPENDENCY_INDEX = DependencyIndex()
+_TASK_LEASE_TABLES: Dict[Path, LeaseTable] = {}
+_TASK_LEASE_TABLES_LOCK = threading.Lock()
 _last_halt_log_at: List[float] = [0.0]  # Mutable for throttled halt logging
 _SCAN_CURSOR: int = 0
 
@@ -845,48 +892,46 @@ def ensure_directories() -> None:
 
 
 def read_queue() -> Dict[str, Any]:
-    """Read the shared queue file (never write to it from residents)."""
-    data = read_json(QUEUE_FILE, default=None)
-    return normalize_queue(data)
+    """
+    Read the queue header and open tasks for a scan (residents only mutate the
+    queue through backend transactions). The completed/failed history is not
+    loaded; the SQLite backend serves this from its section index.
+    """
+    return get_queue_backend(QUEUE_FILE).open_queue()
+
+
+def _budget_ledger() -> BudgetLedger:
+    """Shared budget ledger (a new swarm account is seeded from EXECUTION_LOG)."""
+    return get_budget_ledger(seed_log=EXECUTION_LOG)
 
 
 def _is_halted() -> bool:
     """
     Check if worker must stop: kill switch ON, or total spend >= budget limit.
     When budget exceeded, auto-engages kill switch so UI shows HALT until user re-enables.
+
+    Kill switch and UI settings are cached by mtime and spend is one row read
+    from the shared budget ledger the execution API charges, so an idle check
+    is O(1) and agrees with every other process.
     """
     # 1. Kill switch (manual or previous budget halt)
-    if KILL_SWITCH.exists():
-        try:
-            with open(KILL_SWITCH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if data.get("halt", False):
-                return True
-        except Exception:
-            pass
+    kill_switch = _RUNTIME_FILE_CACHE.read(KILL_SWITCH, default={})
+    if isinstance(kill_switch, dict) and kill_switch.get("halt", False):
+        return True
 
     # 2. Budget: total spend >= limit → stop fully until user says so
     budget_limit = 1.0
-    if UI_SETTINGS_FILE.exists():
+    ui = _RUNTIME_FILE_CACHE.read(UI_SETTINGS_FILE, default={})
+    if isinstance(ui, dict):
         try:
-            with open(UI_SETTINGS_FILE, "r", encoding="utf-8") as f:
-                ui = json.load(f)
             budget_limit = max(0.01, float(ui.get("budget_limit", 1.0) or 1.0))
-        except Exception:
+        except (TypeError, ValueError):
             pass
 
-    api_cost_all_time = 0.0
     try:
-        entries = read_jsonl(EXECUTION_LOG, default=[])
-        for entry in entries:
-            bu = entry.get("budget_used")
-            if bu is not None:
-                try:
-                    api_cost_all_time += float(bu)
-                except (TypeError, ValueError):
-                    pass
+        api_cost_all_time = _budget_ledger().spent(SWARM_ACCOUNT)
     except Exception:
-        pass
+        api_cost_all_time = 0.0
 
     if api_cost_all_time >= budget_limit:
         _log("WARN", f"Budget limit reached: ${api_cost_all_time:.4f} >= ${budget_limit:.2f}. Halting until you re-enable.")
@@ -909,32 +954,39 @@ def _is_halted() -> bool:
     return False
 
 
+def _execution_status_index() -> ExecutionStatusIndex:
+    """Status index for the current EXECUTION_LOG (caller holds _EXECUTION_LOG_LOCK)."""
+    index = _EXECUTION_LOG_STATE["index"]
+    if index is None or index.log_path != EXECUTION_LOG:
+        if index is not None:
+            index.flush()
+        index = ExecutionStatusIndex(EXECUTION_LOG, snapshot_interval=EXECUTION_SNAPSHOT_INTERVAL_SECONDS)
+        _EXECUTION_LOG_STATE["index"] = index
+        _DEPENDENCY_INDEX.reset_statuses(
+            {task_id: record.get("status") for task_id, record in index.tasks().items()}
+        )
+    return index
+
+
 def read_execution_log() -> Dict[str, Any]:
-    """Read the execution log (JSONL) and return latest status per task. Thread-safe."""
+    """
+    Return the latest compact status record per task from the execution log. Thread-safe.
+
+    Backed by ExecutionStatusIndex: a cold start loads the status snapshot and
+    tails only bytes appended after it; bulky event fields stay on disk.
+    """
     if EXECUTION_LOG.exists():
         try:
-            size = EXECUTION_LOG.stat().st_size
             with _EXECUTION_LOG_LOCK:
-                if size < _EXECUTION_LOG_STATE["size"]:
-                    _EXECUTION_LOG_STATE["offset"] = 0
-                    _EXECUTION_LOG_STATE["tasks"] = {}
-                with open(EXECUTION_LOG, "r", encoding="utf-8") as f:
-                    f.seek(_EXECUTION_LOG_STATE["offset"])
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            event = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-                        task_id = event.get("task_id")
-                        if task_id:
-                            _EXECUTION_LOG_STATE["tasks"][task_id] = event
-                    _EXECUTION_LOG_STATE["offset"] = f.tell()
-                _EXECUTION_LOG_STATE["size"] = size
-                if _EXECUTION_LOG_STATE["tasks"]:
-                    return {"tasks": dict(_EXECUTION_LOG_STATE["tasks"])}
+                index = _execution_status_index()
+                records, reset = index.poll()
+                if reset:
+                    _DEPENDENCY_INDEX.reset_statuses()
+                for record in records:
+                    _DEPENDENCY_INDEX.observe(record["task_id"], record.get("status"))
+                tasks = index.tasks()
+                if tasks:
+                    return {"tasks": tasks}
         except OSError:
             pass
 
@@ -943,19 +995,54 @@ def read_execution_log() -> Dict[str, Any]:
     for event in events:
         task_id = event.get("task_id")
         if task_id:
-            task_index[task_id] = event
-    if task_index:
-        return {"tasks": task_index}
+            task_index[task_id] = compact_status_record(event)
+    if not task_index:
+        # Legacy fallback: JSON execution log (optional)
+        legacy_path = WORKSPACE / "execution_log.json"
+        legacy_log = read_json(legacy_path, default={})
+        if legacy_log and isinstance(legacy_log, dict):
+            legacy_tasks = legacy_log.get("tasks", {})
+            if isinstance(legacy_tasks, dict):
+                task_index = legacy_tasks
+
+    _DEPENDENCY_INDEX.reset_statuses(
+        {
+            task_id: entry.get("status") if isinstance(entry, dict) else None
+            for task_id, entry in task_index.items()
+        }
+    )
+    return {"tasks": task_index}
 
-    # Legacy fallback: JSON execution log (optional)
-    legacy_path = WORKSPACE / "execution_log.json"
-    legacy_log = read_json(legacy_path, default={})
-    if legacy_log and isinstance(legacy_log, dict):
-        legacy_tasks = legacy_log.get("tasks", {})
-        if isinstance(legacy_tasks, dict):
-            return {"tasks": legacy_tasks}
 
-    return {"tasks": {}}
+def compact_execution_log_now(archive: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Compact EXECUTION_LOG to the latest event per task.
+
+    Superseded events go to dated segments under ``execution_log_archive/`` next
+    to the log unless archiving is disabled. Every reader resets on the
+    replaced file and replays only the compacted log.
+    """
+    archive = EXECUTION_LOG_ARCHIVE_ENABLED if archive is None else archive
+    archive_dir = EXECUTION_LOG.parent / "execution_log_archive" if archive else None
+    stats = compact_execution_log(EXECUTION_LOG, archive_dir=archive_dir)
+    if stats.get("archived"):
+        _log(
+            "INFO",
+            f"Compacted execution log: kept {stats['kept']} events, "
+            f"{'archived' if archive else 'dropped'} {stats['archived']} superseded events",
+        )
+    return stats
+
+
+def _maybe_compact_execution_log() -> None:
+    if EXECUTION_LOG_COMPACT_BYTES <= 0:
+        return
+    try:
+        if EXECUTION_LOG.stat().st_size < EXECUTION_LOG_COMPACT_BYTES:
+            return
+        compact_execution_log_now()
+    except OSError as exc:
+        _log("WARN", f"Execution log compaction failed: {exc}")
 
 
 def append_execution_event(task_id: str, status: str, **fields: Any) -> None:
@@ -970,7 +1057,22 @@ def append_execution_event(task_id: str, status: str, **fields: Any) -> None:
         "timestamp": get_timestamp(),
         **fields,
     }
-    append_jsonl(EXECUTION_LOG, record)
+    append_execution_record(EXECUTION_LOG, record)
+
+
+def _append_stream_progress(task_id: str, **fields: Any) -> None:
+    """Append a live-output record for a streaming task (best effort: never fails the task)."""
+    record = {
+        "task_id": task_id,
+        "resident_id": RESIDENT_ID,
+        "worker_id": WORKER_ID,
+        "timestamp": get_timestamp(),
+        **fields,
+    }
+    try:
+        get_appender(STREAM_PROGRESS_LOG, max_bytes=STREAM_PROGRESS_LOG_MAX_BYTES, backup_count=1).append(record)
+    except OSError as exc:
+        _log("WARN", f"Could not record stream progress for {task_id}: {exc}")
 
 
 def _human_friendly_result_preview(raw: str, max_len: int = MAX_TEXT_DETAIL_CHARS) -> str:
@@ -1033,67 +1135,39 @@ def _notify_human_task_pending_approval(
         _log("WARN", f"Could not notify human of pending task {task_id}: {exc}")
 
 
-def get_lock_path(task_id: str) -> Path:
-    """Get the lock file path for a task."""
-    return LOCKS_DIR / f"{task_id}.lock"
+def _task_lease_table() -> LeaseTable:
+    """Lease table under the current LOCKS_DIR (one instance per directory)."""
+    table_path = LOCKS_DIR / LEASE_TABLE_FILENAME
+    with _TASK_LEASE_TABLES_LOCK:
+        table = _TASK_LEASE_TABLES.get(table_path)
+        if table is None:
+            table = LeaseTable(table_path, ttl_seconds=TASK_LEASE_TTL_SECONDS)
+            _TASK_LEASE_TABLES[table_path] = table
+        return table
 
 
-def is_lock_stale(lock_path: Path) -> bool:
-    """Check if a lock file is stale (older than LOCK_TIMEOUT_SECONDS)."""
-    if not lock_path.exists():
-        return False
-
+def leased_task_ids() -> Set[str]:
+    """Tasks currently leased by any live resident (one read per scan)."""
     try:
-        lock_data = read_json(lock_path)
-
-        started_at = datetime.fromisoformat(lock_data["started_at"].replace("Z", "+00:00"))
-        age_seconds = (datetime.now(timezone.utc) - started_at).total_seconds()
-        return age_seconds > LOCK_TIMEOUT_SECONDS
-    except (json.JSONDecodeError, KeyError, ValueError, IOError) as e:
-        _log("DEBUG", f"Lock file corrupted ({lock_path}): {e}")
-        return True
+        return _task_lease_table().leased_task_ids()
+    except OSError as e:
+        _log("WARN", f"Could not read task leases: {e}")
+        return set()
 
 
 def try_acquire_lock(task_id: str) -> bool:
-    """Attempt to acquire lock for a task using atomic file creation."""
-    lock_path = get_lock_path(task_id)
-
-    if lock_path.exists():
-        if is_lock_stale(lock_path):
-            try:
-                lock_path.unlink()
-                _log("INFO", f"Removed stale lock for {task_id}")
-            except OSError as e:
-                _log("ERROR", f"Failed to remove stale lock ({task_id}): {e}")
-                return False
-        else:
-            return False
-
-    lock_data = {
-        "resident_id": RESIDENT_ID,
-        "worker_id": WORKER_ID,
-        "started_at": get_timestamp(),
-        "task_id": task_id,
-    }
-
+    """Attempt to lease a task; the lease is renewed by a heartbeat until released."""
     try:
-        fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-        with os.fdopen(fd, "w") as f:
-            json.dump(lock_data, f, indent=2)  # Atomic operation, can't use write_json
-        return True
-    except FileExistsError:
-        return False
-    except (OSError, IOError) as e:
+        return _task_lease_table().acquire(task_id, RESIDENT_ID)
+    except OSError as e:
         _log("ERROR", f"Failed to acquire lock ({task_id}): {e}")
         return False
 
 
 def release_lock(task_id: str) -> None:
-    """Release the lock for a task."""
-    lock_path = get_lock_path(task_id)
+    """Release the lease for a task."""
     try:
-        if lock_path.exists():
-            lock_path.unlink()
+        _task_lease_table().release(task_id, RESIDENT_ID)
     except OSError as e:
         _log("ERROR", f"Failed to release lock ({task_id}): {e}")
 
@@ -1138,34 +1212,21 @@ def _apply_queue_outcome(task_id: str, final_status: str) -> None:
     - requeue/pending_review/etc -> keep task in open queue
     """
     try:
-        queue = read_queue()
-        tasks = list(queue.get("tasks", []))
-        task_index = None
-        for idx, task in enumerate(tasks):
-            if task.get("id") == task_id:
-                task_index = idx
-                break
-        if task_index is None:
-            return
-
-        task = dict(tasks.pop(task_index))
-        terminal_success = {"completed", "approved", "ready_for_merge"}
-        terminal_failure = {"failed"}
+        get_queue_backend(QUEUE_FILE).apply_outcome(task_id, final_status)
+    except Exception as exc:
+        _log("WARN", f"Failed to sync queue outcome for {task_id}: {exc}")
 
-        if final_status in terminal_success:
-            task["status"] = "completed"
-            queue.setdefault("completed", []).append(task)
-        elif final_status in terminal_failure:
-            task["status"] = "failed"
-            queue.setdefault("failed", []).append(task)
-        else:
-            task["status"] = "pending" if final_status == "requeue" else final_status
-            tasks.insert(task_index, task)
 
-        queue["tasks"] = tasks
-        write_json(QUEUE_FILE, normalize_queue(queue))
+def _mark_task_claimed(task_id: str) -> bool:
+    """
+    Record the claim on the task's queue row. False if the task left the open
+    queue since the scan (e.g. another resident just finished it).
+    """
+    try:
+        return get_queue_backend(QUEUE_FILE).claim(task_id, RESIDENT_ID, takeover=True)
     except Exception as exc:
-        _log("WARN", f"Failed to sync queue outcome for {task_id}: {exc}")
+        _log("WARN", f"Failed to record queue claim for {task_id}: {exc}")
+        return True
 
 
 def _task_shard(task_id: str, shard_count: int) -> int:
@@ -1207,7 +1268,7 @@ def _compute_idle_sleep(idle_count: int) -> float:
 
 
 def _load_runtime_wait_seconds() -> Optional[float]:
-    data = read_json(RUNTIME_SPEED_FILE, default={})
+    data = _RUNTIME_FILE_CACHE.read(RUNTIME_SPEED_FILE, default={})
     if not isinstance(data, dict):
         return None
     raw = data.get("wait_seconds")
@@ -1227,6 +1288,25 @@ def _resolve_idle_wait_seconds(idle_count: int) -> float:
     return max(0.0, DEFAULT_RUNTIME_WAIT_SECONDS if DEFAULT_RUNTIME_WAIT_SECONDS >= 0 else _compute_idle_sleep(idle_count))
 
 
+def _start_work_signal() -> Optional[WorkSignal]:
+    """Watch the queue and control files so idle residents wake on change instead of polling."""
+    if not RESIDENT_EVENT_WAKEUP:
+        return None
+    signal = WorkSignal([QUEUE_FILE, KILL_SWITCH, RUNTIME_SPEED_FILE, UI_SETTINGS_FILE])
+    if not signal.start():
+        _log("WARN", "File watcher unavailable; falling back to sleep polling.")
+        return None
+    return signal
+
+
+def _idle_wait(signal: Optional[WorkSignal], wait_seconds: float) -> bool:
+    """Sleep up to wait_seconds, returning early (True) if the work signal fires."""
+    if signal is None:
+        time.sleep(wait_seconds)
+        return False
+    return signal.wait(wait_seconds)
+
+
 def _build_facet_plan_text(plan: Any) -> str:
     lines = [
         "RESIDENT FACET PLAN",
@@ -1300,6 +1380,20 @@ def _is_loopback_api_endpoint(endpoint: str) -> bool:
     return _is_loopback_host(parsed.hostname)
 
 
+def _attach_safety_verdict(payload: Dict[str, Any], checked_text: str) -> None:
+    """
+    Sign the passed worker safety check into ``payload`` so /cycle can skip its
+    own check. Only attached when the API would check the same text; a prompt
+    extended after the check (tool context, intent) is re-checked by the API.
+    """
+    api_target = payload.get("task") or payload.get("prompt") or ""
+    if normalize_task_text(api_target) != normalize_task_text(checked_text):
+        return
+    verdict = sign_verdict(WORKER_INTERNAL_EXECUTION_TOKEN, checked_text)
+    if verdict:
+        payload["safety_verdict"] = verdict
+
+
 def _internal_api_headers() -> Dict[str, str]:
     return {
         "X-Vivarium-Internal-Token": WORKER_INTERNAL_EXECUTION_TOKEN,
@@ -1619,7 +1713,21 @@ def _maybe_compile_phase4_plan(task: Dict[str, Any], queue: Dict[str, Any]) -> O
         "subtasks": subtask_ids,
     }
 
-    write_json(QUEUE_FILE, normalize_queue(queue))
+    # Re-apply against the latest stored queue so concurrent writers are not clobbered.
+    task_id = task.get("id")
+    with get_queue_backend(QUEUE_FILE).transaction() as stored_queue:
+        stored_tasks = stored_queue.setdefault("tasks", [])
+        stored_ids = {str(existing.get("id")) for existing in stored_tasks if isinstance(existing, dict)}
+        stored_tasks.extend(subtask for subtask in new_subtasks if subtask["id"] not in stored_ids)
+        for stored_task in stored_tasks:
+            if stored_task.get("id") == task_id:
+                stored_task.update(
+                    depends_on=task["depends_on"],
+                    phase4_planned=True,
+                    phase4_intent=intent_payload,
+                    phase4_plan=task["phase4_plan"],
+                )
+                break
 
     return {
         "complexity_score": gut_check.get("complexity_score", 0),
@@ -2542,7 +2650,7 @@ def _execute_delegated_subtasks(
     max_parallel = parallelism if isinstance(parallelism, int) and parallelism > 0 else DEFAULT_SUBTASK_PARALLELISM
     max_parallel = max(1, min(max_parallel, len(subtasks_list)))
 
-    def run_subtask(index: int, sub: Any) -> Dict[str, Any]:
+    def prepare_subtask(index: int, sub: Any) -> Dict[str, Any]:
         subtask_id = getattr(sub, "subtask_id", None) or f"subtask_{index:02d}"
         focus = getattr(sub, "suggested_focus", None)
         sub_prompt = getattr(sub, "description", "") or ""
@@ -2600,89 +2708,134 @@ def _execute_delegated_subtasks(
         if resident_ctx:
             payload["resident_id"] = resident_ctx.resident_id
             payload["identity_id"] = resident_ctx.identity.identity_id
+        _attach_safety_verdict(payload, sub_prompt)
+        return {
+            "status": "ready",
+            "subtask_id": subtask_id,
+            "index": index,
+            "focus": focus,
+            "identity_fields": identity_fields,
+            "payload": payload,
+        }
 
-        try:
-            with httpx.Client(timeout=API_REQUEST_TIMEOUT) as client:
-                response = client.post(
-                    f"{api_endpoint}{CYCLE_EXECUTION_ENDPOINT}",
-                    json=payload,
-                    headers=_internal_api_headers(),
-                )
-        except httpx.ConnectError as exc:
-            error_msg = f"Connection error: {exc}"
-            append_execution_event(
-                task_id,
-                "subtask_failed",
-                subtask_id=subtask_id,
-                focus=focus,
-                errors=error_msg,
-                **identity_fields,
-            )
-            return {
-                "status": "failed",
-                "error": error_msg,
-                "subtask_id": subtask_id,
-                "index": index,
-            }
-
-        if response.status_code != 200:
-            error_msg = f"API returned {response.status_code}: {response.text}"
-            append_execution_event(
-                task_id,
-                "subtask_failed",
-                subtask_id=subtask_id,
-                focus=focus,
-                errors=error_msg,
-                **identity_fields,
-            )
-            return {
-                "status": "failed",
-                "error": error_msg,
-                "subtask_id": subtask_id,
-                "index": index,
-            }
+    def subtask_failed(prepared: Dict[str, Any], error_msg: str) -> Dict[str, Any]:
+        append_execution_event(
+            task_id,
+            "subtask_failed",
+            subtask_id=prepared["subtask_id"],
+            focus=prepared["focus"],
+            errors=error_msg,
+            **prepared["identity_fields"],
+        )
+        return {
+            "status": "failed",
+            "error": error_msg,
+            "subtask_id": prepared["subtask_id"],
+            "index": prepared["index"],
+        }
 
-        result = response.json()
+    def subtask_completed(prepared: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        subtask_id = prepared["subtask_id"]
         budget_used = result.get("budget_used")
         append_execution_event(
             task_id,
             "subtask_completed",
             subtask_id=subtask_id,
-            focus=focus,
+            focus=prepared["focus"],
             result_summary=result.get("result"),
             model=result.get("model"),
             budget_used=budget_used,
-            **identity_fields,
+            **prepared["identity_fields"],
         )
         return {
             "status": "completed",
             "result": result.get("result", f"{subtask_id} completed"),
             "subtask_id": subtask_id,
-            "index": index,
+            "index": prepared["index"],
             "budget_used": budget_used,
         }
 
+    def run_subtask(prepared: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            response = get_api_client(API_REQUEST_TIMEOUT).post(
+                f"{api_endpoint}{CYCLE_EXECUTION_ENDPOINT}",
+                json=prepared["payload"],
+                headers=_internal_api_headers(),
+            )
+        except httpx.ConnectError as exc:
+            return subtask_failed(prepared, f"Connection error: {exc}")
+
+        if response.status_code != 200:
+            return subtask_failed(prepared, f"API returned {response.status_code}: {response.text}")
+        return subtask_completed(prepared, response.json())
+
+    def run_batch(ready: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        One /cycle/batch call for up to CYCLE_BATCH_MAX_ITEMS subtasks; None if the
+        API has no batch endpoint or rejects the batch as a whole (run them per item).
+        """
+        try:
+            response = get_api_client(API_REQUEST_TIMEOUT).post(
+                f"{api_endpoint}{CYCLE_BATCH_ENDPOINT}",
+                json={"items": [item["payload"] for item in ready], "max_concurrency": max_parallel},
+                headers=_internal_api_headers(),
+            )
+        except httpx.ConnectError as exc:
+            return [subtask_failed(item, f"Connection error: {exc}") for item in ready]
+
+        if response.status_code in (404, 405, 413, 422):
+            return None
+        if response.status_code != 200:
+            error_msg = f"API returned {response.status_code}: {response.text}"
+            return [subtask_failed(item, error_msg) for item in ready]
+
+        results = response.json().get("results") or []
+        outcomes = []
+        for position, item in enumerate(ready):
+            entry = results[position] if position < len(results) and isinstance(results[position], dict) else {}
+            if entry.get("status_code") == 200 and isinstance(entry.get("response"), dict):
+                outcomes.append(subtask_completed(item, entry["response"]))
+            else:
+                error_msg = f"API returned {entry.get('status_code', 'no result')}: {entry.get('error')}"
+                outcomes.append(subtask_failed(item, error_msg))
+        return outcomes
+
+    prepared_subtasks = [prepare_subtask(idx, sub) for idx, sub in enumerate(subtasks_list, start=1)]
+    outcomes = [item for item in prepared_subtasks if item["status"] != "ready"]
+    ready = [item for item in prepared_subtasks if item["status"] == "ready"]
+
+    batch_size = max(1, CYCLE_BATCH_MAX_ITEMS)
+    use_batch = len(ready) > 1
+    unbatched: List[Dict[str, Any]] = []
+    for start in range(0, len(ready), batch_size):
+        chunk = ready[start:start + batch_size]
+        batch_outcomes = run_batch(chunk) if use_batch and len(chunk) > 1 else None
+        if batch_outcomes is not None:
+            outcomes.extend(batch_outcomes)
+            continue
+        if len(chunk) > 1:
+            # No batch endpoint (older API) or batch refused: run the rest per item.
+            use_batch = False
+        unbatched.extend(chunk)
+    if unbatched:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(unbatched)))) as executor:
+            outcomes.extend(executor.map(run_subtask, unbatched))
+
     results_by_index: Dict[int, str] = {}
     failures: List[str] = []
     total_budget_used: float = 0.0
 
-    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
-        futures = {
-            executor.submit(run_subtask, idx, sub): idx
-            for idx, sub in enumerate(subtasks_list, start=1)
-        }
-        for future in as_completed(futures):
-            outcome = future.result()
-            if outcome.get("status") != "completed":
-                failures.append(outcome.get("error", "subtask failed"))
-            else:
-                results_by_index[outcome.get("index", 0)] = outcome.get("result", "subtask completed")
-                bu = outcome.get("budget_used")
-                if bu is not None:
-                    try:
-                        total_budget_used += float(bu)
-                    except (TypeError, ValueError):
-                        pass
+    for outcome in sorted(outcomes, key=lambda item: item.get("index", 0)):
+        if outcome.get("status") != "completed":
+            failures.append(outcome.get("error", "subtask failed"))
+        else:
+            results_by_index[outcome.get("index", 0)] = outcome.get("result", "subtask completed")
+            bu = outcome.get("budget_used")
+            if bu is not None:
+                try:
+                    total_budget_used += float(bu)
+                except (TypeError, ValueError):
+                    pass
 
     if failures:
         return {
@@ -2764,6 +2917,7 @@ def execute_task(
 
     tool_route_info: Dict[str, Any] = {}
 
+    safety_text = _resolve_safety_task_text(prompt, command, mode)
     safety_passed, safety_report = _run_worker_safety_check(task_id, prompt, command, mode)
     if not safety_passed:
         blocked_reason = safety_report.get("blocked_reason", "blocked by worker safety gateway")
@@ -2924,17 +3078,23 @@ def execute_task(
         payload["task"] = command
     if mode:
         payload["mode"] = mode
+    _attach_safety_verdict(payload, safety_text)
 
     try:
-        with httpx.Client(timeout=API_REQUEST_TIMEOUT) as client:
-            response = client.post(
+        status_code: Optional[int] = None
+        if RESIDENT_STREAM_CYCLE and mode != "local" and not command:
+            status_code, result, error_text = _stream_cycle_request(api_endpoint, payload, task_id)
+        if status_code is None:
+            response = get_api_client(API_REQUEST_TIMEOUT).post(
                 f"{api_endpoint}{CYCLE_EXECUTION_ENDPOINT}",
                 json=payload,
                 headers=_internal_api_headers(),
             )
+            status_code = response.status_code
+            result = response.json() if status_code == 200 else None
+            error_text = "" if status_code == 200 else response.text
 
-        if response.status_code == 200:
-            result = response.json()
+        if status_code == 200:
             api_safety_report = result.get("safety_report")
             result_summary = result.get("result", "Task completed")
             markdown_artifacts = _persist_mvp_markdown_artifacts(task, result_summary, resident_ctx)
@@ -2953,7 +3113,7 @@ def execute_task(
                 **tool_route_info,
             }
 
-        error_msg = f"API returned {response.status_code}: {response.text}"
+        error_msg = f"API returned {status_code}: {error_text}"
         _log("WARN", error_msg)
         return {
             "status": "failed",
@@ -2998,6 +3158,96 @@ def execute_task(
         }
 
 
+def _iter_sse_events(lines: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """Parse ``event:``/``data:`` Server-Sent Event lines into (event, json data)."""
+    event = "message"
+    data_lines: List[str] = []
+    for line in lines:
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].lstrip())
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
+
+
+def _stream_cycle_request(
+    api_endpoint: str,
+    payload: Dict[str, Any],
+    task_id: str,
+) -> Tuple[Optional[int], Optional[Dict[str, Any]], str]:
+    """
+    Run an LLM cycle through /cycle/stream, appending the new output as delta
+    records to STREAM_PROGRESS_LOG at most every STREAM_PROGRESS_INTERVAL_SECONDS
+    so the control panel can show it live.
+
+    Returns (status_code, result, error_text) like a plain /cycle POST; a
+    stream cut off at the task budget maps to 403. status_code is None when
+    the API has no streaming endpoint and the caller should fall back.
+    """
+    parts: List[str] = []
+    output_tokens = 0
+    last_emit: Optional[float] = None
+    emitted_chars = 0
+
+    def _emit_progress(final: bool = False) -> None:
+        nonlocal last_emit, emitted_chars
+        now = time.monotonic()
+        if not final and last_emit is not None and now - last_emit < STREAM_PROGRESS_INTERVAL_SECONDS:
+            return
+        text = "".join(parts)
+        if len(text) == emitted_chars:
+            return
+        # Only the text added since the last record (its tail if one tick produced a lot).
+        offset = max(emitted_chars, len(text) - STREAM_PROGRESS_TAIL_CHARS)
+        last_emit, emitted_chars = now, len(text)
+        _append_stream_progress(
+            task_id,
+            delta=text[offset:],
+            offset=offset,
+            chars=len(text),
+            output_tokens=output_tokens,
+            model=payload.get("model"),
+        )
+
+    result: Optional[Dict[str, Any]] = None
+    with get_api_client(API_REQUEST_TIMEOUT).stream(
+        "POST",
+        f"{api_endpoint}{CYCLE_STREAM_ENDPOINT}",
+        json=payload,
+        headers=_internal_api_headers(),
+    ) as response:
+        if response.status_code in (404, 405):
+            return None, None, ""
+        if response.status_code != 200:
+            response.read()
+            return response.status_code, None, response.text
+        for event, data in _iter_sse_events(response.iter_lines()):
+            if event == "delta":
+                parts.append(str(data.get("text") or ""))
+                output_tokens = int(data.get("output_tokens") or output_tokens + 1)
+                _emit_progress()
+            elif event == "result":
+                result = data
+            elif event == "error":
+                _emit_progress(final=True)
+                return int(data.get("status_code") or 500), None, str(data.get("detail") or "stream error")
+    _emit_progress(final=True)
+
+    if result is None:
+        return 502, None, "stream ended without a result"
+    if result.get("status") == "budget_exceeded":
+        return 403, None, (
+            f"Stream cut off: cost ${float(result.get('budget_used') or 0.0):.6f} "
+            f"reached task max budget ${float(payload.get('max_budget') or 0.0):.6f}"
+        )
+    return 200, result, ""
+
+
 def _should_accept_task(
     task: Dict[str, Any],
     resident_ctx: Optional["ResidentContext"],
@@ -3016,30 +3266,27 @@ def _should_accept_task(
     return True, reason
 
 
-def find_and_execute_task(
+def _claim_next_task(
     queue: Dict[str, Any],
     resident_ctx: Optional["ResidentContext"],
     min_score: float,
     shard_id: Optional[int],
-) -> bool:
-    """Find an available task, lock it, execute it, and report results."""
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Pick the first ready task this resident accepts and lease it. Returns (task, execution_log)."""
     execution_log = read_execution_log()
-    api_endpoint = queue.get("api_endpoint", "http://127.0.0.1:8420")
 
-    tasks = _select_tasks_for_scan(queue.get("tasks", []))
+    # Only tasks that are not done and whose dependencies are satisfied are
+    # scanned; the index is updated incrementally from queue and log changes.
+    _DEPENDENCY_INDEX.sync_queue(queue.get("tasks", []))
+    tasks = _select_tasks_for_scan(_DEPENDENCY_INDEX.ready_tasks())
+    leased = leased_task_ids() if tasks else set()
     for task in tasks:
         task_id = task.get("id")
-        if not task_id:
+        if not task_id or task_id in leased:
             continue
         if shard_id is not None and _task_shard(task_id, RESIDENT_SHARD_COUNT) != shard_id:
             continue
 
-        if is_task_done(task_id, execution_log):
-            continue
-
-        if not check_dependencies_complete(task, execution_log, queue):
-            continue
-
         accept, reason = _should_accept_task(task, resident_ctx, min_score)
         if not accept:
             _log("INFO", f"Skipping {task_id} (voluntary): {reason}")
@@ -3047,146 +3294,329 @@ def find_and_execute_task(
 
         if not try_acquire_lock(task_id):
             continue
+        # The lease makes this resident the only claimant; the queue row may
+        # still show a dead resident's claim, hence takeover.
+        if not _mark_task_claimed(task_id):
+            release_lock(task_id)
+            continue
 
         _log("INFO", f"Acquired lock for {task_id}")
+        return task, execution_log
+    return None
+
+
+def _run_claimed_task(
+    task: Dict[str, Any],
+    queue: Dict[str, Any],
+    resident_ctx: Optional["ResidentContext"],
+    execution_log: Dict[str, Any],
+) -> None:
+    """Execute a leased task, report results and release the lease."""
+    task_id = task.get("id")
+    api_endpoint = queue.get("api_endpoint", "http://127.0.0.1:8420")
+    try:
+        last_event = execution_log.get("tasks", {}).get(task_id, {})
         try:
-            last_event = execution_log.get("tasks", {}).get(task_id, {})
-            try:
-                previous_review_attempt = int(last_event.get("review_attempt", 0))
-            except (TypeError, ValueError):
-                previous_review_attempt = 0
-            if last_event.get("status") not in {"requeue", "pending_review"}:
-                previous_review_attempt = 0
-
-            identity_fields = {}
-            if resident_ctx:
-                identity_fields["identity_id"] = resident_ctx.identity.identity_id
-                identity_fields["identity_name"] = (
-                    str(getattr(resident_ctx.identity, "name", "") or "").strip()
-                    or resident_ctx.identity.identity_id
-                )
+            previous_review_attempt = int(last_event.get("review_attempt", 0))
+        except (TypeError, ValueError):
+            previous_review_attempt = 0
+        if last_event.get("status") not in {"requeue", "pending_review"}:
+            previous_review_attempt = 0
 
-            phase4_plan = _maybe_compile_phase4_plan(task, queue)
-            if phase4_plan:
-                append_execution_event(
-                    task_id,
-                    "queued",
-                    phase4_plan_generated=True,
-                    phase4_complexity_score=phase4_plan.get("complexity_score"),
-                    phase4_features=phase4_plan.get("features"),
-                    phase4_subtasks=phase4_plan.get("subtask_ids"),
-                    phase4_subtasks_added=phase4_plan.get("subtasks_added"),
-                    **identity_fields,
-                )
-                _log(
-                    "INFO",
-                    (
-                        f"Phase 4 decomposition generated for {task_id}: "
-                        f"{len(phase4_plan.get('subtask_ids', []))} subtasks"
-                    ),
-                )
-                return True
+        identity_fields = {}
+        if resident_ctx:
+            identity_fields["identity_id"] = resident_ctx.identity.identity_id
+            identity_fields["identity_name"] = (
+                str(getattr(resident_ctx.identity, "name", "") or "").strip()
+                or resident_ctx.identity.identity_id
+            )
 
+        phase4_plan = _maybe_compile_phase4_plan(task, queue)
+        if phase4_plan:
             append_execution_event(
                 task_id,
-                "in_progress",
-                started_at=get_timestamp(),
+                "queued",
+                phase4_plan_generated=True,
+                phase4_complexity_score=phase4_plan.get("complexity_score"),
+                phase4_features=phase4_plan.get("features"),
+                phase4_subtasks=phase4_plan.get("subtask_ids"),
+                phase4_subtasks_added=phase4_plan.get("subtasks_added"),
                 **identity_fields,
             )
+            _log(
+                "INFO",
+                (
+                    f"Phase 4 decomposition generated for {task_id}: "
+                    f"{len(phase4_plan.get('subtask_ids', []))} subtasks"
+                ),
+            )
+            return
 
-            result = execute_task(task, api_endpoint, resident_ctx=resident_ctx)
+        append_execution_event(
+            task_id,
+            "in_progress",
+            started_at=get_timestamp(),
+            **identity_fields,
+        )
+
+        result = execute_task(task, api_endpoint, resident_ctx=resident_ctx)
+        append_execution_event(
+            task_id,
+            result["status"],
+            completed_at=get_timestamp(),
+            result_summary=result.get("result_summary"),
+            errors=result.get("errors"),
+            model=result.get("model"),
+            budget_used=result.get("budget_used"),
+            safety_passed=result.get("safety_passed"),
+            safety_report=result.get("safety_report"),
+            tool_route=result.get("tool_route"),
+            tool_name=result.get("tool_name"),
+            tool_confidence=result.get("tool_confidence"),
+            **identity_fields,
+        )
+
+        final_status = result["status"]
+        final_result_summary = result.get("result_summary")
+        if final_status == "completed":
+            review_result = _run_post_execution_review(
+                task=task,
+                result=result,
+                resident_ctx=resident_ctx,
+                previous_review_attempt=previous_review_attempt,
+            )
+            final_status = review_result["status"]
+            final_result_summary = review_result.get("result_summary")
             append_execution_event(
                 task_id,
-                result["status"],
+                final_status,
                 completed_at=get_timestamp(),
-                result_summary=result.get("result_summary"),
-                errors=result.get("errors"),
+                result_summary=review_result.get("result_summary"),
+                errors=review_result.get("errors"),
                 model=result.get("model"),
                 budget_used=result.get("budget_used"),
                 safety_passed=result.get("safety_passed"),
                 safety_report=result.get("safety_report"),
+                review_verdict=review_result.get("review_verdict"),
+                review_confidence=review_result.get("review_confidence"),
+                review_issues=review_result.get("review_issues"),
+                review_suggestions=review_result.get("review_suggestions"),
+                review_attempt=review_result.get("review_attempt"),
+                quality_gate_status=review_result.get("quality_gate_status"),
+                quality_gate_decision=review_result.get("quality_gate_decision"),
+                quality_gate_change_id=review_result.get("quality_gate_change_id"),
+                quality_gate_error=review_result.get("quality_gate_error"),
+                phase5_reward_applied=review_result.get("phase5_reward_applied"),
+                phase5_reward_tokens_requested=review_result.get("phase5_reward_tokens_requested"),
+                phase5_reward_tokens_awarded=review_result.get("phase5_reward_tokens_awarded"),
+                phase5_reward_identity=review_result.get("phase5_reward_identity"),
+                phase5_reward_reason=review_result.get("phase5_reward_reason"),
+                phase5_reward_granted_at=review_result.get("phase5_reward_granted_at"),
+                phase5_reward_ledger_recorded=review_result.get("phase5_reward_ledger_recorded"),
+                phase5_reward_error=review_result.get("phase5_reward_error"),
                 tool_route=result.get("tool_route"),
                 tool_name=result.get("tool_name"),
                 tool_confidence=result.get("tool_confidence"),
                 **identity_fields,
             )
 
-            final_status = result["status"]
-            final_result_summary = result.get("result_summary")
-            if final_status == "completed":
-                review_result = _run_post_execution_review(
-                    task=task,
-                    result=result,
-                    resident_ctx=resident_ctx,
-                    previous_review_attempt=previous_review_attempt,
-                )
-                final_status = review_result["status"]
-                final_result_summary = review_result.get("result_summary")
-                append_execution_event(
-                    task_id,
-                    final_status,
-                    completed_at=get_timestamp(),
-                    result_summary=review_result.get("result_summary"),
-                    errors=review_result.get("errors"),
-                    model=result.get("model"),
-                    budget_used=result.get("budget_used"),
-                    safety_passed=result.get("safety_passed"),
-                    safety_report=result.get("safety_report"),
-                    review_verdict=review_result.get("review_verdict"),
-                    review_confidence=review_result.get("review_confidence"),
-                    review_issues=review_result.get("review_issues"),
-                    review_suggestions=review_result.get("review_suggestions"),
-                    review_attempt=review_result.get("review_attempt"),
-                    quality_gate_status=review_result.get("quality_gate_status"),
-                    quality_gate_decision=review_result.get("quality_gate_decision"),
-                    quality_gate_change_id=review_result.get("quality_gate_change_id"),
-                    quality_gate_error=review_result.get("quality_gate_error"),
-                    phase5_reward_applied=review_result.get("phase5_reward_applied"),
-                    phase5_reward_tokens_requested=review_result.get("phase5_reward_tokens_requested"),
-                    phase5_reward_tokens_awarded=review_result.get("phase5_reward_tokens_awarded"),
-                    phase5_reward_identity=review_result.get("phase5_reward_identity"),
-                    phase5_reward_reason=review_result.get("phase5_reward_reason"),
-                    phase5_reward_granted_at=review_result.get("phase5_reward_granted_at"),
-                    phase5_reward_ledger_recorded=review_result.get("phase5_reward_ledger_recorded"),
-                    phase5_reward_error=review_result.get("phase5_reward_error"),
-                    tool_route=result.get("tool_route"),
-                    tool_name=result.get("tool_name"),
-                    tool_confidence=result.get("tool_confidence"),
-                    **identity_fields,
+        if final_status in {"completed", "approved", "ready_for_merge", "pending_review"}:
+            publish_text = str(final_result_summary or "").strip()
+            if publish_text:
+                _publish_task_update_to_discussion(task, resident_ctx, task_id, publish_text)
+                if not isinstance(result.get("mvp_markdown_artifacts"), dict):
+                    result["mvp_markdown_artifacts"] = _persist_mvp_markdown_artifacts(
+                        task, publish_text, resident_ctx
+                    )
+                if WORKER_MUTABLE_VCS is not None:
+                    try:
+                        checkpoint = WORKER_MUTABLE_VCS.checkpoint(
+                            task_id=task_id,
+                            summary=publish_text,
+                            metadata={"mode": task.get("mode") or "llm", "model": result.get("model")},
+                        )
+                        result["mutable_checkpoint"] = checkpoint.commit_sha
+                    except Exception as exc:
+                        _log("WARN", f"Auto-checkpoint failed for {task_id}: {exc}")
+
+        _apply_queue_outcome(task_id, final_status)
+        _log("INFO", f"Completed task {task_id} - {final_status}")
+    finally:
+        release_lock(task_id)
+        _log("INFO", f"Released lock for {task_id}")
+
+
+def find_and_execute_task(
+    queue: Dict[str, Any],
+    resident_ctx: Optional["ResidentContext"],
+    min_score: float,
+    shard_id: Optional[int],
+) -> bool:
+    """Find an available task, lock it, execute it, and report results."""
+    claimed = _claim_next_task(queue, resident_ctx, min_score, shard_id)
+    if claimed is None:
+        return False
+    task, execution_log = claimed
+    _run_claimed_task(task, queue, resident_ctx, execution_log)
+    return True
+
+
+def _serial_worker_loop(
+    max_iterations: Optional[int],
+    resident_ctx: Optional["ResidentContext"],
+    shard_id: Optional[int],
+    work_signal: Optional[WorkSignal],
+) -> int:
+    """Run one task at a time until idle/max iterations. Returns tasks executed."""
+    iterations = 0
+    idle_count = 0
+
+    while True:
+        if max_iterations and iterations >= max_iterations:
+            _log("INFO", f"Reached max iterations ({max_iterations})")
+            break
+
+        try:
+            if work_signal is not None:
+                work_signal.clear()
+            if _is_halted():
+                now_ts = time.time()
+                if now_ts - _last_halt_log_at[0] >= 60.0:
+                    _log("INFO", "Halted (kill switch or budget limit). Re-enable via HALT button when ready.")
+                    _last_halt_log_at[0] = now_ts
+                _idle_wait(work_signal, 5.0)
+                continue
+
+            queue = read_queue()
+
+            if find_and_execute_task(queue, resident_ctx, DEFAULT_MIN_SCORE, shard_id):
+                iterations += 1
+                idle_count = 0
+            else:
+                idle_count += 1
+                _maybe_compact_execution_log()
+                max_idle = MAX_IDLE_CYCLES if os.environ.get("VIVARIUM_WORKER_DAEMON") not in ("1", "true", "yes") else None
+                if max_idle is not None and idle_count >= max_idle:
+                    _log("INFO", f"No tasks available after {MAX_IDLE_CYCLES} checks. Exiting.")
+                    break
+                wait_seconds = _resolve_idle_wait_seconds(idle_count)
+                _log(
+                    "INFO",
+                    f"No tasks available, waiting up to {wait_seconds:.2f}s... "
+                    f"({idle_count}/{MAX_IDLE_CYCLES if max_idle else '∞'})",
                 )
+                # A wakeup that then finds no work still counts as an idle
+                # check, so a resident in a busy swarm reaches MAX_IDLE_CYCLES.
+                _idle_wait(work_signal, wait_seconds)
+        except KeyboardInterrupt:
+            _log("INFO", "Interrupted by user")
+            break
+        except Exception as e:
+            _log("ERROR", f"Unexpected error in resident loop: {type(e).__name__}: {e}")
+            raise
+    return iterations
 
-            if final_status in {"completed", "approved", "ready_for_merge", "pending_review"}:
-                publish_text = str(final_result_summary or "").strip()
-                if publish_text:
-                    _publish_task_update_to_discussion(task, resident_ctx, task_id, publish_text)
-                    if not isinstance(result.get("mvp_markdown_artifacts"), dict):
-                        result["mvp_markdown_artifacts"] = _persist_mvp_markdown_artifacts(
-                            task, publish_text, resident_ctx
-                        )
-                    if WORKER_MUTABLE_VCS is not None:
-                        try:
-                            checkpoint = WORKER_MUTABLE_VCS.checkpoint(
-                                task_id=task_id,
-                                summary=publish_text,
-                                metadata={"mode": task.get("mode") or "llm", "model": result.get("model")},
-                            )
-                            result["mutable_checkpoint"] = checkpoint.commit_sha
-                        except Exception as exc:
-                            _log("WARN", f"Auto-checkpoint failed for {task_id}: {exc}")
-
-            _apply_queue_outcome(task_id, final_status)
-            _log("INFO", f"Completed task {task_id} - {final_status}")
-        finally:
-            release_lock(task_id)
-            _log("INFO", f"Released lock for {task_id}")
 
-        return True
+def _concurrent_worker_loop(
+    max_iterations: Optional[int],
+    concurrency: int,
+    resident_ctx: Optional["ResidentContext"],
+    shard_id: Optional[int],
+    work_signal: Optional[WorkSignal],
+) -> int:
+    """
+    Keep up to ``concurrency`` leased tasks running on a thread pool.
 
-    return False
+    The main thread scans and leases (so the scan cursor and dependency index
+    are only driven from one place); worker threads share resident_ctx and
+    run _run_claimed_task. Each claim gets its own fresh queue read, so a
+    phase-4 plan compiled by one task never mutates another task's queue.
+    """
+    iterations = 0
+    idle_count = 0
+    in_flight: Set[Future] = set()
+
+    def _wait(timeout: float) -> bool:
+        if work_signal is not None:
+            return _idle_wait(work_signal, timeout)
+        if in_flight:
+            done, _ = wait_futures(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            return bool(done)
+        time.sleep(timeout)
+        return False
+
+    def _reap() -> None:
+        nonlocal iterations
+        for future in [f for f in in_flight if f.done()]:
+            in_flight.discard(future)
+            iterations += 1
+            exc = future.exception()
+            if exc is not None:
+                _log("ERROR", f"Unexpected error in resident task thread: {type(exc).__name__}: {exc}")
+                raise exc
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="resident-task") as pool:
+        while True:
+            try:
+                _reap()
+                if max_iterations and iterations + len(in_flight) >= max_iterations:
+                    if not in_flight:
+                        _log("INFO", f"Reached max iterations ({max_iterations})")
+                        break
+                    wait_futures(in_flight, return_when=FIRST_COMPLETED)
+                    continue
+                if len(in_flight) >= concurrency:
+                    wait_futures(in_flight, return_when=FIRST_COMPLETED)
+                    continue
 
+                if work_signal is not None:
+                    work_signal.clear()
+                if _is_halted():
+                    now_ts = time.time()
+                    if now_ts - _last_halt_log_at[0] >= 60.0:
+                        _log("INFO", "Halted (kill switch or budget limit). Re-enable via HALT button when ready.")
+                        _last_halt_log_at[0] = now_ts
+                    _wait(5.0)
+                    continue
+
+                queue = read_queue()
+                claimed = _claim_next_task(queue, resident_ctx, DEFAULT_MIN_SCORE, shard_id)
+                if claimed is not None:
+                    task, execution_log = claimed
+                    future = pool.submit(_run_claimed_task, task, queue, resident_ctx, execution_log)
+                    if work_signal is not None:
+                        future.add_done_callback(lambda _f: work_signal.notify())
+                    in_flight.add(future)
+                    idle_count = 0
+                    continue
 
-def worker_loop(max_iterations: Optional[int] = None) -> None:
-    """Main resident loop. Continuously looks for and executes tasks."""
+                wait_seconds = _resolve_idle_wait_seconds(max(idle_count, 1))
+                if in_flight:
+                    # Busy, just nothing else claimable right now: not idle.
+                    _wait(wait_seconds)
+                    continue
+                idle_count += 1
+                _maybe_compact_execution_log()
+                max_idle = MAX_IDLE_CYCLES if os.environ.get("VIVARIUM_WORKER_DAEMON") not in ("1", "true", "yes") else None
+                if max_idle is not None and idle_count >= max_idle:
+                    _log("INFO", f"No tasks available after {MAX_IDLE_CYCLES} checks. Exiting.")
+                    break
+                _log(
+                    "INFO",
+                    f"No tasks available, waiting up to {wait_seconds:.2f}s... "
+                    f"({idle_count}/{MAX_IDLE_CYCLES if max_idle else '∞'})",
+                )
+                _wait(wait_seconds)
+            except KeyboardInterrupt:
+                _log("INFO", "Interrupted by user; waiting for running tasks to finish")
+                break
+    _reap()
+    return iterations
+
+
+def worker_loop(max_iterations: Optional[int] = None, concurrency: Optional[int] = None) -> None:
+    """Main resident loop. Continuously looks for and executes tasks (up to ``concurrency`` at once)."""
+    concurrency = max(1, int(concurrency or RESIDENT_CONCURRENCY))
     try:
         ensure_directories()
         resident_ctx = None
@@ -3213,50 +3643,23 @@ def worker_loop(max_iterations: Optional[int] = None) -> None:
                 f"(scan_limit={RESIDENT_SCAN_LIMIT or 'full'})",
             )
 
-        _log("INFO", "Starting resident loop")
-
-        iterations = 0
-        idle_count = 0
-
-        while True:
-            if max_iterations and iterations >= max_iterations:
-                _log("INFO", f"Reached max iterations ({max_iterations})")
-                break
-
-            try:
-                if _is_halted():
-                    now_ts = time.time()
-                    if now_ts - _last_halt_log_at[0] >= 60.0:
-                        _log("INFO", "Halted (kill switch or budget limit). Re-enable via HALT button when ready.")
-                        _last_halt_log_at[0] = now_ts
-                    time.sleep(5.0)
-                    continue
-
-                queue = read_queue()
-
-                if find_and_execute_task(queue, resident_ctx, DEFAULT_MIN_SCORE, shard_id):
-                    iterations += 1
-                    idle_count = 0
-                else:
-                    idle_count += 1
-                    max_idle = MAX_IDLE_CYCLES if os.environ.get("VIVARIUM_WORKER_DAEMON") not in ("1", "true", "yes") else None
-                    if max_idle is not None and idle_count >= max_idle:
-                        _log("INFO", f"No tasks available after {MAX_IDLE_CYCLES} checks. Exiting.")
-                        break
-                    wait_seconds = _resolve_idle_wait_seconds(idle_count)
-                    _log(
-                        "INFO",
-                        f"No tasks available, waiting {wait_seconds:.2f}s... "
-                        f"({idle_count}/{MAX_IDLE_CYCLES if max_idle else '∞'})",
-                    )
-                    time.sleep(wait_seconds)
-            except KeyboardInterrupt:
-                _log("INFO", "Interrupted by user")
-                break
-            except Exception as e:
-                _log("ERROR", f"Unexpected error in resident loop: {type(e).__name__}: {e}")
-                raise
+        work_signal = _start_work_signal()
+        _log(
+            "INFO",
+            f"Starting resident loop (wakeup={'events' if work_signal else 'polling'}, concurrency={concurrency})",
+        )
 
+        if concurrency > 1:
+            iterations = _concurrent_worker_loop(max_iterations, concurrency, resident_ctx, shard_id, work_signal)
+        else:
+            iterations = _serial_worker_loop(max_iterations, resident_ctx, shard_id, work_signal)
+
+        if work_signal is not None:
+            work_signal.stop()
+        _task_lease_table().stop_heartbeat()
+        with _EXECUTION_LOG_LOCK:
+            if _EXECUTION_LOG_STATE["index"] is not None:
+                _EXECUTION_LOG_STATE["index"].flush()
         if resident_ctx and release_identity_lock:
             try:
                 release_identity_lock(resident_ctx.identity.identity_id, resident_ctx.resident_id)
@@ -3280,8 +3683,6 @@ def add_task(
 ) -> None:
     """Helper to add a task to the queue."""
     try:
-        queue = read_queue()
-
         task: Dict[str, Any] = normalize_task({
             "id": task_id,
             "type": task_type,
@@ -3294,9 +3695,7 @@ def add_task(
             "model": model,
         })
 
-        queue["tasks"].append(task)
-
-        write_json(QUEUE_FILE, normalize_queue(queue))
+        get_queue_backend(QUEUE_FILE).add_tasks([task])
 
         _log("INFO", f"Added task: {task_id}")
     except (IOError, TypeError) as e:
@@ -3304,6 +3703,31 @@ def add_task(
         raise
 
 
+def _parse_run_args(args: List[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Parse ``run`` arguments: ``[max_iterations] [--concurrency N | --concurrency=N]``."""
+    max_iter: Optional[int] = None
+    run_concurrency: Optional[int] = None
+    remaining = list(args)
+    while remaining:
+        arg = remaining.pop(0)
+        if arg == "--concurrency" or arg.startswith("--concurrency="):
+            raw = arg.split("=", 1)[1] if "=" in arg else (remaining.pop(0) if remaining else "")
+            try:
+                run_concurrency = int(raw)
+            except ValueError:
+                raise ValueError(f"--concurrency expects an integer, got {raw!r}") from None
+            if run_concurrency < 1:
+                raise ValueError("--concurrency must be at least 1")
+        elif max_iter is None:
+            try:
+                max_iter = int(arg)
+            except ValueError:
+                raise ValueError(f"invalid max_iterations {arg!r}") from None
+        else:
+            raise ValueError(f"unexpected argument {arg!r}")
+    return max_iter, run_concurrency
+
+
 if __name__ == "__main__":
     try:
         if len(sys.argv) > 1:
@@ -3311,18 +3735,27 @@ if __name__ == "__main__":
                 validate_config(require_groq_key=False)
                 deps = sys.argv[4].split(",") if len(sys.argv) > 4 else None
                 add_task(sys.argv[2], sys.argv[3], deps)
+            elif sys.argv[1] == "compact-log":
+                compact_execution_log_now(archive="--no-archive" not in sys.argv[2:])
             elif sys.argv[1] == "run":
                 try:
-                    validate_config(require_groq_key=True)
-                    max_iter = int(sys.argv[2]) if len(sys.argv) > 2 else None
-                    worker_loop(max_iter)
-                except ValueError:
-                    _log("ERROR", f"Invalid max_iterations: {sys.argv[2]}")
+                    max_iter, run_concurrency = _parse_run_args(sys.argv[2:])
+                except ValueError as exc:
+                    _log("ERROR", f"Invalid run arguments: {exc}")
                     sys.exit(1)
+                validate_config(require_groq_key=True)
+                worker_loop(max_iter, run_concurrency)
             else:
                 print("Usage:")
-                print("  python -m vivarium.runtime.worker_runtime run [max_iterations]  - Start resident runtime")
+                print(
+                    "  python -m vivarium.runtime.worker_runtime run [max_iterations] [--concurrency N]"
+                    "  - Start resident runtime"
+                )
                 print("  python -m vivarium.runtime.worker_runtime add <id> <instruction> [deps]  - Add task")
+                print(
+                    "  python -m vivarium.runtime.worker_runtime compact-log [--no-archive]"
+                    "  - Keep only the latest execution event per task"
+                )
                 sys.exit(1)
         else:
             worker_loop()
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Mapping, Optional
 
 from vivarium.physics import SWARM_WORLD_PHYSICS, SwarmWorldControls, SwarmWorldPhysics
+from vivarium.utils.jsonl_appender import get_appender
 
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -157,14 +158,12 @@ class FreshSwarmEnvironment:
         """Append a structured event to the local JSONL audit log."""
         if not event_type or not event_type.strip():
             raise ValueError("event_type must be non-empty")
-        self.event_log_file.parent.mkdir(parents=True, exist_ok=True)
         record = {
             "timestamp": _utc_now(),
             "event_type": event_type.strip(),
             "payload": payload,
         }
-        with open(self.event_log_file, "a", encoding="utf-8") as handle:
-            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        get_appender(self.event_log_file).append(record)
 
     def _load_queue(self) -> Dict[str, Any]:
         default_queue: Dict[str, Any] = {
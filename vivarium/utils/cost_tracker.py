@@ -1,4 +1,8 @@
+import os
+import socket
 import threading
+import time
+from typing import Optional
 
 class BudgetExceededError(RuntimeError):
     """Raised when a requested operation would exceed the allocated budget."""
@@ -8,6 +12,16 @@ class CostTracker:
     """
     Thread‑safe singleton that records USD spend for LLM API calls
     and enforces a configurable budget.
+
+    Spend lives in the cross-process budget ledger under the tracker's own
+    account; the swarm's all-time account is refused, so reset() can never
+    wipe it.
+
+    Without ``account`` the budget is per run, as it was when spend lived in
+    process memory: the account is ``session:<host>:<pid>:<start time>``, so a
+    restart or another process starts again at $0. Pass an explicit account
+    to share one budget between processes; that budget is then a lifetime cap
+    that persists until ``reset()``.
     """
     _instance = None
     _lock = threading.Lock()
@@ -20,23 +34,40 @@ class CostTracker:
                     cls._instance = super(CostTracker, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, budget_usd: float = 2.0):
+    def __init__(self, budget_usd: float = 2.0, ledger=None, account: Optional[str] = None):
         # `__init__` may be called multiple times; guard against re‑initialisation
         if not hasattr(self, "_initialized"):
+            if account == "swarm":
+                raise ValueError("CostTracker needs its own ledger account, not the swarm account")
             self.budget_usd = budget_usd
-            self.spent_usd = 0.0
+            self.account = account or f"session:{socket.gethostname()}:{os.getpid()}:{time.time_ns()}"
+            self._ledger = ledger
             self._initialized = True
 
+    @property
+    def ledger(self):
+        if self._ledger is None:
+            # Imported lazily: utils must not pull in the runtime at import time.
+            from vivarium.runtime.budget_ledger import get_budget_ledger
+
+            self._ledger = get_budget_ledger()
+        return self._ledger
+
+    @property
+    def spent_usd(self) -> float:
+        return self.ledger.spent(self.account)
+
     def add_cost(self, amount_usd: float):
         """Add cost and raise if budget would be exceeded."""
         if amount_usd < 0:
             raise ValueError("Cost amount must be non‑negative")
-        if self.spent_usd + amount_usd > self.budget_usd:
+        reservation = self.ledger.reserve(self.account, amount_usd, self.budget_usd)
+        if reservation is None:
             raise BudgetExceededError(
                 f"Attempted to spend ${self.spent_usd + amount_usd:.2f} "
                 f"which exceeds the budget of ${self.budget_usd:.2f}"
             )
-        self.spent_usd += amount_usd
+        self.ledger.commit(self.account, reservation, amount_usd)
         print(f"[COST] Spent: ${self.spent_usd:.4f} / Budget: ${self.budget_usd:.2f}")
 
     def get_remaining_budget(self) -> float:
@@ -44,8 +75,8 @@ class CostTracker:
         return max(self.budget_usd - self.spent_usd, 0.0)
 
     def reset(self, new_budget: float = None):
-        """Reset spent amount; optionally set a new budget."""
-        self.spent_usd = 0.0
+        """Reset spent amount (for every process sharing the ledger); optionally set a new budget."""
+        self.ledger.reset(self.account)
         if new_budget is not None:
             self.budget_usd = new_budget
 
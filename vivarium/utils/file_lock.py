@@ -0,0 +1,66 @@
+"""Cross-process advisory file locks (flock, with a process-local fallback)."""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the process-local lock applies
+    fcntl = None  # type: ignore[assignment]
+
+_local_locks: Dict[str, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+def _local_lock(path: Path) -> threading.Lock:
+    key = str(path)
+    with _local_locks_guard:
+        lock = _local_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _local_locks[key] = lock
+        return lock
+
+
+@contextmanager
+def exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on ``lock_path`` for the duration of the block.
+
+    Threads in this process serialize on an in-memory lock; other processes
+    serialize on ``flock`` where fcntl is available. Not re-entrant.
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with _local_lock(lock_path):
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, "a") as lf:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def exclusive_fd_lock(fd: int, path: Path) -> Iterator[None]:
+    """
+    Like ``exclusive_lock`` but flocks an already-open descriptor for ``path``.
+
+    Used by long-lived writers that keep the file itself open; shares the
+    process-local lock keyed by ``path`` with other holders of the same file.
+    """
+    with _local_lock(Path(path)):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
@@ -0,0 +1,278 @@
+"""
+Shared group-commit appender for JSONL (and plain-text) logs.
+
+Every runtime log used to be written with open/write/close per event, and a
+single task emits several events. ``GroupCommitAppender`` keeps one
+``O_APPEND`` descriptor per file and batches concurrent writers:
+
+- A writer enqueues its line and, if no commit is in progress, becomes the
+  leader. The leader (optionally after lingering ``flush_interval`` seconds to
+  gather more lines) writes every pending line in one ``write`` under ``flock``.
+  Other writers wait until their line is committed, so ``append`` still
+  returns only once the record is in the file (read-your-writes holds).
+- ``flock`` on the log file itself keeps multiple processes from interleaving.
+  After taking the lock the appender re-checks that its descriptor still
+  refers to the path; if the file was rotated, compacted or deleted by another
+  process it reopens before writing.
+- ``fsync`` policy: ``never`` (default), ``always`` (after every group commit)
+  or ``interval`` (at most every ``fsync_interval`` seconds).
+- Size rotation: when ``max_bytes`` > 0 the file is renamed to ``.1`` (older
+  backups shifted up to ``backup_count``) before a write would exceed it.
+
+Use ``get_appender(path)`` to share one appender per file within a process.
+Defaults come from VIVARIUM_LOG_FLUSH_INTERVAL, VIVARIUM_LOG_FSYNC,
+VIVARIUM_LOG_FSYNC_INTERVAL, VIVARIUM_LOG_ROTATE_BYTES and
+VIVARIUM_LOG_BACKUP_COUNT.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from vivarium.utils.file_lock import exclusive_fd_lock
+
+FSYNC_POLICIES = ("never", "always", "interval")
+_MAX_SHARED_APPENDERS = 64
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class GroupCommitAppender:
+    """Batched, multi-process-safe appender for one log file."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        flush_interval: float = 0.0,
+        fsync: str = "never",
+        fsync_interval: float = 1.0,
+        max_bytes: int = 0,
+        backup_count: int = 5,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.path = Path(path)
+        self._lock_key = self.path.resolve()
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.fsync = fsync
+        self.fsync_interval = max(0.0, float(fsync_interval))
+        self.max_bytes = max(0, int(max_bytes))
+        self.backup_count = max(1, int(backup_count))
+
+        self._cond = threading.Condition()
+        self._pending: List[bytes] = []
+        self._enqueued = 0
+        self._committed = 0
+        self._leader_active = False
+        self._failure: Optional[Tuple[int, int, BaseException]] = None
+
+        self._fd: Optional[int] = None
+        self._last_fsync = time.monotonic()
+        self.commits = 0
+        self.records = 0
+
+    # -- public API ---------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append ``record`` as one JSON line (UTF-8, non-ASCII kept as-is)."""
+        self.append_line(json.dumps(record, ensure_ascii=False))
+
+    def append_line(self, line: str) -> None:
+        """Append a text line; blocks until it has been written to the file."""
+        data = line.encode("utf-8")
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        with self._cond:
+            self._pending.append(data)
+            self._enqueued += 1
+            my_seq = self._enqueued
+            while self._committed < my_seq:
+                if not self._leader_active:
+                    self._leader_active = True
+                    break
+                self._cond.wait()
+            else:
+                self._raise_if_failed(my_seq)
+                return
+        self._lead()
+        with self._cond:
+            self._raise_if_failed(my_seq)
+
+    def close(self) -> None:
+        """Close the descriptor (the next append reopens it)."""
+        with self._cond:
+            while self._leader_active:
+                self._cond.wait()
+            self._close_fd()
+
+    # -- group commit -------------------------------------------------------
+
+    def _raise_if_failed(self, seq: int) -> None:
+        failure = self._failure
+        if failure is not None and failure[0] <= seq <= failure[1]:
+            raise failure[2]
+
+    def _lead(self) -> None:
+        if self.flush_interval > 0:
+            time.sleep(self.flush_interval)
+        with self._cond:
+            batch, self._pending = self._pending, []
+            first = self._committed + 1
+            upto = self._enqueued
+        error: Optional[BaseException] = None
+        try:
+            self._write_batch(b"".join(batch))
+        except BaseException as exc:  # surfaced to every writer in the batch
+            error = exc
+        with self._cond:
+            self._committed = upto
+            if error is not None:
+                self._failure = (first, upto, error)
+            self._leader_active = False
+            self.commits += 1
+            self.records += len(batch)
+            self._cond.notify_all()
+
+    # -- file handling (leader only) ---------------------------------------
+
+    def _open_fd(self) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(str(self.path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _close_fd(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _fd_is_current(self, fd: int) -> bool:
+        try:
+            path_stat = os.stat(self.path)
+        except OSError:
+            return False
+        fd_stat = os.fstat(fd)
+        return (fd_stat.st_ino, fd_stat.st_dev) == (path_stat.st_ino, path_stat.st_dev)
+
+    def _rotate(self) -> None:
+        for index in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{index}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+    def _write_batch(self, data: bytes) -> None:
+        for _ in range(8):
+            fd = self._fd if self._fd is not None else self._open_fd()
+            with exclusive_fd_lock(fd, self._lock_key):
+                size = os.fstat(fd).st_size
+                if not self._fd_is_current(fd):
+                    stale = True
+                elif self.max_bytes and size > 0 and size + len(data) > self.max_bytes:
+                    self._rotate()
+                    stale = True
+                else:
+                    stale = False
+                    view = memoryview(data)
+                    while view:
+                        written = os.write(fd, view)
+                        view = view[written:]
+                    self._maybe_fsync(fd)
+            if not stale:
+                return
+            self._close_fd()
+        raise OSError(f"Could not obtain a stable handle for {self.path}")
+
+    def _maybe_fsync(self, fd: int) -> None:
+        if self.fsync == "never":
+            return
+        now = time.monotonic()
+        if self.fsync == "always" or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(fd)
+            self._last_fsync = now
+
+
+_appenders: "OrderedDict[str, GroupCommitAppender]" = OrderedDict()
+_appenders_lock = threading.Lock()
+_OPTION_NAMES = ("flush_interval", "fsync", "fsync_interval", "max_bytes", "backup_count")
+
+
+def _conflicting_options(appender: GroupCommitAppender, options: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """Explicit ``options`` that differ from what ``appender`` was created with, as (current, requested)."""
+    current = {name: getattr(appender, name) for name in _OPTION_NAMES}
+    # Constructing (no descriptor is opened) normalizes and validates the values.
+    requested = GroupCommitAppender(appender.path, **{**current, **options})
+    return {
+        name: (current[name], getattr(requested, name))
+        for name in options
+        if getattr(requested, name) != current[name]
+    }
+
+
+def get_appender(path: Path, **options: Any) -> GroupCommitAppender:
+    """
+    Shared appender for ``path`` (created with ``options`` or env defaults).
+
+    Raises ValueError if ``options`` conflict with the settings of the appender
+    already shared for ``path`` (e.g. rotation for a log that must never rotate).
+    At most a bounded number of descriptors stay open; the least recently used
+    appender is closed (not discarded: it reopens if still referenced).
+    """
+    key = str(Path(path).resolve())
+    evicted: List[GroupCommitAppender] = []
+    with _appenders_lock:
+        appender = _appenders.get(key)
+        if appender is not None:
+            conflicts = _conflicting_options(appender, options) if options else {}
+            if conflicts:
+                raise ValueError(f"Shared appender for {path} already exists with different settings: {conflicts}")
+            _appenders.move_to_end(key)
+            return appender
+        settings: Dict[str, Any] = {
+            "flush_interval": _env_float("VIVARIUM_LOG_FLUSH_INTERVAL", 0.0),
+            "fsync": os.environ.get("VIVARIUM_LOG_FSYNC", "never").strip().lower() or "never",
+            "fsync_interval": _env_float("VIVARIUM_LOG_FSYNC_INTERVAL", 1.0),
+            "max_bytes": _env_int("VIVARIUM_LOG_ROTATE_BYTES", 0),
+            "backup_count": _env_int("VIVARIUM_LOG_BACKUP_COUNT", 5),
+        }
+        settings.update(options)
+        if settings["fsync"] not in FSYNC_POLICIES:
+            settings["fsync"] = "never"
+        appender = GroupCommitAppender(Path(path), **settings)
+        _appenders[key] = appender
+        while len(_appenders) > _MAX_SHARED_APPENDERS:
+            evicted.append(_appenders.popitem(last=False)[1])
+    # Closing flushes to disk; keep that I/O outside the registry lock.
+    for old in evicted:
+        old.close()
+    return appender
+
+
+@atexit.register
+def close_all_appenders() -> None:
+    with _appenders_lock:
+        appenders = list(_appenders.values())
+        _appenders.clear()
+    for appender in appenders:
+        appender.close()